@@ -0,0 +1,82 @@
+"""列式版本号数组性能基准。
+
+对比 packaging.Version 对象列表与 VersionArray 在同一语料上的排序、求最大值和约束过滤耗时，
+以及两者的内存占用。
+
+用法:
+  python benchmarks/bench_array.py                        # 生成 100 万条模拟语料
+  python benchmarks/bench_array.py --size 10000000
+  python benchmarks/bench_array.py --corpus versions.txt  # 使用真实数据（每行一个版本号）
+  python benchmarks/bench_array.py --skip-packaging        # 语料很大时跳过 packaging 对照
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from packaging.specifiers import SpecifierSet
+from packaging.version import Version
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_parse import generate_corpus, load_corpus
+
+from bump_version.version_array import VersionArray
+
+SPECIFIER = "<2,>=1.4"
+
+
+def timed(name: str, func: Callable[[], Any]) -> Any:
+    """执行并打印耗时。"""
+    start = time.perf_counter()
+    result = func()
+    print(f"  {name:<10} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def measure_memory(func: Callable[[], Any]) -> tuple[Any, int]:
+    """测量构造结果后仍被占用的内存。"""
+    tracemalloc.start()
+    result = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000, help="模拟语料的条数")
+    parser.add_argument("--corpus", type=Path, help="真实语料文件，每行一个版本号")
+    parser.add_argument("--skip-packaging", action="store_true", help="跳过 packaging.Version 对照")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else generate_corpus(args.size)
+    corpus = [version.lstrip("v") for version in corpus]
+    print(f"语料: {len(corpus):,} 条，去重后 {len(set(corpus)):,} 条\n")
+
+    print("VersionArray")
+    array = timed("构造", lambda: VersionArray.from_strings(corpus))
+    timed("argsort", array.argsort)
+    timed("max", array.max)
+    timed("filter", lambda: array.mask(SPECIFIER))
+    print(f"  {'内存':<10} {array.nbytes / 1e6:8.1f} MB ({array.nbytes / len(array):.0f} B/条)\n")
+
+    if args.skip_packaging:
+        return
+
+    print("packaging.Version")
+    versions, memory = measure_memory(lambda: [Version(v) for v in corpus])
+    timed("sort", lambda: sorted(versions))
+    timed("max", lambda: max(versions))
+    specifier = SpecifierSet(SPECIFIER)
+    timed("filter", lambda: list(specifier.filter(versions)))
+    print(f"  {'内存':<10} {memory / 1e6:8.1f} MB ({memory / len(versions):.0f} B/条)")
+
+
+if __name__ == "__main__":
+    main()
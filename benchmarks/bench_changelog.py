@@ -0,0 +1,107 @@
+"""更新日志生成性能基准。
+
+用 git fast-import 在临时仓库中生成大量提交（Conventional Commits 与普通提交混合），测量：
+  1. cold:      缓存为空时生成全部历史的更新日志（每个提交都要读取并分类）
+  2. warm:      再次生成（全部来自缓存，只列出提交范围）
+  3. +1 commit: 新增一个提交后再次生成（只分类新提交）
+
+warm 的耗时基本就是 git log 遍历提交范围本身的耗时。--memory 同时用 tracemalloc 统计峰值内存
+（耗时会明显偏高）：提交范围和分类结果都在 SQLite 中，峰值内存主要是生成的更新日志文本本身。
+
+用法:
+  python benchmarks/bench_changelog.py                 # 默认 10 万个提交
+  python benchmarks/bench_changelog.py --commits 1000000 --memory
+"""
+
+import argparse
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bump_version.changelog import generate_changelog
+from bump_version.gitrepo import GitRepository
+
+_TYPES = ["feat", "fix", "perf", "docs", "chore", "refactor", "test"]
+
+
+def fast_import_stream(count: int, seed: int = 440):
+    """git fast-import 的输入：count 个空提交组成的线性历史。"""
+    rng = random.Random(seed)
+    for mark in range(1, count + 1):
+        roll = rng.random()
+        if roll < 0.8:
+            scope = f"({rng.choice(['cli', 'api', 'core'])})" if rng.random() < 0.3 else ""
+            message = f"{rng.choice(_TYPES)}{scope}: 提交 {mark}"
+        else:
+            message = f"Merge branch 'feature-{mark}'"
+        data = message.encode("utf-8")
+        header = f"commit refs/heads/main\nmark :{mark}\n"
+        header += f"committer Bench <bench@example.com> {1_600_000_000 + mark} +0000\ndata {len(data)}\n"
+        yield header.encode() + data + b"\n"
+        if mark > 1:
+            yield f"from :{mark - 1}\n".encode()
+        yield b"\n"
+
+
+def timed(name: str, func, memory: bool) -> object:
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    line = f"{name:<12} {elapsed * 1000:10.1f} ms"
+    if memory:
+        line += f"   峰值内存 {tracemalloc.get_traced_memory()[1] / 1024 / 1024:6.1f} MiB"
+        tracemalloc.stop()
+    print(line)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, default=100_000, help="提交数")
+    parser.add_argument("--memory", action="store_true", help="统计峰值内存（tracemalloc）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        subprocess.run(["git", "init", "-q", "-b", "main", str(root)], check=True)
+        process = subprocess.Popen(["git", "fast-import", "--quiet"], cwd=root, stdin=subprocess.PIPE)
+        for chunk in fast_import_stream(args.commits):
+            process.stdin.write(chunk)  # type: ignore[union-attr]
+        process.stdin.close()  # type: ignore[union-attr]
+        process.wait()
+        print(f"提交: {args.commits:,} 个\n")
+
+        repository = GitRepository.discover(root)
+        notes = timed("cold", lambda: generate_changelog(repository, None), args.memory)
+        timed("warm", lambda: generate_changelog(repository, None), args.memory)
+        subprocess.run(
+            [
+                "git",
+                "-c",
+                "user.name=Bench",
+                "-c",
+                "user.email=bench@example.com",
+                "commit",
+                "-q",
+                "--allow-empty",
+                "-m",
+                "feat: 新功能",
+            ],
+            cwd=root,
+            check=True,
+        )
+        latest = timed("+1 commit", lambda: generate_changelog(repository, None), args.memory)
+        assert latest.classified == 1, latest.classified
+        print(f"\n更新日志: {len(notes.text.splitlines()):,} 行（{notes.commits:,} 个提交）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""命令行冷启动（导入耗时）回归基准。
+
+用 ``python -X importtime`` 多次导入 bump_version.cli，取累计导入耗时的中位数与预算比较，
+超出预算时以退出码 1 结束，可以直接放进 CI。同时列出自身耗时最多的模块，便于定位回归。
+
+用法:
+  python benchmarks/bench_import.py                 # 默认预算 150 ms
+  python benchmarks/bench_import.py --budget 100 --runs 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+TARGET = "bump_version.cli"
+
+# 这些模块只应由需要它们的代码路径按需加载
+HEAVY_MODULES = (
+    "inquirer",
+    "rich",
+    "tomlkit",
+    "packaging.specifiers",
+    "concurrent.futures",
+    "importlib.metadata",
+    "numpy",
+)
+
+
+def import_profile() -> dict[str, tuple[int, int]]:
+    """导入一次目标模块，返回 {模块名: (自身耗时 µs, 累计耗时 µs)}。"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if self_us.isdigit():
+            profile[name] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def command_wall_time(*args: str) -> float:
+    """执行一次子命令的总耗时（秒），包含解释器启动。"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", TARGET, *args], capture_output=True, check=False)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=150.0, help="累计导入耗时预算（毫秒）")
+    parser.add_argument("--runs", type=int, default=5, help="重复次数，取中位数")
+    parser.add_argument("--top", type=int, default=10, help="列出自身耗时最多的模块数")
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    cumulative = statistics.median(profile[TARGET][1] for profile in profiles) / 1000
+
+    print(f"{TARGET} 累计导入耗时（{args.runs} 次中位数）: {cumulative:.1f} ms，预算 {args.budget:.0f} ms\n")
+    print("自身耗时最多的模块:")
+    last = profiles[-1]
+    for name, (self_us, _) in sorted(last.items(), key=lambda item: item[1][0], reverse=True)[: args.top]:
+        print(f"  {self_us / 1000:7.1f} ms  {name}")
+
+    wall = statistics.median(command_wall_time("validate", "1.0.0") for _ in range(args.runs))
+    print(f"\nbump validate 1.0.0 总耗时（含解释器启动）: {wall * 1000:.0f} ms")
+
+    loaded = [name for name in HEAVY_MODULES if name in last]
+    if loaded:
+        print(f"\n❌ 导入时加载了应按需加载的模块: {', '.join(loaded)}")
+        sys.exit(1)
+    if cumulative > args.budget:
+        print(f"\n❌ 导入耗时超出预算 {cumulative - args.budget:.1f} ms")
+        sys.exit(1)
+    print("\n✅ 导入耗时在预算之内")
+
+
+if __name__ == "__main__":
+    main()
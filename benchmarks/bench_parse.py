@@ -0,0 +1,139 @@
+"""版本号解析性能基准。
+
+对比三种解析方式在同一语料上的耗时：
+  1. legacy:    每次构造 packaging.version.Version 再复制到可变 dataclass（最初的实现）
+  2. fast:      预编译模式快速解析，无法识别时回退到 packaging（不使用缓存）
+  3. cached:    VersionManager.parse_version（快速解析 + LRU 缓存）
+
+用法:
+  python benchmarks/bench_parse.py                       # 生成 100 万条模拟语料
+  python benchmarks/bench_parse.py --size 200000
+  python benchmarks/bench_parse.py --corpus versions.txt # 使用真实数据（每行一个版本号）
+
+模拟语料按真实制品仓库的大致分布生成：以三段式正式版本为主，
+夹杂预发布、dev、post、两段式、本地版本以及少量非规范写法，并且存在大量重复。
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from packaging.version import InvalidVersion, Version
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bump_version.version_manager import (
+    VersionManager,
+    _parse_fast,
+    _parse_with_packaging,
+)
+
+
+@dataclass
+class LegacyVersionParts:
+    """最初实现中的可变版本号结构，仅用于对比。"""
+
+    major: int
+    minor: int
+    patch: int
+    prerelease_type: str | None = None
+    prerelease_num: int | None = None
+    dev: int | None = None
+    post: int | None = None
+    local: str | None = None
+
+
+def legacy_parse(version: str) -> LegacyVersionParts | None:
+    """最初的 parse_version 实现：每次都构造完整的 packaging.Version。"""
+    try:
+        pv = Version(version.lstrip("v"))
+    except InvalidVersion:
+        return None
+    major, minor, patch = (*pv.release, 0, 0, 0)[:3]
+    if pv.dev is not None:
+        return LegacyVersionParts(major, minor, patch, "dev", pv.dev, pv.dev, None, pv.local)
+    if pv.pre:
+        return LegacyVersionParts(major, minor, patch, pv.pre[0], pv.pre[1], None, None, pv.local)
+    if pv.post is not None:
+        return LegacyVersionParts(major, minor, patch, "post", pv.post, None, pv.post, pv.local)
+    return LegacyVersionParts(major, minor, patch, local=pv.local)
+
+
+def generate_corpus(size: int, seed: int = 440) -> list[str]:
+    """生成模拟的真实版本号语料。"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        major = min(int(rng.expovariate(0.4)), 40)
+        minor = min(int(rng.expovariate(0.15)), 120)
+        patch = min(int(rng.expovariate(0.3)), 60)
+        base = f"{major}.{minor}.{patch}"
+        roll = rng.random()
+        if roll < 0.70:
+            version = base
+        elif roll < 0.78:
+            version = f"{major}.{minor}"
+        elif roll < 0.86:
+            version = f"{base}{rng.choice(['a', 'b', 'rc'])}{rng.randint(0, 5)}"
+        elif roll < 0.91:
+            version = f"{base}.dev{rng.randint(0, 30)}"
+        elif roll < 0.94:
+            version = f"{base}.post{rng.randint(0, 3)}"
+        elif roll < 0.96:
+            version = f"{base}+cu{rng.choice([118, 121, 124])}"
+        elif roll < 0.98:
+            version = f"v{base}"
+        else:
+            # 非规范写法，走 packaging 回退路径
+            version = rng.choice([f"{base}-alpha.{rng.randint(0, 3)}", f"1!{base}", f"{base}.{rng.randint(1, 9)}"])
+        corpus.append(version)
+    return corpus
+
+
+def load_corpus(path: Path) -> list[str]:
+    """从文件读取语料，每行一个版本号。"""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def measure(name: str, func: Callable[[str], object], corpus: list[str]) -> float:
+    """测量解析整个语料的耗时。"""
+    start = time.perf_counter()
+    for version in corpus:
+        func(version)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<12} {elapsed:8.3f}s  {len(corpus) / elapsed / 1e6:6.2f} M/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000, help="模拟语料的条数")
+    parser.add_argument("--corpus", type=Path, help="真实语料文件，每行一个版本号")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else generate_corpus(args.size)
+    print(f"语料: {len(corpus):,} 条，去重后 {len(set(corpus)):,} 条\n")
+
+    def fast(version: str) -> object:
+        version = version.lstrip("v")
+        return _parse_fast(version) or _parse_with_packaging(version)
+
+    manager = VersionManager()
+    manager.clear_parse_cache()
+
+    baseline = measure("legacy", legacy_parse, corpus)
+    fast_elapsed = measure("fast", fast, corpus)
+    cached_elapsed = measure("cached", manager.parse_version, corpus)
+
+    info = manager.parse_cache_info()
+    print(f"\n缓存: hits={info['hits']:,} misses={info['misses']:,} size={info['currsize']:,}/{info['maxsize']:,}")
+    print(f"加速比: fast {baseline / fast_elapsed:.1f}x, cached {baseline / cached_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""版本标签索引性能基准。
+
+在临时仓库中生成大量版本标签（写入 packed-refs），测量：
+  1. build:        首次建立索引（解析全部标签）
+  2. refresh:      没有任何变化时的刷新（只 stat packed-refs、列出松散标签）
+  3. refresh +1:   新增一个松散标签后的增量刷新
+  4. 查询:         最高版本、下一个可用 rcN、标签是否存在（各执行 1000 次）
+并与每次都列出并解析全部标签的做法对比。
+
+用法:
+  python benchmarks/bench_tagindex.py                 # 默认 10 万个标签
+  python benchmarks/bench_tagindex.py --size 500000
+"""
+
+import argparse
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bump_version.gitrepo import GitRepository
+from bump_version.tagindex import TagIndex
+from bump_version.version_manager import VersionManager
+
+
+def generate_tags(size: int, seed: int = 440) -> list[str]:
+    """生成不重复的版本标签名（正式版本为主，夹杂预发布版本和少量非版本标签）。"""
+    rng = random.Random(seed)
+    tags: set[str] = set()
+    while len(tags) < size:
+        base = f"{rng.randint(0, 30)}.{rng.randint(0, 200)}.{rng.randint(0, 100)}"
+        roll = rng.random()
+        if roll < 0.6:
+            tags.add(f"v{base}")
+        elif roll < 0.95:
+            tags.add(f"v{base}{rng.choice(['a', 'b', 'rc'])}{rng.randint(0, 20)}")
+        else:
+            tags.add(f"deploy-{rng.randint(0, 10**9)}")
+    return sorted(tags)
+
+
+def timed(name: str, func, repeat: int = 1) -> object:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    unit, value = ("ms", elapsed * 1000) if elapsed >= 0.001 else ("µs", elapsed * 1e6)
+    print(f"{name:<24} {value:9.2f} {unit}")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000, help="标签数量")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        subprocess.run(["git", "init", "-q", str(root)], check=True)
+        tags = generate_tags(args.size)
+        sha = "0" * 39 + "1"
+        with open(root / ".git" / "packed-refs", "w", encoding="utf-8") as f:
+            f.write("# pack-refs with: peeled fully-peeled sorted \n")
+            f.writelines(f"{sha} refs/tags/{tag}\n" for tag in tags)
+        print(f"标签: {len(tags):,} 个\n")
+
+        repository = GitRepository.discover(root)
+        manager = VersionManager()
+
+        def scan_all() -> str:
+            # 不使用索引：列出全部标签并逐个解析，取最高版本
+            versions = [
+                (parts, name)
+                for name in GitRepository.discover(root).tags()
+                if (parts := manager.parse_version(name)) is not None
+            ]
+            return max(versions)[1]
+
+        manager.clear_parse_cache()
+        timed("full scan (no index)", scan_all)
+        manager.clear_parse_cache()
+
+        index = timed("build", lambda: TagIndex.open(repository))
+        assert isinstance(index, TagIndex)
+        timed("refresh", index.refresh, repeat=10)
+        (root / ".git" / "refs" / "tags" / "v999.0.0rc0").write_text(sha + "\n")
+        timed("refresh +1", index.refresh)
+
+        timed("highest", index.highest, repeat=1000)
+        timed("highest (stable)", lambda: index.highest(prereleases=False), repeat=1000)
+        timed("next rcN", lambda: index.next_prerelease_number("1.2.3", "rc"), repeat=1000)
+        timed("exists", lambda: index.exists("v1.2.3"), repeat=1000)
+        print(f"\n最高版本: {index.highest()}，最高正式版本: {index.highest(prereleases=False)}")
+        print(f"索引文件: {index.path.stat().st_size / 1024 / 1024:.1f} MiB")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""pyproject.toml 版本号读取和写入性能基准。
+
+读取版本号:
+  1. tomlkit:   保留格式的完整解析（最初的实现）
+  2. tomllib:   标准库完整解析
+  3. scan:      ProjectDocument.version，扫描原文直接找到 [project].version
+  4. cached:    ProjectDocument.load 命中缓存（文件未变化，只 stat 一次）
+
+写入版本号:
+  1. tomlkit:   完整解析并重新序列化整个文档（最初的实现，现在作为回退路径）
+  2. surgical:  只替换版本号字符串所在的字节范围，并用 tomllib 校验替换结果
+
+用法:
+  python benchmarks/bench_toml.py                    # 生成约 5000 行的模拟 pyproject.toml
+  python benchmarks/bench_toml.py --lines 20000 --runs 10
+  python benchmarks/bench_toml.py --file pyproject.toml
+
+模拟文件在 [project] 之后附带大量工具配置（嵌套表、数组、内联表、注释），与自动生成的配置文件类似。
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tomllib
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bump_version.project import ProjectDocument, _rewrite_with_tomlkit, write_project_version
+
+
+def generate_pyproject(lines: int, seed: int = 440) -> bytes:
+    """生成大约 lines 行的 pyproject.toml。"""
+    rng = random.Random(seed)
+    out = [
+        "[project]",
+        'name = "demo"',
+        'version = "1.0.0"',
+        'dependencies = ["click>=8.1.0", "rich>=13.0.0"]',
+        "",
+    ]
+    section = 0
+    while len(out) < lines:
+        section += 1
+        out.append(f"# 自动生成的配置 #{section}")
+        out.append(f"[tool.generated.section{section}]")
+        for key in range(rng.randint(5, 30)):
+            roll = rng.random()
+            if roll < 0.4:
+                out.append(f'key{key} = "value-{rng.randint(0, 10**6)}"')
+            elif roll < 0.6:
+                out.append(f"key{key} = {rng.randint(0, 10**6)}  # 数值")
+            elif roll < 0.8:
+                items = ", ".join(f'"item{i}"' for i in range(rng.randint(1, 8)))
+                out.append(f"key{key} = [{items}]")
+            else:
+                out.append(f'key{key} = {{ enabled = true, level = {rng.randint(0, 9)}, name = "n{key}" }}')
+        out.append("")
+    return ("\n".join(out) + "\n").encode("utf-8")
+
+
+def read_with_tomlkit(content: bytes) -> str:
+    """最初的读取方式：tomlkit 完整解析后取 [project].version。"""
+    import tomlkit
+
+    return str(tomlkit.parse(content.decode("utf-8"))["project"]["version"])  # type: ignore[index]
+
+
+def measure(name: str, func: Callable[[], object], runs: int, baseline: float | None = None) -> float:
+    """多次执行取中位数。"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    median = statistics.median(samples)
+    speedup = f"  {baseline / median:6.1f}x" if baseline is not None else ""
+    print(f"{name:<22} {median * 1000:9.2f} ms{speedup}")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=5000, help="模拟文件的行数")
+    parser.add_argument("--file", type=Path, help="使用真实的 pyproject.toml")
+    parser.add_argument("--runs", type=int, default=5, help="每种方式的执行次数")
+    args = parser.parse_args()
+
+    content = args.file.read_bytes() if args.file else generate_pyproject(args.lines)
+    print(f"文件: {content.count(b'\n'):,} 行，{len(content) / 1024:.0f} KiB\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "pyproject.toml"
+        path.write_bytes(content)
+        document = ProjectDocument(path, content)
+
+        print("读取版本号")
+        baseline = measure("tomlkit", lambda: read_with_tomlkit(content), args.runs)
+        measure("tomllib", lambda: tomllib.loads(content.decode("utf-8")), args.runs, baseline)
+        measure("scan", lambda: ProjectDocument(path, content).version, args.runs, baseline)
+        ProjectDocument.load(path)
+        measure("cached", lambda: ProjectDocument.load(path).version, args.runs, baseline)
+
+        print("\n写入版本号")
+        if document._replace_version("1.0.1") is None:
+            print("无法直接定位版本号，写入时会回退到 tomlkit")
+            return
+        baseline = measure("tomlkit", lambda: _rewrite_with_tomlkit(content, "1.0.1"), args.runs)
+        measure("surgical", lambda: document.with_version("1.0.1"), args.runs, baseline)
+        measure(
+            "write (含原子写入)",
+            lambda: write_project_version(directory, "1.0.1", "pyproject.toml"),
+            args.runs,
+            baseline,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,30 +2,27 @@
 
 from pathlib import Path
 
-import tomlkit
-from tomlkit import items
+PACKAGE_NAME = "bumpster"
 
 
 def get_package_version() -> str:
-    """获取当前包的版本号。"""
-    try:
-        # 尝试从包的根目录读取 pyproject.toml
-        project_root = Path(__file__).parent.parent
-        pyproject_path = project_root / "pyproject.toml"
+    """获取当前包的版本号。
 
-        if pyproject_path.exists():
-            with open(pyproject_path) as f:
-                doc = tomlkit.load(f)
+    优先读取安装元数据；未安装（直接运行源码）时回退到读取仓库根目录的 pyproject.toml。
+    """
+    from importlib.metadata import PackageNotFoundError, version
 
-            project = doc.get("project")
-            if isinstance(project, dict | items.Table):
-                version = project.get("version")
-                if version:
-                    return str(version)
+    try:
+        return version(PACKAGE_NAME)
+    except PackageNotFoundError:
+        pass
 
-            return "unknown"
+    try:
+        import tomllib
 
-        # 如果找不到，返回默认值
-        return "unknown"
-    except Exception:
+        pyproject_path = Path(__file__).parent.parent / "pyproject.toml"
+        with open(pyproject_path, "rb") as f:
+            project = tomllib.load(f).get("project", {})
+        return str(project.get("version") or "unknown")
+    except (OSError, ValueError):
         return "unknown"
@@ -0,0 +1,465 @@
+"""发布流程的库接口。
+
+``release`` 在指定目录中完成一次完整的版本发布（检查、更新版本号、提交、打标签、推送），
+不做任何输出、不询问用户、不调用 sys.exit：成功时返回 ReleaseResult，失败时抛出
+bump_version.errors 中的异常。``release_async`` 是基于 asyncio 子进程的对应版本，
+一个事件循环可以同时驱动大量仓库的发布。
+
+发布步骤只编写一次（_release_steps 生成器），同步和异步版本只是执行外部命令的方式不同。
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import Callable, Generator, Iterable
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from . import commands
+from .changelog import CHANGELOG, prepend_changelog, release_notes
+from .errors import (
+    BranchNotAllowedError,
+    CommandError,
+    InvalidVersionError,
+    JournalError,
+    ReleaseNotAllowedError,
+    TagExistsError,
+)
+from .gitrepo import GitRepository
+from .journal import ReleaseJournal, is_release_commit
+from .lockfile import LOCK_COMMANDS, UV_LOCK, stamp_uv_lock
+from .plumbing import commit_files, ensure_plumbing_allowed
+from .preflight import require_clean_worktree
+from .project import PYPROJECT, read_project_version, write_project_version
+from .tagindex import next_free_version
+from .targets import load_version_targets, prepare_version_targets, write_version_edits
+from .version_manager import PrereleaseType, ReleaseType, VersionManager
+
+DEFAULT_BRANCHES = ("main", "master")
+
+
+@dataclass(frozen=True)
+class ReleaseResult:
+    """一次发布的结果。"""
+
+    path: Path  # 项目目录
+    old_version: str
+    new_version: str
+    tag: str
+    config_file: str  # 被更新的配置文件（pyproject.toml 或 setup.py）
+    commit_sha: str | None  # 发布提交的 SHA，干跑模式下为 None
+    pushed: bool  # 是否已推送到远程仓库
+    dry_run: bool
+    timings: dict[str, float] = field(default_factory=dict)  # 各步骤耗时（秒）
+
+
+@dataclass(frozen=True)
+class _Command:
+    """需要执行的外部命令，执行结果（标准输出）发送回生成器。"""
+
+    step: str
+    argv: list[str]
+
+
+@dataclass(frozen=True)
+class _Call:
+    """需要执行的 Python 操作（如写文件），返回值发送回生成器，异步版本中放到线程池执行。"""
+
+    step: str
+    func: Callable[[], Any]
+
+
+_Step = _Command | _Call
+
+
+def _release_steps(
+    path: Path,
+    release_type: ReleaseType,
+    prerelease_type: PrereleaseType | None,
+    *,
+    allowed_branches: tuple[str, ...] | None,
+    push: bool,
+    dry_run: bool,
+    plumbing: bool = False,
+    changelog: bool = False,
+) -> Generator[_Step, Any, ReleaseResult]:
+    """发布流程：逐个产出需要执行的步骤，接收其输出，最后返回发布结果。
+
+    所有文件和 git 访问都通过产出的步骤完成，生成器本身只做计算：异步版本中不会阻塞事件循环。
+    """
+    repository, branch = yield _Call("check", lambda: _open_repository(path, dry_run))
+    if allowed_branches is not None and branch not in allowed_branches:
+        raise BranchNotAllowedError(branch, allowed_branches)
+
+    # 与 CLI 的发布前检查相同：流式读取 git status，找到足够的更改后立即停止
+    yield _Call("check", lambda: require_clean_worktree(path))
+    if plumbing:
+        # 底层命令不执行提交钩子、不签名：仓库配置了这些功能时拒绝，而不是悄悄跳过
+        yield _Call("check", lambda: ensure_plumbing_allowed(repository))
+
+    old_version, config_file = yield _Call("check", lambda: read_project_version(path))
+    version_manager = VersionManager()
+    version_parts = version_manager.parse_version(old_version)
+    if version_parts is None:
+        raise InvalidVersionError(f"无效的版本号格式: {old_version}")
+    try:
+        new_version = version_manager.get_next_version(
+            version_parts, release_type, prerelease_type is not None, prerelease_type
+        )
+    except ValueError as e:
+        raise ReleaseNotAllowedError(str(e)) from e
+
+    # 在修改任何文件之前检查标签是否已经存在（并行的发布分支可能已经发布过同一个 rcN）
+    new_version = yield _Call("check", lambda: next_free_version(repository, new_version, persist=not dry_run))
+    tag = f"v{new_version}"
+
+    # [tool.bumpster] version-files 中的文件先在内存中完成替换，任何一个失败时不修改任何文件
+    targets = yield _Call("check", lambda: load_version_targets(path))
+    edits = (yield _Call("check", lambda: prepare_version_targets(path, targets, new_version))) if targets else []
+
+    if dry_run:
+        return ReleaseResult(path, old_version, new_version, tag, config_file, None, False, dry_run)
+
+    # 修改任何文件之前记录发布计划，中断后可以用 resume_release 继续、abort_release 回滚
+    files = [config_file, *(name for name, _ in edits)]
+    steps = ["write", "commit", "tag"]
+    # 存在 uv.lock 时同步更新其中根项目的版本号
+    if config_file == PYPROJECT and (yield _Call("check", lambda: (path / UV_LOCK).exists())):
+        files.append(UV_LOCK)
+        steps.append("lock")
+    if changelog:
+        files.append(CHANGELOG)
+        steps.append("changelog")
+    if push:
+        steps.append("push")
+    journal = yield _Call(
+        "update",
+        lambda: ReleaseJournal.begin(
+            repository,
+            path,
+            old_version=old_version,
+            new_version=new_version,
+            tag=tag,
+            config_file=config_file,
+            files=files,
+            steps=steps,
+            plumbing=plumbing,
+        ),
+    )
+    return (yield from _journal_steps(path, repository, journal, edits))
+
+
+def _open_repository(path: Path, dry_run: bool) -> tuple[GitRepository, str]:
+    """找到 path 所在的仓库，确认没有未完成的发布（干跑时不检查），返回仓库和当前分支。"""
+    repository = GitRepository.discover(path)
+    if not dry_run:
+        ReleaseJournal.ensure_idle(repository)
+    return repository, repository.current_branch()
+
+
+def _has_release_notes(path: Path, tag: str) -> bool:
+    """更新日志文件中是否已经有 tag 的条目。"""
+    try:
+        return f"\n## {tag} (" in "\n" + path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return False
+
+
+def _journal_steps(
+    path: Path, repository: GitRepository, journal: ReleaseJournal, edits: list[tuple[str, bytes]] | None = None
+) -> Generator[_Step, Any, ReleaseResult]:
+    """执行发布日志中尚未完成的步骤，每完成一步记录一次，全部完成后删除日志。
+
+    继续中断的发布时 edits 为 None，version-files 的改写重新计算（已经写入的文件内容不变，不会重复写入）；
+    完成后没来得及记录的提交、标签和更新日志根据仓库的实际状态识别，不会重做。
+    """
+    new_version, tag = journal.new_version, journal.tag
+
+    if not journal.done("write"):
+        yield _Call("update", lambda: write_project_version(path, new_version, journal.config_file))
+        if edits is None:
+            targets = yield _Call("update", lambda: load_version_targets(path))
+            edits = (
+                (yield _Call("update", lambda: prepare_version_targets(path, targets, new_version))) if targets else []
+            )
+        if edits:
+            yield _Call("update", lambda: write_version_edits(path, edits))
+        yield _Call("update", lambda: journal.complete("write"))
+
+    # 无法直接改写 uv.lock 时才运行 uv
+    if not journal.done("lock"):
+        stamped = yield _Call("lock", lambda: stamp_uv_lock(path / UV_LOCK, new_version))
+        if not stamped:
+            yield _Command("lock", LOCK_COMMANDS[UV_LOCK])
+        yield _Call("lock", lambda: journal.complete("lock"))
+
+    # 上一个版本到 HEAD 之间的更新日志插入到 CHANGELOG.md 开头，与版本号一起提交
+    if not journal.done("changelog"):
+        if not (yield _Call("changelog", lambda: _has_release_notes(path / CHANGELOG, tag))):
+            title = f"{tag} ({date.today().isoformat()})"
+            notes = yield _Call("changelog", lambda: release_notes(repository, journal.old_version, title))
+            yield _Call("changelog", lambda: prepend_changelog(path / CHANGELOG, notes.text))
+        yield _Call("changelog", lambda: journal.complete("changelog"))
+
+    commit_sha = journal.commit_sha
+    if not journal.done("commit"):
+        completed = ("commit",)
+        head = yield _Call("commit", repository.head_commit)
+        if (yield _Call("commit", lambda: is_release_commit(repository, journal, head))):
+            # 提交完成后、记录之前被中断
+            commit_sha = head
+        elif head != journal.head:
+            raise JournalError(f"HEAD 已经移动（发布开始时为 {journal.head}），无法继续发布")
+        elif journal.plumbing:
+            # 不经过索引，直接构造提交和标签（见 plumbing 模块）
+            commit = yield _Call(
+                "commit",
+                lambda: commit_files(
+                    repository,
+                    journal.files,
+                    journal.commit_message,
+                    tag=tag,
+                    tag_message=journal.tag_message,
+                    root=path,
+                ),
+            )
+            commit_sha = commit.commit_sha
+            completed = ("commit", "tag")  # 标签和提交一起创建
+        else:
+            yield _Command("commit", ["git", "add", *journal.files])
+            yield _Command("commit", ["git", "commit", "-m", journal.commit_message])
+            commit_sha = yield _Call("commit", repository.head_commit)
+        yield _Call("commit", lambda: journal.complete(*completed, commit_sha=commit_sha))
+
+    if not journal.done("tag"):
+        if (yield _Call("tag", lambda: repository.resolve_ref(f"refs/tags/{tag}"))) is None:
+            yield _Command("tag", ["git", "tag", "-a", tag, "-m", journal.tag_message])
+        elif (yield _Call("tag", lambda: repository.peel(f"refs/tags/{tag}"))) != commit_sha:
+            raise TagExistsError(tag)
+        yield _Call("tag", lambda: journal.complete("tag"))
+
+    if not journal.done("push"):
+        yield _Command("push", ["git", "push", "--follow-tags"])
+        yield _Call("push", lambda: journal.complete("push"))
+
+    yield _Call("update", journal.finish)
+    pushed = "push" in journal.steps
+    return ReleaseResult(path, journal.old_version, new_version, tag, journal.config_file, commit_sha, pushed, False)
+
+
+def _run_steps(root: Path, steps: Generator[_Step, Any, ReleaseResult]) -> ReleaseResult:
+    """在当前线程中逐个执行步骤，返回发布结果。"""
+    timings: dict[str, float] = {}
+
+    output = None
+    try:
+        while True:
+            step = steps.send(output)  # type: ignore[arg-type]
+            start = time.perf_counter()
+            if isinstance(step, _Call):
+                output = step.func()
+            else:
+                output = commands.run(step.argv, cwd=root)
+            timings[step.step] = timings.get(step.step, 0.0) + time.perf_counter() - start
+    except StopIteration as stop:
+        result: ReleaseResult = stop.value
+    result.timings.update(timings)
+    return result
+
+
+def _resolve_options(
+    path: str | os.PathLike[str], allow_any_branch: bool, allowed_branches: Iterable[str], push: bool | None
+) -> tuple[Path, tuple[str, ...] | None, bool]:
+    """整理公共参数：push 为 None 时遵循 BUMP_VERSION_SKIP_PUSH 环境变量。"""
+    if push is None:
+        push = not os.environ.get("BUMP_VERSION_SKIP_PUSH")
+    return Path(path), None if allow_any_branch else tuple(allowed_branches), push
+
+
+def release(
+    path: str | os.PathLike[str] = ".",
+    release_type: ReleaseType = "patch",
+    prerelease_type: PrereleaseType | None = None,
+    *,
+    dry_run: bool = False,
+    push: bool | None = None,
+    allowed_branches: Iterable[str] = DEFAULT_BRANCHES,
+    allow_any_branch: bool = False,
+    plumbing: bool = False,
+    changelog: bool = False,
+) -> ReleaseResult:
+    """在 path 目录中发布新版本。
+
+    Args:
+        path: 项目目录（Git 仓库）
+        release_type: 版本号递增类型 major / minor / patch
+        prerelease_type: 预发布类型 dev / a / b / rc / post，None 表示正式版本
+        dry_run: 只做检查并计算新版本号，不修改任何文件
+        push: 是否推送；None 表示未设置 BUMP_VERSION_SKIP_PUSH 时推送
+        allowed_branches: 允许发布的分支
+        allow_any_branch: 为 True 时不检查分支
+        plumbing: 使用 git 底层命令提交和打标签，不刷新整个索引（适用于超大仓库）；
+            不执行提交钩子、不签名，仓库配置了这些功能时抛出 PlumbingNotAllowedError
+        changelog: 把上一个版本之后的更新日志插入到 CHANGELOG.md 开头，与版本号一起提交
+
+    Raises:
+        ProjectNotFoundError: 没有找到项目配置文件
+        NotAGitRepositoryError: path 不在 Git 仓库中
+        InvalidVersionError: 当前版本号无效
+        ReleaseNotAllowedError: 当前版本不允许该发布操作
+        BranchNotAllowedError: 当前分支不允许发布
+        DirtyWorktreeError: 工作区有未提交的更改
+        PlumbingNotAllowedError: plumbing 为 True，但仓库配置了提交钩子或签名
+        ReleaseInProgressError: 上一次发布没有完成（见 resume_release / abort_release）
+        TagExistsError: 新版本的标签已经存在（a / b / rc 版本会自动跳到下一个可用序号，不会抛出）
+        VersionTargetError: [tool.bumpster] version-files 配置错误、文件不存在或没有找到版本号
+        CommandError: git / uv 命令执行失败
+    """
+    root, branches, push = _resolve_options(path, allow_any_branch, allowed_branches, push)
+    steps = _release_steps(
+        root,
+        release_type,
+        prerelease_type,
+        allowed_branches=branches,
+        push=push,
+        dry_run=dry_run,
+        plumbing=plumbing,
+        changelog=changelog,
+    )
+    return _run_steps(root, steps)
+
+
+async def release_async(
+    path: str | os.PathLike[str] = ".",
+    release_type: ReleaseType = "patch",
+    prerelease_type: PrereleaseType | None = None,
+    *,
+    dry_run: bool = False,
+    push: bool | None = None,
+    allowed_branches: Iterable[str] = DEFAULT_BRANCHES,
+    allow_any_branch: bool = False,
+    plumbing: bool = False,
+    changelog: bool = False,
+) -> ReleaseResult:
+    """release 的异步版本：git add / commit / tag / push 等外部命令通过 asyncio 子进程执行，
+    读写文件、读取仓库和流式的工作区检查放到线程池，事件循环中不做任何阻塞操作。
+
+    参数、返回值和异常与 release 相同。
+    """
+    root, branches, push = _resolve_options(path, allow_any_branch, allowed_branches, push)
+    steps = _release_steps(
+        root,
+        release_type,
+        prerelease_type,
+        allowed_branches=branches,
+        push=push,
+        dry_run=dry_run,
+        plumbing=plumbing,
+        changelog=changelog,
+    )
+    timings: dict[str, float] = {}
+
+    output = None
+    try:
+        while True:
+            step = steps.send(output)  # type: ignore[arg-type]
+            start = time.perf_counter()
+            if isinstance(step, _Call):
+                output = await asyncio.to_thread(step.func)
+            else:
+                commands.record_process(step.argv)
+                process = await asyncio.create_subprocess_exec(
+                    *step.argv,
+                    cwd=root,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                stdout, stderr = await process.communicate()
+                if process.returncode != 0:
+                    raise CommandError(step.argv, process.returncode or 0, stderr.decode(errors="replace"))
+                output = stdout.decode()
+            timings[step.step] = timings.get(step.step, 0.0) + time.perf_counter() - start
+    except StopIteration as stop:
+        result: ReleaseResult = stop.value
+    result.timings.update(timings)
+    return result
+
+
+def resume_release(path: str | os.PathLike[str] = ".") -> ReleaseResult:
+    """继续 path 所在仓库中被中断的发布：从第一个未完成的步骤开始，已完成的步骤不会重做。
+
+    分支、推送等选项沿用发布开始时的设置。
+
+    Raises:
+        NotAGitRepositoryError: path 不在 Git 仓库中
+        JournalError: 没有未完成的发布、发布日志已损坏，或 HEAD 在此期间被移动
+        TagExistsError: 标签已经存在但不指向发布提交
+        VersionTargetError: version-files 中的文件不存在或没有找到版本号
+        CommandError: git / uv 命令执行失败（可以再次继续）
+    """
+    repository = GitRepository.discover(path)
+    journal = ReleaseJournal.load(repository)
+    root = Path(journal.root)
+    return _run_steps(root, _journal_steps(root, repository, journal))
+
+
+def abort_release(path: str | os.PathLike[str] = ".") -> ReleaseJournal:
+    """回滚 path 所在仓库中被中断的发布，返回被回滚的发布日志。
+
+    删除本次发布创建的标签，把分支退回到发布前的提交，恢复被修改的文件、删除新建的文件。
+    已经推送到远程仓库的提交和标签不会被撤销。
+
+    Raises:
+        NotAGitRepositoryError: path 不在 Git 仓库中
+        JournalError: 没有未完成的发布、发布日志已损坏，或发布之后 HEAD 又被移动
+        CommandError: git 命令执行失败
+    """
+    repository = GitRepository.discover(path)
+    journal = ReleaseJournal.load(repository)
+    root = Path(journal.root)
+    if journal.head is None:
+        raise JournalError("发布前仓库中没有任何提交，无法自动回滚")
+
+    head = repository.head_commit()
+    commit_sha = journal.commit_sha or (head if is_release_commit(repository, journal, head) else None)
+    if head != (commit_sha or journal.head):
+        raise JournalError(f"发布之后 HEAD 又被移动（当前为 {head}），无法自动回滚")
+    if commit_sha is not None:
+        if repository.peel(f"refs/tags/{journal.tag}") == commit_sha:
+            commands.run(["git", "tag", "-d", journal.tag], cwd=root)
+        # 只移动分支，发布提交中的更改留在索引中，下面和未提交的更改一起恢复
+        commands.run(["git", "reset", "--soft", journal.head], cwd=root)
+
+    restored = [name for name in journal.files if name not in journal.created]
+    if restored:
+        commands.run(["git", "checkout", journal.head, "--", *restored], cwd=root)
+    if journal.created:
+        commands.run(["git", "rm", "--quiet", "--cached", "--ignore-unmatch", "--", *journal.created], cwd=root)
+        for name in journal.created:
+            (root / name).unlink(missing_ok=True)
+    journal.finish()
+    return journal
+
+
+async def release_many(
+    paths: Iterable[str | os.PathLike[str]],
+    release_type: ReleaseType = "patch",
+    prerelease_type: PrereleaseType | None = None,
+    *,
+    concurrency: int = 32,
+    **options: Any,
+) -> list[ReleaseResult | BaseException]:
+    """并发发布多个仓库，同时进行的发布数不超过 concurrency。
+
+    返回值与 paths 一一对应：成功为 ReleaseResult，失败为对应的异常对象（不会中断其他仓库的发布）。
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(path: str | os.PathLike[str]) -> ReleaseResult:
+        async with semaphore:
+            return await release_async(path, release_type, prerelease_type, **options)
+
+    return await asyncio.gather(*(run(path) for path in paths), return_exceptions=True)
@@ -0,0 +1,117 @@
+"""批量版本号校验模块。
+
+以生成器流水线的方式处理任意规模的版本号输入：逐行读取、按块分组、
+大输入时分发到进程池并行校验，结果按输入顺序产出，内存占用与输入规模无关。
+"""
+
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+@dataclass
+class ValidationSummary:
+    """批量校验的汇总统计。"""
+
+    total: int = 0
+    valid: int = 0
+    invalid: int = 0
+
+    def add(self, result: dict[str, Any]) -> None:
+        """累计一条校验结果。"""
+        self.total += 1
+        if result["valid"]:
+            self.valid += 1
+        else:
+            self.invalid += 1
+
+    def as_dict(self) -> dict[str, int]:
+        """转换为可序列化的字典。"""
+        return {"total": self.total, "valid": self.valid, "invalid": self.invalid}
+
+
+def check_version(version: str) -> dict[str, Any]:
+    """校验单个版本号，返回包含输入、是否有效和规范化形式的结果。"""
+    # 延迟导入：CLI 启动时会导入本模块（选项默认值），只有真正校验时才需要 packaging
+    from packaging.version import InvalidVersion, Version
+
+    try:
+        normalized = str(Version(version))
+    except InvalidVersion:
+        return {"input": version, "valid": False, "normalized": None}
+    return {"input": version, "valid": True, "normalized": normalized}
+
+
+def _check_chunk(chunk: list[str]) -> list[dict[str, Any]]:
+    """校验一块版本号（进程池的工作函数，必须位于模块顶层以便序列化）。"""
+    return [check_version(version) for version in chunk]
+
+
+def iter_versions(lines: Iterable[str]) -> Iterator[str]:
+    """从文本行中提取版本号，去掉行尾换行和首尾空白并跳过空行。"""
+    for line in lines:
+        version = line.strip()
+        if version:
+            yield version
+
+
+def chunked(items: Iterable[str], size: int) -> Iterator[list[str]]:
+    """把可迭代对象切分为固定大小的块，最后一块可能不足。"""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def validate_stream(
+    lines: Iterable[str],
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """流式校验版本号，按输入顺序逐条产出结果。
+
+    输入只有一块时直接在当前进程中校验，避免进程池的启动开销；
+    否则分发到进程池，同时在途的块数限制为 ``workers * 2``，保证内存有界。
+
+    Args:
+        lines: 每行一个版本号的文本行
+        workers: 并行进程数，默认使用 CPU 核数；为 1 时不启动进程池
+        chunk_size: 每个任务块包含的版本号数量
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = chunked(iter_versions(lines), chunk_size)
+
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+
+    if second is None or workers == 1:
+        yield from _check_chunk(first)
+        if second is not None:
+            yield from _check_chunk(second)
+            for chunk in chunks:
+                yield from _check_chunk(chunk)
+        return
+
+    # 进程池只在真正需要并行时才加载
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[list[dict[str, Any]]]] = deque(
+            [executor.submit(_check_chunk, first), executor.submit(_check_chunk, second)]
+        )
+        for chunk in chunks:
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(_check_chunk, chunk))
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,221 @@
+"""更新日志生成模块。
+
+按 Conventional Commits 把两个版本之间的提交分组（破坏性变更、新功能、问题修复、性能优化），
+生成 Markdown 格式的更新日志。
+
+每个提交的分类结果按 SHA 保存在 Git 公共目录的 ``bumpster/commits.sqlite3`` 中，提交内容不会变化，
+缓存永远不需要失效：每次发布只读取并解析从未见过的提交（通过常驻的 git cat-file 进程）。
+提交范围以流的形式写入 SQLite 临时表，分组和排序在 SQLite 中完成，历史再长内存占用也不会增长。
+"""
+
+import contextlib
+import sqlite3
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import commands
+from .conventional import parse_commit
+from .gitrepo import GitRepository
+from .project import atomic_write
+from .tagindex import TagIndex
+
+# 缓存文件相对于 Git 公共目录的路径
+CACHE_PATH = Path("bumpster") / "commits.sqlite3"
+
+# 缓存格式版本，与已有文件不一致时清空
+SCHEMA_VERSION = 1
+
+# 默认的更新日志文件
+CHANGELOG = "CHANGELOG.md"
+
+# 更新日志的分组标题，按显示顺序排列；破坏性变更不论类型都归入第一组
+SECTIONS = ("⚠️ 破坏性变更", "✨ 新功能", "🐛 问题修复", "⚡ 性能优化")
+_SECTION_TYPES = {"feat": 1, "fix": 2, "perf": 3}
+
+# 每批查询、写入的提交数
+_BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    section INTEGER,
+    scope TEXT,
+    subject TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True)
+class Changelog:
+    """一段生成的更新日志。"""
+
+    text: str  # Markdown 文本（以二级标题开头）
+    commits: int  # 范围内的提交数
+    classified: int  # 本次新解析的提交数（其余来自缓存）
+
+
+def _classify(message: str) -> tuple[int | None, str | None, str]:
+    """提交所属的分组、范围和描述；不属于任何分组时分组为 None。"""
+    commit = parse_commit(message)
+    if commit is None:
+        return None, None, message.partition("\n")[0]
+    section = 0 if commit.breaking else _SECTION_TYPES.get(commit.type)
+    return section, commit.scope, commit.subject
+
+
+def _commit_message(raw: bytes) -> str:
+    """从提交对象的原始内容中取出提交信息（头部之后第一个空行之后的部分）。"""
+    _, _, message = raw.partition(b"\n\n")
+    return message.decode("utf-8", "replace").strip()
+
+
+class CommitCache:
+    """按 SHA 缓存的提交分类结果。连接只能在创建它的线程中使用。"""
+
+    def __init__(self, repository: GitRepository, path: str | Path | None = None):
+        self.repository = repository
+        self.path = Path(path) if path is not None else repository.common_dir / CACHE_PATH
+        self._connection = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """打开缓存文件；文件损坏时重建，无法写入时使用内存数据库。"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            return self._initialize(sqlite3.connect(self.path, timeout=30))
+        except sqlite3.DatabaseError:
+            with contextlib.suppress(OSError):
+                self.path.unlink()
+            with contextlib.suppress(OSError, sqlite3.DatabaseError):
+                return self._initialize(sqlite3.connect(self.path, timeout=30))
+        except OSError:
+            pass
+        return self._initialize(sqlite3.connect(":memory:"))
+
+    @staticmethod
+    def _initialize(connection: sqlite3.Connection) -> sqlite3.Connection:
+        """创建表结构；格式版本不一致时清空缓存。"""
+        try:
+            with connection:
+                connection.executescript(_SCHEMA)
+                row = connection.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+                if row is not None and row[0] != str(SCHEMA_VERSION):
+                    connection.execute("DELETE FROM commits")
+                connection.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+            connection.execute("CREATE TEMP TABLE range (position INTEGER PRIMARY KEY, sha TEXT NOT NULL)")
+        except BaseException:
+            connection.close()
+            raise
+        return connection
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "CommitCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM commits").fetchone()[0]
+
+    def load_range(self, shas: Iterable[str]) -> int:
+        """把要生成更新日志的提交（按 git log 顺序）写入临时表，返回提交数。"""
+        with self._connection:
+            self._connection.execute("DELETE FROM temp.range")
+            self._connection.executemany("INSERT INTO temp.range (sha) VALUES (?)", ((sha,) for sha in shas))
+        return self._connection.execute("SELECT COUNT(*) FROM temp.range").fetchone()[0]
+
+    def classify_missing(self) -> int:
+        """读取并分类范围内尚未缓存的提交，返回新分类的提交数。"""
+        cat_file = commands.cat_file(self.repository.git_dir)
+        query = (
+            "SELECT r.position, r.sha FROM temp.range AS r LEFT JOIN commits AS c ON c.sha = r.sha "
+            "WHERE c.sha IS NULL AND r.position > ? ORDER BY r.position LIMIT ?"
+        )
+        count, position = 0, 0
+        # 按批次（position 递增）查询，不把所有未缓存的 SHA 一次读入内存
+        while batch := self._connection.execute(query, (position, _BATCH_SIZE)).fetchall():
+            rows = []
+            for _, sha in batch:
+                obj = cat_file.read(sha)
+                message = _commit_message(obj[2]) if obj is not None else ""
+                rows.append((sha, *_classify(message)))
+            with self._connection:
+                self._connection.executemany("INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?)", rows)
+            count += len(rows)
+            position = batch[-1][0]
+        return count
+
+    def entries(self) -> Iterator[tuple[int, str | None, str, str]]:
+        """范围内需要记录的提交 (分组, 范围, 描述, SHA)，按分组、再按 git log 顺序排列。"""
+        query = (
+            "SELECT c.section, c.scope, c.subject, r.sha FROM temp.range AS r JOIN commits AS c ON c.sha = r.sha "
+            "WHERE c.section IS NOT NULL ORDER BY c.section, r.position"
+        )
+        yield from self._connection.execute(query)
+
+
+def _range_shas(repository: GitRepository, since: str | None, until: str) -> Iterator[str]:
+    """流式列出 since（不含）到 until 之间的提交 SHA，since 为 None 时列出 until 的全部历史。"""
+    for revision in (since, until):
+        if revision is not None and (not revision or revision.startswith("-")):
+            raise ValueError(f"无效的版本: {revision!r}")
+    revisions = [until] if since is None else [until, f"^{since}"]
+    argv = ["git", f"--git-dir={repository.git_dir}", "log", "-z", "--format=%H", *revisions, "--"]
+    for record in commands.stream_records(argv, cwd=repository.work_tree or repository.git_dir):
+        yield record.decode("ascii").strip()
+
+
+def render(entries: Iterable[tuple[int, str | None, str, str]], title: str) -> str:
+    """把分组后的提交渲染为 Markdown。"""
+    lines = [f"## {title}"]
+    current = None
+    for section, scope, subject, sha in entries:
+        if section != current:
+            lines += ["", f"### {SECTIONS[section]}", ""]
+            current = section
+        prefix = f"**{scope}:** " if scope else ""
+        lines.append(f"- {prefix}{subject} ({sha[:7]})")
+    if current is None:
+        lines += ["", "没有需要记录的更改。"]
+    return "\n".join(lines) + "\n"
+
+
+def generate_changelog(
+    repository: GitRepository, since: str | None, until: str = "HEAD", title: str = "未发布"
+) -> Changelog:
+    """生成 since（不含）到 until 之间的更新日志。
+
+    Raises:
+        CommandError: git log 执行失败（如版本不存在）
+    """
+    with CommitCache(repository) as cache:
+        count = cache.load_range(_range_shas(repository, since, until))
+        classified = cache.classify_missing()
+        return Changelog(render(cache.entries(), title), count, classified)
+
+
+def prepend_changelog(path: str | Path, text: str) -> None:
+    """把一段更新日志插入到文件开头（保留文件的一级标题），文件不存在时创建。"""
+    path = Path(path)
+    try:
+        existing = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        existing = ""
+    header = ""
+    if existing.startswith("# "):
+        header, _, existing = existing.partition("\n")
+        header += "\n\n"
+        existing = existing.lstrip("\n")
+    content = header + text + ("\n" + existing if existing else "")
+    atomic_write(path, content.encode("utf-8"))
+
+
+def release_notes(repository: GitRepository, current_version: str, title: str) -> Changelog:
+    """上一次发布（current_version 的标签）到 HEAD 之间的更新日志，用于发布流程。"""
+    with TagIndex.open(repository) as index:
+        since = index.last_release_tag(current_version)
+    return generate_changelog(repository, since, "HEAD", title)
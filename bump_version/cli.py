@@ -1,24 +1,84 @@
 #!/usr/bin/env python3
 """主命令行界面模块。"""
 
+import json
 import os
-import subprocess
+import shlex
 import sys
+from collections.abc import Iterable
+from dataclasses import asdict
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import click
-import tomlkit
-from inquirer import confirm, list_input
-from packaging.version import InvalidVersion, Version
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from tomlkit import items
 
-from ._version import get_package_version
-from .version_manager import VersionManager
+from . import commands
+from .bulk import DEFAULT_CHUNK_SIZE, ValidationSummary, iter_versions, validate_stream
+from .errors import CommandError
+from .sorting import latest_version, parse_size, sort_versions
+from .version_manager import (
+    OFFERED_TARGETS,
+    PRERELEASE_TYPES,
+    RELEASE_TYPES,
+    PrereleaseType,
+    ReleaseType,
+    VersionManager,
+)
 
-console = Console()
+if TYPE_CHECKING:
+    from .journal import ReleaseJournal
+    from .preflight import PreflightResult
+
+# 交互式发布流程中各发布类型的选项文字
+RELEASE_CHOICE_LABELS: dict[PrereleaseType | None, str] = {
+    None: "正式版本 (Production)",
+    "dev": "Dev 版本",
+    "a": "Alpha 版本",
+    "b": "Beta 版本",
+    "rc": "RC 版本",
+    "post": "Post 版本",
+}
+_RELEASE_CHOICE_TYPES = {label: prerelease_type for prerelease_type, label in RELEASE_CHOICE_LABELS.items()}
+
+
+class _LazyConsole:
+    """首次输出时才创建 rich Console，只做校验、计算的子命令不必加载 rich。"""
+
+    _console: Any = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
+
+
+def list_input(message: str, choices: list[str], default: str | None = None) -> str | None:
+    """交互式单选（按需加载 inquirer）。"""
+    import inquirer
+
+    return inquirer.list_input(message=message, choices=choices, default=default)
+
+
+def confirm(message: str, default: bool = False) -> bool:
+    """交互式确认（按需加载 inquirer）。"""
+    import inquirer
+
+    return inquirer.confirm(message, default=default)
+
+
+def _print_version(ctx: click.Context, param: click.Parameter, value: bool) -> None:
+    """--version 回调：只在需要时从安装元数据中读取版本号。"""
+    if not value or ctx.resilient_parsing:
+        return
+    from ._version import get_package_version
+
+    click.echo(f"bump, version {get_package_version()}")
+    ctx.exit()
 
 
 def validate_version(version_string: str) -> bool:
@@ -30,126 +90,217 @@ def validate_version(version_string: str) -> bool:
     Returns:
         bool: 如果版本号符合 PEP 440 规范返回 True，否则返回 False
     """
+    from packaging.version import InvalidVersion, Version
+
     try:
         Version(version_string)
-        click.echo(f"✅ Version {version_string} is PEP 440 compliant")
-        return True
     except InvalidVersion:
+        return _echo_validation(version_string, False)
+    return _echo_validation(version_string, True)
+
+
+def _echo_validation(version_string: str, valid: bool) -> bool:
+    """输出单个版本号的验证结果。"""
+    if valid:
+        click.echo(f"✅ Version {version_string} is PEP 440 compliant")
+    else:
         click.echo(f"❌ Version '{version_string}' is not PEP 440 compliant")
-        return False
+    return valid
 
 
-def exec_command(command: str, silent: bool = False) -> str:
-    """执行命令并返回结果。"""
+def validate_bulk(lines, workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> ValidationSummary:
+    """批量验证版本号，逐行输出 NDJSON 结果，并把汇总统计输出到标准错误。
+
+    Args:
+        lines: 每行一个版本号的文本行（文件对象或任意可迭代对象）
+        workers: 并行进程数
+        chunk_size: 每个任务块的版本号数量
+
+    Returns:
+        ValidationSummary: 汇总统计
+    """
+    summary = ValidationSummary()
+    out = sys.stdout
+    for result in validate_stream(lines, workers=workers, chunk_size=chunk_size):
+        summary.add(result)
+        out.write(json.dumps(result, ensure_ascii=False))
+        out.write("\n")
+    out.flush()
+    click.echo(json.dumps({"summary": summary.as_dict()}), err=True)
+    return summary
+
+
+def build_next_matrix(version_manager: VersionManager, version: str) -> dict[str, Any]:
+    """构建单个版本号的候选版本矩阵文档。"""
+    version_parts = version_manager.parse_version(version)
+    if version_parts is None:
+        return {"input": version, "valid": False, "error": f"无效的版本号格式: {version}", "candidates": []}
+    return {
+        "input": version,
+        "valid": True,
+        "current": str(version_parts),
+        "state": version_parts.prerelease_type,
+        "candidates": [asdict(candidate) for candidate in version_manager.get_candidates(version_parts)],
+    }
+
+
+def exec_command(command: str | list[str], silent: bool = False) -> str:
+    """执行命令并返回结果（不经过 shell，字符串命令按 shell 规则拆分为参数列表）。"""
+    argv = shlex.split(command) if isinstance(command, str) else command
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, check=True)
+        output = commands.run(argv).strip()
+    except CommandError as e:
         if not silent:
-            console.print(result.stdout.strip())
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        if not silent:
-            console.print(f"[red]❌ 命令执行失败: {command}[/red]")
+            console.print(f"[red]❌ 命令执行失败: {shlex.join(argv)}[/red]")
             console.print(e.stderr)
             sys.exit(1)
-        raise e
+        raise
+    if not silent:
+        console.print(output)
+    return output
 
 
 def get_current_version() -> tuple[str, str]:
     """获取当前版本号和配置文件类型。"""
-    # 优先查找 pyproject.toml
-    if Path("pyproject.toml").exists():
-        with open("pyproject.toml") as f:
-            doc = tomlkit.load(f)
-
-        # 检查 [project] 部分
-        project = doc.get("project")
-        if isinstance(project, dict | items.Table) and "version" in project:
-            return str(project["version"]), "pyproject.toml"
-
-        # 检查 [tool.poetry] 部分
-        tool = doc.get("tool")
-        if isinstance(tool, dict | items.Table):
-            poetry = tool.get("poetry")
-            if isinstance(poetry, dict | items.Table) and "version" in poetry:
-                return str(poetry["version"]), "pyproject.toml"
-
-    # 检查 setup.py
-    if Path("setup.py").exists():
-        console.print("[yellow]⚠️  找到 setup.py, 但建议使用 pyproject.toml[/yellow]")
-        # 简单的版本提取（实际可能更复杂）
-        with open("setup.py") as f:
-            content = f.read()
-            import re
+    from .project import SETUP_PY, ProjectNotFoundError, read_project_version
 
-            match = re.search(r'version\s*=\s*["\']([^"\']+)["\']', content)
-            if match:
-                return match.group(1), "setup.py"
+    try:
+        version, file_type = read_project_version()
+    except ProjectNotFoundError:
+        console.print("[red]❌ 未找到 Python 项目配置文件 (pyproject.toml 或 setup.py)[/red]")
+        console.print("[dim]提示：这是一个 Python 版本管理工具，请在 Python 项目中使用[/dim]")
+        sys.exit(1)
 
-    console.print("[red]❌ 未找到 Python 项目配置文件 (pyproject.toml 或 setup.py)[/red]")
-    console.print("[dim]提示：这是一个 Python 版本管理工具，请在 Python 项目中使用[/dim]")
-    sys.exit(1)
+    if file_type == SETUP_PY:
+        console.print("[yellow]⚠️  找到 setup.py, 但建议使用 pyproject.toml[/yellow]")
+    return version, file_type
 
 
 def update_version_file(new_version: str, file_type: str) -> None:
     """更新版本文件。"""
-    if file_type == "pyproject.toml":
-        with open("pyproject.toml") as f:
-            doc = tomlkit.load(f)
-
-        # 更新相应部分的版本
-        project = doc.get("project")
-        if isinstance(project, dict | items.Table) and "version" in project:
-            project["version"] = new_version
-        else:
-            tool = doc.get("tool")
-            if isinstance(tool, dict | items.Table):
-                poetry = tool.get("poetry")
-                if isinstance(poetry, dict | items.Table) and "version" in poetry:
-                    poetry["version"] = new_version
+    from .project import write_project_version
 
-        # 使用 tomlkit.dumps 保留原始格式
-        with open("pyproject.toml", "w") as f:
-            f.write(tomlkit.dumps(doc))
+    write_project_version(".", new_version, file_type)
 
-    elif file_type == "setup.py":
-        # 简单的替换（实际可能需要更复杂的处理）
-        with open("setup.py") as f:
-            content = f.read()
-        import re
 
-        content = re.sub(r'version\s*=\s*["\'][^"\']+["\']', f'version="{new_version}"', content)
-        with open("setup.py", "w") as f:
-            f.write(content)
+def get_current_branch() -> str:
+    """获取当前 Git 分支（直接读取 .git，不在 Git 仓库中时交给 git 命令报错）。"""
+    from .errors import NotAGitRepositoryError
+    from .gitrepo import GitRepository
 
+    try:
+        return GitRepository.discover().current_branch()
+    except NotAGitRepositoryError:
+        return exec_command(["git", "branch", "--show-current"], silent=True)
+
+
+def _print_dirty_entries(entries: Iterable[str], truncated: bool) -> None:
+    """输出工作区的更改（只输出前几条）。"""
+    from rich.markup import escape
+
+    console.print("[yellow]⚠️  工作区有未提交的更改:[/yellow]")
+    for entry in entries:
+        console.print(escape(entry))
+    if truncated:
+        console.print("[dim]  ...（只显示前几条更改）[/dim]")
 
-def get_current_branch() -> str:
-    """获取当前 Git 分支。"""
-    return exec_command("git branch --show-current", silent=True)
 
+def check_git_status(untracked: str = "normal", pathspecs: tuple[str, ...] = ()) -> bool:
+    """检查工作区是否干净（流式读取 git status，找到足够的更改后立即停止）。"""
+    from .preflight import scan_worktree
 
-def check_git_status() -> bool:
-    """检查工作区是否干净。"""
-    status = exec_command("git status --porcelain", silent=True)
-    if status:
-        console.print("[yellow]⚠️  工作区有未提交的更改:[/yellow]")
-        console.print(status)
+    status = scan_worktree(untracked=untracked, pathspecs=pathspecs)
+    if not status.clean:
+        _print_dirty_entries(status.entries, status.truncated)
         return False
     return True
 
 
-def run_version_bump(dry_run=False):
-    """执行版本升级的核心逻辑。"""
+def _print_preflight_result(name: str, value: Any) -> None:
+    """逐项显示发布前检查的结果。"""
+    from .project import SETUP_PY
+
+    if name == "version":
+        version, file_type = value
+        console.print(f"[cyan]📦 当前版本: {version}[/cyan]")
+        console.print(f"[cyan]📄 配置文件: {file_type}[/cyan]")
+        if file_type == SETUP_PY:
+            console.print("[yellow]⚠️  找到 setup.py, 但建议使用 pyproject.toml[/yellow]")
+    elif name == "branch":
+        console.print(f"[cyan]🌿 当前分支: {value}[/cyan]")
+
+
+def run_preflight_checks(untracked: str = "normal", pathspecs: tuple[str, ...] = ()) -> "PreflightResult":
+    """并发执行发布前检查并逐项显示结果，任一检查失败时输出原因并退出。"""
+    from .errors import CommandError, DirtyWorktreeError, NotAGitRepositoryError, ProjectNotFoundError
+    from .preflight import preflight
+
+    try:
+        return preflight(on_result=_print_preflight_result, untracked=untracked, pathspecs=pathspecs)
+    except ProjectNotFoundError:
+        console.print("[red]❌ 未找到 Python 项目配置文件 (pyproject.toml 或 setup.py)[/red]")
+        console.print("[dim]提示：这是一个 Python 版本管理工具，请在 Python 项目中使用[/dim]")
+        sys.exit(1)
+    except NotAGitRepositoryError:
+        console.print("[red]❌ 当前目录不在 Git 仓库中[/red]")
+        sys.exit(1)
+    except DirtyWorktreeError as e:
+        _print_dirty_entries(e.status.splitlines(), e.truncated)
+        console.print("[red]✖ 发布已取消：工作区有未提交的更改[/red]")
+        sys.exit(0)
+    except CommandError as e:
+        console.print(f"[red]❌ 命令执行失败: {' '.join(e.argv)}[/red]")
+        console.print(e.stderr)
+        sys.exit(1)
+
+
+def run_version_bump(
+    dry_run: bool = False,
+    release_type: ReleaseType | None = None,
+    prerelease_type: PrereleaseType | None = None,
+    assume_yes: bool = False,
+    plumbing: bool = False,
+    untracked: str = "normal",
+    scope: str = "repo",
+    auto: bool = False,
+    changelog: bool = False,
+):
+    """执行版本升级的核心逻辑。
+
+    Args:
+        dry_run: 干跑模式，只显示将要执行的操作
+        release_type: 版本号递增类型；与 prerelease_type 任一给出时不再询问发布类型和递增类型
+        prerelease_type: 预发布类型，None 表示正式版本
+        assume_yes: 跳过非主分支确认和执行前确认
+        plumbing: 使用 git 底层命令提交和打标签，不刷新整个索引；仓库配置了提交钩子或签名时拒绝执行
+        untracked: 工作区检查的未跟踪文件模式（normal / all / no）
+        scope: 工作区检查的范围，repo 为整个仓库，project 只检查当前项目目录
+        auto: 根据上一个版本标签之后的提交（Conventional Commits）自动选择递增类型
+        changelog: 把本次发布的更新日志插入到 CHANGELOG.md 开头，与版本号一起提交
+    """
+    from rich.panel import Panel
+    from rich.table import Table
+
+    from .journal import ReleaseJournal
+
+    journal: ReleaseJournal | None = None
+
+    def record(*steps: str, commit_sha: str | None = None) -> None:
+        """记录已完成的发布步骤（干跑模式下没有发布日志）。"""
+        if journal is not None:
+            journal.complete(*steps, commit_sha=commit_sha)
+
     try:
         console.print(Panel.fit("🔢 版本号管理工具", style="bold blue"))
         console.print()
 
-        # 检查当前状态
-        current_version, config_file = get_current_version()
-        current_branch = get_current_branch()
+        # 上一次发布被中断时需要先继续或回滚
+        if not dry_run:
+            _ensure_no_release_in_progress()
 
-        console.print(f"[cyan]📦 当前版本: {current_version}[/cyan]")
-        console.print(f"[cyan]📄 配置文件: {config_file}[/cyan]")
-        console.print(f"[cyan]🌿 当前分支: {current_branch}[/cyan]")
+        # 检查当前状态（读取版本号、分支、工作区状态并发执行）
+        checks = run_preflight_checks(untracked, (".",) if scope == "project" else ())
+        current_version, config_file, current_branch = checks.version, checks.config_file, checks.branch
 
         # 如果是干跑模式，显示明显的提示
         if dry_run:
@@ -161,14 +312,21 @@ def run_version_bump(dry_run=False):
         # 检查分支
         if current_branch not in ["main", "master"]:
             console.print("[yellow]⚠️  警告: 不在主分支上[/yellow]")
-            if not confirm("确定要在非主分支上发布吗？", default=False):
+            if not assume_yes and not confirm("确定要在非主分支上发布吗？", default=False):
                 console.print("[red]✖ 发布已取消[/red]")
                 sys.exit(0)
 
-        # 检查工作区
-        if not check_git_status():
-            console.print("[red]✖ 发布已取消：工作区有未提交的更改[/red]")
-            sys.exit(0)
+        # --plumbing 不执行提交钩子、不签名：仓库配置了这些功能时拒绝，而不是悄悄跳过
+        if plumbing:
+            from .errors import PlumbingNotAllowedError
+            from .gitrepo import GitRepository
+            from .plumbing import ensure_plumbing_allowed
+
+            try:
+                ensure_plumbing_allowed(GitRepository.discover())
+            except PlumbingNotAllowedError as e:
+                console.print(f"[red]❌ {e}[/red]")
+                sys.exit(1)
 
         # 创建版本管理器
         version_manager = VersionManager()
@@ -179,50 +337,38 @@ def run_version_bump(dry_run=False):
             console.print(f"[red]❌ 无效的版本号格式: {current_version}[/red]")
             sys.exit(1)
 
-        # 构建发布类型选项
-        choices = ["正式版本 (Production)"]
-
-        # Dev 版本只能在当前是 dev 版本或者没有预发布版本时选择
-        if not version_parts.prerelease_type or version_parts.prerelease_type == "dev":
-            choices.append("Dev 版本")
+        # --auto：根据上一个版本标签之后的提交选择递增类型
+        if auto:
+            from .conventional import detect_release_type
+            from .gitrepo import GitRepository
 
-        if not version_parts.prerelease_type or version_parts.prerelease_type in ["dev", "a"]:
-            choices.append("Alpha 版本")
+            decision = detect_release_type(GitRepository.discover(), current_version)
+            since = f"标签 {decision.base}" if decision.base else "仓库创建"
+            if decision.release_type is None:
+                console.print(f"[yellow]自{since}以来没有需要发布的提交（feat / fix / perf 或破坏性变更）[/yellow]")
+                sys.exit(0)
+            release_type = decision.release_type
+            console.print(f"[cyan]🔍 根据{since}以来的提交自动选择: {release_type}[/cyan]")
+            console.print(f"[dim]  {decision.reason}{'（缓存）' if decision.cached else ''}[/dim]")
 
-        if not version_parts.prerelease_type or version_parts.prerelease_type in ["dev", "a", "b"]:
-            choices.append("Beta 版本")
+        # 通过 --type / --pre 指定时直接使用，不再询问（--type 默认为 patch）
+        interactive = release_type is None and prerelease_type is None
+        version_bump: ReleaseType = release_type or "patch"
 
-        if not version_parts.prerelease_type or version_parts.prerelease_type in ["dev", "a", "b", "rc"]:
-            choices.append("RC 版本")
+        if interactive:
+            # 构建发布类型选项（各状态可选的类型见 OFFERED_TARGETS）
+            choices = [RELEASE_CHOICE_LABELS[target] for target in OFFERED_TARGETS[version_parts.prerelease_type]]
 
-        # Post 版本只能从正式版本或者已有的 post 版本创建
-        if not version_parts.prerelease_type or version_parts.prerelease_type == "post":
-            choices.append("Post 版本")
+            # 选择发布类型
+            release_choice = list_input(message="选择发布类型", choices=choices, default=choices[0])
 
-        # 选择发布类型
-        release_choice = list_input(message="选择发布类型", choices=choices, default=choices[0])
+            if not release_choice:
+                console.print("[red]✖ 发布已取消[/red]")
+                sys.exit(0)
 
-        if not release_choice:
-            console.print("[red]✖ 发布已取消[/red]")
-            sys.exit(0)
-
-        # 解析选择
-        is_prerelease = "正式版本" not in release_choice
-        prerelease_type = None
-        if is_prerelease:
-            if "Dev" in release_choice:
-                prerelease_type = "dev"
-            elif "Alpha" in release_choice:
-                prerelease_type = "a"
-            elif "Beta" in release_choice:
-                prerelease_type = "b"
-            elif "RC" in release_choice:
-                prerelease_type = "rc"
-            elif "Post" in release_choice:
-                prerelease_type = "post"
-
-        # 选择版本号类型
-        version_bump = "patch"
+            # 解析选择
+            prerelease_type = _RELEASE_CHOICE_TYPES[release_choice]
+        is_prerelease = prerelease_type is not None
 
         if version_parts.prerelease_type:
             # 当前是预发布版本
@@ -236,7 +382,7 @@ def run_version_bump(dry_run=False):
                 )
             else:
                 console.print(f"[yellow]当前是 {version_parts.prerelease_type} 版本，将发布为正式版本[/yellow]")
-        else:
+        elif interactive:
             # 需要选择版本递增类型
             major, minor, patch = version_parts.major, version_parts.minor, version_parts.patch
 
@@ -262,9 +408,48 @@ def run_version_bump(dry_run=False):
                 version_bump = "major"
 
         # 计算新版本号
-        new_version = version_manager.get_next_version(current_version, version_bump, is_prerelease, prerelease_type)
+        try:
+            new_version = version_manager.get_next_version(version_parts, version_bump, is_prerelease, prerelease_type)
+        except ValueError as e:
+            console.print(f"[red]❌ {e}[/red]")
+            sys.exit(1)
+
+        # 在修改任何文件之前检查标签是否已经存在（并行的发布分支可能已经发布过同一个 rcN）
+        from .errors import TagExistsError
+        from .gitrepo import GitRepository
+        from .tagindex import next_free_version
+
+        # 干跑时在内存中建立标签索引，不写入 Git 目录
+        try:
+            free_version = next_free_version(GitRepository.discover(), new_version, persist=not dry_run)
+        except TagExistsError as e:
+            console.print(f"[red]❌ {e}[/red]")
+            sys.exit(1)
+        if free_version != new_version:
+            # 不能悄悄发布一个没有选过的版本号：--yes 时没有人确认，直接失败
+            if assume_yes:
+                console.print(
+                    f"[red]❌ {TagExistsError(f'v{new_version}')}（可用的下一个版本号是 {free_version}）[/red]"
+                )
+                sys.exit(1)
+            console.print(f"[yellow]标签 v{new_version} 已存在，下一个可用的版本号是 {free_version}[/yellow]")
+            if not dry_run and not confirm(f"改为发布 {free_version}？", default=True):
+                console.print("[red]✖ 发布已取消[/red]")
+                sys.exit(0)
+            new_version = free_version
         tag_name = f"v{new_version}"
 
+        # [tool.bumpster] version-files 中的文件先在内存中完成替换，任何一个失败时不修改任何文件
+        from .errors import VersionTargetError
+        from .targets import load_version_targets, prepare_version_targets, write_version_edits
+
+        try:
+            version_edits = prepare_version_targets(".", load_version_targets(), new_version)
+        except VersionTargetError as e:
+            console.print(f"[red]❌ {e}[/red]")
+            sys.exit(1)
+        version_files = [config_file, *(path for path, _ in version_edits)]
+
         # 显示执行计划
         console.print()
         console.print(Panel.fit("📋 执行计划", style="bold blue"))
@@ -284,7 +469,8 @@ def run_version_bump(dry_run=False):
 
         console.print("[bold blue]📝 执行步骤:[/bold blue]")
         steps = [
-            f"更新版本号到 {new_version}",
+            f"更新版本号到 {new_version} ({', '.join(version_files)})",
+            *(["生成更新日志并写入 CHANGELOG.md"] if changelog else []),
             f'提交版本更新 (commit message: "chore: release {new_version}")',
             f"创建 Git 标签 {tag_name}",
             "推送提交和标签到远程仓库 (git push --follow-tags)",
@@ -297,11 +483,39 @@ def run_version_bump(dry_run=False):
         console.print(f'\n[dim]提交信息预览: "chore: release {new_version}"[/dim]')
 
         # 确认执行
-        if not dry_run:
+        if not dry_run and not assume_yes:
             if not confirm("确认执行以上步骤？", default=True):
                 console.print("[red]✖ 发布已取消[/red]")
                 sys.exit(0)
 
+        # 要提交的文件：如果存在 uv.lock，也添加它（因为版本号变化会更新 lock 文件）；一次 git add 添加所有文件
+        has_uv_lock = config_file == "pyproject.toml" and checks.has_uv_lock
+        files = [*version_files, *(["uv.lock"] if has_uv_lock else []), *(["CHANGELOG.md"] if changelog else [])]
+        push = not os.environ.get("BUMP_VERSION_SKIP_PUSH")
+
+        # 修改任何文件之前记录发布计划，中断后可以用 bump --resume 继续、bump --abort 回滚
+        if not dry_run:
+            from .gitrepo import GitRepository
+
+            journal = ReleaseJournal.begin(
+                GitRepository.discover(),
+                ".",
+                old_version=current_version,
+                new_version=new_version,
+                tag=tag_name,
+                config_file=config_file,
+                files=files,
+                steps=[
+                    "write",
+                    *(["lock"] if has_uv_lock else []),
+                    *(["changelog"] if changelog else []),
+                    "commit",
+                    "tag",
+                    *(["push"] if push else []),
+                ],
+                plumbing=plumbing,
+            )
+
         # 执行版本更新流程
         console.print()
         console.print("[bold green]🏃 开始执行版本更新...[/bold green]")
@@ -310,53 +524,99 @@ def run_version_bump(dry_run=False):
         console.print(f"[cyan]📦 {'干跑: ' if dry_run else ''}更新版本号到 {new_version}...[/cyan]")
         if not dry_run:
             update_version_file(new_version, config_file)
+            write_version_edits(".", version_edits)
+            record("write")
         else:
-            console.print(f"[dim]  将更新 {config_file} 中的版本号[/dim]")
+            console.print(f"[dim]  将更新 {', '.join(version_files)} 中的版本号[/dim]")
+
+        # 如果是 pyproject.toml 且存在 uv.lock，直接更新其中根项目的版本号，无法直接改写时才运行 uv
+        if has_uv_lock:
+            from .lockfile import LOCK_COMMANDS, UV_LOCK, stamp_uv_lock
 
-        # 如果是 pyproject.toml 且存在 uv.lock，运行 uv sync 更新 lock 文件
-        if config_file == "pyproject.toml" and Path("uv.lock").exists():
             if not dry_run:
                 console.print("[dim]正在更新 uv.lock...[/dim]")
-                exec_command("uv sync --quiet", silent=True)
+                if not stamp_uv_lock(UV_LOCK, new_version):
+                    console.print(f"[dim]  无法直接更新，改为运行 {shlex.join(LOCK_COMMANDS[UV_LOCK])}[/dim]")
+                    exec_command(LOCK_COMMANDS[UV_LOCK], silent=True)
+                record("lock")
+            else:
+                console.print(
+                    f"[dim]  将更新 uv.lock 中的项目版本号（必要时运行 {shlex.join(LOCK_COMMANDS[UV_LOCK])}）[/dim]"
+                )
+
+        # 生成上一个版本到 HEAD 之间的更新日志，插入到 CHANGELOG.md 开头
+        if changelog:
+            from datetime import date
+
+            from .changelog import CHANGELOG, prepend_changelog, release_notes
+            from .gitrepo import GitRepository
+
+            console.print(f"\n[cyan]📝 {'干跑: ' if dry_run else ''}生成更新日志...[/cyan]")
+            notes = release_notes(GitRepository.discover(), current_version, f"{tag_name} ({date.today().isoformat()})")
+            console.print(f"[dim]  {notes.commits} 个提交（新解析 {notes.classified} 个）[/dim]")
+            if not dry_run:
+                prepend_changelog(CHANGELOG, notes.text)
+                record("changelog")
             else:
-                console.print("[dim]  uv sync --quiet[/dim]")
+                console.print(f"[dim]  将插入到 {CHANGELOG} 开头:[/dim]")
+                console.print(notes.text, markup=False, highlight=False)
 
         # 2. 提交更改
         console.print(f"\n[cyan]💾 {'干跑: ' if dry_run else ''}提交版本更新...[/cyan]")
-        if not dry_run:
-            if config_file == "pyproject.toml":
-                exec_command("git add pyproject.toml")
-                # 如果存在 uv.lock，也添加它（因为版本号变化会更新 lock 文件）
-                if Path("uv.lock").exists():
-                    exec_command("git add uv.lock")
-            elif config_file == "setup.py":
-                exec_command("git add setup.py")
-
-            exec_command(f'git commit -m "chore: release {new_version}"')
-        else:
-            if config_file == "pyproject.toml":
-                console.print("[dim]  git add pyproject.toml[/dim]")
-                if Path("uv.lock").exists():
-                    console.print("[dim]  git add uv.lock[/dim]")
-            elif config_file == "setup.py":
-                console.print("[dim]  git add setup.py[/dim]")
-            console.print(f'[dim]  git commit -m "chore: release {new_version}"[/dim]')
-
-        # 3. 创建标签
-        console.print(f"\n[cyan]🏷️  {'干跑: ' if dry_run else ''}创建标签 {tag_name}...[/cyan]")
-        if not dry_run:
-            exec_command(f'git tag -a {tag_name} -m "Release {new_version}"')
+        add_argv = ["git", "add", *files]
+        commit_argv = ["git", "commit", "-m", f"chore: release {new_version}"]
+        tag_argv = ["git", "tag", "-a", tag_name, "-m", f"Release {new_version}"]
+        if plumbing:
+            # 不经过索引，用底层命令同时创建提交和标签（见 plumbing 模块）
+            if not dry_run:
+                from .gitrepo import GitRepository
+                from .plumbing import commit_files
+
+                commit = commit_files(
+                    GitRepository.discover(),
+                    files,
+                    f"chore: release {new_version}",
+                    tag=tag_name,
+                    tag_message=f"Release {new_version}",
+                    root=".",
+                )
+                record("commit", "tag", commit_sha=commit.commit_sha)
+                console.print(f"[dim]  提交 {commit.commit_sha[:12]}，标签 {tag_name}[/dim]")
+            else:
+                console.print(f"[dim]  git hash-object -w --stdin-paths ({' '.join(files)})[/dim]")
+                console.print("[dim]  git mktree --batch / git commit-tree / git mktag[/dim]")
+                console.print("[dim]  git update-ref --stdin / git update-index --cacheinfo[/dim]")
+        elif not dry_run:
+            from .gitrepo import GitRepository
+
+            exec_command(add_argv)
+            exec_command(commit_argv)
+            record("commit", commit_sha=GitRepository.discover().head_commit())
         else:
-            console.print(f'[dim]  git tag -a {tag_name} -m "Release {new_version}"[/dim]')
+            console.print(f"[dim]  {shlex.join(add_argv)}[/dim]")
+            console.print(f"[dim]  {shlex.join(commit_argv)}[/dim]")
+
+        # 3. 创建标签（底层命令提交时已经创建）
+        if not plumbing:
+            console.print(f"\n[cyan]🏷️  {'干跑: ' if dry_run else ''}创建标签 {tag_name}...[/cyan]")
+            if not dry_run:
+                exec_command(tag_argv)
+                record("tag")
+            else:
+                console.print(f"[dim]  {shlex.join(tag_argv)}[/dim]")
 
         # 4. 推送提交和标签
-        if not os.environ.get("BUMP_VERSION_SKIP_PUSH"):
+        if push:
             console.print(f"\n[cyan]📤 {'干跑: ' if dry_run else ''}推送提交和标签到远程仓库...[/cyan]")
             if not dry_run:
-                exec_command("git push --follow-tags")
+                exec_command(["git", "push", "--follow-tags"])
+                record("push")
             else:
                 console.print("[dim]  git push --follow-tags[/dim]")
 
+        if journal is not None:
+            journal.finish()
+
         console.print()
         if dry_run:
             console.print("[bold yellow]🎭 干跑模式完成！[/bold yellow]")
@@ -371,28 +631,171 @@ def run_version_bump(dry_run=False):
             console.print("  1. 构建包: uv build")
             console.print("  2. 发布: uv publish")
 
+        if os.environ.get("BUMP_TRACE"):
+            counts = ", ".join(f"{name}: {count}" for name, count in sorted(commands.process_counts().items()))
+            console.print(f"\n[dim]子进程: {commands.process_count()} ({counts})[/dim]")
+
+    except SystemExit:
+        # 命令执行失败（exec_command 直接退出）
+        _print_resume_hint(journal)
+        raise
+
     except Exception as e:
         console.print("\n[red]❌ 版本更新过程中出现错误[/red]")
         console.print(str(e))
+        _print_resume_hint(journal)
         sys.exit(1)
 
     except KeyboardInterrupt:
         console.print("\n[yellow]⚠️  用户取消操作[/yellow]")
+        _print_resume_hint(journal)
         sys.exit(0)
 
 
+def _ensure_no_release_in_progress() -> None:
+    """存在未完成的发布时提示继续或回滚并退出；不在 Git 仓库中时交给发布前检查报告。"""
+    from .errors import NotAGitRepositoryError, ReleaseInProgressError
+    from .gitrepo import GitRepository
+    from .journal import ReleaseJournal
+
+    try:
+        ReleaseJournal.ensure_idle(GitRepository.discover())
+    except NotAGitRepositoryError:
+        pass
+    except ReleaseInProgressError as e:
+        console.print(f"[red]❌ {e}[/red]")
+        sys.exit(1)
+
+
+def _print_resume_hint(journal: "ReleaseJournal | None") -> None:
+    """发布中断后提示如何继续或回滚。"""
+    if journal is None or not journal.path.exists() or not journal.pending:
+        return
+    from .journal import STEP_LABELS
+
+    console.print(f"\n[yellow]⏸️  发布在「{STEP_LABELS[journal.pending[0]]}」步骤中断，已完成的步骤已记录[/yellow]")
+    console.print("[dim]运行 bump --resume 从中断的步骤继续，或运行 bump --abort 回滚[/dim]")
+
+
+def run_resume() -> None:
+    """继续被中断的发布：从第一个未完成的步骤开始，已完成的步骤不会重做。"""
+    from .api import resume_release
+    from .errors import BumpError
+    from .gitrepo import GitRepository
+    from .journal import STEP_LABELS, ReleaseJournal
+
+    try:
+        journal = ReleaseJournal.load(GitRepository.discover())
+    except BumpError as e:
+        console.print(f"[red]❌ {e}[/red]")
+        sys.exit(1)
+
+    console.print(f"[cyan]⏯️  继续发布 {journal.old_version} → {journal.new_version}[/cyan]")
+    for step in journal.steps:
+        mark = "✓" if step in journal.completed else "·"
+        console.print(f"[dim]  {mark} {STEP_LABELS[step]}[/dim]")
+
+    try:
+        result = resume_release(journal.root)
+    except BumpError as e:
+        console.print(f"\n[red]❌ {e}[/red]")
+        console.print("[dim]解决问题后再次运行 bump --resume，或运行 bump --abort 回滚[/dim]")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]⚠️  用户取消操作[/yellow]")
+        console.print("[dim]运行 bump --resume 从中断的步骤继续，或运行 bump --abort 回滚[/dim]")
+        sys.exit(0)
+
+    console.print(f"\n[bold green]✅ 版本 {result.new_version} 发布完成！[/bold green]")
+    if not result.pushed:
+        console.print("[dim]未推送到远程仓库（BUMP_VERSION_SKIP_PUSH）[/dim]")
+
+
+def run_abort() -> None:
+    """回滚被中断的发布：删除本次创建的标签，退回发布前的提交并恢复被修改的文件。"""
+    from .api import abort_release
+    from .errors import BumpError
+
+    try:
+        journal = abort_release()
+    except BumpError as e:
+        console.print(f"[red]❌ {e}[/red]")
+        sys.exit(1)
+
+    console.print(f"[green]↩️  已回滚发布 {journal.tag}，版本号恢复为 {journal.old_version}[/green]")
+    if "push" in journal.steps and "tag" in journal.completed:
+        console.print(f"[yellow]⚠️  如果推送已经部分完成，请手动删除远程仓库中的标签 {journal.tag}[/yellow]")
+
+
 @click.group(invoke_without_command=True)
 @click.pass_context
-@click.version_option(version=get_package_version(), prog_name="bump")
+@click.option(
+    "--version",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=_print_version,
+    help="Show the version and exit.",
+)
 @click.option("--dry-run", is_flag=True, help="显示将要执行的操作但不实际执行（无副作用）")
-def main(ctx, dry_run):
+@click.option(
+    "--type",
+    "release_type",
+    type=click.Choice(RELEASE_TYPES),
+    help="版本号递增类型，指定后不再询问（与 --pre 任一给出时默认 patch）",
+)
+@click.option("--pre", "prerelease_type", type=click.Choice(PRERELEASE_TYPES), help="预发布类型，指定后不再询问")
+@click.option(
+    "--auto",
+    is_flag=True,
+    help="根据上一个版本标签之后的提交（Conventional Commits）自动选择递增类型，不能与 --type 同时使用",
+)
+@click.option("--changelog", is_flag=True, help="把本次发布的更新日志插入到 CHANGELOG.md 开头，与版本号一起提交")
+@click.option("--resume", is_flag=True, help="从中断的步骤继续上一次未完成的发布（已完成的步骤不会重做）")
+@click.option("--abort", is_flag=True, help="回滚上一次未完成的发布（删除标签、退回提交、恢复文件）")
+@click.option("-y", "--yes", "assume_yes", is_flag=True, help="跳过所有确认（非主分支确认与执行前确认）")
+@click.option(
+    "--plumbing",
+    is_flag=True,
+    help="用 git 底层命令提交和打标签，不刷新整个索引（适用于超大仓库）；不执行提交钩子、不签名，"
+    "仓库配置了钩子或 commit.gpgsign / tag.gpgsign 时拒绝执行",
+)
+@click.option(
+    "--untracked-files",
+    "untracked",
+    # 与 preflight.UNTRACKED_MODES 一致；这里直接写出，启动时不导入 preflight
+    type=click.Choice(["normal", "all", "no"]),
+    default="normal",
+    show_default=True,
+    help="工作区检查如何对待未跟踪文件（no 表示忽略）",
+)
+@click.option(
+    "--scope",
+    type=click.Choice(["repo", "project"]),
+    default="repo",
+    show_default=True,
+    help="工作区检查的范围：整个仓库或只检查当前项目目录（monorepo）",
+)
+def main(
+    ctx, dry_run, release_type, prerelease_type, auto, changelog, resume, abort, assume_yes, plumbing, untracked, scope
+):
     """Python 项目版本号管理工具 - 自动更新版本号并创建 Git 标签
 
     \b
     使用方法:
       bump                          运行交互式版本管理（默认）
       bump --dry-run                干跑模式，显示将要执行的操作但不实际执行
+      bump --type minor --yes       非交互式发布（适用于 CI）
+      bump --auto --yes             根据提交信息自动选择递增类型
+      bump --resume                 继续上一次被中断的发布
+      bump --abort                  回滚上一次被中断的发布
       bump validate                 验证版本号
+      bump next                     计算下一个版本号（非交互式）
+      bump sort                     按 PEP 440 顺序排序版本号流
+      bump latest                   输出版本号流中最大的版本号
+      bump match                    筛选满足约束（如 "<2,>=1.4"）的版本号
+      bump changelog                输出上一个版本之后的更新日志（Markdown）
+      bump serve                    启动常驻服务，加速频繁的版本查询
       bump-py                       别名命令
 
     \b
@@ -409,7 +812,13 @@ def main(ctx, dry_run):
     示例:
       bump                               # 交互式版本管理
       bump --dry-run                     # 干跑模式，预览操作
+      bump --type minor --pre rc --yes   # 非交互式发布 RC 版本
       bump validate 1.0.0                # 验证版本号
+      bump validate --stdin < list.txt   # 批量验证（NDJSON 输出）
+      bump next --matrix                 # 输出所有候选版本（JSON）
+      bump sort < versions.txt           # 按 PEP 440 顺序排序
+      git tag | bump latest --stable     # 最新的稳定版本
+      git tag | bump match "<2,>=1.4"    # 满足约束的版本号
       bump-py validate 1.0.0a0           # 验证 Alpha 版本
 
     \b
@@ -424,17 +833,54 @@ def main(ctx, dry_run):
     \b
     环境变量:
       BUMP_VERSION_SKIP_PUSH  设置后跳过 git push
+      BUMP_SOCKET             常驻服务的套接字路径
+      BUMP_NO_DAEMON          设置后不使用常驻服务
+      BUMP_TRACE              设置后在发布结束时输出启动的子进程数
 
     更多信息请访问: https://github.com/yarnovo/bumpster-py
     """
     # 如果没有子命令，执行默认的版本升级
     if ctx.invoked_subcommand is None:
-        run_version_bump(dry_run=dry_run)
+        if auto and release_type:
+            raise click.UsageError("--auto 与 --type 不能同时使用")
+        if resume and abort:
+            raise click.UsageError("--resume 与 --abort 不能同时使用")
+        if resume:
+            run_resume()
+            return
+        if abort:
+            run_abort()
+            return
+        run_version_bump(
+            dry_run,
+            release_type,
+            prerelease_type,
+            assume_yes,
+            plumbing=plumbing,
+            untracked=untracked,
+            scope=scope,
+            auto=auto,
+            changelog=changelog,
+        )
 
 
 @main.command()
-@click.argument("version")
-def validate(version):
+@click.argument("version", required=False)
+@click.option("--stdin", "from_stdin", is_flag=True, help="从标准输入逐行读取版本号（批量模式，输出 NDJSON）")
+@click.option(
+    "--from-file",
+    type=click.File("r", encoding="utf-8"),
+    help="从文件逐行读取版本号（批量模式，输出 NDJSON）",
+)
+@click.option("--workers", type=click.IntRange(min=1), default=None, help="批量模式的并行进程数（默认 CPU 核数）")
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    help="批量模式下每个任务块的版本号数量",
+)
+def validate(version, from_stdin, from_file, workers, chunk_size):
     """验证版本号是否符合 PEP 440 规范
 
     \b
@@ -445,10 +891,17 @@ def validate(version):
       bump validate 1.0.0a0              ✅ 有效的 Alpha 版本
       bump validate invalid              ❌ 无效版本
 
+    \b
+    批量模式:
+      bump validate --stdin < versions.txt
+      bump validate --from-file versions.txt --workers 8
+      每行输出一条 JSON 结果（input / valid / normalized），
+      汇总统计输出到标准错误
+
     \b
     退出码:
-      0  版本号有效
-      1  版本号无效
+      0  版本号有效（批量模式下全部有效）
+      1  版本号无效（批量模式下存在无效版本号）
 
     \b
     在 CI/CD 中使用:
@@ -459,10 +912,396 @@ def validate(version):
         exit 1
       fi
     """
-    if validate_version(version):
-        sys.exit(0)
+    if from_stdin and from_file:
+        raise click.UsageError("--stdin 与 --from-file 不能同时使用")
+
+    if from_stdin or from_file:
+        if version:
+            raise click.UsageError("批量模式下不能同时指定 VERSION 参数")
+        summary = validate_bulk(sys.stdin if from_stdin else from_file, workers=workers, chunk_size=chunk_size)
+        sys.exit(0 if summary.invalid == 0 else 1)
+
+    if version is None:
+        raise click.UsageError("请指定要验证的版本号，或使用 --stdin / --from-file 进行批量验证")
+
+    result = _daemon_call("validate", version=version)
+    valid = validate_version(version) if result is None else _echo_validation(version, result["valid"])
+    sys.exit(0 if valid else 1)
+
+
+def _daemon_call(method: str, **params: Any) -> Any | None:
+    """常驻服务可用时通过服务计算；服务不可用或返回错误时返回 None，由调用方在本地计算（并报告错误）。"""
+    from .daemon import DaemonError, try_call
+
+    try:
+        return try_call(method, **params)
+    except DaemonError:
+        return None
+
+
+@main.command(name="next")
+@click.argument("version", required=False)
+@click.option("--stdin", "from_stdin", is_flag=True, help="从标准输入逐行读取多个版本号")
+@click.option("--matrix", is_flag=True, help="输出所有发布操作对应的候选版本（JSON）")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "ndjson"]),
+    default="json",
+    show_default=True,
+    help="--matrix 的输出格式",
+)
+@click.option(
+    "--type",
+    "release_type",
+    type=click.Choice(RELEASE_TYPES),
+    default="patch",
+    show_default=True,
+    help="版本号递增类型（非 --matrix 模式）",
+)
+@click.option("--pre", "prerelease_type", type=click.Choice(PRERELEASE_TYPES), help="预发布类型（非 --matrix 模式）")
+def next_version(version, from_stdin, matrix, output_format, release_type, prerelease_type):
+    """计算下一个版本号（非交互式）
+
+    \b
+    版本号来源（按优先级）:
+      VERSION 参数 → --stdin 逐行读取 → 当前项目的配置文件
+
+    \b
+    示例:
+      bump next 1.0.0 --type minor             1.1.0
+      bump next 1.0.0 --pre a                  1.0.1a0
+      bump next --matrix                       当前项目所有候选版本（JSON）
+      bump next --matrix 1.0.0rc1              指定版本的所有候选版本
+      bump next --matrix --stdin --format ndjson < versions.txt
+
+    \b
+    --matrix 输出的每个候选项包含:
+      release_type     版本号递增类型（与之无关时为 null）
+      prerelease_type  预发布类型（正式版本为 null）
+      version / error  新版本号，或不允许该操作的原因
+      offered          交互式发布流程是否提供该选项
+
+    \b
+    退出码:
+      0  全部计算成功
+      1  存在无效的版本号（或非 --matrix 模式下不允许的操作）
+    """
+    if version and from_stdin:
+        raise click.UsageError("不能同时指定 VERSION 参数和 --stdin")
+
+    if version:
+        versions = iter([version])
+    elif from_stdin:
+        versions = iter_versions(sys.stdin)
     else:
+        project = _daemon_call("read-project-version", root=os.getcwd())
+        versions = iter([project["version"] if project else get_current_version()[0]])
+
+    version_manager = VersionManager()
+    failed = False
+
+    if not matrix:
+        for current in versions:
+            if not from_stdin:
+                result = _daemon_call(
+                    "next", version=current, release_type=release_type, prerelease_type=prerelease_type
+                )
+                if result is not None:
+                    click.echo(result["version"])
+                    continue
+            try:
+                click.echo(
+                    version_manager.get_next_version(
+                        current, release_type, prerelease_type is not None, prerelease_type
+                    )
+                )
+            except ValueError as e:
+                click.echo(f"❌ {current}: {e}", err=True)
+                failed = True
+        sys.exit(1 if failed else 0)
+
+    documents = (build_next_matrix(version_manager, current) for current in versions)
+    if output_format == "ndjson":
+        for document in documents:
+            failed = failed or not document["valid"]
+            click.echo(json.dumps(document, ensure_ascii=False))
+    else:
+        collected = list(documents)
+        failed = not all(document["valid"] for document in collected)
+        output = collected if from_stdin else collected[0]
+        click.echo(json.dumps(output, ensure_ascii=False, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+def _report_invalid(version: str) -> None:
+    """把无效版本号输出到标准错误。"""
+    click.echo(f"❌ 无效的版本号: {version}", err=True)
+
+
+def _memory_size(ctx, param, value: str) -> int:
+    """click 回调：解析 --buffer-size。"""
+    try:
+        return parse_size(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+@main.command(name="sort")
+@click.option(
+    "--from-file",
+    type=click.File("r", encoding="utf-8"),
+    help="从文件逐行读取版本号（默认读取标准输入）",
+)
+@click.option("-r", "--reverse", is_flag=True, help="降序输出")
+@click.option("-u", "--unique", is_flag=True, help="相等的版本号（如 1.0 与 1.0.0）只输出第一个")
+@click.option(
+    "-S",
+    "--buffer-size",
+    "memory_limit",
+    default="256M",
+    show_default=True,
+    callback=_memory_size,
+    help="内存预算，超出后把已排序的分段写入临时文件（支持 K/M/G 后缀）",
+)
+@click.option(
+    "-T",
+    "--temp-dir",
+    type=click.Path(file_okay=False, dir_okay=True, writable=True),
+    help="分段临时文件所在目录（默认系统临时目录）",
+)
+def sort_command(from_file, reverse, unique, memory_limit, temp_dir):
+    """按 PEP 440 顺序排序版本号
+
+    \b
+    与 sort -V 不同，预发布、dev 和 post 版本都按 PEP 440 规则排序:
+      1.0.dev0 < 1.0a1 < 1.0rc1 < 1.0 < 1.0.post1
+
+    \b
+    输入超出内存预算时，已排序的分段会写入临时文件，最后多路归并输出，
+    因此可以处理远大于内存的版本号流。输出保留输入的原始写法，排序是稳定的。
+
+    \b
+    示例:
+      bump sort < versions.txt
+      git tag | bump sort -r | head -n 5
+      bump sort --from-file dump.txt -S 1G -T /data/tmp > sorted.txt
+
+    \b
+    退出码:
+      0  全部版本号有效
+      1  存在无效的版本号（已跳过，并输出到标准错误）
+    """
+    invalid = 0
+
+    def on_invalid(version: str) -> None:
+        nonlocal invalid
+        invalid += 1
+        _report_invalid(version)
+
+    out = sys.stdout
+    for version in sort_versions(
+        from_file or sys.stdin,
+        reverse=reverse,
+        unique=unique,
+        memory_limit=memory_limit,
+        temp_dir=temp_dir,
+        on_invalid=on_invalid,
+    ):
+        out.write(version)
+        out.write("\n")
+    out.flush()
+    sys.exit(1 if invalid else 0)
+
+
+@main.command()
+@click.option(
+    "--from-file",
+    type=click.File("r", encoding="utf-8"),
+    help="从文件逐行读取版本号（默认读取标准输入）",
+)
+@click.option("--stable", is_flag=True, help="只考虑稳定版本（排除 dev/alpha/beta/rc，post 视为稳定版本）")
+def latest(from_file, stable):
+    """输出最大的版本号
+
+    \b
+    单次遍历输入，内存占用恒定。输出保留输入的原始写法，
+    无效的版本号会被跳过并输出到标准错误。
+
+    \b
+    示例:
+      git tag | bump latest              v2.0.0rc1
+      git tag | bump latest --stable     v1.9.3
+
+    \b
+    退出码:
+      0  找到了符合条件的版本号
+      1  没有符合条件的版本号
+    """
+    result = latest_version(from_file or sys.stdin, stable=stable, on_invalid=_report_invalid)
+    if result is None:
+        click.echo("❌ 没有找到符合条件的版本号", err=True)
         sys.exit(1)
+    click.echo(result)
+
+
+@main.command()
+@click.argument("specifier")
+@click.option(
+    "--from-file",
+    type=click.File("r", encoding="utf-8"),
+    help="从文件逐行读取版本号（默认读取标准输入）",
+)
+@click.option(
+    "--pre/--no-pre",
+    "prereleases",
+    default=None,
+    help="是否接受预发布版本（默认仅当约束本身提到预发布版本时接受）",
+)
+@click.option("-v", "--invert", is_flag=True, help="输出不满足约束的版本号")
+def match(specifier, from_file, prereleases, invert):
+    """筛选满足 PEP 440 约束的版本号
+
+    \b
+    约束只编译一次，每个版本号只比较排序键，适合筛选大批量的版本号。
+    结果按输入顺序逐行输出，保留原始写法；无效的版本号会被跳过并输出到标准错误。
+
+    \b
+    示例:
+      git tag | bump match "<2,>=1.4"
+      bump match "~=1.4" --from-file versions.txt
+      bump match ">=2.0" --pre < versions.txt
+
+    \b
+    退出码:
+      0  至少有一个版本号被输出
+      1  没有版本号被输出
+      2  约束无效
+    """
+    from packaging.specifiers import InvalidSpecifier
+
+    from .specifiers import compile_specifier
+
+    try:
+        compiled = compile_specifier(specifier)
+    except InvalidSpecifier as e:
+        raise click.BadParameter(f"无效的版本约束: {specifier}", param_hint="SPECIFIER") from e
+
+    version_manager = VersionManager()
+    matched = 0
+    out = sys.stdout
+    for version in iter_versions(from_file or sys.stdin):
+        version_parts = version_manager.parse_version(version)
+        if version_parts is None:
+            _report_invalid(version)
+            continue
+        if compiled.contains(version_parts, prereleases, version) != invert:
+            matched += 1
+            out.write(version)
+            out.write("\n")
+    out.flush()
+    sys.exit(0 if matched else 1)
+
+
+@main.command()
+@click.option("--from", "since", help="起点（不含），默认为当前版本的标签；没有版本标签时包含全部历史")
+@click.option("--to", "until", default="HEAD", show_default=True, help="终点")
+@click.option("--title", help="标题（默认终点为 HEAD 时为“未发布”，否则为终点名称）")
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False),
+    help="插入到该文件开头（如 CHANGELOG.md），默认输出到标准输出",
+)
+def changelog(since, until, title, output):
+    """生成两个版本之间的更新日志
+
+    \b
+    按 Conventional Commits 把提交分为破坏性变更、新功能、问题修复、性能优化四组，
+    输出 Markdown。每个提交的分类结果按 SHA 缓存在 .git/bumpster/ 中，
+    再次生成时只解析从未见过的提交。
+
+    \b
+    示例:
+      bump changelog                           上一个版本之后的更改
+      bump changelog --from v1.0.0 --to v1.1.0
+      bump changelog --title "v1.2.0" -o CHANGELOG.md
+    """
+    from .changelog import generate_changelog, prepend_changelog
+    from .errors import BumpError
+    from .gitrepo import GitRepository
+    from .project import read_project_version
+    from .tagindex import TagIndex
+
+    try:
+        repository = GitRepository.discover()
+        if since is None:
+            with TagIndex.open(repository) as index:
+                try:
+                    since = index.last_release_tag(read_project_version()[0])
+                except (BumpError, ValueError):
+                    # 不在 Python 项目中或版本号无效：从版本号最高的标签开始
+                    since = index.highest()
+        notes = generate_changelog(repository, since, until, title or ("未发布" if until == "HEAD" else until))
+    except (BumpError, ValueError) as e:
+        click.echo(f"❌ {e}", err=True)
+        sys.exit(1)
+
+    if output:
+        prepend_changelog(output, notes.text)
+        click.echo(f"📝 已更新 {output}（{notes.commits} 个提交，新解析 {notes.classified} 个）", err=True)
+    else:
+        click.echo(notes.text, nl=False)
+
+
+@main.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="套接字路径（默认 $BUMP_SOCKET、$XDG_RUNTIME_DIR/bumpster.sock 或临时目录）",
+)
+@click.option(
+    "--idle-timeout",
+    type=click.FloatRange(min=0),
+    default=600,
+    show_default=True,
+    help="没有连接时空闲多少秒后退出，0 表示不退出",
+)
+def serve(socket_path, idle_timeout):
+    """启动常驻服务，通过 Unix 域套接字回答版本查询
+
+    \b
+    服务保持 VersionManager 及其缓存常热，按行收发 JSON-RPC 2.0 消息，
+    支持 validate、parse、next、match、read-project-version 方法，
+    每个连接由独立线程处理。
+
+    \b
+    套接字存在时，bump validate VERSION 和 bump next 会自动改由服务计算；
+    服务不可用时回退到本地计算。设置 BUMP_NO_DAEMON 可以禁用。
+
+    \b
+    示例:
+      bump serve &                                  后台启动
+      bump serve --idle-timeout 0                   永不因空闲退出
+      echo '{"jsonrpc": "2.0", "id": 1, "method": "next", "params": {"version": "1.0.0"}}' \\
+        | nc -U "$XDG_RUNTIME_DIR/bumpster.sock"
+    """
+    from .daemon import DaemonServer, default_socket_path
+
+    path = Path(socket_path) if socket_path else default_socket_path()
+    try:
+        server = DaemonServer(path, idle_timeout=idle_timeout)
+    except OSError as e:
+        click.echo(f"❌ 无法启动服务: {e}", err=True)
+        sys.exit(1)
+
+    click.echo(f"🚀 服务已启动: {path}", err=True)
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
+    click.echo("👋 服务已退出", err=True)
 
 
 if __name__ == "__main__":
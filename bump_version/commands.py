@@ -0,0 +1,185 @@
+"""外部命令执行模块。
+
+所有外部命令都以参数列表执行，不经过 shell：每次调用只启动目标程序本身，参数也不需要转义。
+模块记录启动的子进程数（按程序名统计），便于观察一次发布实际启动了多少进程。
+
+对象和引用查询使用常驻的 ``git cat-file --batch`` / ``--batch-check`` 进程（每个仓库各一个），
+多次查询只启动一次 git。
+"""
+
+import atexit
+import subprocess
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from .errors import CommandError
+
+_lock = threading.Lock()
+_process_counts: Counter[str] = Counter()
+
+
+def record_process(argv: list[str]) -> None:
+    """记录一次子进程启动（不经过本模块启动进程的调用方，如 asyncio 子进程，需要自行记录）。"""
+    with _lock:
+        _process_counts[Path(argv[0]).name] += 1
+
+
+def process_count() -> int:
+    """本进程至今启动的子进程总数。"""
+    with _lock:
+        return sum(_process_counts.values())
+
+
+def process_counts() -> dict[str, int]:
+    """按程序名统计的子进程启动次数。"""
+    with _lock:
+        return dict(_process_counts)
+
+
+def reset_process_counts() -> None:
+    """清零子进程计数。"""
+    with _lock:
+        _process_counts.clear()
+
+
+def popen(argv: list[str], **kwargs: Any) -> subprocess.Popen:
+    """启动子进程并计数。"""
+    record_process(argv)
+    return subprocess.Popen(argv, **kwargs)
+
+
+def run(argv: list[str], cwd: str | Path | None = None, check: bool = True, input: str | None = None) -> str:
+    """执行命令并返回标准输出，input 为写入标准输入的内容。
+
+    Raises:
+        CommandError: check 为 True 且命令以非零状态退出
+    """
+    record_process(argv)
+    stdin = subprocess.DEVNULL if input is None else None
+    result = subprocess.run(argv, cwd=cwd, input=input, stdin=stdin, capture_output=True, text=True)
+    if check and result.returncode != 0:
+        raise CommandError(argv, result.returncode, result.stderr)
+    return result.stdout
+
+
+def read_records(stream: IO[bytes]) -> Iterator[bytes]:
+    """逐条读取以 NUL 分隔的记录（git -z 输出），不把全部输出读入内存。"""
+    buffer = b""
+    while chunk := stream.read1(65536):  # type: ignore[attr-defined]
+        buffer += chunk
+        *records, buffer = buffer.split(b"\0")
+        yield from records
+    if buffer:
+        yield buffer
+
+
+def stream_records(argv: list[str], cwd: str | Path | None = None) -> Iterator[bytes]:
+    """执行命令并逐条产出以 NUL 分隔的标准输出记录；提前结束迭代时终止进程。
+
+    Raises:
+        CommandError: 命令以非零状态退出（提前结束时不检查）
+    """
+    process = popen(argv, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    finished = False
+    try:
+        yield from read_records(process.stdout)  # type: ignore[arg-type]
+        stderr = process.stderr.read()  # type: ignore[union-attr]
+        finished = True
+    finally:
+        if not finished:
+            process.kill()
+        process.wait()
+        process.stdout.close()  # type: ignore[union-attr]
+        process.stderr.close()  # type: ignore[union-attr]
+    if process.returncode != 0:
+        raise CommandError(argv, process.returncode, stderr.decode("utf-8", "replace"))
+
+
+class CatFile:
+    """常驻的 ``git cat-file`` 进程：查询对象类型、大小和内容，支持 ``v1.0^{commit}`` 等表达式。
+
+    两个进程（--batch-check 和 --batch）都在首次使用时才启动，通过 close 或进程退出时关闭。
+    同一实例可以在多个线程中使用。
+    """
+
+    def __init__(self, git_dir: str | Path):
+        self.git_dir = Path(git_dir)
+        self._lock = threading.Lock()
+        self._check: subprocess.Popen | None = None
+        self._batch: subprocess.Popen | None = None
+
+    def _start(self, mode: str) -> subprocess.Popen:
+        return popen(
+            ["git", f"--git-dir={self.git_dir}", "cat-file", mode],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    @staticmethod
+    def _request(process: subprocess.Popen, rev: str) -> tuple[str, str, int] | None:
+        """发送一个查询，解析响应头（``<sha> <type> <size>``）；对象不存在时返回 None。"""
+        if "\n" in rev:
+            raise ValueError(f"无效的对象名: {rev!r}")
+        stdin: IO[bytes] = process.stdin  # type: ignore[assignment]
+        stdout: IO[bytes] = process.stdout  # type: ignore[assignment]
+        stdin.write(rev.encode("utf-8") + b"\n")
+        stdin.flush()
+        header = stdout.readline().decode("utf-8").split()
+        if len(header) != 3:
+            # "<rev> missing" 或 "<rev> ambiguous"
+            return None
+        sha, object_type, size = header
+        return sha, object_type, int(size)
+
+    def info(self, rev: str) -> tuple[str, str, int] | None:
+        """对象的 (SHA, 类型, 大小)；对象不存在时返回 None。"""
+        with self._lock:
+            if self._check is None:
+                self._check = self._start("--batch-check")
+            return self._request(self._check, rev)
+
+    def read(self, rev: str) -> tuple[str, str, bytes] | None:
+        """对象的 (SHA, 类型, 内容)；对象不存在时返回 None。"""
+        with self._lock:
+            if self._batch is None:
+                self._batch = self._start("--batch")
+            header = self._request(self._batch, rev)
+            if header is None:
+                return None
+            sha, object_type, size = header
+            stdout: IO[bytes] = self._batch.stdout  # type: ignore[assignment]
+            content = stdout.read(size)
+            stdout.read(1)  # 内容之后的换行符
+            return sha, object_type, content
+
+    def close(self) -> None:
+        """关闭常驻进程。"""
+        with self._lock:
+            for process in (self._check, self._batch):
+                if process is not None:
+                    process.stdin.close()  # type: ignore[union-attr]
+                    process.wait()
+                    process.stdout.close()  # type: ignore[union-attr]
+            self._check = self._batch = None
+
+
+_cat_files: dict[Path, CatFile] = {}
+
+
+def cat_file(git_dir: str | Path) -> CatFile:
+    """仓库共享的 CatFile 实例（每个 Git 目录一个，进程退出时关闭）。"""
+    key = Path(git_dir).resolve()
+    with _lock:
+        if key not in _cat_files:
+            _cat_files[key] = CatFile(key)
+        return _cat_files[key]
+
+
+@atexit.register
+def _close_cat_files() -> None:
+    for instance in list(_cat_files.values()):
+        instance.close()
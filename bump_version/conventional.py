@@ -0,0 +1,140 @@
+"""根据 Conventional Commits 自动选择版本号递增类型。
+
+扫描上一个版本标签之后的提交：标题带 ``!`` 或正文中有 ``BREAKING CHANGE:`` 脚注为 major，
+``feat`` 为 minor，``fix`` / ``perf`` 为 patch，其他类型（docs、chore 等）不触发发布。
+
+``git log -z`` 的输出以生成器逐条读取，找到 major 级别的提交后立即终止 git，不再读取更早的历史。
+扫描结果按（版本标签, HEAD）缓存在 Git 公共目录的 ``bumpster/auto-release.json`` 中，
+HEAD 和标签都没有变化时再次运行不会启动任何子进程（上一次发布的标签也有缓存，见 TagIndex.last_release_tag）。
+"""
+
+import contextlib
+import json
+import re
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from . import commands
+from .gitrepo import GitRepository
+from .project import atomic_write
+from .tagindex import TagIndex
+from .version_manager import RELEASE_TYPES, ReleaseType
+
+# 缓存文件相对于 Git 公共目录的路径
+CACHE_PATH = Path("bumpster") / "auto-release.json"
+
+# 提交类型对应的递增类型，未列出的类型不触发发布
+COMMIT_TYPE_RELEASES: dict[str, ReleaseType] = {"feat": "minor", "fix": "patch", "perf": "patch"}
+
+_HEADER_PATTERN = re.compile(r"(?P<type>[A-Za-z]+)(?:\((?P<scope>[^()\r\n]*)\))?(?P<breaking>!)?: (?P<subject>\S.*)")
+_BREAKING_FOOTER_PATTERN = re.compile(r"^BREAKING[ -]CHANGE: ", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class AutoRelease:
+    """自动选择递增类型的结果。"""
+
+    release_type: ReleaseType | None  # None 表示没有需要发布的提交
+    base: str | None  # 扫描起点的版本标签，没有版本标签时为 None（扫描全部历史）
+    head: str | None  # 扫描时的 HEAD 提交，仓库还没有提交时为 None
+    commits: int  # 扫描的提交数（找到 major 级别的提交后提前停止）
+    reason: str | None  # 决定递增类型的提交标题
+    cached: bool = False  # 结果是否来自缓存
+
+
+@dataclass(frozen=True)
+class ConventionalCommit:
+    """解析后的 Conventional Commits 提交信息。"""
+
+    type: str  # 提交类型（小写），如 feat、fix
+    scope: str | None
+    breaking: bool  # 标题带 ! 或正文有 BREAKING CHANGE 脚注
+    subject: str  # 标题中冒号之后的描述
+
+    @property
+    def release_type(self) -> ReleaseType | None:
+        """对应的递增类型；不触发发布时为 None。"""
+        return "major" if self.breaking else COMMIT_TYPE_RELEASES.get(self.type)
+
+
+def parse_commit(message: str) -> ConventionalCommit | None:
+    """解析提交信息；不是 Conventional Commits 格式时返回 None。"""
+    header, _, body = message.partition("\n")
+    match = _HEADER_PATTERN.match(header.rstrip())
+    if match is None:
+        return None
+    breaking = bool(match["breaking"] or _BREAKING_FOOTER_PATTERN.search(body))
+    return ConventionalCommit(match["type"].lower(), match["scope"] or None, breaking, match["subject"])
+
+
+def commit_release_type(message: str) -> ReleaseType | None:
+    """一条提交信息对应的递增类型；不是 Conventional Commits 格式或不触发发布时返回 None。"""
+    commit = parse_commit(message)
+    return commit.release_type if commit is not None else None
+
+
+def iter_commits(repository: GitRepository, revisions: list[str]) -> Iterator[tuple[str, str]]:
+    """流式读取 ``git log`` 输出的 (SHA, 提交信息)；提前结束迭代时终止 git。
+
+    Raises:
+        CommandError: git log 执行失败
+    """
+    argv = ["git", f"--git-dir={repository.git_dir}", "log", "-z", "--format=%H%n%B", *revisions, "--"]
+    with contextlib.closing(commands.stream_records(argv, cwd=repository.work_tree or repository.git_dir)) as records:
+        for record in records:
+            sha, _, message = record.decode("utf-8", "replace").partition("\n")
+            yield sha, message.strip()
+
+
+def _read_cache(path: Path) -> dict | None:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return cache if isinstance(cache, dict) else None
+
+
+def detect_release_type(repository: GitRepository, current_version: str, use_cache: bool = True) -> AutoRelease:
+    """根据上一个版本标签之后的提交选择递增类型。
+
+    Raises:
+        CommandError: git log 执行失败
+    """
+    with TagIndex.open(repository) as index:
+        base = index.last_release_tag(current_version)
+        base_sha = index.sha(base) if base is not None else None
+    head = repository.head_commit()
+    if head is None:
+        return AutoRelease(None, base, None, 0, None)
+
+    cache_path = repository.common_dir / CACHE_PATH
+    key = {"base": base, "base_sha": base_sha, "head": head}
+    if use_cache and (cache := _read_cache(cache_path)) is not None:
+        if {name: cache.get(name) for name in key} == key and cache.get("release_type") in (None, *RELEASE_TYPES):
+            return AutoRelease(cache["release_type"], base, head, cache.get("commits", 0), cache.get("reason"), True)
+
+    release_type: ReleaseType | None = None
+    reason = None
+    commits = 0
+    revisions = [head, f"^{base_sha}"] if base_sha is not None else [head]
+    with contextlib.closing(iter_commits(repository, revisions)) as log:
+        for _, message in log:
+            commits += 1
+            level = commit_release_type(message)
+            # RELEASE_TYPES 按 major、minor、patch 排列，序号越小级别越高
+            if level is not None and (
+                release_type is None or RELEASE_TYPES.index(level) < RELEASE_TYPES.index(release_type)
+            ):
+                release_type, reason = level, message.partition("\n")[0]
+                if level == "major":
+                    break
+
+    result = AutoRelease(release_type, base, head, commits, reason)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(cache_path, json.dumps({**key, **asdict(result)}, ensure_ascii=False).encode("utf-8"))
+    except OSError:
+        # 缓存写入失败不影响结果
+        pass
+    return result
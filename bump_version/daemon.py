@@ -0,0 +1,360 @@
+"""常驻服务模块。
+
+``bump serve`` 启动一个长期运行的本地进程，保持 VersionManager 及其解析、约束编译缓存常热，
+通过 Unix 域套接字回答 JSON-RPC 2.0 请求。每个请求和响应各占一行（NDJSON），
+同一连接上可以连续发送多个请求；每个连接由独立线程处理，空闲超时后自动退出。
+
+支持的方法:
+  validate              {"version"}                                  -> {"valid", "normalized"}
+  parse                 {"version"}                                  -> 版本号各部分
+  next                  {"version", "release_type", "prerelease_type"} -> {"version"}
+  match                 {"specifier", "versions", "prereleases"}     -> {"matches"}
+  read-project-version  {"root"}                                     -> {"version", "file"}
+  ping / shutdown
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .project import ProjectNotFoundError, read_project_version
+from .version_manager import PRERELEASE_TYPES, RELEASE_TYPES, VersionManager
+
+# 默认空闲超时（秒），0 表示永不退出
+DEFAULT_IDLE_TIMEOUT = 600.0
+
+# 客户端连接和读取的超时（秒）：服务无响应时应尽快回退到本地计算
+CLIENT_TIMEOUT = 2.0
+
+# JSON-RPC 2.0 错误码
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+APPLICATION_ERROR = -32000
+
+
+def default_socket_path() -> Path:
+    """默认的套接字路径：BUMP_SOCKET 环境变量 > $XDG_RUNTIME_DIR > 系统临时目录（按用户区分）。"""
+    if path := os.environ.get("BUMP_SOCKET"):
+        return Path(path)
+    if runtime_dir := os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(runtime_dir) / "bumpster.sock"
+    return Path(tempfile.gettempdir()) / f"bumpster-{os.getuid()}.sock"
+
+
+class RpcError(Exception):
+    """JSON-RPC 错误，携带错误码。"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class DaemonError(Exception):
+    """服务返回了错误响应。"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _param(params: dict[str, Any], name: str, expected: type | tuple[type, ...], default: Any = ...) -> Any:
+    """读取并校验请求参数。"""
+    if name not in params:
+        if default is ...:
+            raise RpcError(INVALID_PARAMS, f"缺少参数: {name}")
+        return default
+    value = params[name]
+    if not isinstance(value, expected):
+        raise RpcError(INVALID_PARAMS, f"参数类型错误: {name}")
+    return value
+
+
+class Dispatcher:
+    """把 JSON-RPC 请求分派到 VersionManager，本身不涉及网络，便于单独测试。"""
+
+    def __init__(
+        self,
+        version_manager: VersionManager | None = None,
+        on_shutdown: Callable[[], None] | None = None,
+    ):
+        self.version_manager = version_manager or VersionManager()
+        self.methods: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "ping": self.ping,
+            "validate": self.validate,
+            "parse": self.parse,
+            "next": self.next,
+            "match": self.match,
+            "read-project-version": self.read_project_version,
+        }
+        if on_shutdown is not None:
+            self.on_shutdown = on_shutdown
+            self.methods["shutdown"] = self.shutdown
+
+    def ping(self, params: dict[str, Any]) -> str:
+        return "pong"
+
+    def shutdown(self, params: dict[str, Any]) -> str:
+        self.on_shutdown()
+        return "bye"
+
+    def validate(self, params: dict[str, Any]) -> dict[str, Any]:
+        from packaging.version import InvalidVersion, Version
+
+        version = _param(params, "version", str)
+        try:
+            return {"valid": True, "normalized": str(Version(version))}
+        except InvalidVersion:
+            return {"valid": False, "normalized": None}
+
+    def parse(self, params: dict[str, Any]) -> dict[str, Any]:
+        version = _param(params, "version", str)
+        version_parts = self.version_manager.parse_version(version)
+        if version_parts is None:
+            raise RpcError(APPLICATION_ERROR, f"无效的版本号格式: {version}")
+        return {
+            "normalized": str(version_parts),
+            "epoch": version_parts.epoch,
+            "major": version_parts.major,
+            "minor": version_parts.minor,
+            "patch": version_parts.patch,
+            "prerelease_type": version_parts.prerelease_type,
+            "prerelease_num": version_parts.prerelease_num,
+            "dev": version_parts.dev,
+            "post": version_parts.post,
+            "local": version_parts.local,
+        }
+
+    def next(self, params: dict[str, Any]) -> dict[str, Any]:
+        version = _param(params, "version", str)
+        release_type = _param(params, "release_type", str, "patch")
+        prerelease_type = _param(params, "prerelease_type", (str, type(None)), None)
+        if release_type not in RELEASE_TYPES or (
+            prerelease_type is not None and prerelease_type not in PRERELEASE_TYPES
+        ):
+            raise RpcError(INVALID_PARAMS, f"不支持的发布操作: {release_type} / {prerelease_type}")
+        try:
+            new_version = self.version_manager.get_next_version(
+                version, release_type, prerelease_type is not None, prerelease_type
+            )
+        except ValueError as e:
+            raise RpcError(APPLICATION_ERROR, str(e)) from e
+        return {"version": new_version}
+
+    def match(self, params: dict[str, Any]) -> dict[str, Any]:
+        from packaging.specifiers import InvalidSpecifier
+
+        specifier = _param(params, "specifier", str)
+        versions = _param(params, "versions", list)
+        prereleases = _param(params, "prereleases", (bool, type(None)), None)
+        if not all(isinstance(version, str) for version in versions):
+            raise RpcError(INVALID_PARAMS, "参数类型错误: versions")
+        try:
+            matches = list(self.version_manager.filter_by_specifier(versions, specifier, prereleases))
+        except InvalidSpecifier as e:
+            raise RpcError(APPLICATION_ERROR, f"无效的版本约束: {specifier}") from e
+        return {"matches": matches}
+
+    def read_project_version(self, params: dict[str, Any]) -> dict[str, Any]:
+        root = _param(params, "root", str, ".")
+        try:
+            version, file_type = read_project_version(root)
+        except (ProjectNotFoundError, OSError, ValueError) as e:
+            raise RpcError(APPLICATION_ERROR, str(e)) from e
+        return {"version": version, "file": file_type}
+
+    def dispatch(self, request: Any) -> dict[str, Any] | None:
+        """处理一个请求对象，返回响应对象；通知（没有 id 的请求）返回 None。"""
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or "method" not in request:
+                raise RpcError(INVALID_REQUEST, "无效的 JSON-RPC 请求")
+            method = self.methods.get(request["method"])
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, f"未知的方法: {request['method']}")
+            params = request.get("params", {})
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params 必须是对象")
+            result = method(params)
+        except RpcError as e:
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": e.code, "message": str(e)}}
+        except Exception as e:
+            # 单个请求出错不能影响服务本身
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": INTERNAL_ERROR, "message": str(e)}}
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def handle_line(self, line: str) -> dict[str, Any] | None:
+        """处理一行请求文本。"""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": "无法解析的 JSON"}}
+        return self.dispatch(request)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """逐行读取请求并写回响应，直到客户端关闭连接。"""
+
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        try:
+            for raw in self.rfile:
+                line = raw.decode("utf-8").strip()
+                if not line:
+                    continue
+                response = self.server.dispatcher.handle_line(line)
+                if response is not None:
+                    self._write(response)
+        except (ConnectionError, UnicodeDecodeError):
+            pass
+
+    def _write(self, response: dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """多线程 Unix 域套接字服务，每个连接一个线程，记录活动时间用于空闲退出。"""
+
+    daemon_threads = True
+    # CI 上常有大量客户端同时连接，默认的积压队列（5）会让非阻塞 connect 直接失败
+    request_queue_size = 128
+
+    def __init__(self, socket_path: str | Path, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.socket_path = Path(socket_path)
+        self.idle_timeout = idle_timeout
+        self.dispatcher = Dispatcher(on_shutdown=self.request_shutdown)
+        self._lock = threading.Lock()
+        self._connections = 0
+        self._last_activity = time.monotonic()
+        self._shutdown_requested = False
+
+        _remove_stale_socket(self.socket_path)
+        super().__init__(str(self.socket_path), _RequestHandler)
+
+    def server_bind(self) -> None:
+        """创建套接字文件时就只有所有者可以访问（bind 之后再 chmod 会留下一段权限过宽的时间）。"""
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        """在服务线程中、创建处理线程之前记录连接：空闲检查不会错过刚接受但还没开始处理的连接。"""
+        self.connection_opened()
+        try:
+            super().process_request(request, client_address)
+        except BaseException:
+            self.connection_closed()
+            raise
+
+    def process_request_thread(self, request: Any, client_address: Any) -> None:
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.connection_closed()
+
+    def connection_opened(self) -> None:
+        with self._lock:
+            self._connections += 1
+            self._last_activity = time.monotonic()
+
+    def connection_closed(self) -> None:
+        with self._lock:
+            self._connections -= 1
+            self._last_activity = time.monotonic()
+
+    def request_shutdown(self) -> None:
+        self._shutdown_requested = True
+
+    def should_stop(self) -> bool:
+        """收到 shutdown 请求，或没有活动连接且空闲超时。"""
+        if self._shutdown_requested:
+            return True
+        if self.idle_timeout <= 0:
+            return False
+        with self._lock:
+            return self._connections == 0 and time.monotonic() - self._last_activity > self.idle_timeout
+
+    def run(self, poll_interval: float = 0.5) -> None:
+        """处理请求直到应当退出，退出时删除套接字文件。"""
+        self.timeout = poll_interval
+        try:
+            while not self.should_stop():
+                self.handle_request()
+        finally:
+            self.server_close()
+            self.socket_path.unlink(missing_ok=True)
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    """删除残留的套接字文件；已有服务在监听，或路径是普通文件、符号链接等其他文件时报错。"""
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"路径已存在且不是套接字，不会删除: {socket_path}")
+    if ping(socket_path):
+        raise OSError(f"已有服务在监听: {socket_path}")
+    socket_path.unlink()
+
+
+def call(socket_path: str | Path, method: str, timeout: float = CLIENT_TIMEOUT, **params: Any) -> Any:
+    """向服务发送一个请求并返回结果。
+
+    Raises:
+        OSError: 无法连接服务
+        DaemonError: 服务返回了错误响应
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        client.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        with client.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("服务关闭了连接")
+    response = json.loads(line)
+    if "error" in response:
+        raise DaemonError(response["error"]["code"], response["error"]["message"])
+    return response["result"]
+
+
+def ping(socket_path: str | Path) -> bool:
+    """检查服务是否在监听。"""
+    try:
+        return call(socket_path, "ping", timeout=0.5) == "pong"
+    except (OSError, ValueError, DaemonError):
+        return False
+
+
+def try_call(method: str, **params: Any) -> Any | None:
+    """套接字存在时通过服务计算，服务不可用时返回 None（调用方回退到本地计算）。
+
+    设置 BUMP_NO_DAEMON 环境变量可以禁用服务。服务返回的业务错误（DaemonError）照常抛出。
+    """
+    if os.environ.get("BUMP_NO_DAEMON"):
+        return None
+    socket_path = default_socket_path()
+    if not socket_path.exists():
+        return None
+    try:
+        return call(socket_path, method, **params)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,87 @@
+"""异常类型模块。
+
+库接口（api.release 等）通过这些异常报告失败，调用方可以按类型分别处理，
+而不必解析命令行输出。
+"""
+
+from pathlib import Path
+
+
+class BumpError(Exception):
+    """bumpster 所有异常的基类。"""
+
+
+class ProjectNotFoundError(BumpError):
+    """目录中没有可识别版本号的 Python 项目配置文件。"""
+
+
+class NotAGitRepositoryError(BumpError):
+    """目录不在任何 Git 仓库中。"""
+
+
+class InvalidVersionError(BumpError, ValueError):
+    """版本号不符合 PEP 440 规范。"""
+
+
+class ReleaseNotAllowedError(BumpError, ValueError):
+    """当前版本不允许执行该发布操作（如从预发布版本直接升级到 post 版本）。"""
+
+
+class PlumbingNotAllowedError(BumpError):
+    """仓库配置了提交钩子或签名，使用底层命令提交会跳过它们。"""
+
+    def __init__(self, features: list[str]):
+        super().__init__(f"底层命令提交会跳过仓库配置的 {'、'.join(features)}，请去掉 --plumbing（plumbing=True）")
+        self.features = features
+
+
+class BranchNotAllowedError(BumpError):
+    """当前分支不允许发布。"""
+
+    def __init__(self, branch: str, allowed: tuple[str, ...]):
+        super().__init__(f"不在允许发布的分支上: {branch or '(detached HEAD)'}（允许: {', '.join(allowed)}）")
+        self.branch = branch
+        self.allowed = allowed
+
+
+class DirtyWorktreeError(BumpError):
+    """工作区有未提交的更改。"""
+
+    def __init__(self, status: str, truncated: bool = False):
+        super().__init__(f"工作区有未提交的更改:\n{status}")
+        self.status = status  # git status --porcelain 格式的更改列表（可能只是一部分）
+        self.truncated = truncated  # 为 True 时还有更多更改没有列出
+
+
+class CommandError(BumpError):
+    """外部命令（git、uv）执行失败。"""
+
+    def __init__(self, argv: list[str], returncode: int, stderr: str):
+        super().__init__(f"命令执行失败 ({returncode}): {' '.join(argv)}\n{stderr.strip()}")
+        self.argv = argv
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+class TagExistsError(BumpError):
+    """要创建的版本标签已经存在（如另一个发布分支已经发布过同一版本）。"""
+
+    def __init__(self, tag: str):
+        super().__init__(f"标签已存在: {tag}")
+        self.tag = tag
+
+
+class VersionTargetError(BumpError):
+    """额外的版本号位置（[tool.bumpster] version-files）配置错误、文件不存在或没有找到版本号。"""
+
+
+class ReleaseInProgressError(BumpError):
+    """上一次发布没有完成（发布日志仍然存在），需要先继续或回滚。"""
+
+    def __init__(self, path: Path):
+        super().__init__("上一次发布没有完成：运行 bump --resume 从中断的步骤继续，或运行 bump --abort 回滚")
+        self.path = path  # 发布日志文件
+
+
+class JournalError(BumpError):
+    """无法继续或回滚发布：没有未完成的发布、日志已损坏，或仓库状态与日志不一致。"""
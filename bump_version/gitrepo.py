@@ -0,0 +1,258 @@
+"""Git 仓库只读访问模块。
+
+直接从磁盘读取 HEAD、符号引用、松散引用和 packed-refs，支持 ``.git`` 文件（``gitdir:``）、
+链接工作树（worktrees + commondir）和裸仓库。只读查询（当前分支、HEAD 提交、标签列表）
+不再需要启动 git 子进程；遇到无法直接解析的仓库格式（如 reftable）时回退到 git 命令。
+"""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+from . import commands
+from .errors import CommandError, NotAGitRepositoryError
+
+# 符号引用的最大解析深度（与 git 一致）
+MAX_SYMREF_DEPTH = 5
+
+# 属于单个工作树的引用前缀，其余引用保存在公共目录中
+_PER_WORKTREE_PREFIXES = ("refs/bisect/", "refs/worktree/", "refs/rewritten/")
+
+_SYMREF_PREFIX = "ref: "
+
+
+def _read_text(path: Path) -> str | None:
+    """读取文件内容，文件不存在时返回 None。"""
+    try:
+        return path.read_text(encoding="utf-8")
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+        return None
+
+
+def _is_git_dir(path: Path) -> bool:
+    """判断目录是否像一个 Git 目录（HEAD 文件和 refs/、objects/ 目录，或链接工作树的 commondir）。"""
+    return (path / "HEAD").is_file() and (
+        (path / "commondir").is_file() or ((path / "refs").is_dir() and (path / "objects").is_dir())
+    )
+
+
+def _read_gitfile(path: Path) -> Path | None:
+    """解析 ``.git`` 文件（``gitdir: <路径>``），相对路径相对于文件所在目录。"""
+    content = _read_text(path)
+    if content is None or not content.startswith("gitdir:"):
+        return None
+    git_dir = Path(content[len("gitdir:") :].strip())
+    return git_dir if git_dir.is_absolute() else (path.parent / git_dir).resolve()
+
+
+def _check_ref_name(name: str) -> None:
+    """拒绝可能逃出 Git 目录的引用名。"""
+    if not name or name.startswith("/") or ".." in name.split("/") or "\\" in name:
+        raise ValueError(f"无效的引用名: {name}")
+
+
+class GitRepository:
+    """一个 Git 仓库的只读视图。"""
+
+    def __init__(self, git_dir: str | Path, work_tree: str | Path | None = None):
+        self.git_dir = Path(git_dir)
+        self.work_tree = Path(work_tree) if work_tree is not None else None
+
+        # 链接工作树的 HEAD 保存在自己的目录中，分支和标签保存在 commondir 指向的公共目录中
+        common = _read_text(self.git_dir / "commondir")
+        if common is not None:
+            common_dir = Path(common.strip())
+            self.common_dir = common_dir if common_dir.is_absolute() else (self.git_dir / common_dir).resolve()
+        else:
+            self.common_dir = self.git_dir
+
+        # reftable 格式的引用无法直接读取，所有查询都交给 git 命令
+        self.uses_git_binary = (self.common_dir / "reftable").is_dir()
+
+        self._packed_refs: dict[str, str] | None = None
+        self._packed_refs_stat: tuple[int, int] | None = None
+
+    @classmethod
+    def discover(cls, path: str | Path = ".") -> "GitRepository":
+        """从 path 开始向上查找仓库（遵循 GIT_DIR / GIT_WORK_TREE 环境变量）。
+
+        Raises:
+            NotAGitRepositoryError: path 不在任何 Git 仓库中
+        """
+        if git_dir := os.environ.get("GIT_DIR"):
+            work_tree = os.environ.get("GIT_WORK_TREE")
+            return cls(Path(git_dir).resolve(), work_tree)
+
+        start = Path(path).resolve()
+        for directory in (start, *start.parents):
+            dot_git = directory / ".git"
+            if dot_git.is_dir() and _is_git_dir(dot_git):
+                return cls(dot_git, directory)
+            if dot_git.is_file() and (git_dir := _read_gitfile(dot_git)) is not None and _is_git_dir(git_dir):
+                return cls(git_dir, directory)
+            if _is_git_dir(directory):
+                # 裸仓库
+                return cls(directory)
+        raise NotAGitRepositoryError(f"不是 Git 仓库: {start}")
+
+    def _git(self, *args: str, check: bool = True) -> str:
+        """回退到 git 命令；check 为 False 时命令失败返回空字符串。"""
+        try:
+            return commands.run(["git", f"--git-dir={self.git_dir}", *args], cwd=self.work_tree or self.git_dir)
+        except CommandError:
+            if check:
+                raise
+            return ""
+
+    def _ref_path(self, name: str) -> Path:
+        """引用文件的路径：HEAD 等伪引用和单个工作树的引用在 git_dir 中，其余在公共目录中。"""
+        if not name.startswith("refs/") or name.startswith(_PER_WORKTREE_PREFIXES):
+            return self.git_dir / name
+        return self.common_dir / name
+
+    def packed_refs(self) -> dict[str, str]:
+        """读取 packed-refs，返回 {引用名: SHA}；按文件修改时间缓存。"""
+        path = self.common_dir / "packed-refs"
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._packed_refs, self._packed_refs_stat = {}, None
+            return {}
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._packed_refs is None or self._packed_refs_stat != key:
+            refs = {}
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    # 注释行（# pack-refs with: ...）和附注标签的解引用行（^SHA）跳过
+                    if line.startswith(("#", "^")):
+                        continue
+                    sha, _, name = line.rstrip("\n").partition(" ")
+                    if name:
+                        refs[name] = sha
+            self._packed_refs, self._packed_refs_stat = refs, key
+        return self._packed_refs
+
+    def read_ref(self, name: str) -> str | None:
+        """读取一个引用的原始内容：SHA 或 ``ref: <目标>``；引用不存在时返回 None。"""
+        _check_ref_name(name)
+        content = _read_text(self._ref_path(name))
+        if content is not None:
+            return content.strip()
+        return self.packed_refs().get(name)
+
+    def symbolic_target(self, name: str = "HEAD") -> str | None:
+        """符号引用指向的引用名（如 HEAD -> refs/heads/main）；不是符号引用时返回 None。"""
+        if self.uses_git_binary:
+            return self._git("symbolic-ref", "--quiet", name, check=False).strip() or None
+        value = self.read_ref(name)
+        if value is not None and value.startswith(_SYMREF_PREFIX):
+            return value[len(_SYMREF_PREFIX) :].strip()
+        return None
+
+    def resolve_ref(self, name: str) -> str | None:
+        """把引用解析为提交（或标签对象）的 SHA；引用不存在（如新仓库的 HEAD）时返回 None。"""
+        if self.uses_git_binary:
+            return self._git("rev-parse", "--verify", "--quiet", name, check=False).strip() or None
+        for _ in range(MAX_SYMREF_DEPTH):
+            value = self.read_ref(name)
+            if value is None:
+                return None
+            if not value.startswith(_SYMREF_PREFIX):
+                return value
+            name = value[len(_SYMREF_PREFIX) :].strip()
+        raise ValueError(f"符号引用嵌套过深: {name}")
+
+    def current_branch(self) -> str:
+        """当前分支名；HEAD 处于分离状态时返回空字符串（与 git branch --show-current 一致）。"""
+        target = self.symbolic_target("HEAD")
+        if target is None or not target.startswith("refs/heads/"):
+            return ""
+        return target[len("refs/heads/") :]
+
+    def head_commit(self) -> str | None:
+        """HEAD 指向的提交；还没有任何提交时返回 None。"""
+        return self.resolve_ref("HEAD")
+
+    def object_info(self, rev: str) -> tuple[str, str, int] | None:
+        """对象的 (SHA, 类型, 大小)，rev 可以是引用名或 ``v1.0^{commit}`` 等表达式；不存在时返回 None。
+
+        通过仓库共享的常驻 git cat-file 进程查询，多次查询不会重复启动 git。
+        """
+        return commands.cat_file(self.git_dir).info(rev)
+
+    def peel(self, rev: str) -> str | None:
+        """把引用（包括附注标签）解析为它指向的提交 SHA；不存在时返回 None。"""
+        info = self.object_info(f"{rev}^{{commit}}")
+        return info[0] if info is not None else None
+
+    def merged_refs(self, prefix: str = "refs/", commit: str = "HEAD") -> set[str]:
+        """prefix 下指向 commit 历史中某个提交的引用（完整引用名），需要遍历提交图，
+        一次 git for-each-ref --merged 完成，与引用数量无关。
+        """
+        return set(self._git("for-each-ref", f"--merged={commit}", "--format=%(refname)", prefix).splitlines())
+
+    def config(self) -> dict[str, str]:
+        """读取仓库配置（公共目录中的 config 文件），返回 {"节.键" 或 "节.子节.键": 值}。
+
+        节名和键名转为小写，同一个键出现多次时取最后一个值；不处理 include 和全局配置，
+        只用于判断仓库是否显式配置了某个选项。
+        """
+        values: dict[str, str] = {}
+        content = _read_text(self.common_dir / "config")
+        section = ""
+        for raw in (content or "").splitlines():
+            line = raw.strip()
+            if not line or line.startswith(("#", ";")):
+                continue
+            if line.startswith("["):
+                header = line[1 : line.index("]")] if "]" in line else line[1:]
+                name, _, subsection = header.partition(" ")
+                subsection = subsection.strip().strip('"')
+                section = f"{name.lower()}.{subsection}" if subsection else name.lower()
+                continue
+            key, has_value, value = line.partition("=")
+            value = value.strip().strip('"') if has_value else "true"
+            values[f"{section}.{key.strip().lower()}"] = value
+        return values
+
+    def _loose_ref_names(self, prefix: str) -> Iterator[str]:
+        """prefix 下的松散引用名；每个引用只从它所属的目录（工作树或公共目录）读取。"""
+        for root in dict.fromkeys((self.common_dir, self.git_dir)):
+            directory = root / prefix
+            if not directory.is_dir():
+                continue
+            for path in directory.rglob("*"):
+                if not path.is_file() or path.name.endswith(".lock"):
+                    continue
+                name = path.relative_to(root).as_posix()
+                if self._ref_path(name) == path:
+                    yield name
+
+    def refs(self, prefix: str = "refs/") -> dict[str, str]:
+        """列出 prefix 下的所有引用 {引用名: SHA}，松散引用优先于 packed-refs，按引用名排序。"""
+        _check_ref_name(prefix.rstrip("/"))
+        if self.uses_git_binary:
+            output = self._git("for-each-ref", "--format=%(objectname) %(refname)", prefix)
+            return dict(sorted((name, sha) for sha, _, name in (line.partition(" ") for line in output.splitlines())))
+
+        refs = {name: sha for name, sha in self.packed_refs().items() if name.startswith(prefix)}
+        refs.update(self.loose_refs(prefix))
+        return dict(sorted(refs.items()))
+
+    def loose_refs(self, prefix: str = "refs/") -> dict[str, str]:
+        """只列出 prefix 下的松散引用 {引用名: SHA}（不含 packed-refs），用于增量更新索引。"""
+        _check_ref_name(prefix.rstrip("/"))
+        refs = {}
+        for name in self._loose_ref_names(prefix):
+            sha = self.resolve_ref(name)
+            if sha is not None:
+                refs[name] = sha
+        return refs
+
+    def branches(self) -> dict[str, str]:
+        """本地分支 {分支名: SHA}。"""
+        return {name[len("refs/heads/") :]: sha for name, sha in self.refs("refs/heads/").items()}
+
+    def tags(self) -> dict[str, str]:
+        """标签 {标签名: SHA}，附注标签为标签对象的 SHA。"""
+        return {name[len("refs/tags/") :]: sha for name, sha in self.refs("refs/tags/").items()}
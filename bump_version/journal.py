@@ -0,0 +1,179 @@
+"""发布日志模块。
+
+一次发布由多个步骤组成（更新版本号、更新锁文件、生成更新日志、提交、打标签、推送），
+任何一步失败或被 Ctrl-C 中断时，仓库会停在中间状态：版本号已经改了但没有提交，或者已经提交
+但没有推送。重新运行 bump 会因为工作区不干净或版本号已经变化而失败，只能手工收拾。
+
+发布开始时把计划写入 Git 目录中的 ``bumpster/release.json``，每完成一步原子地记录一次。
+``bump --resume`` 从第一个未完成的步骤继续（已完成的步骤不会重做，完成后没来得及记录的步骤
+会根据仓库的实际状态识别出来），``bump --abort`` 删除本次发布创建的标签、把分支退回到发布前的
+提交并恢复被修改的文件。发布全部完成后删除日志。
+
+日志保存在 git_dir 而不是公共目录中：HEAD 属于每个工作树，链接工作树各自有自己的发布。
+"""
+
+import json
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+
+from . import commands
+from .errors import JournalError, ReleaseInProgressError
+from .gitrepo import GitRepository
+from .project import atomic_write
+
+# 日志文件相对于 Git 目录的路径
+JOURNAL_PATH = Path("bumpster") / "release.json"
+
+# 日志格式版本
+SCHEMA_VERSION = 1
+
+# 发布步骤，按执行顺序排列
+STEPS = ("write", "lock", "changelog", "commit", "tag", "push")
+
+STEP_LABELS = {
+    "write": "更新版本号",
+    "lock": "更新锁文件",
+    "changelog": "生成更新日志",
+    "commit": "提交版本更新",
+    "tag": "创建标签",
+    "push": "推送到远程仓库",
+}
+
+
+@dataclass
+class ReleaseJournal:
+    """一次进行中的发布。"""
+
+    path: Path  # 日志文件
+    root: str  # 项目目录（绝对路径）
+    old_version: str
+    new_version: str
+    tag: str
+    config_file: str
+    files: list[str]  # 要提交的文件（相对于项目目录）
+    created: list[str]  # 发布前不存在的文件，回滚时删除
+    head: str | None  # 发布前的 HEAD
+    steps: list[str]  # 本次发布要执行的步骤（STEPS 的子序列）
+    plumbing: bool = False
+    completed: list[str] = field(default_factory=list)
+    commit_sha: str | None = None  # 发布提交，提交步骤完成后记录
+
+    @staticmethod
+    def location(repository: GitRepository) -> Path:
+        return repository.git_dir / JOURNAL_PATH
+
+    @classmethod
+    def ensure_idle(cls, repository: GitRepository) -> None:
+        """确认没有未完成的发布。
+
+        Raises:
+            ReleaseInProgressError: 存在上一次发布留下的日志
+        """
+        if cls.location(repository).exists():
+            raise ReleaseInProgressError(cls.location(repository))
+
+    @classmethod
+    def begin(
+        cls,
+        repository: GitRepository,
+        root: str | Path,
+        *,
+        old_version: str,
+        new_version: str,
+        tag: str,
+        config_file: str,
+        files: list[str],
+        steps: list[str],
+        plumbing: bool = False,
+    ) -> "ReleaseJournal":
+        """记录发布计划，在修改任何文件之前调用。
+
+        Raises:
+            ReleaseInProgressError: 存在上一次发布留下的日志
+        """
+        cls.ensure_idle(repository)
+        root = Path(root).resolve()
+        journal = cls(
+            cls.location(repository),
+            str(root),
+            old_version,
+            new_version,
+            tag,
+            config_file,
+            list(files),
+            [name for name in files if not (root / name).exists()],
+            repository.head_commit(),
+            [step for step in STEPS if step in steps],
+            plumbing,
+        )
+        journal.save()
+        return journal
+
+    @classmethod
+    def load(cls, repository: GitRepository) -> "ReleaseJournal":
+        """读取未完成的发布。
+
+        Raises:
+            JournalError: 没有未完成的发布，或日志已损坏
+        """
+        path = cls.location(repository)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise JournalError("没有未完成的发布") from None
+        except (OSError, ValueError) as e:
+            raise JournalError(f"发布日志已损坏: {path}") from e
+        names = {item.name for item in fields(cls)} - {"path"}
+        if not isinstance(data, dict) or data.pop("schema", None) != SCHEMA_VERSION or set(data) != names:
+            raise JournalError(f"发布日志已损坏: {path}")
+        return cls(path, **data)
+
+    def save(self) -> None:
+        data = {"schema": SCHEMA_VERSION, **asdict(self)}
+        del data["path"]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.path, json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def done(self, step: str) -> bool:
+        """步骤已完成，或本次发布不需要这个步骤。"""
+        return step in self.completed or step not in self.steps
+
+    @property
+    def pending(self) -> list[str]:
+        """尚未完成的步骤，按执行顺序排列。"""
+        return [step for step in self.steps if step not in self.completed]
+
+    def complete(self, *steps: str, commit_sha: str | None = None) -> None:
+        """记录步骤已经完成。"""
+        self.completed += [step for step in steps if step not in self.completed]
+        if commit_sha is not None:
+            self.commit_sha = commit_sha
+        self.save()
+
+    def finish(self) -> None:
+        """发布完成或已回滚，删除日志。"""
+        self.path.unlink(missing_ok=True)
+
+    @property
+    def commit_message(self) -> str:
+        return f"chore: release {self.new_version}"
+
+    @property
+    def tag_message(self) -> str:
+        return f"Release {self.new_version}"
+
+
+def is_release_commit(repository: GitRepository, journal: ReleaseJournal, sha: str | None) -> bool:
+    """sha 是否为本次发布的提交：父提交是发布前的 HEAD，提交信息是发布提交信息。
+
+    用于识别提交完成后、记录到日志之前被中断的情况。
+    """
+    if sha is None or sha == journal.head:
+        return False
+    obj = commands.cat_file(repository.git_dir).read(sha)
+    if obj is None or obj[1] != "commit":
+        return False
+    header, _, message = obj[2].partition(b"\n\n")
+    parents = [line[7:].decode("ascii") for line in header.split(b"\n") if line.startswith(b"parent ")]
+    expected = [journal.head] if journal.head is not None else []
+    return parents == expected and message.decode("utf-8", "replace").strip() == journal.commit_message
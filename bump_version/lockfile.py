@@ -0,0 +1,91 @@
+"""锁文件版本号更新模块。
+
+版本号变化后，uv.lock 中根项目条目（``source = { editable = "." }``）的 version 也要随之更新。
+过去通过 ``uv sync`` 完成，这会重新解析依赖并同步整个环境，耗时几十秒并且可能访问网络。
+这里直接改写该条目的 version 字节，再按锁文件结构校验：除根项目的版本号外其余内容必须完全不变，
+否则交给 uv 处理（LOCK_COMMANDS）。
+
+poetry.lock 和 pdm.lock 不记录项目自身的版本号（它们的 content-hash 也不包含版本号），
+版本变化时不需要修改。
+"""
+
+import re
+from pathlib import Path
+from typing import Any
+
+from .project import atomic_write
+
+UV_LOCK = "uv.lock"
+
+# 能够直接改写的 uv.lock 格式版本（顶层的 version 字段）
+SUPPORTED_UV_LOCK_VERSIONS = (1,)
+
+# 无法直接改写时用于更新锁文件的命令
+LOCK_COMMANDS = {UV_LOCK: ["uv", "sync", "--quiet"]}
+
+_PACKAGE_HEADER_PATTERN = re.compile(rb"^\[\[package\]\][ \t]*\r?$", re.MULTILINE)
+_ROOT_SOURCE_PATTERN = re.compile(rb'^source = \{ (?:editable|virtual) = "\." \}[ \t]*\r?$', re.MULTILINE)
+_VERSION_LINE_PATTERN = re.compile(rb'^version = (?P<value>"[^"\\\r\n]*")[ \t]*\r?$', re.MULTILINE)
+
+
+def _root_index(doc: dict[str, Any]) -> int | None:
+    """根项目在 package 数组中的位置；锁文件格式不受支持或根项目不唯一时返回 None。"""
+    if doc.get("version") not in SUPPORTED_UV_LOCK_VERSIONS:
+        return None
+    packages = doc.get("package")
+    if not isinstance(packages, list):
+        return None
+    roots = [
+        index
+        for index, package in enumerate(packages)
+        if isinstance(package, dict)
+        and isinstance(package.get("source"), dict)
+        and "." in (package["source"].get("editable"), package["source"].get("virtual"))
+    ]
+    return roots[0] if len(roots) == 1 else None
+
+
+def _root_version_span(content: bytes) -> tuple[int, int] | None:
+    """根项目条目中 version 值（含引号）的字节范围；找不到或不唯一时返回 None。"""
+    headers = [match.start() for match in _PACKAGE_HEADER_PATTERN.finditer(content)]
+    spans = []
+    for start, end in zip(headers, [*headers[1:], len(content)], strict=True):
+        if _ROOT_SOURCE_PATTERN.search(content, start, end):
+            match = _VERSION_LINE_PATTERN.search(content, start, end)
+            if match is None:
+                return None
+            spans.append(match.span("value"))
+    return spans[0] if len(spans) == 1 else None
+
+
+def stamp_uv_lock(path: str | Path, new_version: str) -> bool:
+    """把 uv.lock 中根项目的版本号改为 new_version，只改写这一个字符串。
+
+    返回 False 表示无法安全地直接改写（格式不受支持、找不到根项目的版本号或校验失败），
+    文件保持不变，调用方应改为运行 LOCK_COMMANDS 中的命令。
+    """
+    import tomllib
+
+    path = Path(path)
+    content = path.read_bytes()
+    try:
+        doc = tomllib.loads(content.decode("utf-8"))
+    except (UnicodeDecodeError, tomllib.TOMLDecodeError):
+        return False
+    index = _root_index(doc)
+    span = _root_version_span(content)
+    if index is None or span is None or "version" not in doc["package"][index]:
+        return False
+
+    start, end = span
+    updated = content[: start + 1] + new_version.encode("utf-8") + content[end - 1 :]
+    try:
+        new_doc = tomllib.loads(updated.decode("utf-8"))
+    except tomllib.TOMLDecodeError:
+        return False
+    doc["package"][index]["version"] = new_version
+    if new_doc != doc:
+        return False
+    if updated != content:
+        atomic_write(path, updated)
+    return True
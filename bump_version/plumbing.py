@@ -0,0 +1,269 @@
+"""基于 git 底层命令的发布提交模块。
+
+``git add`` / ``git commit`` 需要刷新并重写整个索引，在跟踪数十万文件的仓库中，
+即使只改动一两个文件也要花费大量时间。这里直接构造对象：
+
+1. ``git hash-object -w --stdin-paths`` 一次写入所有改动文件的 blob；
+2. 只沿改动路径重建树对象（读取原有树用常驻的 cat-file 进程，写入新树用 ``git mktree --batch``）；
+3. ``git commit-tree`` 创建提交，``git mktag`` 创建附注标签；
+4. ``git update-ref --stdin`` 在一个事务中更新分支和标签（分支被他人移动时整体失败）；
+5. ``git update-index --cacheinfo`` 只更新改动文件的索引条目。
+
+提交耗时只与改动文件数和路径深度有关，与仓库大小无关。
+
+底层命令不会执行 ``git commit`` / ``git tag`` 的附加功能：提交钩子（pre-commit、
+prepare-commit-msg、commit-msg、post-commit）和签名（``commit.gpgsign``、``tag.gpgsign``）。
+仓库配置了这些功能时 ``ensure_plumbing_allowed`` 拒绝使用底层命令，以免悄悄跳过。
+"""
+
+import os
+import subprocess
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+from . import commands
+from .errors import CommandError, PlumbingNotAllowedError
+from .gitrepo import GitRepository
+
+TREE_MODE = "40000"
+FILE_MODE = "100644"
+SYMLINK_MODE = "120000"
+# git commit 会执行、底层命令会跳过的钩子
+COMMIT_HOOKS = ("pre-commit", "prepare-commit-msg", "commit-msg", "post-commit")
+_SIGNING_KEYS = ("commit.gpgsign", "tag.gpgsign")
+_OBJECT_TYPES = {TREE_MODE: "tree", "160000": "commit"}
+
+
+@dataclass(frozen=True)
+class PlumbingCommit:
+    """底层命令创建的提交和标签。"""
+
+    commit_sha: str
+    tag_sha: str | None
+
+
+def skipped_features(repository: GitRepository) -> list[str]:
+    """返回仓库配置的、底层命令会跳过的功能（已安装的提交钩子和签名），没有时返回空列表。
+
+    用一次 ``git config --get-regexp`` 读取所有层级（系统、全局、仓库）的有效配置。
+    """
+    output = commands.run(
+        ["git", "config", "--get-regexp", r"^(core\.hookspath|commit\.gpgsign|tag\.gpgsign)$"],
+        cwd=repository.work_tree or repository.git_dir,
+        check=False,
+    )
+    # 同一个键出现多次时后面的层级优先
+    values = dict(line.partition(" ")[::2] for line in output.splitlines())
+    features = [key for key in _SIGNING_KEYS if values.get(key, "").lower() in ("true", "yes", "on", "1")]
+
+    hooks_path = values.get("core.hookspath")
+    if hooks_path:
+        # 相对路径相对于执行钩子的目录（工作区根目录）
+        hooks_dir = (repository.work_tree or repository.git_dir) / os.path.expanduser(hooks_path)
+    else:
+        hooks_dir = repository.common_dir / "hooks"
+    features += [
+        f"{hook} 钩子" for hook in COMMIT_HOOKS if (hooks_dir / hook).is_file() and os.access(hooks_dir / hook, os.X_OK)
+    ]
+    return features
+
+
+def ensure_plumbing_allowed(repository: GitRepository) -> None:
+    """确认可以用底层命令提交：仓库没有配置提交钩子或签名。
+
+    Raises:
+        PlumbingNotAllowedError: 仓库配置了底层命令会跳过的钩子或签名
+    """
+    features = skipped_features(repository)
+    if features:
+        raise PlumbingNotAllowedError(features)
+
+
+def parse_tree(content: bytes, hash_size: int) -> dict[str, tuple[str, str]]:
+    """解析树对象内容，返回 {文件名: (模式, SHA)}。"""
+    entries = {}
+    pos = 0
+    while pos < len(content):
+        space = content.index(b" ", pos)
+        nul = content.index(b"\0", space)
+        name = content[space + 1 : nul].decode("utf-8", "surrogateescape")
+        end = nul + 1 + hash_size
+        entries[name] = (content[pos:space].decode("ascii"), content[nul + 1 : end].hex())
+        pos = end
+    return entries
+
+
+class _TreeWriter:
+    """通过一个 ``git mktree -z --batch`` 进程写入多个树对象。"""
+
+    def __init__(self, cwd: Path):
+        self.cwd = cwd
+        self._process: subprocess.Popen | None = None
+
+    def write(self, entries: dict[str, tuple[str, str]]) -> str:
+        if self._process is None:
+            self._process = commands.popen(
+                ["git", "mktree", "-z", "--batch"], cwd=self.cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+            )
+        stdin: IO[bytes] = self._process.stdin  # type: ignore[assignment]
+        stdout: IO[bytes] = self._process.stdout  # type: ignore[assignment]
+        for name, (mode, sha) in entries.items():
+            stdin.write(f"{mode} {_OBJECT_TYPES.get(mode, 'blob')} {sha}\t".encode("ascii"))
+            stdin.write(name.encode("utf-8", "surrogateescape") + b"\0")
+        # 空记录结束一个树
+        stdin.write(b"\0")
+        stdin.flush()
+        sha = stdout.readline().decode("ascii").strip()
+        if not sha:
+            raise CommandError(["git", "mktree", "-z", "--batch"], self._process.wait(), "")
+        return sha
+
+    def close(self) -> None:
+        if self._process is not None:
+            self._process.stdin.close()  # type: ignore[union-attr]
+            self._process.wait()
+            self._process.stdout.close()  # type: ignore[union-attr]
+
+
+def _read_tree(repository: GitRepository, rev: str | None, hash_size: int) -> dict[str, tuple[str, str]]:
+    """读取树对象的条目，rev 为 None 时返回空树。"""
+    if rev is None:
+        return {}
+    obj = commands.cat_file(repository.git_dir).read(rev)
+    if obj is None or obj[1] != "tree":
+        raise ValueError(f"无法读取树对象: {rev}")
+    return parse_tree(obj[2], hash_size)
+
+
+def _build_tree(
+    repository: GitRepository,
+    writer: _TreeWriter,
+    base: str | None,
+    changes: dict[str, str],
+    hash_size: int,
+    symlinks: frozenset[str] = frozenset(),
+    prefix: str = "",
+) -> tuple[str, dict[str, str]]:
+    """在 base 树上应用 {相对路径: blob SHA} 的改动，返回 (新树 SHA, {完整路径: 文件模式})。
+
+    symlinks 中的完整路径以符号链接模式写入；其他文件沿用原有模式（可执行位），新文件为普通文件。
+    """
+    entries = _read_tree(repository, base, hash_size)
+    modes: dict[str, str] = {}
+    nested: dict[str, dict[str, str]] = {}
+    for path, blob in changes.items():
+        head, _, rest = path.partition("/")
+        if rest:
+            nested.setdefault(head, {})[rest] = blob
+            continue
+        mode = entries[head][0] if head in entries else FILE_MODE
+        if mode in _OBJECT_TYPES:
+            raise ValueError(f"不能用文件替换目录或子模块: {prefix}{head}")
+        if prefix + head in symlinks:
+            mode = SYMLINK_MODE
+        elif mode == SYMLINK_MODE:
+            mode = FILE_MODE
+        entries[head] = (mode, blob)
+        modes[prefix + head] = mode
+
+    for name, sub_changes in nested.items():
+        sub_base = None
+        if name in entries:
+            if entries[name][0] != TREE_MODE:
+                raise ValueError(f"路径不是目录: {prefix}{name}")
+            sub_base = entries[name][1]
+        sha, sub_modes = _build_tree(repository, writer, sub_base, sub_changes, hash_size, symlinks, f"{prefix}{name}/")
+        entries[name] = (TREE_MODE, sha)
+        modes.update(sub_modes)
+    return writer.write(entries), modes
+
+
+def _committer(repository: GitRepository, commit_sha: str) -> str:
+    """读取提交的 committer（姓名、邮箱和时间），用作标签的 tagger。"""
+    obj = commands.cat_file(repository.git_dir).read(commit_sha)
+    assert obj is not None
+    for line in obj[2].split(b"\n\n", 1)[0].decode("utf-8", "surrogateescape").splitlines():
+        if line.startswith("committer "):
+            return line[len("committer ") :]
+    raise ValueError(f"提交缺少 committer: {commit_sha}")
+
+
+def commit_files(
+    repository: GitRepository,
+    paths: Iterable[str],
+    message: str,
+    *,
+    tag: str | None = None,
+    tag_message: str | None = None,
+    root: str | Path | None = None,
+) -> PlumbingCommit:
+    """把工作区中 paths 的当前内容提交到当前分支，可选地创建附注标签。
+
+    paths 相对于 root（默认为工作区根目录；项目位于 monorepo 子目录时传入项目目录）。
+
+    不读取、不刷新整个索引；调用前工作区应当是干净的（除 paths 以外没有未提交的更改）。
+    与 ``git add`` 相同，符号链接按链接本身提交，不跟随到目标文件。不执行钩子、不签名，
+    调用前应当先用 ``ensure_plumbing_allowed`` 检查。
+
+    Raises:
+        CommandError: git 命令执行失败（包括分支在此期间被移动）
+        ValueError: 仓库没有工作区，路径在工作区之外，或路径与已有目录冲突
+    """
+    if repository.work_tree is None:
+        raise ValueError("裸仓库没有工作区")
+    cwd = repository.work_tree
+    top = cwd.resolve()
+    base = Path(root).resolve() if root is not None else top
+    # 只规范化路径中的 . 和 ..，不解析符号链接
+    paths = [Path(os.path.normpath(base / path)).relative_to(top).as_posix() for path in paths]
+    symlinks = frozenset(path for path in paths if (cwd / path).is_symlink())
+
+    # 1. 一次写入所有普通文件的 blob；符号链接写入链接内容（hash-object --stdin-paths 会跟随链接）
+    files = [path for path in paths if path not in symlinks]
+    changes: dict[str, str] = {}
+    if files:
+        blobs = commands.run(["git", "hash-object", "-w", "--stdin-paths"], cwd=cwd, input="\n".join(files) + "\n")
+        changes.update(zip(files, blobs.split(), strict=True))
+    for path in symlinks:
+        link = os.readlink(cwd / path)
+        changes[path] = commands.run(["git", "hash-object", "-w", "--stdin"], cwd=cwd, input=link).strip()
+
+    # 2. 沿改动路径重建树
+    ref = repository.symbolic_target("HEAD") or "HEAD"
+    parent = repository.head_commit()
+    hash_size = len(next(iter(changes.values()))) // 2
+    base_tree = f"{parent}^{{tree}}" if parent is not None else None
+    writer = _TreeWriter(cwd)
+    try:
+        tree, modes = _build_tree(repository, writer, base_tree, changes, hash_size, symlinks)
+    finally:
+        writer.close()
+
+    # 3. 提交与标签
+    parent_args = ["-p", parent] if parent is not None else []
+    if not message.endswith("\n"):
+        message += "\n"
+    commit_sha = commands.run(["git", "commit-tree", tree, *parent_args, "-F", "-"], cwd=cwd, input=message).strip()
+    tag_sha = None
+    if tag is not None:
+        tag_object = (
+            f"object {commit_sha}\ntype commit\ntag {tag}\ntagger {_committer(repository, commit_sha)}\n\n"
+            f"{tag_message if tag_message is not None else tag}\n"
+        )
+        tag_sha = commands.run(["git", "mktag"], cwd=cwd, input=tag_object).strip()
+
+    # 4. 原子地更新分支和标签：分支必须仍指向 parent，标签必须不存在
+    zero = "0" * (hash_size * 2)
+    transaction = f"update {ref} {commit_sha} {parent or zero}\n"
+    if tag_sha is not None:
+        transaction += f"create refs/tags/{tag} {tag_sha}\n"
+    subject = message.splitlines()[0] if message else ""
+    commands.run(["git", "update-ref", "-m", f"commit: {subject}", "--stdin"], cwd=cwd, input=transaction)
+
+    # 5. 只更新改动文件的索引条目
+    cacheinfo = [arg for path in changes for arg in ("--cacheinfo", f"{modes[path]},{changes[path]},{path}")]
+    commands.run(["git", "update-index", "--add", *cacheinfo], cwd=cwd)
+
+    return PlumbingCommit(commit_sha, tag_sha)
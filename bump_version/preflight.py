@@ -0,0 +1,282 @@
+"""发布前检查模块。
+
+读取项目版本号、读取当前分支（直接读取 .git，见 gitrepo）、检查工作区状态、探测 uv.lock 彼此独立，在线程池中并发执行：
+大仓库上耗时最长的 ``git status`` 不再与其他检查串行，并且以流式读取，找到足够的更改后立即停止。每个检查完成时立即回调（用于逐项显示结果）；
+任一检查失败时终止仍在运行的 git 子进程，不再等待其余检查的结果。
+"""
+
+import subprocess
+import tempfile
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from . import commands
+from .errors import CommandError, DirtyWorktreeError, NotAGitRepositoryError
+from .gitrepo import GitRepository
+from .project import read_project_version
+
+
+class CheckCancelled(Exception):
+    """检查因其他检查失败而被终止。"""
+
+
+class _Cancellation:
+    """在检查之间共享的取消状态，记录运行中的子进程以便终止。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._processes: set[subprocess.Popen[str]] = set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            processes = list(self._processes)
+        # terminate 而不是 kill：git 收到 SIGTERM 时会清理自己创建的锁文件
+        for process in processes:
+            process.terminate()
+
+    def start(self, argv: list[str], cwd: Path, text: bool = True, stderr: Any = subprocess.PIPE) -> subprocess.Popen:
+        """启动一个可被取消的子进程；已取消时抛出 CheckCancelled。用完后调用 finish。"""
+        with self._lock:
+            if self._cancelled:
+                raise CheckCancelled(" ".join(argv))
+            process = commands.popen(
+                argv,
+                cwd=cwd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                text=text,
+            )
+            self._processes.add(process)
+        return process
+
+    def finish(self, argv: list[str], process: subprocess.Popen) -> None:
+        """注销子进程；检查已被取消时抛出 CheckCancelled。"""
+        with self._lock:
+            self._processes.discard(process)
+        if self._cancelled:
+            raise CheckCancelled(" ".join(argv))
+
+    def run(self, argv: list[str], cwd: Path) -> str:
+        """执行命令并返回标准输出；已取消或被终止时抛出 CheckCancelled。"""
+        process = self.start(argv, cwd)
+        try:
+            stdout, stderr = process.communicate()
+        finally:
+            self.finish(argv, process)
+        if process.returncode != 0:
+            raise CommandError(argv, process.returncode, stderr)
+        return stdout
+
+
+# git status 的未跟踪文件模式：normal（未跟踪目录只列出目录）、all（列出每个文件）、no（忽略未跟踪文件）
+UNTRACKED_MODES = ("normal", "all", "no")
+
+# 工作区不干净时最多报告的更改数，找到这么多条后立即停止 git status
+DIRTY_SAMPLE_SIZE = 10
+
+# porcelain v2 各类记录中路径之前的字段数
+_PATH_FIELD = {"1": 8, "2": 9, "u": 10}
+
+
+@dataclass(frozen=True)
+class WorktreeStatus:
+    """工作区状态检查结果。"""
+
+    entries: tuple[str, ...]  # git status --porcelain 格式的更改（"XY 路径"），最多 limit 条
+    truncated: bool  # 是否因为达到 limit 提前停止（可能还有更多更改）
+
+    @property
+    def clean(self) -> bool:
+        return not self.entries
+
+
+def _status_entries(records: Iterator[bytes]) -> Iterator[str]:
+    """把 porcelain v2 记录转换为 porcelain v1 格式的 "XY 路径"。"""
+    for record in records:
+        line = record.decode("utf-8", "surrogateescape")
+        kind = line[:1]
+        if kind == "?":
+            yield f"?? {line[2:]}"
+        elif kind in _PATH_FIELD:
+            fields = line.split(" ", _PATH_FIELD[kind])
+            yield f"{fields[1].replace('.', ' ')} {fields[-1]}"
+            if kind == "2":
+                # 重命名记录后面紧跟原路径
+                next(records, None)
+        # "#" 头部和 "!" 忽略的文件不影响判断
+
+
+def _status_argv(root: Path, untracked: str, pathspecs: tuple[str, ...]) -> list[str]:
+    """构造 git status 命令：仓库没有显式配置时启用未跟踪文件缓存（fsmonitor 按仓库配置自动使用）。
+
+    不使用 --no-optional-locks：git status 需要顺便写回索引，才能保存未跟踪文件缓存和刷新后的
+    文件状态，下次检查才快。被取消时用 SIGTERM 终止 git，它会删除自己创建的 index.lock。
+    """
+    argv = ["git"]
+    if untracked != "no":
+        try:
+            configured = "core.untrackedcache" in GitRepository.discover(root).config()
+        except NotAGitRepositoryError:
+            configured = True
+        if not configured:
+            argv += ["-c", "core.untrackedCache=true"]
+    argv += ["status", "--porcelain=v2", "-z", "--no-renames", f"--untracked-files={untracked}", "--", *pathspecs]
+    return argv
+
+
+def scan_worktree(
+    root: str | Path = ".",
+    *,
+    untracked: str = "normal",
+    pathspecs: tuple[str, ...] = (),
+    limit: int = DIRTY_SAMPLE_SIZE,
+    cancellation: _Cancellation | None = None,
+) -> WorktreeStatus:
+    """流式读取 git status，找到 limit 条更改后立即终止 git，不等待完整输出。
+
+    Args:
+        root: 执行 git status 的目录，pathspecs 相对于该目录
+        untracked: 未跟踪文件模式，见 UNTRACKED_MODES
+        pathspecs: 只检查这些路径（如 "." 表示只检查 root 目录）；为空时检查整个仓库
+        limit: 最多收集的更改数
+        cancellation: 与其他检查共享的取消状态
+
+    Raises:
+        CommandError: git status 执行失败
+    """
+    if untracked not in UNTRACKED_MODES:
+        raise ValueError(f"不支持的未跟踪文件模式: {untracked}")
+    root = Path(root)
+    cancellation = cancellation or _Cancellation()
+    argv = _status_argv(root, untracked, pathspecs)
+
+    entries: list[str] = []
+    truncated = False
+    # 标准错误写入临时文件：git 输出大量警告时不会因为没人读取管道而阻塞
+    with tempfile.TemporaryFile() as errors:
+        process = cancellation.start(argv, root, text=False, stderr=errors)
+        finished = False
+        try:
+            for entry in _status_entries(commands.read_records(process.stdout)):  # type: ignore[arg-type]
+                entries.append(entry)
+                if len(entries) >= limit:
+                    truncated = True
+                    break
+            finished = not truncated
+        finally:
+            # 提前停止或读取出错时终止 git（SIGTERM，git 会删除自己创建的 index.lock）
+            if not finished:
+                process.terminate()
+            process.wait()
+            process.stdout.close()  # type: ignore[union-attr]
+            cancellation.finish(argv, process)
+        if not truncated and process.returncode != 0:
+            errors.seek(0)
+            raise CommandError(argv, process.returncode, errors.read().decode("utf-8", "replace"))
+    return WorktreeStatus(tuple(entries), truncated)
+
+
+def require_clean_worktree(
+    root: str | Path = ".",
+    *,
+    untracked: str = "normal",
+    pathspecs: tuple[str, ...] = (),
+    cancellation: _Cancellation | None = None,
+) -> WorktreeStatus:
+    """确认工作区干净（CLI 的发布前检查和 api.release 共用），参数见 scan_worktree。
+
+    Raises:
+        DirtyWorktreeError: 工作区有未提交的更改
+        CommandError: git status 执行失败
+    """
+    status = scan_worktree(root, untracked=untracked, pathspecs=pathspecs, cancellation=cancellation)
+    if not status.clean:
+        raise DirtyWorktreeError("\n".join(status.entries), status.truncated)
+    return status
+
+
+@dataclass(frozen=True)
+class PreflightResult:
+    """发布前检查的结果。"""
+
+    version: str
+    config_file: str
+    branch: str
+    has_uv_lock: bool
+
+
+def run_checks(
+    checks: dict[str, Callable[[_Cancellation], Any]],
+    on_result: Callable[[str, Any], None] | None = None,
+) -> dict[str, Any]:
+    """并发执行一组检查，返回 {名称: 结果}。
+
+    on_result 在主线程中按完成顺序调用。任一检查失败时取消其余检查，等待它们退出后
+    按 checks 的声明顺序抛出第一个真实的失败（被取消的检查不算），结果与完成顺序无关。
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    cancellation = _Cancellation()
+    results: dict[str, Any] = {}
+    with ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix="bump-preflight") as executor:
+        futures = {executor.submit(check, cancellation): name for name, check in checks.items()}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if any(future.exception() is not None for future in done):
+                cancellation.cancel()
+                wait(pending)
+                break
+            for future in done:
+                name = futures[future]
+                results[name] = future.result()
+                if on_result is not None:
+                    on_result(name, results[name])
+
+    for future in futures:
+        error = future.exception()
+        if error is not None and not isinstance(error, CheckCancelled):
+            raise error
+    return results
+
+
+def preflight(
+    root: str | Path = ".",
+    on_result: Callable[[str, Any], None] | None = None,
+    *,
+    untracked: str = "normal",
+    pathspecs: tuple[str, ...] = (),
+) -> PreflightResult:
+    """并发执行发布前检查。
+
+    on_result 依次收到 ("version", (版本号, 配置文件名))、("branch", 分支名)、
+    ("status", WorktreeStatus)、("uv_lock", bool)，顺序取决于完成先后。
+    untracked 和 pathspecs 控制工作区检查的范围，见 scan_worktree。
+
+    Raises:
+        ProjectNotFoundError: 没有找到项目配置文件
+        NotAGitRepositoryError: 不在 Git 仓库中
+        DirtyWorktreeError: 工作区有未提交的更改
+        CommandError: git 命令执行失败
+    """
+    root = Path(root)
+
+    results = run_checks(
+        {
+            "version": lambda cancellation: read_project_version(root),
+            "branch": lambda cancellation: GitRepository.discover(root).current_branch(),
+            "status": lambda cancellation: require_clean_worktree(
+                root, untracked=untracked, pathspecs=pathspecs, cancellation=cancellation
+            ),
+            "uv_lock": lambda cancellation: (root / "uv.lock").exists(),
+        },
+        on_result,
+    )
+    version, config_file = results["version"]
+    return PreflightResult(version, config_file, results["branch"], results["uv_lock"])
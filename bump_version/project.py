@@ -0,0 +1,312 @@
+"""项目配置文件读取模块。
+
+从 pyproject.toml（[project] 或 [tool.poetry]）或 setup.py 中读取、更新项目版本号，
+不做任何输出，供命令行、常驻服务和库接口共用。
+
+pyproject.toml 以 ProjectDocument 的形式按路径缓存：一次发布中的多个步骤（以及常驻服务的多次请求）
+共享同一份读取结果，文件的修改时间、大小或 inode 变化后才重新读取。读取版本号时使用能满足需求的
+最便宜的方式：先扫描原文，扫描无法确定时才用 tomllib 完整解析；tomlkit 只在改写版本号且无法直接
+定位时使用，只读操作从不加载它。
+"""
+
+import contextlib
+import os
+import re
+import stat
+import threading
+from pathlib import Path
+from typing import Any
+
+from .errors import ProjectNotFoundError
+
+__all__ = [
+    "PYPROJECT",
+    "SETUP_PY",
+    "ProjectDocument",
+    "ProjectNotFoundError",
+    "atomic_write",
+    "clear_document_cache",
+    "read_project_version",
+    "write_project_version",
+]
+
+PYPROJECT = "pyproject.toml"
+SETUP_PY = "setup.py"
+
+_SETUP_VERSION_PATTERN = re.compile(r'version\s*=\s*["\']([^"\']+)["\']')
+
+# ProjectDocument 缓存的最大文档数（常驻服务可能被问到很多项目）
+MAX_CACHED_DOCUMENTS = 64
+
+
+def read_project_version(root: str | Path = ".") -> tuple[str, str]:
+    """读取项目版本号，返回 (版本号, 配置文件名)。
+
+    优先使用 pyproject.toml 的 [project] 部分，其次是 [tool.poetry] 部分，最后是 setup.py。
+
+    Raises:
+        ProjectNotFoundError: 没有找到包含版本号的配置文件
+    """
+    root = Path(root)
+
+    try:
+        document = ProjectDocument.load(root / PYPROJECT)
+    except FileNotFoundError:
+        document = None
+    if document is not None and (version := document.version) is not None:
+        return version, PYPROJECT
+
+    setup_path = root / SETUP_PY
+    if setup_path.exists():
+        # 简单的版本提取（实际可能更复杂）
+        match = _SETUP_VERSION_PATTERN.search(setup_path.read_text())
+        if match:
+            return match.group(1), SETUP_PY
+
+    raise ProjectNotFoundError(f"未找到 Python 项目配置文件 ({PYPROJECT} 或 {SETUP_PY}): {root}")
+
+
+def _version_table(doc: dict[str, Any]) -> tuple[str, ...] | None:
+    """版本号所在的表：优先 [project]，其次 [tool.poetry]（与 read_project_version 一致）；没有版本号时返回 None。"""
+    project = doc.get("project")
+    if isinstance(project, dict) and "version" in project:
+        return ("project",)
+    tool = doc.get("tool")
+    poetry = tool.get("poetry") if isinstance(tool, dict) else None
+    if isinstance(poetry, dict) and "version" in poetry:
+        return ("tool", "poetry")
+    return None
+
+
+# 扫描 pyproject.toml 时关心的记号：行首的表头（[a.b]、[[a.b]]）和单行字符串形式的 version 键；
+# 多行字符串、单行字符串和注释整体跳过，避免把其中形似表头的内容当成表头
+_TOML_TOKEN_PATTERN = re.compile(
+    rb"""
+      (?P<multiline>\"\"\"(?:[^"\\]|\\.|"(?!""))*\"{3,5}|'''(?:[^']|'(?!''))*'{3,5})
+    | ^[ \t]*\[(?P<table>[^\[\]\r\n]*)\]
+    | ^[ \t]*(?P<array>\[\[)
+    | ^[ \t]*version[ \t]*=[ \t]*(?P<value>"[^"\\\r\n]*"|'[^'\r\n]*')[ \t]*(?:\#[^\r\n]*)?\r?$
+    | "(?:[^"\\\r\n]|\\.)*"
+    | '[^'\r\n]*'
+    | \#[^\r\n]*
+    """,
+    re.MULTILINE | re.DOTALL | re.VERBOSE,
+)
+
+# 按 read_project_version 的优先级排列的版本号所在表
+_VERSION_TABLES = (("project",), ("tool", "poetry"))
+
+
+def _version_span(content: bytes) -> tuple[tuple[str, ...], tuple[int, int]] | None:
+    """扫描原文，返回 (版本号所在的表, version 值含引号的字节范围)；找不到时返回 None。
+
+    只识别最常见的写法（表头下的 ``version = "..."``），内联表、点号键等写法返回 None。
+    """
+    targets = {tuple(part.encode() for part in table): table for table in _VERSION_TABLES}
+    found: dict[tuple[str, ...], tuple[int, int]] = {}
+    current: tuple[bytes, ...] | None = ()
+    for match in _TOML_TOKEN_PATTERN.finditer(content):
+        if match["table"] is not None:
+            current = tuple(part.strip() for part in match["table"].split(b"."))
+        elif match["array"] is not None:
+            current = None
+        elif match["value"] is not None and current in targets:
+            found.setdefault(targets[current], match.span("value"))
+            if _VERSION_TABLES[0] in found:
+                break
+    for table in _VERSION_TABLES:
+        if table in found:
+            return table, found[table]
+    return None
+
+
+def _rewrite_with_tomlkit(content: bytes, new_version: str) -> bytes:
+    """用 tomlkit 完整读写文档（保留格式，但在很大的文件上较慢）。"""
+    import tomlkit
+    from tomlkit import items
+
+    doc = tomlkit.parse(content.decode("utf-8"))
+
+    # 更新相应部分的版本
+    project = doc.get("project")
+    if isinstance(project, dict | items.Table) and "version" in project:
+        project["version"] = new_version
+    else:
+        tool = doc.get("tool")
+        if isinstance(tool, dict | items.Table):
+            poetry = tool.get("poetry")
+            if isinstance(poetry, dict | items.Table) and "version" in poetry:
+                poetry["version"] = new_version
+
+    return tomlkit.dumps(doc).encode("utf-8")
+
+
+def atomic_write(path: str | Path, data: bytes) -> None:
+    """先写入同目录下的临时文件再 os.replace，中途失败不会留下写了一半的文件。
+
+    保留原文件的权限（新建的文件只有所有者可以读写）；path 是符号链接时替换链接指向的文件。
+    """
+    import tempfile
+
+    target = Path(os.path.realpath(path))
+    try:
+        mode: int | None = stat.S_IMODE(target.stat().st_mode)
+    except FileNotFoundError:
+        mode = None
+    fd, temp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(temp_name, mode)
+        os.replace(temp_name, target)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temp_name)
+        raise
+
+
+class ProjectDocument:
+    """一次读入的 pyproject.toml。
+
+    原文在读取时保存，tomllib 解析结果在首次访问 data 时生成并缓存。通过 load 得到的文档在多个调用方
+    之间共享，不要修改 data。
+    """
+
+    def __init__(self, path: str | Path, content: bytes, data: dict[str, Any] | None = None):
+        self.path = Path(path)
+        self.content = content
+        self._data = data
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ProjectDocument":
+        """读取文件；文件的修改时间、大小和 inode 都没有变化时直接返回上次读取的文档。
+
+        Raises:
+            FileNotFoundError: 文件不存在
+        """
+        key = os.path.abspath(path)
+        stamp = _stat_stamp(key)
+        with _documents_lock:
+            cached = _documents.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        # 先取文件状态再读取内容：读取期间文件被修改时，下次 load 会因为状态不同而重新读取
+        with open(key, "rb") as f:
+            document = cls(key, f.read())
+        _remember(key, stamp, document)
+        return document
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """完整的 tomllib 解析结果。"""
+        if self._data is None:
+            import tomllib
+
+            self._data = tomllib.loads(self.content.decode("utf-8"))
+        return self._data
+
+    @property
+    def version(self) -> str | None:
+        """项目版本号（[project] 优先，其次 [tool.poetry]）；没有版本号时返回 None。
+
+        扫描原文直接找到 [project] 表头下的 version 时不做完整解析（它的优先级最高，合法的 TOML 中
+        不可能在别处再定义一次）；其余情况以 tomllib 的解析结果为准。
+        """
+        located = _version_span(self.content)
+        if located is not None and located[0] == _VERSION_TABLES[0]:
+            start, end = located[1]
+            return self.content[start + 1 : end - 1].decode("utf-8")
+        table = _version_table(self.data)
+        if table is None:
+            return None
+        section = self.data
+        for key in table:
+            section = section[key]
+        return str(section["version"])
+
+    def _replace_version(self, new_version: str) -> "ProjectDocument | None":
+        """只改写原文中版本号字符串所在的字节范围。
+
+        替换后用 tomllib 重新解析校验：版本号必须出现在 version 会读取的位置。
+        无法定位（写法特殊）或校验失败时返回 None。
+        """
+        import tomllib
+
+        located = _version_span(self.content)
+        if located is None:
+            return None
+        table, (start, end) = located
+        quote = self.content[start : start + 1]
+        updated = self.content[:start] + quote + new_version.encode("utf-8") + quote + self.content[end:]
+        try:
+            data = tomllib.loads(updated.decode("utf-8"))
+        except tomllib.TOMLDecodeError:
+            return None
+        if _version_table(data) != table:
+            return None
+        section = data
+        for key in table:
+            section = section[key]
+        return ProjectDocument(self.path, updated, data) if section["version"] == new_version else None
+
+    def with_version(self, new_version: str) -> "ProjectDocument":
+        """返回版本号替换为 new_version 的新文档（不写入文件）。
+
+        只替换版本号字符串本身，其余字节保持不变；无法安全定位时回退到 tomlkit 完整读写。
+        """
+        document = self._replace_version(new_version)
+        if document is None:
+            document = ProjectDocument(self.path, _rewrite_with_tomlkit(self.content, new_version))
+        return document
+
+    def save(self) -> None:
+        """原子地写入文件，并把自身记入缓存（随后的 load 不再读取和解析）。"""
+        atomic_write(self.path, self.content)
+        key = os.path.abspath(self.path)
+        _remember(key, _stat_stamp(key), self)
+
+
+_documents: dict[str, tuple[tuple[int, int, int], ProjectDocument]] = {}
+_documents_lock = threading.Lock()
+
+
+def _stat_stamp(path: str) -> tuple[int, int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _remember(key: str, stamp: tuple[int, int, int], document: ProjectDocument) -> None:
+    with _documents_lock:
+        _documents.pop(key, None)
+        _documents[key] = (stamp, document)
+        while len(_documents) > MAX_CACHED_DOCUMENTS:
+            # 淘汰最早放入的文档
+            del _documents[next(iter(_documents))]
+
+
+def clear_document_cache() -> None:
+    """清空 ProjectDocument 缓存。"""
+    with _documents_lock:
+        _documents.clear()
+
+
+def write_project_version(root: str | Path, new_version: str, file_type: str) -> Path:
+    """把新版本号写入配置文件，返回被修改的文件路径。
+
+    pyproject.toml 只替换版本号字符串本身，其余字节保持不变；无法安全定位时回退到 tomlkit 完整读写。
+    setup.py 使用正则替换。文件通过临时文件原子地替换。
+    """
+    path = Path(root) / file_type
+
+    if file_type == PYPROJECT:
+        ProjectDocument.load(path).with_version(new_version).save()
+
+    elif file_type == SETUP_PY:
+        # 简单的替换（实际可能需要更复杂的处理）
+        content = _SETUP_VERSION_PATTERN.sub(f'version="{new_version}"', path.read_text(encoding="utf-8"))
+        atomic_write(path, content.encode("utf-8"))
+
+    return path
@@ -0,0 +1,178 @@
+"""版本号流式排序模块。
+
+按 PEP 440 顺序排序任意规模的版本号流：输入在内存预算内时直接排序；超出预算时把已排序的
+分段写入临时文件，最后多路归并输出（外部归并排序）。求最大版本号只需一次遍历，内存占用恒定。
+"""
+
+import heapq
+import os
+import re
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import ExitStack
+from pathlib import Path
+
+from .bulk import iter_versions
+from .version_manager import SortKey, VersionManager
+
+# 默认内存预算（字节）
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+# 每条缓冲记录除字符串本身之外的估算开销：字符串对象头、列表槽位以及排序时的排序键
+_RECORD_OVERHEAD = 160
+
+# 一次归并同时打开的分段文件数上限，超出时先分批归并为更大的分段
+MAX_MERGE_FANIN = 64
+
+_SIZE_PATTERN = re.compile(r"^\s*(\d+)\s*([kmg]?)b?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+_version_manager = VersionManager()
+
+
+def parse_size(text: str) -> int:
+    """解析内存大小，支持 K/M/G 后缀（如 512M、2G），无效时抛出 ValueError。"""
+    match = _SIZE_PATTERN.match(text)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"无效的内存大小: {text}")
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2).lower()]
+
+
+def _sort_key(version: str) -> SortKey:
+    """已校验版本号的排序键（解析结果来自 LRU 缓存）。"""
+    version_parts = _version_manager.parse_version(version)
+    assert version_parts is not None
+    return version_parts.sort_key
+
+
+def _valid_versions(lines: Iterable[str], on_invalid: Callable[[str], None] | None) -> Iterator[str]:
+    """过滤出有效的版本号，无效的交给 on_invalid 处理。"""
+    for version in iter_versions(lines):
+        if _version_manager.parse_version(version) is not None:
+            yield version
+        elif on_invalid is not None:
+            on_invalid(version)
+
+
+def _write_run(versions: list[str], directory: Path, index: int) -> Path:
+    """把已排序的一段版本号写入临时文件。"""
+    path = directory / f"run-{index:06d}.txt"
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(f"{version}\n" for version in versions)
+    return path
+
+
+def _read_run(path: Path) -> Iterator[str]:
+    """逐行读取分段文件。"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def _merge(sources: list[Iterable[str]], reverse: bool) -> Iterator[str]:
+    """多路归并已排序的分段，相等的版本号保持分段顺序（即输入顺序）。"""
+    return heapq.merge(*sources, key=_sort_key, reverse=reverse)
+
+
+def _merge_runs(runs: list[Path], directory: Path, index: int, reverse: bool) -> Path:
+    """把一批分段归并为一个新分段，并删除原分段文件。"""
+    if len(runs) == 1:
+        return runs[0]
+    path = directory / f"run-{index:06d}.txt"
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(f"{version}\n" for version in _merge([_read_run(run) for run in runs], reverse))
+    for run in runs:
+        run.unlink()
+    return path
+
+
+def sort_versions(
+    lines: Iterable[str],
+    *,
+    reverse: bool = False,
+    unique: bool = False,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    temp_dir: str | os.PathLike[str] | None = None,
+    on_invalid: Callable[[str], None] | None = None,
+) -> Iterator[str]:
+    """按 PEP 440 顺序流式排序版本号，原样产出输入的写法（排序是稳定的）。
+
+    Args:
+        lines: 每行一个版本号的文本行
+        reverse: 是否降序
+        unique: 是否去掉相等的版本号（如 1.0 与 1.0.0），只保留第一个
+        memory_limit: 内存预算（字节），缓冲区超出预算时写出一个已排序的分段
+        temp_dir: 分段临时文件所在目录，默认使用系统临时目录
+        on_invalid: 遇到无效版本号时的回调，无效版本号不参与排序
+    """
+    with ExitStack() as stack:
+        runs: list[Path] = []
+        directory: Path | None = None
+        buffer: list[str] = []
+        buffered_bytes = 0
+
+        for version in _valid_versions(lines, on_invalid):
+            buffer.append(version)
+            buffered_bytes += len(version) + _RECORD_OVERHEAD
+            if buffered_bytes >= memory_limit:
+                if directory is None:
+                    import tempfile
+
+                    directory = Path(
+                        stack.enter_context(tempfile.TemporaryDirectory(prefix="bump-sort-", dir=temp_dir))
+                    )
+                buffer.sort(key=_sort_key, reverse=reverse)
+                runs.append(_write_run(buffer, directory, len(runs)))
+                buffer, buffered_bytes = [], 0
+
+        buffer.sort(key=_sort_key, reverse=reverse)
+        if not runs:
+            merged: Iterator[str] = iter(buffer)
+        else:
+            assert directory is not None
+            # 分段过多时逐层分批归并，保证同时打开的文件数有界；相邻分段合并以保持输入顺序
+            index = len(runs)
+            while len(runs) + 1 > MAX_MERGE_FANIN:
+                level = []
+                for start in range(0, len(runs), MAX_MERGE_FANIN):
+                    batch = runs[start : start + MAX_MERGE_FANIN]
+                    level.append(_merge_runs(batch, directory, index, reverse))
+                    index += 1
+                runs = level
+            merged = _merge([*(_read_run(path) for path in runs), buffer], reverse)
+
+        if not unique:
+            yield from merged
+            return
+
+        previous: SortKey | None = None
+        for version in merged:
+            key = _sort_key(version)
+            if key != previous:
+                yield version
+                previous = key
+
+
+def latest_version(
+    lines: Iterable[str],
+    *,
+    stable: bool = False,
+    on_invalid: Callable[[str], None] | None = None,
+) -> str | None:
+    """单次遍历求最大的版本号，原样返回输入的写法；没有符合条件的版本号时返回 None。
+
+    Args:
+        lines: 每行一个版本号的文本行
+        stable: 是否只考虑稳定版本（排除 dev/a/b/rc，post 版本视为稳定版本）
+        on_invalid: 遇到无效版本号时的回调
+    """
+    best: str | None = None
+    best_key: SortKey | None = None
+    for version in _valid_versions(lines, on_invalid):
+        version_parts = _version_manager.parse_version(version)
+        assert version_parts is not None
+        if stable and version_parts.is_prerelease:
+            continue
+        key = version_parts.sort_key
+        if best_key is None or key > best_key:
+            best, best_key = version, key
+    return best
@@ -0,0 +1,229 @@
+"""PEP 440 版本约束编译模块。
+
+把 SpecifierSet（如 ``>=1.4,<2``）编译为排序键空间上的若干区间。匹配时只需比较
+VersionParts 的排序键，不必为每个候选版本构造 packaging.Version；区间同时可以
+映射到 VersionArray 的整数列上做向量化比较。
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+from packaging.specifiers import Specifier, SpecifierSet
+from packaging.version import Version
+
+from .version_manager import SortKey, VersionParts, _build_parts
+
+# 排序键中本地标识符的上界哨兵：大于任何真实的本地标识符（真实段的首元素只有 0 和 1）
+LOCAL_MAX: tuple[tuple[int, int, str], ...] = ((2, 0, ""),)
+
+
+@dataclass(frozen=True, slots=True)
+class Bound:
+    """区间的一个端点。"""
+
+    key: SortKey
+    inclusive: bool
+
+
+# 编译结果缓存的容量：同一批约束会被反复查询
+SPECIFIER_CACHE_SIZE = 1024
+
+
+# 区间的下界和上界，None 表示无界
+Interval = tuple[Bound | None, Bound | None]
+
+_FULL_RANGE: tuple[Interval, ...] = ((None, None),)
+
+
+def _key(
+    version: Version,
+    *,
+    release: tuple[int, ...] | None = None,
+    pre: tuple[str, int] | None = None,
+    post: int | None = None,
+    dev: int | None = None,
+    local: str | None = None,
+) -> SortKey:
+    """由约束中的版本号（可替换部分字段）计算排序键。"""
+    return _build_parts(
+        version.epoch, release if release is not None else version.release, pre, post, dev, local
+    ).sort_key
+
+
+def _after_locals(key: SortKey) -> SortKey:
+    """大于 key 及其所有本地版本（V+local），但小于下一个公开版本的边界。"""
+    return (*key[:6], LOCAL_MAX)  # type: ignore[return-value]
+
+
+def _after_posts(key: SortKey) -> SortKey:
+    """大于 key 及其所有 post 版本（V.postN、V+local），但小于下一个版本的边界。"""
+    return (*key[:4], math.inf, math.inf, ())  # type: ignore[return-value]
+
+
+def _next_prefix_dev0(version: Version, release: tuple[int, ...]) -> SortKey:
+    """下一个前缀的最小版本：1.2 -> 1.3.dev0。"""
+    return _key(version, release=(*release[:-1], release[-1] + 1), dev=0)
+
+
+def _clause_intervals(specifier: Specifier) -> tuple[Interval, ...]:
+    """把单个约束子句编译为区间（与 packaging 的区间语义一致）。"""
+    op, text = specifier.operator, specifier.version
+
+    if text.endswith(".*"):
+        base = Version(text[:-2])
+        lower = Bound(_key(base, dev=0), True)
+        upper = Bound(_next_prefix_dev0(base, base.release), False)
+        if op == "==":
+            return ((lower, upper),)
+        # !=V.*
+        return ((None, Bound(lower.key, False)), (Bound(upper.key, True), None))
+
+    version = Version(text)
+    key = _key(version, pre=version.pre, post=version.post, dev=version.dev)
+    exact = _key(version, pre=version.pre, post=version.post, dev=version.dev, local=version.local)
+
+    if op == ">=":
+        return ((Bound(key, True), None),)
+    if op == "<=":
+        return ((None, Bound(_after_locals(key), True)),)
+    if op == ">":
+        if version.dev is not None:
+            # >V.devN：dev 版本没有 post 版本，下一个版本就是 V.dev(N+1)
+            return ((Bound(_key(version, pre=version.pre, post=version.post, dev=version.dev + 1), True), None),)
+        if version.post is not None:
+            # >V.postN：下一个版本是 V.post(N+1).dev0
+            return ((Bound(_key(version, pre=version.pre, post=version.post + 1, dev=0), True), None),)
+        # >V：排除 V 本身、V+local 以及所有 V.postN
+        return ((Bound(_after_posts(key), False), None),)
+    if op == "<":
+        # V 不是预发布版本时，<V 也排除 V 的预发布版本（V.dev0 是其中最小的）
+        bound = key if version.is_prerelease else _key(version, pre=version.pre, post=version.post, dev=0)
+        return ((None, Bound(bound, False)),)
+    if op == "~=":
+        upper = _next_prefix_dev0(version, version.release[:-1])
+        return ((Bound(key, True), Bound(upper, False)),)
+
+    # ==、!=：约束中没有本地标识符时，V 的本地版本也算相等
+    upper_key = exact if version.local else _after_locals(key)
+    if op == "==":
+        return ((Bound(exact, True), Bound(upper_key, True)),)
+    if op == "!=":
+        return ((None, Bound(exact, False)), (Bound(upper_key, False), None))
+
+    raise ValueError(f"不支持的约束运算符: {op}")
+
+
+def _lower_max(a: Bound | None, b: Bound | None) -> Bound | None:
+    """取两个下界中较紧的一个。"""
+    if a is None:
+        return b
+    if b is None or a.key > b.key:
+        return a
+    if a.key < b.key:
+        return b
+    return a if not a.inclusive else b
+
+
+def _upper_min(a: Bound | None, b: Bound | None) -> Bound | None:
+    """取两个上界中较紧的一个。"""
+    if a is None:
+        return b
+    if b is None or a.key < b.key:
+        return a
+    if a.key > b.key:
+        return b
+    return a if not a.inclusive else b
+
+
+def _is_empty(lower: Bound | None, upper: Bound | None) -> bool:
+    """判断区间是否为空。"""
+    if lower is None or upper is None:
+        return False
+    if lower.key != upper.key:
+        return lower.key > upper.key
+    return not (lower.inclusive and upper.inclusive)
+
+
+def _intersect(left: tuple[Interval, ...], right: tuple[Interval, ...]) -> tuple[Interval, ...]:
+    """求两组有序且互不重叠的区间的交集。"""
+    result = []
+    for a_lower, a_upper in left:
+        for b_lower, b_upper in right:
+            lower, upper = _lower_max(a_lower, b_lower), _upper_min(a_upper, b_upper)
+            if not _is_empty(lower, upper):
+                result.append((lower, upper))
+    result.sort(key=lambda interval: (0,) if interval[0] is None else (1, interval[0].key, not interval[0].inclusive))
+    return tuple(result)
+
+
+def key_in_intervals(key: SortKey, intervals: tuple[Interval, ...]) -> bool:
+    """判断排序键是否落在任一区间内（区间按下界有序）。"""
+    for lower, upper in intervals:
+        if lower is not None and (key < lower.key or (key == lower.key and not lower.inclusive)):
+            # 后面区间的下界只会更大
+            return False
+        if upper is None or key < upper.key or (key == upper.key and upper.inclusive):
+            return True
+    return False
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSpecifier:
+    """编译后的版本约束。"""
+
+    specifier: str  # 原始约束字符串
+    intervals: tuple[Interval, ...]  # 排序键空间上有序、互不重叠的区间
+    implies_prereleases: bool  # 约束本身是否提到了预发布版本（如 >=2.0b1），或 SpecifierSet 显式设置的 prereleases
+    arbitrary: tuple[str, ...] = ()  # === 子句要求的字符串（已转为小写）
+
+    def contains(self, version_parts: VersionParts, prereleases: bool | None = None, raw: str | None = None) -> bool:
+        """判断版本是否满足约束。
+
+        Args:
+            version_parts: 已解析的版本
+            prereleases: 是否接受预发布版本；None 表示仅当约束本身提到预发布版本时才接受
+            raw: 原始版本号字符串，仅 === 子句需要
+        """
+        if prereleases is None:
+            prereleases = self.implies_prereleases
+        if not prereleases and version_parts.is_prerelease:
+            return False
+        if self.arbitrary:
+            text = (raw if raw is not None else str(version_parts)).lower()
+            if any(text != expected for expected in self.arbitrary):
+                return False
+        return key_in_intervals(version_parts.sort_key, self.intervals)
+
+
+def compile_specifier(specifier: str | SpecifierSet) -> CompiledSpecifier:
+    """把约束字符串编译为区间表示（结果带 LRU 缓存），约束不合法时抛出 InvalidSpecifier。
+
+    SpecifierSet 显式设置了 prereleases 时以它为准（与 SpecifierSet.contains 一致）。
+    prereleases 为 None 时不实现 PEP 440 中“没有正式版本匹配时改为接受预发布版本”的回退规则：
+    该规则需要看到全部候选版本，与流式匹配相矛盾。需要预发布版本时请显式传入 prereleases=True。
+    """
+    if isinstance(specifier, SpecifierSet):
+        # SpecifierSet 的相等和哈希不考虑 prereleases，不能直接作为缓存键
+        return _compile_specifier(str(specifier), specifier.prereleases)
+    return _compile_specifier(specifier, None)
+
+
+@lru_cache(maxsize=SPECIFIER_CACHE_SIZE)
+def _compile_specifier(specifier: str, prereleases: bool | None) -> CompiledSpecifier:
+    specifier_set = SpecifierSet(specifier)
+
+    intervals = _FULL_RANGE
+    implies_prereleases = False
+    arbitrary = []
+    for clause in specifier_set:
+        if clause.operator == "===":
+            arbitrary.append(clause.version.lower())
+            continue
+        if clause.operator != "!=" and not clause.version.endswith(".*"):
+            implies_prereleases = implies_prereleases or Version(clause.version).is_prerelease
+        intervals = _intersect(intervals, _clause_intervals(clause))
+    if prereleases is not None:
+        implies_prereleases = prereleases
+
+    return CompiledSpecifier(str(specifier_set), intervals, implies_prereleases, tuple(arbitrary))
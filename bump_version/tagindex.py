@@ -0,0 +1,332 @@
+"""版本标签索引模块。
+
+发布前需要知道仓库中已有哪些版本标签：最高版本是什么、某个版本的下一个可用 rcN 是多少、
+要创建的标签是否已经存在。标签多达十万个时，每次都列出并解析全部标签太慢，这里把解析结果
+保存在 Git 公共目录的 ``bumpster/tags.sqlite3`` 中（链接工作树共享同一个索引）：
+
+- 每个标签一行，版本号标签额外保存可按字节比较的排序键（encode_sort_key）和基础版本号，
+  上述查询都走 B 树索引，复杂度 O(log n)；
+- refresh 只处理变化的部分：packed-refs 的修改时间和大小未变时不重新读取它，
+  松散标签与索引逐个比较 SHA，只解析和写入新增或变化的标签；
+- 索引损坏或格式不兼容时删除重建，Git 目录不可写时退回到内存数据库。
+"""
+
+import contextlib
+import json
+import math
+import sqlite3
+from pathlib import Path
+
+from .errors import TagExistsError
+from .gitrepo import GitRepository
+from .version_manager import SortKey, VersionManager, VersionParts
+
+# 索引文件相对于 Git 公共目录的路径
+INDEX_PATH = Path("bumpster") / "tags.sqlite3"
+
+# 索引格式版本，与已有文件不一致时重建索引
+SCHEMA_VERSION = 1
+
+_TAG_PREFIX = "refs/tags/"
+
+# 标签来源：packed-refs 或松散引用（同名时松散引用优先）；git 命令回退时统一记为松散引用
+_PACKED, _LOOSE = 0, 1
+
+# 变长整数编码的最大字节数：长度字节 0xFF 留给“没有 dev 段”（排在所有 dev 版本之后）
+_MAX_INT_BYTES = 254
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS tags (
+    origin INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    sort_key BLOB,
+    prerelease INTEGER,
+    base TEXT,
+    pre_type TEXT,
+    pre_num INTEGER,
+    PRIMARY KEY (origin, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_by_name ON tags (name);
+CREATE INDEX IF NOT EXISTS tags_by_version ON tags (sort_key) WHERE sort_key IS NOT NULL;
+CREATE INDEX IF NOT EXISTS tags_by_stable_version ON tags (sort_key) WHERE sort_key IS NOT NULL AND prerelease = 0;
+CREATE INDEX IF NOT EXISTS tags_by_prerelease ON tags (base, pre_type, pre_num) WHERE pre_type IS NOT NULL;
+"""
+
+_version_manager = VersionManager()
+
+
+def _encode_uint(number: int) -> bytes:
+    """变长无符号整数：长度字节在前、大端序数值在后，数值越大字节串越大。"""
+    data = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    if len(data) > _MAX_INT_BYTES:
+        raise OverflowError(number)
+    return bytes((len(data),)) + data
+
+
+def encode_sort_key(key: SortKey) -> bytes | None:
+    """把 PEP 440 排序键编码为字节串，字节串的字典序与排序键的顺序一致（SQLite 按 memcmp 比较 BLOB）。
+
+    整数使用变长编码，变长部分（版本段、本地标识符）每段前加标记字节、末尾以 0 结束。
+    数值大到无法编码时返回 None。
+    """
+    epoch, release, phase, pre_num, post, dev, local = key
+    try:
+        chunks = [_encode_uint(epoch)]
+        for number in release:
+            chunks += (b"\x01", _encode_uint(number))
+        chunks += (
+            b"\x00",
+            bytes((phase + 1,)),
+            _encode_uint(pre_num),
+            _encode_uint(post + 1),
+            b"\xff" if dev == math.inf else _encode_uint(int(dev)),
+        )
+        for numeric, number, text in local:
+            # 字母段 < 数字段
+            chunks += (b"\x02", _encode_uint(number)) if numeric else (b"\x01", text.encode("ascii"), b"\x00")
+        chunks.append(b"\x00")
+    except OverflowError:
+        return None
+    return b"".join(chunks)
+
+
+def _base(key: SortKey) -> str:
+    """基础版本号（纪元和去掉末尾 0 的版本段），如 2.3.0rc1 -> "2.3"。"""
+    release = ".".join(map(str, key[1]))
+    return f"{key[0]}!{release}" if key[0] else release
+
+
+def _row(origin: int, name: str, sha: str) -> tuple:
+    """标签在 tags 表中的一行；不是版本号的标签只保存名称和 SHA。"""
+    parts = _version_manager.parse_version(name)
+    sort_key = encode_sort_key(parts.sort_key) if parts is not None else None
+    if parts is None or sort_key is None:
+        return (origin, name, sha, None, None, None, None, None)
+    pre_type, pre_num = parts.pre if parts.pre is not None else (None, None)
+    return (origin, name, sha, sort_key, int(parts.is_prerelease), _base(parts.sort_key), pre_type, pre_num)
+
+
+class TagIndex:
+    """仓库版本标签的磁盘索引。
+
+    通过 open 打开（会先 refresh）；查询基于最近一次 refresh 时的标签。连接只能在创建它的线程中使用。
+    persist 为 False 时（干跑）在内存中建立索引，不在 Git 目录中创建或修改任何文件。
+    """
+
+    def __init__(self, repository: GitRepository, path: str | Path | None = None, *, persist: bool = True):
+        self.repository = repository
+        self.path = Path(path) if path is not None else repository.common_dir / INDEX_PATH
+        self._connection = self._connect() if persist else self._initialize(sqlite3.connect(":memory:"))
+
+    @classmethod
+    def open(cls, repository: GitRepository, path: str | Path | None = None, *, persist: bool = True) -> "TagIndex":
+        """打开（必要时创建）索引并同步到仓库当前的标签。"""
+        index = cls(repository, path, persist=persist)
+        index.refresh()
+        return index
+
+    def _connect(self) -> sqlite3.Connection:
+        """打开索引文件；文件损坏或格式不兼容时重建，无法写入时使用内存数据库。"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = self._initialize(sqlite3.connect(self.path, timeout=30))
+        except sqlite3.DatabaseError:
+            with contextlib.suppress(OSError):
+                self.path.unlink()
+            try:
+                connection = self._initialize(sqlite3.connect(self.path, timeout=30))
+            except (OSError, sqlite3.DatabaseError):
+                connection = self._initialize(sqlite3.connect(":memory:"))
+        except OSError:
+            connection = self._initialize(sqlite3.connect(":memory:"))
+        return connection
+
+    @staticmethod
+    def _initialize(connection: sqlite3.Connection) -> sqlite3.Connection:
+        """创建表结构；已有索引的格式版本不一致时清空重建。"""
+        try:
+            with connection:
+                connection.executescript(_SCHEMA)
+                row = connection.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+                if row is not None and row[0] != str(SCHEMA_VERSION):
+                    connection.execute("DELETE FROM tags")
+                    connection.execute("DELETE FROM meta")
+                connection.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+        except BaseException:
+            connection.close()
+            raise
+        return connection
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "TagIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _meta(self, key: str) -> str | None:
+        row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _sync(self, origin: int, current: dict[str, str]) -> int:
+        """让 origin 来源的行与 current（{标签名: SHA}）一致，返回变化的行数。"""
+        existing = dict(self._connection.execute("SELECT name, sha FROM tags WHERE origin = ?", (origin,)))
+        removed = [(origin, name) for name in existing.keys() - current.keys()]
+        changed = [_row(origin, name, sha) for name, sha in current.items() if existing.get(name) != sha]
+        self._connection.executemany("DELETE FROM tags WHERE origin = ? AND name = ?", removed)
+        self._connection.executemany("INSERT OR REPLACE INTO tags VALUES (?, ?, ?, ?, ?, ?, ?, ?)", changed)
+        return len(removed) + len(changed)
+
+    def refresh(self) -> int:
+        """把索引同步到仓库当前的标签，返回新增、变化和删除的标签数。"""
+        repository = self.repository
+        with self._connection:
+            if repository.uses_git_binary:
+                # reftable：通过 git for-each-ref 列出全部标签
+                tags = {name[len(_TAG_PREFIX) :]: sha for name, sha in repository.refs(_TAG_PREFIX).items()}
+                count = self._sync(_LOOSE, tags)
+            else:
+                count = 0
+                packed_path = repository.common_dir / "packed-refs"
+                try:
+                    stat = packed_path.stat()
+                    stamp = f"{stat.st_mtime_ns}:{stat.st_size}:{stat.st_ino}"
+                except FileNotFoundError:
+                    stamp = ""
+                if stamp != self._meta("packed_refs"):
+                    packed = {
+                        name[len(_TAG_PREFIX) :]: sha
+                        for name, sha in repository.packed_refs().items()
+                        if name.startswith(_TAG_PREFIX)
+                    }
+                    count += self._sync(_PACKED, packed)
+                    self._connection.execute("INSERT OR REPLACE INTO meta VALUES ('packed_refs', ?)", (stamp,))
+                loose = {name[len(_TAG_PREFIX) :]: sha for name, sha in repository.loose_refs(_TAG_PREFIX).items()}
+                count += self._sync(_LOOSE, loose)
+            if count:
+                # 标签有变化，上一次发布标签的缓存失效
+                self._connection.execute("DELETE FROM meta WHERE key = 'last_release'")
+            return count
+
+    def exists(self, tag: str) -> bool:
+        """标签是否存在。"""
+        return self._connection.execute("SELECT 1 FROM tags WHERE name = ? LIMIT 1", (tag,)).fetchone() is not None
+
+    def sha(self, tag: str) -> str | None:
+        """标签指向的对象（松散引用优先）；标签不存在时返回 None。"""
+        row = self._connection.execute(
+            "SELECT sha FROM tags WHERE name = ? ORDER BY origin DESC LIMIT 1", (tag,)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def highest(self, prereleases: bool = True) -> str | None:
+        """版本号最高的标签名；prereleases 为 False 时只考虑正式版本。没有版本标签时返回 None。"""
+        if prereleases:
+            query = "SELECT name FROM tags WHERE sort_key IS NOT NULL ORDER BY sort_key DESC LIMIT 1"
+        else:
+            query = "SELECT name FROM tags WHERE sort_key IS NOT NULL AND prerelease = 0 ORDER BY sort_key DESC LIMIT 1"
+        row = self._connection.execute(query).fetchone()
+        return row[0] if row is not None else None
+
+    def tags_for(self, version: str | VersionParts) -> list[str]:
+        """与 version 等价的版本标签（如 v1.0 和 v1.0.0）。"""
+        key = self._sort_key(version)
+        rows = self._connection.execute("SELECT DISTINCT name FROM tags WHERE sort_key = ? ORDER BY name", (key,))
+        return [name for (name,) in rows]
+
+    def last_release_tag(self, current_version: str | VersionParts) -> str | None:
+        """上一次发布的标签：当前版本的标签（优先 v 前缀）。
+
+        没有时取版本号不高于当前版本、并且在 HEAD 的历史中的最高标签：其他分支（如维护分支、
+        下一个大版本的预发布分支）上版本号更高的标签不是这个分支的上一次发布。都没有时返回 None。
+        可达性只用一次 git for-each-ref --merged 判断，结果按 (HEAD, 版本号) 缓存在索引中，
+        标签变化时失效：HEAD 和标签都没有变化时不启动子进程。
+        """
+        tags = self.tags_for(current_version)
+        if f"v{current_version}" in tags:
+            return f"v{current_version}"
+        if tags:
+            return tags[0]
+        head = self.repository.head_commit()
+        if head is None:
+            return None
+        key = [head, str(current_version)]
+        cached = self._meta("last_release")
+        if cached is not None and json.loads(cached)[:2] == key:
+            return json.loads(cached)[2]
+
+        rows = self._connection.execute(
+            "SELECT DISTINCT name, sort_key FROM tags WHERE sort_key IS NOT NULL AND sort_key <= ? "
+            "ORDER BY sort_key DESC, name",
+            (self._sort_key(current_version),),
+        )
+        tag = None
+        merged: set[str] | None = None
+        for name, _ in rows:
+            if merged is None:
+                merged = self.repository.merged_refs(_TAG_PREFIX)
+            if _TAG_PREFIX + name in merged:
+                tag = name
+                break
+        rows.close()
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('last_release', ?)", (json.dumps([*key, tag]),)
+            )
+        return tag
+
+    def next_prerelease_number(self, version: str | VersionParts, prerelease_type: str) -> int:
+        """基础版本号与 version 相同的 a / b / rc 标签中尚未使用的下一个序号（已有最大序号 + 1）。"""
+        parts = self._parts(version)
+        row = self._connection.execute(
+            "SELECT pre_num FROM tags WHERE base = ? AND pre_type = ? ORDER BY pre_num DESC LIMIT 1",
+            (_base(parts.sort_key), prerelease_type),
+        ).fetchone()
+        return 0 if row is None else row[0] + 1
+
+    @staticmethod
+    def _parts(version: str | VersionParts) -> VersionParts:
+        parts = version if isinstance(version, VersionParts) else _version_manager.parse_version(version)
+        if parts is None:
+            raise ValueError(f"无效的版本号: {version}")
+        return parts
+
+    def _sort_key(self, version: str | VersionParts) -> bytes | None:
+        return encode_sort_key(self._parts(version).sort_key)
+
+
+def next_free_version(repository: GitRepository, version: str, tag_prefix: str = "v", *, persist: bool = True) -> str:
+    """检查 version 的标签是否已经存在，返回可以使用的版本号。
+
+    标签已存在且 version 是 a / b / rc 预发布版本（不带 dev、post）时，跳到该阶段下一个尚未使用的序号
+    （并行的发布分支常常各自发布同一个 rcN）；其它版本的标签已存在时抛出 TagExistsError。
+    persist 为 False 时不写入磁盘上的索引（干跑）。
+
+    Raises:
+        TagExistsError: 标签已存在且无法自动选择其它版本号
+    """
+    with TagIndex.open(repository, persist=persist) as index:
+        if not index.exists(f"{tag_prefix}{version}"):
+            return version
+        parts = TagIndex._parts(version)
+        if parts.pre is None or parts.dev is not None or parts.post is not None:
+            raise TagExistsError(f"{tag_prefix}{version}")
+        number = index.next_prerelease_number(parts, parts.pre[0])
+        candidate = VersionParts(
+            parts.major,
+            parts.minor,
+            parts.patch,
+            prerelease_type=parts.pre[0],  # type: ignore[arg-type]
+            prerelease_num=number,
+            local=parts.local,
+            epoch=parts.epoch,
+            pre=(parts.pre[0], number),
+            release_tail=parts.release_tail,
+        )
+        if index.exists(f"{tag_prefix}{candidate}"):
+            raise TagExistsError(f"{tag_prefix}{candidate}")
+        return str(candidate)
@@ -0,0 +1,184 @@
+"""额外版本号位置（``__version__`` 等）的同步更新模块。
+
+除 pyproject.toml / setup.py 外，很多项目还在源码中保存版本号的副本（``__init__.py`` 中的
+``__version__``、文档配置等），发布时很容易忘记同步。在 pyproject.toml 中配置这些位置::
+
+    [tool.bumpster]
+    version-files = [
+        "src/pkg/__init__.py",                                  # 默认匹配 __version__ = "..."
+        { path = "docs/conf.py", pattern = 'release = "{version}"' },
+        { path = "README.md", pattern = ["pkg=={version}", "pkg@v{version}"] },
+    ]
+
+模式中的 ``{version}`` 匹配版本号，其余部分按字面匹配（空白可以是任意数量的空格或制表符）。
+每个文件的所有模式在加载配置时编译成一个正则表达式，一次替换完成该文件的全部改写。
+所有文件先读入内存并完成替换，全部成功后才逐个原子写入：任何一个文件缺失或没有匹配时不修改任何文件。
+文件较多时读取、替换和写入在线程池中并发进行。
+"""
+
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .errors import VersionTargetError
+from .project import PYPROJECT, ProjectDocument, atomic_write
+
+# 只写路径时使用的模式
+DEFAULT_PATTERNS = ('__version__ = "{version}"', "__version__ = '{version}'")
+
+# 文件数达到这个数量时在线程池中处理
+PARALLEL_THRESHOLD = 8
+
+# PEP 440 版本号中可能出现的字符（包括本地版本标识符），必须以字母或数字结尾：
+# 句末的 "pkg==1.2.3." 中最后的句点不属于版本号
+_VERSION_CHARS = r"[0-9A-Za-z!+._-]*[0-9A-Za-z]"
+
+_PLACEHOLDER = "{version}"
+
+
+def compile_patterns(patterns: Iterable[str]) -> re.Pattern[str]:
+    """把多个模式编译成一个正则表达式，第 i 个模式的版本号位于分组 ``v{i}``。
+
+    Raises:
+        VersionTargetError: 模式中没有恰好一个 ``{version}``
+    """
+    alternatives = []
+    for index, pattern in enumerate(patterns):
+        if pattern.count(_PLACEHOLDER) != 1:
+            raise VersionTargetError(f"模式中需要恰好一个 {_PLACEHOLDER}: {pattern!r}")
+        before, _, after = pattern.partition(_PLACEHOLDER)
+        alternatives.append(f"{_literal(before)}(?P<v{index}>{_VERSION_CHARS}){_literal(after)}")
+    if not alternatives:
+        raise VersionTargetError("没有配置任何模式")
+    return re.compile("|".join(alternatives))
+
+
+def _literal(text: str) -> str:
+    """字面匹配 text，其中的空白匹配任意数量的空格或制表符。"""
+    return r"[ \t]*".join(re.escape(part) for part in re.split(r"[ \t]+", text))
+
+
+@dataclass(frozen=True)
+class VersionTarget:
+    """一个需要同步版本号的文件。"""
+
+    path: str  # 相对于项目根目录的路径
+    patterns: tuple[str, ...]
+    matcher: re.Pattern[str]  # 由 patterns 编译而成
+
+    @classmethod
+    def create(cls, path: str, patterns: Iterable[str] = DEFAULT_PATTERNS) -> "VersionTarget":
+        patterns = tuple(patterns)
+        return cls(path, patterns, compile_patterns(patterns))
+
+    def rewrite(self, content: str, new_version: str) -> str:
+        """把 content 中所有匹配处的版本号替换为 new_version。
+
+        Raises:
+            VersionTargetError: 没有任何匹配
+        """
+
+        def replace(match: re.Match[str]) -> str:
+            group = match.lastgroup or ""
+            start, end = match.span(group)
+            offset = match.start()
+            text = match.group()
+            return text[: start - offset] + new_version + text[end - offset :]
+
+        updated, count = self.matcher.subn(replace, content)
+        if count == 0:
+            raise VersionTargetError(f"{self.path} 中没有找到版本号（模式: {', '.join(self.patterns)}）")
+        return updated
+
+
+def load_version_targets(root: str | Path = ".") -> list[VersionTarget]:
+    """读取 pyproject.toml 中 [tool.bumpster] 的 version-files 配置；没有配置时返回空列表。
+
+    同一个文件出现多次时合并为一个目标（只读写一次）。
+
+    Raises:
+        VersionTargetError: 配置格式错误
+    """
+    try:
+        document = ProjectDocument.load(Path(root) / PYPROJECT)
+    except FileNotFoundError:
+        return []
+    # 没有 [tool.bumpster] 时不需要完整解析
+    if b"bumpster" not in document.content:
+        return []
+    entries = document.data.get("tool", {}).get("bumpster", {}).get("version-files", [])
+    if not isinstance(entries, list):
+        raise VersionTargetError("[tool.bumpster] version-files 应为数组")
+
+    patterns: dict[str, list[str]] = {}
+    for entry in entries:
+        path, entry_patterns = _parse_entry(entry)
+        file_patterns = patterns.setdefault(path, [])
+        file_patterns += [pattern for pattern in entry_patterns if pattern not in file_patterns]
+    return [VersionTarget.create(path, file_patterns) for path, file_patterns in patterns.items()]
+
+
+def _parse_entry(entry: Any) -> tuple[str, tuple[str, ...]]:
+    """解析 version-files 中的一项：路径字符串，或 {path = ..., pattern = 字符串或字符串数组}。"""
+    if isinstance(entry, str):
+        return entry, DEFAULT_PATTERNS
+    if isinstance(entry, dict) and isinstance(entry.get("path"), str):
+        pattern = entry.get("pattern", list(DEFAULT_PATTERNS))
+        if isinstance(pattern, str):
+            return entry["path"], (pattern,)
+        if isinstance(pattern, list) and pattern and all(isinstance(p, str) for p in pattern):
+            return entry["path"], tuple(pattern)
+    raise VersionTargetError(f"无效的 version-files 配置项: {entry!r}")
+
+
+def _map[T, R](func: Callable[[T], R], items: list[T]) -> list[R]:
+    """对每一项调用 func；项数达到 PARALLEL_THRESHOLD 时在线程池中执行。第一个异常原样抛出。"""
+    if len(items) < PARALLEL_THRESHOLD:
+        return [func(item) for item in items]
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(32, len(items)), thread_name_prefix="bump-targets") as executor:
+        return list(executor.map(func, items))
+
+
+def prepare_version_targets(
+    root: str | Path, targets: list[VersionTarget], new_version: str
+) -> list[tuple[str, bytes]]:
+    """读取每个文件并在内存中替换版本号，返回需要写入的 (相对路径, 新内容)；内容没有变化的文件不返回。
+
+    Raises:
+        VersionTargetError: 文件不存在或没有匹配
+    """
+    root = Path(root)
+
+    def prepare(target: VersionTarget) -> tuple[str, bytes] | None:
+        try:
+            content = (root / target.path).read_bytes()
+        except (FileNotFoundError, IsADirectoryError) as e:
+            raise VersionTargetError(f"版本号文件不存在: {target.path}") from e
+        # surrogateescape：不是 UTF-8 的字节原样写回
+        updated = target.rewrite(content.decode("utf-8", "surrogateescape"), new_version)
+        data = updated.encode("utf-8", "surrogateescape")
+        return (target.path, data) if data != content else None
+
+    return [edit for edit in _map(prepare, targets) if edit is not None]
+
+
+def write_version_edits(root: str | Path, edits: list[tuple[str, bytes]]) -> list[str]:
+    """原子写入 prepare_version_targets 的结果，返回写入的文件（相对路径）。"""
+    root = Path(root)
+    _map(lambda edit: atomic_write(root / edit[0], edit[1]), edits)
+    return [path for path, _ in edits]
+
+
+def write_version_targets(root: str | Path, targets: list[VersionTarget], new_version: str) -> list[str]:
+    """更新所有额外位置的版本号，返回被修改的文件（相对路径）。
+
+    所有文件都替换成功后才开始写入，每个文件原子写入。
+
+    Raises:
+        VersionTargetError: 文件不存在或没有匹配（此时不修改任何文件）
+    """
+    return write_version_edits(root, prepare_version_targets(root, targets, new_version))
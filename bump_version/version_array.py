@@ -0,0 +1,373 @@
+"""列式版本号数组模块。
+
+把大量版本号存成若干定宽整数列（纪元、版本段、预发布阶段/序号、post、dev、本地标识符编号），
+排序、求最大值和按约束过滤都在 NumPy 中向量化完成，内存占用只有 packaging.Version 对象的一小部分。
+
+需要可选依赖 NumPy：``pip install 'bumpster[array]'``。
+"""
+
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from typing import Any, Self
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover - 取决于运行环境
+    raise ImportError("VersionArray 需要 NumPy，请执行: pip install 'bumpster[array]'") from exc
+
+from .specifiers import LOCAL_MAX, Bound, compile_specifier
+from .version_manager import (
+    _NO_PRE_PHASE,
+    _PRE_PHASE_ORDER,
+    SortKey,
+    VersionParts,
+    _build_parts,
+    _parse_fast,
+    _parse_with_packaging,
+    local_sort_key,
+)
+
+_PHASE_NAMES = {phase: name for name, phase in _PRE_PHASE_ORDER.items()}
+_INT32 = np.iinfo(np.int32)
+
+NDArray = Any  # numpy.ndarray，避免类型检查依赖 numpy 的存根
+
+
+def _compact(column: NDArray, sentinel: int | None = None) -> NDArray:
+    """在不丢失信息的前提下把 int64 列压缩为 int32，哨兵值映射为 int32 的最大值。"""
+    values = column if sentinel is None else column[column != sentinel]
+    if values.size and (values.min() < _INT32.min or values.max() >= _INT32.max):
+        return column
+    compact = column.astype(np.int32)
+    if sentinel is not None:
+        compact[column == sentinel] = _INT32.max
+    return compact
+
+
+def _sentinel(column: NDArray) -> int:
+    """列中代表“无穷大”（没有 dev 段等）的哨兵值。"""
+    return int(np.iinfo(column.dtype).max)
+
+
+class VersionArray:
+    """按列存储的版本号数组。
+
+    每个版本号占用约 40 字节：版本段按最长的版本补 0 存成二维列（补 0 不影响比较），
+    本地标识符去重后按排序键编号，只存一列 int32 编号。
+    """
+
+    __slots__ = ("_local_keys", "_locals", "dev", "epoch", "local", "phase", "post", "pre_num", "release")
+
+    def __init__(
+        self,
+        epoch: NDArray,
+        release: NDArray,
+        phase: NDArray,
+        pre_num: NDArray,
+        post: NDArray,
+        dev: NDArray,
+        local: NDArray,
+        locals_: tuple[str, ...] = (),
+    ) -> None:
+        """直接由列构造（通常应使用 from_strings / from_parts）。
+
+        Args:
+            epoch: 纪元，形状 (n,)
+            release: 版本段，形状 (n, k)，k >= 3
+            phase: 预发布阶段，-1 表示只有 dev 段，0/1/2 表示 a/b/rc，3 表示没有预发布段
+            pre_num: 预发布序号
+            post: post 序号，-1 表示没有
+            dev: dev 序号，列类型的最大值表示没有
+            local: 本地标识符编号，0 表示没有，i 表示 locals_[i - 1]
+            locals_: 按排序键升序排列的本地标识符
+        """
+        self.epoch = epoch
+        self.release = release
+        self.phase = phase
+        self.pre_num = pre_num
+        self.post = post
+        self.dev = dev
+        self.local = local
+        self._locals = locals_
+        self._local_keys = [local_sort_key(value) for value in locals_]
+
+    # ---- 构造 ----
+
+    @classmethod
+    def from_parts(cls, parts: Iterable[VersionParts]) -> Self:
+        """由已解析的 VersionParts 构造。"""
+        items = list(parts)
+        n = len(items)
+        keys = [p.sort_key for p in items]
+
+        width = max((len(key[1]) for key in keys), default=0)
+        width = max(width, 3)
+        release = np.zeros((n, width), dtype=np.int64)
+        for row, key in enumerate(keys):
+            release[row, : len(key[1])] = key[1]
+
+        # 本地标识符去重后按排序键编号，排序键相同的写法（如 1 和 01）共用一个编号
+        local_strings = sorted({p.local for p in items if p.local}, key=local_sort_key)
+        locals_: list[str] = []
+        codes: dict[str, int] = {}
+        previous_key = None
+        for value in local_strings:
+            key = local_sort_key(value)
+            if key != previous_key:
+                locals_.append(value)
+                previous_key = key
+            codes[value] = len(locals_)
+
+        int64_max = int(np.iinfo(np.int64).max)
+        return cls(
+            epoch=_compact(np.fromiter((key[0] for key in keys), dtype=np.int64, count=n)),
+            release=_compact(release),
+            phase=np.fromiter((key[2] for key in keys), dtype=np.int8, count=n),
+            pre_num=_compact(np.fromiter((key[3] for key in keys), dtype=np.int64, count=n)),
+            post=_compact(np.fromiter((key[4] for key in keys), dtype=np.int64, count=n)),
+            dev=_compact(
+                np.fromiter((int64_max if p.dev is None else p.dev for p in items), dtype=np.int64, count=n),
+                sentinel=int64_max,
+            ),
+            local=np.fromiter((codes[p.local] if p.local else 0 for p in items), dtype=np.int32, count=n),
+            locals_=tuple(locals_),
+        )
+
+    @classmethod
+    def from_strings(cls, versions: Iterable[str], *, skip_invalid: bool = False) -> Self:
+        """批量解析版本号字符串。
+
+        相同的字符串只解析一次，再按编号展开为完整的列，适合重复度很高的制品仓库数据。
+
+        Args:
+            versions: 版本号字符串（可带 v 前缀）
+            skip_invalid: 为 True 时跳过无效版本号，否则遇到无效版本号抛出 ValueError
+        """
+        unique: dict[str, int] = {}
+        indices: list[int] = []
+        for version in versions:
+            index = unique.get(version)
+            if index is None:
+                index = unique[version] = len(unique)
+            indices.append(index)
+
+        parsed: list[VersionParts | None] = []
+        for version in unique:
+            text = version.lstrip("v")
+            parts = _parse_fast(text) or _parse_with_packaging(text)
+            if parts is None and not skip_invalid:
+                raise ValueError(f"无效的版本号: {version}")
+            parsed.append(parts)
+
+        inverse = np.asarray(indices, dtype=np.int64)
+        if skip_invalid and any(parts is None for parts in parsed):
+            valid = np.fromiter((parts is not None for parts in parsed), dtype=bool, count=len(parsed))
+            # 重新编号，只保留有效版本号
+            remap = np.cumsum(valid) - 1
+            inverse = remap[inverse[valid[inverse]]]
+            parsed = [parts for parts in parsed if parts is not None]
+
+        return cls.from_parts(parts for parts in parsed if parts is not None).take(inverse)
+
+    # ---- 基本访问 ----
+
+    def __len__(self) -> int:
+        return len(self.epoch)
+
+    def __repr__(self) -> str:
+        return f"VersionArray(size={len(self)}, locals={len(self._locals)})"
+
+    def __getitem__(self, index: int) -> VersionParts:
+        """取出单个版本号（版本段中补齐的 0 会被去掉，但至少保留三段）。"""
+        release = [int(value) for value in self.release[index]]
+        end = len(release)
+        while end > 3 and release[end - 1] == 0:
+            end -= 1
+        phase = int(self.phase[index])
+        dev = int(self.dev[index])
+        post = int(self.post[index])
+        local = int(self.local[index])
+        return _build_parts(
+            int(self.epoch[index]),
+            tuple(release[:end]),
+            (_PHASE_NAMES[phase], int(self.pre_num[index])) if phase in _PHASE_NAMES else None,
+            None if post < 0 else post,
+            None if dev == _sentinel(self.dev) else dev,
+            self._locals[local - 1] if local else None,
+        )
+
+    def __iter__(self) -> Iterator[VersionParts]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_strings(self) -> list[str]:
+        """转换为规范化的版本号字符串列表。"""
+        return [str(parts) for parts in self]
+
+    def take(self, indices: NDArray) -> Self:
+        """按下标（或布尔掩码）取出子数组，本地标识符表共享。"""
+        taken = type(self).__new__(type(self))
+        taken.epoch = self.epoch[indices]
+        taken.release = self.release[indices]
+        taken.phase = self.phase[indices]
+        taken.pre_num = self.pre_num[indices]
+        taken.post = self.post[indices]
+        taken.dev = self.dev[indices]
+        taken.local = self.local[indices]
+        taken._locals = self._locals
+        taken._local_keys = self._local_keys
+        return taken
+
+    @property
+    def nbytes(self) -> int:
+        """各列占用的总字节数。"""
+        return sum(
+            column.nbytes
+            for column in (self.epoch, self.release, self.phase, self.pre_num, self.post, self.dev, self.local)
+        )
+
+    # ---- 排序与最值 ----
+
+    def _columns(self) -> list[NDArray]:
+        """按比较优先级排列的各列。"""
+        return [
+            self.epoch,
+            *(self.release[:, j] for j in range(self.release.shape[1])),
+            self.phase,
+            self.pre_num,
+            self.post,
+            self.dev,
+            self.local,
+        ]
+
+    def _packed_key(self) -> NDArray | None:
+        """各列取值范围的位宽之和不超过 64 时，把整行打包成一个 uint64 排序键。"""
+        if not len(self):
+            return None
+        columns = self._columns()
+        # dev 列的哨兵值是类型最大值，直接参与打包会占满位宽；换成“实际最大值 + 1”不改变顺序
+        has_dev = self.dev != _sentinel(self.dev)
+        dev_max = int(self.dev[has_dev].max()) if has_dev.any() else -1
+        columns[-2] = np.where(has_dev, self.dev, dev_max + 1)
+        bounds = [(int(column.min()), int(column.max())) for column in columns]
+        widths = [(high - low).bit_length() for low, high in bounds]
+        if sum(widths) > 64:
+            return None
+
+        packed = np.zeros(len(self), dtype=np.uint64)
+        shift = sum(widths)
+        for column, (low, _), width in zip(columns, bounds, widths, strict=True):
+            shift -= width
+            if width:
+                packed |= (column.astype(np.int64) - low).astype(np.uint64) << np.uint64(shift)
+        return packed
+
+    def argsort(self) -> NDArray:
+        """按 PEP 440 顺序排序的下标（稳定排序）。
+
+        常见数据的各列取值范围很小，可以打包成单个 uint64 后一次排序；否则退回多列的 lexsort。
+        """
+        packed = self._packed_key()
+        if packed is not None:
+            return np.argsort(packed, kind="stable")
+        # lexsort 以最后一个键为主键
+        return np.lexsort(self._columns()[::-1])
+
+    def sorted(self) -> Self:
+        """返回排序后的新数组。"""
+        return self.take(self.argsort())
+
+    def argmax(self) -> int:
+        """最大版本号的下标（有多个相等的最大值时取第一个），数组为空时抛出 ValueError。"""
+        if not len(self):
+            raise ValueError("空数组没有最大值")
+        candidates = np.arange(len(self))
+        for column in self._columns():
+            values = column[candidates]
+            candidates = candidates[values == values.max()]
+            if len(candidates) == 1:
+                break
+        return int(candidates[0])
+
+    def max(self) -> VersionParts:
+        """最大的版本号。"""
+        return self[self.argmax()]
+
+    # ---- 约束过滤 ----
+
+    def _local_code(self, key: tuple[tuple[int, int, str], ...]) -> float:
+        """把边界中的本地标识符映射到编号轴上：介于两个已有编号之间时取半数。"""
+        if not key:
+            return 0
+        if key == LOCAL_MAX:
+            return len(self._locals) + 1
+        position = bisect_left(self._local_keys, key)
+        if position < len(self._local_keys) and self._local_keys[position] == key:
+            return position + 1
+        return position + 0.5
+
+    def _compare(self, key: SortKey) -> NDArray:
+        """逐行与排序键做字典序比较，返回 -1/0/1。"""
+        epoch, release, phase, pre_num, post, dev, local = key
+        width = max(self.release.shape[1], len(release))
+        values: list[tuple[Any, float]] = [(self.epoch, epoch)]
+        for j in range(width):
+            column = self.release[:, j] if j < self.release.shape[1] else 0
+            values.append((column, release[j] if j < len(release) else 0))
+        values += [
+            (self.phase, phase),
+            (self.pre_num, pre_num),
+            (self.post, _sentinel(self.post) if post == float("inf") else post),
+            (self.dev, _sentinel(self.dev) if dev == float("inf") else dev),
+            (self.local, self._local_code(local)),
+        ]
+
+        result = np.zeros(len(self), dtype=np.int8)
+        undecided = np.ones(len(self), dtype=bool)
+        for column, value in values:
+            result[undecided & (column < value)] = -1
+            result[undecided & (column > value)] = 1
+            undecided &= column == value
+            if not undecided.any():
+                break
+        return result
+
+    def _satisfies_lower(self, bound: Bound) -> NDArray:
+        cmp = self._compare(bound.key)
+        return cmp >= 0 if bound.inclusive else cmp > 0
+
+    def _satisfies_upper(self, bound: Bound) -> NDArray:
+        cmp = self._compare(bound.key)
+        return cmp <= 0 if bound.inclusive else cmp < 0
+
+    def is_prerelease(self) -> NDArray:
+        """每行是否为预发布版本（包括 dev 版本）的布尔掩码。"""
+        return (self.phase != _NO_PRE_PHASE) | (self.dev != _sentinel(self.dev))
+
+    def mask(self, specifier: str, prereleases: bool | None = None) -> NDArray:
+        """满足约束的布尔掩码。
+
+        Args:
+            specifier: PEP 440 约束，如 ``>=1.4,<2``（不支持 ===）
+            prereleases: 是否接受预发布版本；None 表示仅当约束本身提到预发布版本时才接受
+        """
+        compiled = compile_specifier(specifier)
+        if compiled.arbitrary:
+            raise ValueError("VersionArray 不支持 === 约束")
+
+        result = np.zeros(len(self), dtype=bool)
+        for lower, upper in compiled.intervals:
+            inside = np.ones(len(self), dtype=bool)
+            if lower is not None:
+                inside &= self._satisfies_lower(lower)
+            if upper is not None:
+                inside &= self._satisfies_upper(upper)
+            result |= inside
+
+        if not (compiled.implies_prereleases if prereleases is None else prereleases):
+            result &= ~self.is_prerelease()
+        return result
+
+    def filter(self, specifier: str, prereleases: bool | None = None) -> Self:
+        """返回满足约束的子数组（保持原有顺序）。"""
+        return self.take(self.mask(specifier, prereleases))
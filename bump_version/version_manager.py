@@ -1,17 +1,48 @@
 """版本管理核心功能模块。"""
 
-from dataclasses import dataclass
-from typing import Literal
+import math
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Literal
 
-from packaging.version import InvalidVersion, Version
+if TYPE_CHECKING:
+    from packaging.specifiers import SpecifierSet
 
 ReleaseType = Literal["major", "minor", "patch"]
 PrereleaseType = Literal["a", "b", "rc", "dev", "post"]  # Python 风格的预发布类型
 
 
-@dataclass
+# 预发布阶段在排序键中的次序：仅有 dev 的版本 < a < b < rc < 无预发布段
+_PRE_PHASE_ORDER = {"a": 0, "b": 1, "rc": 2}
+_DEV_ONLY_PHASE = -1
+_NO_PRE_PHASE = 3
+
+# 排序键：(纪元, 去掉末尾 0 的版本段, 预发布阶段, 预发布序号, post, dev, 本地标识符)
+SortKey = tuple[int, tuple[int, ...], int, int, int, float, tuple[tuple[int, int, str], ...]]
+
+
+# 绕过冻结 dataclass 的 __setattr__ 直接写入字段
+_object_setattr = object.__setattr__
+
+
+def local_sort_key(local: str | None) -> tuple[tuple[int, int, str], ...]:
+    """本地标识符的排序键：数字段大于字母段，数字段按数值比较，字母段按字典序比较。"""
+    if not local:
+        return ()
+    return tuple((1, int(seg), "") if seg.isdigit() else (0, 0, seg) for seg in local.split("."))
+
+
+@dataclass(frozen=True, slots=True, eq=False, init=False)
 class VersionParts:
-    """版本号组成部分。"""
+    """版本号组成部分。
+
+    不可变、可哈希的值类型，按 PEP 440 规则比较大小，排序键计算一次后缓存在实例上。
+    prerelease_type / prerelease_num 是发布流程关注的主要后缀（dev 优先于 a/b/rc，其次是 post），
+    完整的 PEP 440 信息保存在 epoch、pre、post、dev 和 release_tail 中。
+    """
 
     major: int
     minor: int
@@ -21,6 +52,372 @@ class VersionParts:
     dev: int | None = None  # 开发版本号
     post: int | None = None  # 后发布版本号
     local: str | None = None  # Python 支持本地版本标识符
+    epoch: int = 0  # 纪元号（N!）
+    pre: tuple[str, int] | None = None  # a/b/rc 段，与 dev 同时存在时也会保留
+    release_tail: tuple[int, ...] = ()  # 修订号之后的版本段（如 1.2.3.4 中的 4）
+    _sort_key: SortKey | None = field(init=False, repr=False)
+
+    def __init__(
+        self,
+        major: int,
+        minor: int,
+        patch: int,
+        prerelease_type: PrereleaseType | None = None,
+        prerelease_num: int | None = None,
+        dev: int | None = None,
+        post: int | None = None,
+        local: str | None = None,
+        epoch: int = 0,
+        pre: tuple[str, int] | None = None,
+        release_tail: tuple[int, ...] = (),
+    ) -> None:
+        # 手写初始化：这里处于解析热路径上，比 dataclass 生成的冻结初始化快约一倍
+        # 只通过 prerelease_type 构造时，补全对应的 pre/dev/post 字段
+        if prerelease_type is not None:
+            if prerelease_type == "dev":
+                if dev is None:
+                    dev = prerelease_num or 0
+            elif prerelease_type == "post":
+                if post is None:
+                    post = prerelease_num or 0
+            elif pre is None:
+                pre = (prerelease_type, prerelease_num or 0)
+
+        _object_setattr(self, "major", major)
+        _object_setattr(self, "minor", minor)
+        _object_setattr(self, "patch", patch)
+        _object_setattr(self, "prerelease_type", prerelease_type)
+        _object_setattr(self, "prerelease_num", prerelease_num)
+        _object_setattr(self, "dev", dev)
+        _object_setattr(self, "post", post)
+        _object_setattr(self, "local", local)
+        _object_setattr(self, "epoch", epoch)
+        _object_setattr(self, "pre", pre)
+        _object_setattr(self, "release_tail", release_tail)
+        # 排序键在第一次比较时计算并缓存，纯解析场景不必承担这部分开销
+        _object_setattr(self, "_sort_key", None)
+
+    def _compute_sort_key(self) -> SortKey:
+        """按 PEP 440 的比较规则计算排序键。"""
+        release = (
+            (self.major, self.minor, self.patch, *self.release_tail)
+            if self.release_tail
+            else (
+                self.major,
+                self.minor,
+                self.patch,
+            )
+        )
+        end = len(release)
+        while end > 1 and release[end - 1] == 0:
+            end -= 1
+
+        pre, post, dev = self.pre, self.post, self.dev
+        if pre is not None:
+            phase, pre_num = _PRE_PHASE_ORDER[pre[0]], pre[1]
+        elif post is None and dev is not None:
+            # 1.0.dev0 排在 1.0a0 之前
+            phase, pre_num = _DEV_ONLY_PHASE, 0
+        else:
+            phase, pre_num = _NO_PRE_PHASE, 0
+
+        return (
+            self.epoch,
+            release[:end],
+            phase,
+            pre_num,
+            -1 if post is None else post,
+            math.inf if dev is None else dev,
+            local_sort_key(self.local),
+        )
+
+    @property
+    def is_prerelease(self) -> bool:
+        """是否为预发布版本（包括 dev 版本）。"""
+        return self.dev is not None or self.pre is not None
+
+    @property
+    def sort_key(self) -> SortKey:
+        """PEP 440 排序键（首次访问时计算并缓存）。"""
+        key = self._sort_key
+        if key is None:
+            key = self._compute_sort_key()
+            _object_setattr(self, "_sort_key", key)
+        return key
+
+    def __str__(self) -> str:
+        """渲染为规范形式的版本号字符串。"""
+        text = ".".join(map(str, (self.major, self.minor, self.patch, *self.release_tail)))
+        if self.epoch:
+            text = f"{self.epoch}!{text}"
+        if self.pre is not None:
+            text += f"{self.pre[0]}{self.pre[1]}"
+        if self.post is not None:
+            text += f".post{self.post}"
+        if self.dev is not None:
+            text += f".dev{self.dev}"
+        if self.local:
+            text += f"+{self.local}"
+        return text
+
+    def __hash__(self) -> int:
+        return hash(self.sort_key)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VersionParts):
+            return NotImplemented
+        return self.sort_key == other.sort_key
+
+    def __lt__(self, other: "VersionParts") -> bool:
+        if not isinstance(other, VersionParts):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other: "VersionParts") -> bool:
+        if not isinstance(other, VersionParts):
+            return NotImplemented
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other: "VersionParts") -> bool:
+        if not isinstance(other, VersionParts):
+            return NotImplemented
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other: "VersionParts") -> bool:
+        if not isinstance(other, VersionParts):
+            return NotImplemented
+        return self.sort_key >= other.sort_key
+
+
+# 本地版本标识符的段：含字母的段原样保留，纯数字段不能有前导零（packaging 会将其规范化）
+_LOCAL_SEGMENT = r"(?:[a-z0-9]*[a-z][a-z0-9]*|0|[1-9][0-9]*)"
+
+# 常见规范写法的快速解析模式：主.次.修订、a/b/rc、post、dev 和本地版本标识符。
+# 其他写法（epoch、四段以上版本号、alpha/preview 等别名、大写等）交给 packaging 处理。
+_FAST_VERSION_PATTERN = re.compile(
+    r"(?P<major>[0-9]+)(?:\.(?P<minor>[0-9]+))?(?:\.(?P<patch>[0-9]+))?"
+    r"(?:(?P<pre_l>a|b|rc)(?P<pre_n>[0-9]+))?"
+    r"(?:\.?post(?P<post>[0-9]+))?"
+    r"(?:\.?dev(?P<dev>[0-9]+))?"
+    rf"(?:\+(?P<local>{_LOCAL_SEGMENT}(?:\.{_LOCAL_SEGMENT})*))?"
+)
+
+# 解析缓存的容量上限
+PARSE_CACHE_SIZE = 65536
+
+
+def _build_parts(
+    epoch: int,
+    release: tuple[int, ...],
+    pre: tuple[str, int] | None,
+    post: int | None,
+    dev: int | None,
+    local: str | None,
+) -> VersionParts:
+    """由 PEP 440 的各组成部分构造 VersionParts。"""
+    if len(release) < 3:
+        release = (*release, 0, 0)[:3]
+    major, minor, patch, *tail = release
+
+    # 优先级：dev < pre < 正式版 < post
+    if dev is not None:
+        prerelease_type, prerelease_num = "dev", dev
+    elif pre is not None:
+        prerelease_type, prerelease_num = pre
+    elif post is not None:
+        prerelease_type, prerelease_num = "post", post
+    else:
+        prerelease_type, prerelease_num = None, None
+
+    return VersionParts(
+        major,
+        minor,
+        patch,
+        prerelease_type,  # type: ignore[arg-type]
+        prerelease_num,
+        dev,
+        post,
+        local,
+        epoch,
+        pre,
+        tuple(tail),
+    )
+
+
+def _parse_fast(version: str) -> VersionParts | None:
+    """使用预编译模式解析常见写法，无法识别时返回 None。"""
+    match = _FAST_VERSION_PATTERN.fullmatch(version)
+    if match is None:
+        return None
+
+    major, minor, patch, pre_l, pre_n, post, dev, local = match.groups()
+    major, minor, patch = int(major), int(minor) if minor else 0, int(patch) if patch else 0
+
+    # 与 _build_parts 相同的折算规则，内联以减少热路径上的函数调用
+    if dev is not None:
+        dev_num = int(dev)
+        return VersionParts(
+            major,
+            minor,
+            patch,
+            "dev",
+            dev_num,
+            dev_num,
+            int(post) if post is not None else None,
+            local,
+            0,
+            (pre_l, int(pre_n)) if pre_l else None,
+        )
+    if pre_l is not None:
+        pre_num = int(pre_n)
+        return VersionParts(
+            major,
+            minor,
+            patch,
+            pre_l,
+            pre_num,
+            None,
+            int(post) if post is not None else None,
+            local,
+            0,
+            (pre_l, pre_num),
+        )  # type: ignore[arg-type]
+    if post is not None:
+        post_num = int(post)
+        return VersionParts(major, minor, patch, "post", post_num, None, post_num, local)
+    return VersionParts(major, minor, patch, None, None, None, None, local)
+
+
+def _parse_with_packaging(version: str) -> VersionParts | None:
+    """使用 packaging 完整解析，处理快速模式无法识别的写法（只在这时导入 packaging）。"""
+    from packaging.version import InvalidVersion, Version
+
+    try:
+        pv = Version(version)
+    except InvalidVersion:
+        return None
+    return _build_parts(pv.epoch, pv.release, pv.pre, pv.post, pv.dev, pv.local)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(version: str) -> VersionParts | None:
+    """带 LRU 缓存的解析入口：先走快速路径，失败再回退到 packaging。"""
+    parts = _parse_fast(version)
+    if parts is None:
+        parts = _parse_with_packaging(version)
+    return parts
+
+
+RELEASE_TYPES: tuple[ReleaseType, ...] = ("major", "minor", "patch")
+PRERELEASE_TYPES: tuple[PrereleaseType, ...] = ("dev", "a", "b", "rc", "post")
+# 版本号当前所处的状态：None 表示正式版本
+VERSION_STATES: tuple[PrereleaseType | None, ...] = (None, *PRERELEASE_TYPES)
+
+# 迁移表的键：(当前状态, 版本号递增类型, 目标预发布类型)
+TransitionKey = tuple[PrereleaseType | None, ReleaseType, PrereleaseType | None]
+
+
+@dataclass(frozen=True, slots=True)
+class Transition:
+    """一条版本状态迁移规则。"""
+
+    bump: int | None  # 需要递增的版本段下标（0/1/2），其后的段归零；None 表示保持不变
+    suffix: str  # 新版本号的后缀前缀，如 "a"、".dev"；空字符串表示正式版本
+    increment: bool  # True 表示在当前序号上加 1，False 表示从 0 开始
+    error: str | None = None  # 不允许的迁移对应的错误信息
+
+    def apply(self, version_parts: VersionParts) -> str:
+        """对给定版本执行迁移，返回新版本号。"""
+        if self.error is not None:
+            raise ValueError(self.error)
+
+        major, minor, patch = version_parts.major, version_parts.minor, version_parts.patch
+        if self.bump == 0:
+            major, minor, patch = major + 1, 0, 0
+        elif self.bump == 1:
+            minor, patch = minor + 1, 0
+        elif self.bump == 2:
+            patch += 1
+
+        if not self.suffix:
+            return f"{major}.{minor}.{patch}"
+        number = (version_parts.prerelease_num or 0) + 1 if self.increment else 0
+        return f"{major}.{minor}.{patch}{self.suffix}{number}"
+
+
+def _suffix_for(prerelease_type: PrereleaseType) -> str:
+    """dev 和 post 使用点分写法，其他预发布类型紧跟版本号。"""
+    return f".{prerelease_type}" if prerelease_type in ("dev", "post") else prerelease_type
+
+
+def _transition_rule(
+    current: PrereleaseType | None, release_type: ReleaseType, target: PrereleaseType | None
+) -> Transition:
+    """计算单个 (状态, 操作) 组合的迁移规则，仅在构建迁移表时调用。"""
+    if current is None:
+        # 当前是正式版本：正式版本可以直接升级到 post 版本
+        if target == "post":
+            return Transition(None, ".post", False)
+        bump = RELEASE_TYPES.index(release_type)
+        return Transition(bump, _suffix_for(target) if target else "", False)
+
+    if target is None:
+        # 预发布 -> 正式版：去掉预发布后缀
+        return Transition(None, "", False)
+
+    if target == current:
+        # 相同类型：递增版本号
+        return Transition(None, _suffix_for(target), True)
+
+    # PEP 440 顺序: dev < a < b < rc < 正式版 < post
+    if current == "post":
+        # 从 post 版本只能继续 post 或者升级到新的主/次/修订版本
+        return Transition(None, "", False, f"不能从 post 版本回到 {target} 版本")
+    if target == "post":
+        return Transition(None, "", False, "不能从预发布版本直接升级到 post 版本，请先发布正式版本")
+
+    # 升级或降级预发布类型，序号都从 0 开始
+    return Transition(None, _suffix_for(target), False)
+
+
+def _build_transition_table() -> Mapping[TransitionKey, Transition]:
+    """枚举所有 (状态, 操作) 组合，构建只读的迁移表。"""
+    return MappingProxyType(
+        {
+            (current, release_type, target): _transition_rule(current, release_type, target)
+            for current in VERSION_STATES
+            for release_type in RELEASE_TYPES
+            for target in VERSION_STATES
+        }
+    )
+
+
+# 预先计算的迁移表，覆盖全部 6 x 3 x 6 种组合
+TRANSITION_TABLE = _build_transition_table()
+
+# 交互式发布流程在各状态下提供的目标类型（None 表示正式版本）
+# Dev 只能从正式版本或 dev 版本选择；a/b/rc 只能向后推进；post 只能从正式版本或 post 版本创建
+OFFERED_TARGETS: Mapping[PrereleaseType | None, tuple[PrereleaseType | None, ...]] = MappingProxyType(
+    {
+        None: (None, "dev", "a", "b", "rc", "post"),
+        "dev": (None, "dev", "a", "b", "rc"),
+        "a": (None, "a", "b", "rc"),
+        "b": (None, "b", "rc"),
+        "rc": (None, "rc"),
+        "post": (None, "post"),
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Candidate:
+    """某个发布操作对应的候选版本。"""
+
+    release_type: ReleaseType | None  # None 表示该操作与递增类型无关
+    prerelease_type: PrereleaseType | None  # None 表示正式版本
+    version: str | None  # 新版本号，不允许的操作为 None
+    error: str | None  # 不允许的操作对应的错误信息
+    offered: bool  # 交互式发布流程是否提供该选项
 
 
 class VersionManager:
@@ -28,143 +425,120 @@ class VersionManager:
 
     def parse_version(self, version: str) -> VersionParts | None:
         """解析版本号，支持 PEP 440 格式。"""
-        # 移除可能的 'v' 前缀
-        version = version.lstrip("v")
+        # 移除可能的 'v' 前缀；VersionParts 不可变，缓存中的实例可以直接共享
+        return _parse_cached(version.lstrip("v"))
 
-        try:
-            pv = Version(version)
-        except InvalidVersion:
-            return None
+    @staticmethod
+    def parse_cache_info() -> dict[str, int]:
+        """返回解析缓存的命中、未命中次数和容量信息。"""
+        info = _parse_cached.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "maxsize": info.maxsize or 0, "currsize": info.currsize}
 
-        # 提取主版本号
-        if len(pv.release) >= 3:
-            major, minor, patch = pv.release[:3]
-        else:
-            # 处理版本号不完整的情况（如 1.0 -> 1.0.0）
-            release = [*list(pv.release), 0, 0, 0]
-            major, minor, patch = release[:3]
-
-        # 统一处理预发布类型和版本号
-        prerelease_type = None
-        prerelease_num = None
-        dev_num = None
-        post_num = None
-
-        # 优先级：dev < pre < 正式版 < post
-        if pv.dev is not None:
-            # dev 版本
-            prerelease_type = "dev"
-            prerelease_num = pv.dev
-            dev_num = pv.dev
-        elif pv.pre:
-            # alpha, beta, rc 版本
-            prerelease_type = pv.pre[0]  # 'a', 'b', 'rc'
-            prerelease_num = pv.pre[1]
-        elif pv.post is not None:
-            # post 版本
-            prerelease_type = "post"
-            prerelease_num = pv.post
-            post_num = pv.post
+    @staticmethod
+    def clear_parse_cache() -> None:
+        """清空解析缓存。"""
+        _parse_cached.cache_clear()
 
-        return VersionParts(
-            major=major,
-            minor=minor,
-            patch=patch,
-            prerelease_type=prerelease_type,  # type: ignore
-            prerelease_num=prerelease_num,
-            dev=dev_num,
-            post=post_num,
-            local=pv.local,
-        )
+    def filter_by_specifier(
+        self,
+        versions: Iterable[str],
+        specifier: "str | SpecifierSet",
+        prereleases: bool | None = None,
+    ) -> Iterator[str]:
+        """流式筛选满足约束的版本号，按输入顺序原样产出，无效的版本号被跳过。
+
+        约束只编译一次（并且有缓存），每个候选版本只比较排序键，不构造 packaging.Version。
+
+        Args:
+            versions: 版本号字符串
+            specifier: PEP 440 约束，如 ``>=1.4,<2``，不合法时抛出 InvalidSpecifier
+            prereleases: 是否接受预发布版本；None 表示仅当约束本身提到预发布版本时才接受
+        """
+        from .specifiers import compile_specifier
+
+        compiled = compile_specifier(specifier)
+        contains = compiled.contains
+        for version in versions:
+            version_parts = self.parse_version(version)
+            if version_parts is not None and contains(version_parts, prereleases, version):
+                yield version
+
+    def _resolve(self, version: str | VersionParts) -> VersionParts:
+        """把版本号字符串解析为 VersionParts，已解析的直接返回。"""
+        if isinstance(version, VersionParts):
+            return version
+        version_parts = self.parse_version(version)
+        if not version_parts:
+            raise ValueError(f"无效的版本号格式: {version}")
+        return version_parts
+
+    def get_transition(
+        self,
+        current: PrereleaseType | None,
+        release_type: ReleaseType,
+        is_prerelease: bool,
+        prerelease_type: PrereleaseType | None,
+    ) -> Transition:
+        """查询迁移表，返回从当前状态执行该发布操作的迁移规则。"""
+        target = prerelease_type if is_prerelease else None
+        transition = TRANSITION_TABLE.get((current, release_type, target))
+        if transition is None:
+            raise ValueError(f"不支持的发布操作: {release_type} / {prerelease_type}")
+        return transition
 
     def get_next_version(
         self,
-        current_version: str,
+        current_version: str | VersionParts,
         release_type: ReleaseType,
         is_prerelease: bool,
         prerelease_type: PrereleaseType | None,
     ) -> str:
-        """计算下一个版本号。"""
-        version_parts = self.parse_version(current_version)
-        if not version_parts:
-            raise ValueError(f"无效的版本号格式: {current_version}")
-
-        major = version_parts.major
-        minor = version_parts.minor
-        patch = version_parts.patch
-
-        # 如果当前是预发布版本
-        if version_parts.prerelease_type:
-            if is_prerelease and prerelease_type:
-                if prerelease_type == version_parts.prerelease_type:
-                    # 相同类型：递增版本号
-                    new_num = (version_parts.prerelease_num or 0) + 1
-                    if prerelease_type in ["dev", "post"]:
-                        return f"{major}.{minor}.{patch}.{prerelease_type}{new_num}"
-                    else:
-                        return f"{major}.{minor}.{patch}{prerelease_type}{new_num}"
-                else:
-                    # 不同类型：检查升级路径
-                    # PEP 440 顺序: dev < a < b < rc < 正式版 < post
-                    prerelease_order = ["dev", "a", "b", "rc"]
-
-                    # 处理 post 版本的特殊情况
-                    if version_parts.prerelease_type == "post":
-                        # 从 post 版本只能继续 post 或者升级到新的主/次/修订版本
-                        if prerelease_type == "post":
-                            new_num = (version_parts.prerelease_num or 0) + 1
-                            return f"{major}.{minor}.{patch}.post{new_num}"
-                        else:
-                            # 不允许从 post 回到其他预发布版本
-                            raise ValueError(f"不能从 post 版本回到 {prerelease_type} 版本")
-                    elif prerelease_type == "post":
-                        # 不能从预发布版本直接到 post 版本
-                        raise ValueError("不能从预发布版本直接升级到 post 版本，请先发布正式版本")
-
-                    current_idx = (
-                        prerelease_order.index(version_parts.prerelease_type)
-                        if version_parts.prerelease_type in prerelease_order
-                        else -1
-                    )
-                    new_idx = prerelease_order.index(prerelease_type) if prerelease_type in prerelease_order else -1
-
-                    if new_idx > current_idx:
-                        # 升级预发布类型
-                        if prerelease_type in ["dev", "post"]:
-                            return f"{major}.{minor}.{patch}.{prerelease_type}0"
-                        else:
-                            return f"{major}.{minor}.{patch}{prerelease_type}0"
-                    else:
-                        # 降级警告，但仍然允许
-                        if prerelease_type in ["dev", "post"]:
-                            return f"{major}.{minor}.{patch}.{prerelease_type}0"
-                        else:
-                            return f"{major}.{minor}.{patch}{prerelease_type}0"
-            else:
-                # 预发布 -> 正式版：去掉预发布后缀
-                return f"{major}.{minor}.{patch}"
-        else:
-            # 当前是正式版本
-            if is_prerelease and prerelease_type == "post":
-                # 正式版本可以直接升级到 post 版本
-                return f"{major}.{minor}.{patch}.post0"
-
-            if release_type == "major":
-                major += 1
-                minor = 0
-                patch = 0
-            elif release_type == "minor":
-                minor += 1
-                patch = 0
-            elif release_type == "patch":
-                patch += 1
-
-            new_version = f"{major}.{minor}.{patch}"
-
-            if is_prerelease and prerelease_type and prerelease_type != "post":
-                if prerelease_type == "dev":
-                    new_version += f".{prerelease_type}0"
-                else:
-                    new_version += f"{prerelease_type}0"
-
-            return new_version
+        """计算下一个版本号。
+
+        current_version 可以是版本号字符串，也可以是已解析的 VersionParts（避免重复解析）。
+        """
+        version_parts = self._resolve(current_version)
+        transition = self.get_transition(version_parts.prerelease_type, release_type, is_prerelease, prerelease_type)
+        return transition.apply(version_parts)
+
+    def get_next_versions(
+        self,
+        versions: Iterable[str | VersionParts],
+        release_type: ReleaseType,
+        is_prerelease: bool,
+        prerelease_type: PrereleaseType | None,
+    ) -> list[str]:
+        """对一批版本号执行同一个发布操作，返回对应的下一个版本号列表。
+
+        迁移规则按当前状态预先取出，每个版本号只需一次字典查找。
+        """
+        rules = {
+            state: self.get_transition(state, release_type, is_prerelease, prerelease_type) for state in VERSION_STATES
+        }
+        results = []
+        for version in versions:
+            version_parts = self._resolve(version)
+            results.append(rules[version_parts.prerelease_type].apply(version_parts))
+        return results
+
+    def get_candidates(self, current_version: str | VersionParts) -> list[Candidate]:
+        """列出当前版本在所有发布操作下的候选版本，包括不允许的操作及其错误信息。
+
+        与递增类型无关的操作（如预发布版本之间的切换）只列出一次，release_type 为 None。
+        """
+        version_parts = self._resolve(current_version)
+        state = version_parts.prerelease_type
+        offered = OFFERED_TARGETS[state]
+
+        candidates = []
+        for target in VERSION_STATES:
+            rules = {release_type: TRANSITION_TABLE[(state, release_type, target)] for release_type in RELEASE_TYPES}
+            if len(set(rules.values())) == 1:
+                rules = {None: rules["patch"]}
+            for release_type, transition in rules.items():
+                try:
+                    version, error = transition.apply(version_parts), None
+                except ValueError as e:
+                    version, error = None, str(e)
+                candidates.append(Candidate(release_type, target, version, error, target in offered and error is None))
+        return candidates
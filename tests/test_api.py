@@ -0,0 +1,226 @@
+"""发布流程库接口测试。"""
+
+import asyncio
+import itertools
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from bump_version import api
+from bump_version.api import ReleaseResult, release, release_async, release_many
+from bump_version.errors import (
+    BranchNotAllowedError,
+    BumpError,
+    CommandError,
+    DirtyWorktreeError,
+    ProjectNotFoundError,
+    ReleaseNotAllowedError,
+    TagExistsError,
+)
+from bump_version.gitrepo import GitRepository
+from bump_version.preflight import DIRTY_SAMPLE_SIZE
+from tests.conftest import get_git_tags, get_last_commit_message, get_version_from_pyproject
+
+
+def head_sha(path) -> str:
+    """仓库当前的提交 SHA。"""
+    return subprocess.run(["git", "rev-parse", "HEAD"], cwd=path, capture_output=True, text=True).stdout.strip()
+
+
+class TestRelease:
+    """测试同步发布接口。"""
+
+    def test_release_patch(self, project_with_pyproject):
+        """测试发布修订版本并返回结构化结果。"""
+        path = project_with_pyproject["path"]
+
+        result = release(path, "patch", push=False)
+
+        assert isinstance(result, ReleaseResult)
+        assert (result.old_version, result.new_version, result.tag) == ("1.0.0", "1.0.1", "v1.0.1")
+        assert result.config_file == "pyproject.toml"
+        assert result.commit_sha == head_sha(path)
+        assert not result.pushed
+        assert {"check", "update", "commit", "tag"} <= set(result.timings)
+        assert get_version_from_pyproject(path) == "1.0.1"
+        assert get_last_commit_message(path) == "chore: release 1.0.1"
+        assert "v1.0.1" in get_git_tags(path)
+
+    def test_release_prerelease(self, project_with_setup_py):
+        """测试在 setup.py 项目中发布预发布版本。"""
+        result = release(project_with_setup_py["path"], "minor", "rc", push=False)
+
+        assert result.new_version == "1.1.0rc0"
+        assert result.config_file == "setup.py"
+
+    def test_dry_run(self, project_with_pyproject):
+        """测试干跑模式只计算不修改。"""
+        path = project_with_pyproject["path"]
+        before = head_sha(path)
+
+        result = release(path, "major", dry_run=True)
+
+        assert result.new_version == "2.0.0"
+        assert result.dry_run
+        assert result.commit_sha is None
+        assert head_sha(path) == before
+        assert get_version_from_pyproject(path) == "1.0.0"
+
+    def test_skip_push_env(self, project_with_pyproject, monkeypatch):
+        """测试 push 为 None 时遵循 BUMP_VERSION_SKIP_PUSH。"""
+        monkeypatch.setenv("BUMP_VERSION_SKIP_PUSH", "1")
+
+        assert not release(project_with_pyproject["path"]).pushed
+
+    def test_push_failure_raises_command_error(self, project_with_pyproject):
+        """测试没有远程仓库时推送失败抛出 CommandError。"""
+        with pytest.raises(CommandError) as exc_info:
+            release(project_with_pyproject["path"], push=True)
+
+        assert exc_info.value.argv[:2] == ["git", "push"]
+        assert exc_info.value.returncode != 0
+
+    def test_dirty_worktree(self, project_with_pyproject):
+        """测试工作区不干净时抛出 DirtyWorktreeError。"""
+        path = project_with_pyproject["path"]
+        (path / "untracked.txt").write_text("x")
+
+        with pytest.raises(DirtyWorktreeError, match=r"untracked\.txt"):
+            release(path, push=False)
+
+    def test_dirty_worktree_sampled(self, project_with_pyproject):
+        """测试与 CLI 的发布前检查相同：更改很多时只报告前几条，不读取完整的 git status。"""
+        path = project_with_pyproject["path"]
+        (path / "pyproject.toml").write_text((path / "pyproject.toml").read_text() + "\n")
+        for i in range(DIRTY_SAMPLE_SIZE * 2):
+            (path / f"untracked{i}.txt").write_text("x")
+
+        with pytest.raises(DirtyWorktreeError) as exc_info:
+            release(path, push=False)
+
+        assert exc_info.value.truncated
+        assert len(exc_info.value.status.splitlines()) == DIRTY_SAMPLE_SIZE
+        assert " M pyproject.toml" in exc_info.value.status.splitlines()
+
+    def test_branch_not_allowed(self, project_with_pyproject):
+        """测试不在主分支时抛出 BranchNotAllowedError，可以显式放行。"""
+        path = project_with_pyproject["path"]
+        subprocess.run(["git", "checkout", "-b", "feature"], cwd=path, check=True, capture_output=True)
+
+        with pytest.raises(BranchNotAllowedError) as exc_info:
+            release(path, push=False)
+        assert exc_info.value.branch == "feature"
+
+        assert release(path, push=False, allow_any_branch=True).new_version == "1.0.1"
+
+    def test_release_not_allowed(self, project_with_pyproject):
+        """测试不允许的发布操作抛出 ReleaseNotAllowedError（同时是 ValueError）。"""
+        path = project_with_pyproject["path"]
+        release(path, "patch", "a", push=False)
+
+        with pytest.raises(ReleaseNotAllowedError):
+            release(path, "patch", "post", push=False)
+        with pytest.raises(ValueError):
+            release(path, "patch", "post", push=False)
+
+    def test_existing_prerelease_tag_is_skipped(self, project_with_pyproject):
+        """测试预发布标签已存在时改为发布下一个可用序号。"""
+        path = project_with_pyproject["path"]
+        subprocess.run(["git", "tag", "v1.1.0rc0"], cwd=path, check=True)
+
+        result = release(path, "minor", "rc", push=False)
+
+        assert (result.new_version, result.tag) == ("1.1.0rc1", "v1.1.0rc1")
+        assert get_version_from_pyproject(path) == "1.1.0rc1"
+
+    def test_existing_tag(self, project_with_pyproject):
+        """测试正式版本的标签已存在时抛出 TagExistsError，不修改任何文件。"""
+        path = project_with_pyproject["path"]
+        subprocess.run(["git", "tag", "v1.0.1"], cwd=path, check=True)
+        before = head_sha(path)
+
+        with pytest.raises(TagExistsError, match=r"v1\.0\.1"):
+            release(path, "patch", push=False)
+
+        assert head_sha(path) == before
+        assert get_version_from_pyproject(path) == "1.0.0"
+
+    def test_project_not_found(self, git_repo):
+        """测试没有配置文件时抛出 ProjectNotFoundError。"""
+        subprocess.run(["git", "commit", "--allow-empty", "-m", "init"], cwd=git_repo, check=True, capture_output=True)
+
+        with pytest.raises(ProjectNotFoundError):
+            release(git_repo, push=False)
+
+    def test_errors_share_base_class(self):
+        """测试所有异常都继承自 BumpError。"""
+        for error in (BranchNotAllowedError, CommandError, DirtyWorktreeError, ProjectNotFoundError, TagExistsError):
+            assert issubclass(error, BumpError)
+
+
+class TestReleaseAsync:
+    """测试异步发布接口。"""
+
+    def test_release_async(self, project_with_pyproject):
+        """测试异步发布与同步发布结果一致。"""
+        path = project_with_pyproject["path"]
+
+        result = asyncio.run(release_async(path, "minor", push=False))
+
+        assert result.new_version == "1.1.0"
+        assert result.commit_sha == head_sha(path)
+        assert "v1.1.0" in get_git_tags(path)
+
+    def test_event_loop_not_blocked(self, project_with_pyproject, monkeypatch):
+        """测试文件和 git 访问不在事件循环中执行：同时运行的计时任务在发布期间持续推进。"""
+        path = project_with_pyproject["path"]
+
+        def slow(func):
+            def wrapper(*args, **kwargs):
+                time.sleep(0.2)
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        monkeypatch.setattr(api, "read_project_version", slow(api.read_project_version))
+        monkeypatch.setattr(api, "load_version_targets", slow(api.load_version_targets))
+        monkeypatch.setattr(GitRepository, "current_branch", slow(GitRepository.current_branch))
+        monkeypatch.setattr(GitRepository, "head_commit", slow(GitRepository.head_commit))
+
+        async def main():
+            ticks = []
+            release_task = asyncio.create_task(release_async(path, push=False))
+            while not release_task.done():
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+            await release_task
+            return max(b - a for a, b in itertools.pairwise(ticks))
+
+        assert asyncio.run(main()) < 0.15
+        assert get_version_from_pyproject(path) == "1.0.1"
+
+    def test_release_async_errors(self, project_with_pyproject):
+        """测试异步发布抛出相同的类型化异常。"""
+        path = project_with_pyproject["path"]
+        (path / "untracked.txt").write_text("x")
+
+        with pytest.raises(DirtyWorktreeError):
+            asyncio.run(release_async(path, push=False))
+
+    def test_release_many(self, project_with_pyproject, tmp_path):
+        """测试并发发布多个仓库，失败的仓库不影响其他仓库。"""
+        source = project_with_pyproject["path"]
+        paths = []
+        for i in range(3):
+            target = tmp_path / f"repo{i}"
+            shutil.copytree(source, target)
+            paths.append(target)
+        (paths[1] / "dirty.txt").write_text("x")
+
+        results = asyncio.run(release_many(paths, "patch", push=False, concurrency=2))
+
+        assert isinstance(results[1], DirtyWorktreeError)
+        assert [r.new_version for r in (results[0], results[2])] == ["1.0.1", "1.0.1"]
+        assert all(get_version_from_pyproject(p) == "1.0.1" for p in (paths[0], paths[2]))
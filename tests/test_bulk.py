@@ -0,0 +1,99 @@
+"""批量版本号校验测试。"""
+
+import json
+import subprocess
+import sys
+
+from bump_version.bulk import ValidationSummary, check_version, chunked, iter_versions, validate_stream
+
+
+class TestBulkHelpers:
+    """测试批量校验的辅助函数。"""
+
+    def test_check_version_valid(self):
+        """测试有效版本号返回规范化形式。"""
+        assert check_version("v1.0.0-alpha.1") == {"input": "v1.0.0-alpha.1", "valid": True, "normalized": "1.0.0a1"}
+
+    def test_check_version_invalid(self):
+        """测试无效版本号。"""
+        assert check_version("abc") == {"input": "abc", "valid": False, "normalized": None}
+
+    def test_iter_versions_skips_blank_lines(self):
+        """测试跳过空行并去掉换行。"""
+        assert list(iter_versions(["1.0\n", "\n", "  2.0  \n", ""])) == ["1.0", "2.0"]
+
+    def test_chunked(self):
+        """测试按块切分。"""
+        assert list(chunked(iter(["a", "b", "c", "d", "e"]), 2)) == [["a", "b"], ["c", "d"], ["e"]]
+
+    def test_summary(self):
+        """测试汇总统计。"""
+        summary = ValidationSummary()
+        for result in (check_version("1.0"), check_version("x"), check_version("2.0")):
+            summary.add(result)
+        assert summary.as_dict() == {"total": 3, "valid": 2, "invalid": 1}
+
+
+class TestValidateStream:
+    """测试流式校验。"""
+
+    def test_single_chunk_runs_inline(self):
+        """测试单块输入在当前进程中完成。"""
+        results = list(validate_stream(["1.0.0", "bad"], workers=4))
+        assert [r["valid"] for r in results] == [True, False]
+
+    def test_parallel_preserves_order(self):
+        """测试进程池并行时结果保持输入顺序。"""
+        lines = [f"1.{i}.0" if i % 7 else "invalid" for i in range(500)]
+        results = list(validate_stream(lines, workers=2, chunk_size=37))
+
+        assert [r["input"] for r in results] == lines
+        assert sum(not r["valid"] for r in results) == len([line for line in lines if line == "invalid"])
+
+    def test_empty_input(self):
+        """测试空输入。"""
+        assert list(validate_stream([], workers=2)) == []
+
+
+class TestBulkCommandLine:
+    """测试 validate 子命令的批量模式。"""
+
+    def test_validate_stdin(self):
+        """测试从标准输入批量验证。"""
+        result = subprocess.run(
+            [sys.executable, "-m", "bump_version.cli", "validate", "--stdin"],
+            input="1.0.0\nv2.0.0.dev1\n",
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [r["normalized"] for r in records] == ["1.0.0", "2.0.0.dev1"]
+        assert json.loads(result.stderr.strip().splitlines()[-1]) == {"summary": {"total": 2, "valid": 2, "invalid": 0}}
+
+    def test_validate_from_file_with_invalid(self, temp_dir):
+        """测试从文件批量验证，存在无效版本号时退出码为 1。"""
+        versions_file = temp_dir / "versions.txt"
+        versions_file.write_text("1.0.0\nnot-a-version\n1.0.0rc1\n")
+
+        result = subprocess.run(
+            [sys.executable, "-m", "bump_version.cli", "validate", "--from-file", str(versions_file), "--workers", "1"],
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 1
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [r["valid"] for r in records] == [True, False, True]
+
+    def test_validate_requires_input(self):
+        """测试既没有版本号也没有批量输入时报错。"""
+        result = subprocess.run(
+            [sys.executable, "-m", "bump_version.cli", "validate"],
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 2
+        assert "--stdin" in result.stderr
@@ -0,0 +1,173 @@
+"""更新日志生成测试。"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from bump_version.api import release
+from bump_version.changelog import CommitCache, generate_changelog, prepend_changelog, release_notes
+from bump_version.errors import CommandError
+from bump_version.gitrepo import GitRepository
+
+
+def commit(path: Path, message: str) -> str:
+    subprocess.run(["git", "commit", "--allow-empty", "-m", message], cwd=path, check=True, capture_output=True)
+    return subprocess.run(["git", "rev-parse", "HEAD"], cwd=path, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def history(project_with_pyproject) -> Path:
+    """v1.0.0 之后有各类提交的项目。"""
+    path = project_with_pyproject["path"]
+    commit(path, "feat: 1.0.0 之前的功能")
+    subprocess.run(["git", "tag", "v1.0.0"], cwd=path, check=True)
+    for message in (
+        "fix(cli): 修复参数解析",
+        "docs: 更新文档",
+        "feat: 新增 changelog 命令",
+        "perf: 加速标签查询",
+        "refactor!: 删除旧接口",
+        "不规范的提交信息",
+    ):
+        commit(path, message)
+    return path
+
+
+class TestGenerateChangelog:
+    """测试按分组生成更新日志。"""
+
+    def test_grouped_notes(self, history):
+        """测试按分组输出，组内按 git log 顺序（新的在前），不触发发布的提交不出现。"""
+        notes = generate_changelog(GitRepository.discover(history), "v1.0.0", title="v2.0.0")
+
+        lines = [line for line in notes.text.splitlines() if line and not line.startswith("- ")]
+        assert lines == ["## v2.0.0", "### ⚠️ 破坏性变更", "### ✨ 新功能", "### 🐛 问题修复", "### ⚡ 性能优化"]
+        assert "- 删除旧接口 (" in notes.text
+        assert "- **cli:** 修复参数解析 (" in notes.text
+        assert "1.0.0 之前" not in notes.text
+        assert "更新文档" not in notes.text
+        assert (notes.commits, notes.classified) == (6, 6)
+
+    def test_only_unseen_commits_are_classified(self, history):
+        """测试已经分类过的提交直接使用缓存，只解析新的提交。"""
+        repository = GitRepository.discover(history)
+        generate_changelog(repository, "v1.0.0")
+
+        commit(history, "fix: 又一个修复")
+        notes = generate_changelog(repository, "v1.0.0")
+
+        assert (notes.commits, notes.classified) == (7, 1)
+        assert "又一个修复" in notes.text
+        with CommitCache(repository) as cache:
+            assert len(cache) == 7
+
+    def test_whole_history_without_since(self, history):
+        """测试没有起点时包含全部历史。"""
+        notes = generate_changelog(GitRepository.discover(history), None)
+
+        assert "1.0.0 之前的功能" in notes.text
+
+    def test_empty_range(self, history):
+        """测试没有需要记录的提交。"""
+        notes = generate_changelog(GitRepository.discover(history), "HEAD", title="v2.0.0")
+
+        assert notes.text == "## v2.0.0\n\n没有需要记录的更改。\n"
+
+    def test_unknown_revision(self, history):
+        """测试版本不存在时抛出 CommandError，选项形式的版本被拒绝。"""
+        repository = GitRepository.discover(history)
+        with pytest.raises(CommandError):
+            generate_changelog(repository, "v9.9.9")
+        with pytest.raises(ValueError):
+            generate_changelog(repository, "--all")
+
+    def test_release_notes_start_at_current_version_tag(self, history):
+        """测试发布流程从当前版本的标签开始。"""
+        notes = release_notes(GitRepository.discover(history), "1.0.0", "v2.0.0")
+
+        assert notes.commits == 6
+
+
+class TestPrependChangelog:
+    """测试插入到更新日志文件开头。"""
+
+    def test_keeps_top_heading(self, temp_dir):
+        """测试保留一级标题，新内容插入在旧条目之前。"""
+        path = temp_dir / "CHANGELOG.md"
+        path.write_text("# 更新日志\n\n## v1.0.0\n\n- 旧条目\n", encoding="utf-8")
+
+        prepend_changelog(path, "## v1.1.0\n\n- 新条目\n")
+
+        assert path.read_text(encoding="utf-8") == "# 更新日志\n\n## v1.1.0\n\n- 新条目\n\n## v1.0.0\n\n- 旧条目\n"
+
+    def test_creates_file(self, temp_dir):
+        """测试文件不存在时创建。"""
+        path = temp_dir / "CHANGELOG.md"
+
+        prepend_changelog(path, "## v1.0.0\n")
+
+        assert path.read_text(encoding="utf-8") == "## v1.0.0\n"
+
+
+class TestReleaseWithChangelog:
+    """测试发布流程中的更新日志步骤。"""
+
+    def test_changelog_is_committed(self, history):
+        """测试更新日志与版本号在同一个提交中。"""
+        result = release(history, "major", push=False, changelog=True)
+
+        content = (history / "CHANGELOG.md").read_text(encoding="utf-8")
+        assert content.startswith(f"## {result.tag} (")
+        assert "新增 changelog 命令" in content
+        assert "changelog" in result.timings
+        changed = subprocess.run(
+            ["git", "show", "--name-only", "--format=", "HEAD"], cwd=history, capture_output=True, text=True
+        ).stdout.split()
+        assert sorted(changed) == ["CHANGELOG.md", "pyproject.toml"]
+
+
+class TestChangelogCommand:
+    """测试 bump changelog 子命令和发布时的 --changelog 选项。"""
+
+    def run(self, cwd: Path, *args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, "-m", "bump_version.cli", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "BUMP_VERSION_SKIP_PUSH": "true"},
+        )
+
+    def test_stdout(self, history):
+        """测试默认从当前版本的标签开始，输出到标准输出。"""
+        result = self.run(history, "changelog")
+
+        assert result.returncode == 0
+        assert result.stdout.startswith("## 未发布\n")
+        assert "1.0.0 之前" not in result.stdout
+
+    def test_output_file(self, history):
+        """测试 --output 插入到文件开头。"""
+        result = self.run(history, "changelog", "--from", "v1.0.0", "--title", "v2.0.0", "-o", "CHANGELOG.md")
+
+        assert result.returncode == 0
+        assert (history / "CHANGELOG.md").read_text(encoding="utf-8").startswith("## v2.0.0\n")
+
+    def test_unknown_revision(self, history):
+        """测试起点不存在时以错误码退出。"""
+        result = self.run(history, "changelog", "--from", "v9.9.9")
+
+        assert result.returncode == 1
+        assert "v9.9.9" in result.stderr
+
+    def test_release_option(self, history):
+        """测试发布时 --changelog 生成并提交 CHANGELOG.md。"""
+        result = self.run(history, "--type", "minor", "--changelog", "--yes")
+
+        assert result.returncode == 0, result.stdout
+        assert "v1.1.0 (" in (history / "CHANGELOG.md").read_text(encoding="utf-8")
+        status = subprocess.run(["git", "status", "--porcelain"], cwd=history, capture_output=True, text=True)
+        assert status.stdout == ""
@@ -341,3 +341,124 @@ class TestVersionValidation:
         assert "验证版本号是否符合 PEP 440 规范" in result.stdout
         assert "示例:" in result.stdout
         assert "退出码:" in result.stdout
+
+
+class TestNextCommand:
+    """测试 next 子命令。"""
+
+    def run_next(self, *args: str, cwd: Path | None = None, stdin: str | None = None):
+        """运行 bump next 命令。"""
+        import sys
+
+        return subprocess.run(
+            [sys.executable, "-m", "bump_version.cli", "next", *args],
+            cwd=cwd,
+            input=stdin,
+            capture_output=True,
+            text=True,
+        )
+
+    def test_next_single_version(self):
+        """测试计算单个版本号的下一个版本。"""
+        result = self.run_next("1.0.0", "--type", "minor", "--pre", "rc")
+        assert result.returncode == 0
+        assert result.stdout.strip() == "1.1.0rc0"
+
+    def test_next_illegal_transition(self):
+        """测试不允许的迁移输出错误并返回 1。"""
+        result = self.run_next("1.0.0a1", "--pre", "post")
+        assert result.returncode == 1
+        assert "不能从预发布版本直接升级到 post 版本" in result.stderr
+
+    def test_matrix_reads_project_version(self, project_with_pyproject):
+        """测试 --matrix 从项目配置读取当前版本。"""
+        import json
+
+        result = self.run_next("--matrix", cwd=project_with_pyproject["path"])
+        assert result.returncode == 0
+
+        document = json.loads(result.stdout)
+        assert document["current"] == "1.0.0"
+        versions = {(c["release_type"], c["prerelease_type"]): c["version"] for c in document["candidates"]}
+        assert versions[("major", None)] == "2.0.0"
+        assert versions[("patch", "a")] == "1.0.1a0"
+        assert versions[(None, "post")] == "1.0.0.post0"
+        assert all(c["offered"] for c in document["candidates"])
+
+    def test_matrix_ndjson_from_stdin(self):
+        """测试从标准输入读取多个版本号并输出 NDJSON。"""
+        import json
+
+        result = self.run_next("--matrix", "--stdin", "--format", "ndjson", stdin="1.0.0rc1\ninvalid\n")
+        assert result.returncode == 1
+
+        documents = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [d["valid"] for d in documents] == [True, False]
+
+        post = next(c for c in documents[0]["candidates"] if c["prerelease_type"] == "post")
+        assert post["version"] is None
+        assert "post" in post["error"]
+        assert post["offered"] is False
+
+
+class TestColdStart:
+    """测试命令行冷启动时不加载重量级依赖。"""
+
+    HEAVY_MODULES = ("inquirer", "rich", "tomlkit", "packaging.specifiers", "concurrent.futures", "importlib.metadata")
+
+    def loaded_heavy_modules(self, code: str) -> list[str]:
+        """在新的解释器中执行代码，返回已加载的重量级模块。"""
+        import sys
+
+        script = (
+            f"import sys\n{code}\nprint('LOADED:' + ','.join(m for m in {self.HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        loaded = result.stdout.splitlines()[-1].removeprefix("LOADED:")
+        return [name for name in loaded.split(",") if name]
+
+    def test_import_is_lightweight(self):
+        """测试导入 CLI 模块时不加载交互和富文本依赖。"""
+        assert self.loaded_heavy_modules("import bump_version.cli") == []
+
+    def test_import_skips_packaging(self):
+        """测试导入 CLI 模块时不加载 packaging.version，只有需要完整解析版本号时才加载。"""
+        import sys
+
+        script = "import sys\nimport bump_version.cli\nprint('packaging.version' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+        assert result.stdout.strip() == "False", result.stderr
+
+    def test_validate_is_lightweight(self):
+        """测试 validate 子命令不加载交互和富文本依赖。"""
+        code = "from bump_version.cli import main\ntry:\n    main(['validate', '1.0.0'])\nexcept SystemExit:\n    pass"
+        assert self.loaded_heavy_modules(code) == []
+
+    def test_read_project_version_is_lightweight(self, project_with_pyproject):
+        """测试只读取项目版本号时不加载 tomlkit。"""
+        code = f"from bump_version.project import read_project_version\nread_project_version({str(project_with_pyproject['path'])!r})"
+        assert self.loaded_heavy_modules(code) == []
+
+    def test_version_option(self):
+        """测试 --version 从安装元数据读取版本号。"""
+        import sys
+        from importlib.metadata import version
+
+        result = subprocess.run([sys.executable, "-m", "bump_version.cli", "--version"], capture_output=True, text=True)
+        assert result.returncode == 0
+        assert result.stdout.strip() == f"bump, version {version('bumpster')}"
+
+    def test_import_skips_release_modules(self):
+        """测试导入 CLI 模块时不加载发布流程模块，--untracked-files 的选项与 preflight 一致。"""
+        import sys
+
+        from bump_version.cli import main
+        from bump_version.preflight import UNTRACKED_MODES
+
+        script = "import sys\nimport bump_version.cli\nprint('bump_version.preflight' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+        assert result.stdout.strip() == "False", result.stderr
+
+        option = next(param for param in main.params if param.name == "untracked")
+        assert tuple(option.type.choices) == UNTRACKED_MODES
@@ -0,0 +1,136 @@
+"""外部命令执行测试。"""
+
+import subprocess
+import sys
+
+import pytest
+
+from bump_version import commands
+from bump_version.api import release
+from bump_version.commands import CatFile, cat_file, process_count, process_counts, reset_process_counts, run
+from bump_version.errors import CommandError
+from bump_version.gitrepo import GitRepository
+
+
+def git(cwd, *args: str) -> str:
+    """执行 git 命令并返回输出。"""
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture(autouse=True)
+def clean_counts():
+    """每个测试从零开始计数。"""
+    reset_process_counts()
+    yield
+    reset_process_counts()
+
+
+class TestRun:
+    """测试命令执行与计数。"""
+
+    def test_arguments_are_not_interpreted_by_shell(self):
+        """测试参数原样传给程序，不经过 shell。"""
+        output = run([sys.executable, "-c", "import sys; print(sys.argv[1:])", "$HOME", "a b", "'q'", ";ls"])
+
+        assert output.strip() == repr(["$HOME", "a b", "'q'", ";ls"])
+
+    def test_failure_raises_command_error(self):
+        """测试命令失败时抛出 CommandError。"""
+        argv = [sys.executable, "-c", "import sys; sys.stderr.write('bad'); sys.exit(3)"]
+
+        with pytest.raises(CommandError) as exc_info:
+            run(argv)
+
+        assert exc_info.value.returncode == 3
+        assert exc_info.value.stderr == "bad"
+        assert run(argv, check=False) == ""
+
+    def test_process_counts(self):
+        """测试按程序名统计子进程数。"""
+        run(["git", "--version"])
+        run(["git", "--version"])
+        run([sys.executable, "-c", "pass"])
+
+        assert process_count() == 3
+        assert process_counts()["git"] == 2
+
+    def test_release_process_budget(self, project_with_pyproject):
+        """测试一次发布启动的子进程：状态检查、一次 git add、提交、打标签。"""
+        release(project_with_pyproject["path"], "patch", push=False)
+
+        assert process_counts() == {"git": 4}
+
+    def test_release_with_uv_lock_does_not_run_uv(self, project_with_pyproject):
+        """测试存在 uv.lock 时直接改写其中的版本号，不启动 uv。"""
+        path = project_with_pyproject["path"]
+        (path / "uv.lock").write_text(
+            'version = 1\n\n[[package]]\nname = "test-project"\nversion = "1.0.0"\nsource = { editable = "." }\n'
+        )
+        git(path, "add", "uv.lock")
+        git(path, "commit", "-m", "add lock")
+        reset_process_counts()
+
+        release(path, "patch", push=False)
+
+        assert process_counts() == {"git": 4}
+        assert 'version = "1.0.1"' in git(path, "show", "HEAD:uv.lock")
+
+
+class TestCatFile:
+    """测试常驻的 git cat-file 进程。"""
+
+    @pytest.fixture
+    def repo(self, project_with_pyproject):
+        path = project_with_pyproject["path"]
+        git(path, "tag", "-a", "v1.0.0", "-m", "Release 1.0.0")
+        return path
+
+    def test_info_and_read(self, repo):
+        """测试查询对象信息和内容。"""
+        instance = CatFile(repo / ".git")
+        head = git(repo, "rev-parse", "HEAD")
+        try:
+            sha, object_type, size = instance.info("HEAD")
+            assert (sha, object_type) == (head, "commit")
+
+            sha, object_type, content = instance.read("HEAD")
+            assert (sha, object_type, len(content)) == (head, "commit", size)
+            assert b"Initial commit" in content
+
+            _, object_type, content = instance.read("HEAD:pyproject.toml")
+            assert object_type == "blob"
+            assert b'version = "1.0.0"' in content
+        finally:
+            instance.close()
+
+    def test_missing_object(self, repo):
+        """测试不存在的对象返回 None，进程仍可继续使用。"""
+        instance = CatFile(repo / ".git")
+        try:
+            assert instance.info("refs/tags/nope") is None
+            assert instance.read("0" * 40) is None
+            assert instance.info("HEAD") is not None
+        finally:
+            instance.close()
+
+    def test_rejects_newline(self, repo):
+        """测试拒绝包含换行符的对象名（会破坏批处理协议）。"""
+        instance = CatFile(repo / ".git")
+        with pytest.raises(ValueError):
+            instance.info("HEAD\nHEAD")
+
+    def test_single_process_per_repository(self, repo):
+        """测试同一仓库的多次查询只启动一个进程。"""
+        repository = GitRepository.discover(repo)
+
+        for _ in range(20):
+            assert repository.peel("v1.0.0") == git(repo, "rev-parse", "HEAD")
+        assert repository.object_info("v1.0.0")[1] == "tag"
+
+        assert process_counts() == {"git": 1}
+        assert cat_file(repo / ".git") is cat_file(repo / ".git" / ".." / ".git")
+        commands.cat_file(repo / ".git").close()
+
+    def test_peel_missing(self, repo):
+        """测试解析不存在的引用返回 None。"""
+        assert GitRepository.discover(repo).peel("v9.9.9") is None
@@ -0,0 +1,131 @@
+"""根据提交信息自动选择递增类型的测试。"""
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from bump_version import commands
+from bump_version.conventional import CACHE_PATH, commit_release_type, detect_release_type, iter_commits
+from bump_version.errors import CommandError
+from bump_version.gitrepo import GitRepository
+
+
+def commit(path: Path, message: str) -> None:
+    subprocess.run(["git", "commit", "--allow-empty", "-m", message], cwd=path, check=True, capture_output=True)
+
+
+@pytest.fixture
+def released(project_with_pyproject) -> Path:
+    """已经发布 1.0.0（打了标签）的项目。"""
+    path = project_with_pyproject["path"]
+    commit(path, "feat: 发布前的功能")
+    subprocess.run(["git", "tag", "-a", "v1.0.0", "-m", "Release 1.0.0"], cwd=path, check=True)
+    return path
+
+
+class TestCommitReleaseType:
+    """测试单条提交信息的解析。"""
+
+    @pytest.mark.parametrize(
+        ("message", "expected"),
+        [
+            ("fix: 修复问题", "patch"),
+            ("perf(parser): 加速解析", "patch"),
+            ("feat: 新功能", "minor"),
+            ("Feat(cli): 新选项", "minor"),
+            ("feat!: 删除旧接口", "major"),
+            ("refactor(api)!: 修改返回值", "major"),
+            ("fix: 修复问题\n\nBREAKING CHANGE: 配置格式变化", "major"),
+            ("fix: 修复问题\n\nBREAKING-CHANGE: 配置格式变化", "major"),
+            ("docs: 更新文档", None),
+            ("chore: release 1.0.0", None),
+            ("Merge branch 'feature'", None),
+            ("feat:没有空格", None),
+            ("docs: 提到 BREAKING CHANGE: 不在行首", None),
+        ],
+    )
+    def test_release_type(self, message, expected):
+        """测试标题类型、! 标记和 BREAKING CHANGE 脚注。"""
+        assert commit_release_type(message) == expected
+
+
+class TestDetectReleaseType:
+    """测试扫描上一个版本标签之后的提交。"""
+
+    def test_highest_level_wins(self, released):
+        """测试取所有提交中最高的级别，版本标签之前的提交不计入。"""
+        commit(released, "fix: 修复")
+        commit(released, "docs: 文档")
+
+        result = detect_release_type(GitRepository.discover(released), "1.0.0")
+        assert (result.release_type, result.base, result.commits) == ("patch", "v1.0.0", 2)
+        assert result.reason == "fix: 修复"
+
+        commit(released, "feat(cli): 新选项")
+        assert detect_release_type(GitRepository.discover(released), "1.0.0").release_type == "minor"
+
+    def test_nothing_to_release(self, released):
+        """测试只有不触发发布的提交时返回 None。"""
+        commit(released, "chore: 整理")
+
+        result = detect_release_type(GitRepository.discover(released), "1.0.0")
+        assert result.release_type is None
+        assert result.commits == 1
+
+    def test_stops_at_breaking_change(self, released):
+        """测试找到破坏性变更后停止扫描更早的提交。"""
+        for i in range(5):
+            commit(released, f"fix: 修复 {i}")
+        commit(released, "feat!: 删除旧接口")
+
+        result = detect_release_type(GitRepository.discover(released), "1.0.0")
+        assert (result.release_type, result.commits) == ("major", 1)
+
+    def test_without_tags_scans_all_history(self, project_with_pyproject):
+        """测试没有版本标签时扫描全部历史。"""
+        path = project_with_pyproject["path"]
+        commit(path, "feat: 第一个功能")
+
+        result = detect_release_type(GitRepository.discover(path), "1.0.0")
+        assert (result.release_type, result.base) == ("minor", None)
+
+    def test_cached_for_same_head(self, released):
+        """测试 HEAD 没有变化时直接使用缓存，不启动子进程；HEAD 变化后重新扫描。"""
+        commit(released, "fix: 修复")
+        repository = GitRepository.discover(released)
+        detect_release_type(repository, "1.0.0")
+        assert json.loads((released / ".git" / CACHE_PATH).read_text())["release_type"] == "patch"
+
+        commands.reset_process_counts()
+        result = detect_release_type(repository, "1.0.0")
+        assert result.cached
+        assert result.release_type == "patch"
+        assert commands.process_count() == 0
+
+        commit(released, "feat: 新功能")
+        result = detect_release_type(GitRepository.discover(released), "1.0.0")
+        assert not result.cached
+        assert result.release_type == "minor"
+
+
+class TestIterCommits:
+    """测试流式读取 git log。"""
+
+    def test_messages_and_early_stop(self, released):
+        """测试多行提交信息原样返回，提前结束迭代时终止 git。"""
+        commit(released, "fix: 修复\n\n详细说明\n\nBREAKING CHANGE: 旧配置失效")
+        repository = GitRepository.discover(released)
+
+        commits = iter_commits(repository, ["HEAD"])
+        sha, message = next(commits)
+        commits.close()
+
+        assert sha == repository.head_commit()
+        assert message == "fix: 修复\n\n详细说明\n\nBREAKING CHANGE: 旧配置失效"
+
+    def test_invalid_revision(self, released):
+        """测试 git log 失败时抛出 CommandError。"""
+        with pytest.raises(CommandError):
+            list(iter_commits(GitRepository.discover(released), ["no-such-revision"]))
@@ -0,0 +1,275 @@
+"""常驻服务测试。"""
+
+import json
+import os
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from bump_version.daemon import (
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    DaemonError,
+    DaemonServer,
+    Dispatcher,
+    call,
+    ping,
+)
+
+
+@pytest.fixture
+def socket_path():
+    """短路径的套接字文件（Unix 套接字路径有长度限制）。"""
+    directory = tempfile.mkdtemp(prefix="bump-")
+    yield Path(directory) / "bump.sock"
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def server(socket_path):
+    """在后台线程中运行的服务。"""
+    daemon = DaemonServer(socket_path, idle_timeout=0)
+    thread = threading.Thread(target=daemon.run, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.request_shutdown()
+    thread.join(timeout=5)
+
+
+def rpc(method: str, **params):
+    """构造请求对象。"""
+    return {"jsonrpc": "2.0", "id": 7, "method": method, "params": params}
+
+
+class TestDispatcher:
+    """测试请求分派（不经过网络）。"""
+
+    def test_validate(self):
+        """测试验证版本号。"""
+        dispatcher = Dispatcher()
+
+        assert dispatcher.dispatch(rpc("validate", version="v1.0.0-alpha.1"))["result"] == {
+            "valid": True,
+            "normalized": "1.0.0a1",
+        }
+        assert dispatcher.dispatch(rpc("validate", version="bad"))["result"]["valid"] is False
+
+    def test_parse(self):
+        """测试解析版本号。"""
+        result = Dispatcher().dispatch(rpc("parse", version="1.2.3rc1"))["result"]
+
+        assert result["normalized"] == "1.2.3rc1"
+        assert (result["major"], result["prerelease_type"], result["prerelease_num"]) == (1, "rc", 1)
+
+    def test_next(self):
+        """测试计算下一个版本号，非法操作返回错误。"""
+        dispatcher = Dispatcher()
+
+        assert dispatcher.dispatch(rpc("next", version="1.0.0", release_type="minor"))["result"] == {"version": "1.1.0"}
+        error = dispatcher.dispatch(rpc("next", version="1.0.0a1", prerelease_type="post"))["error"]
+        assert "post" in error["message"]
+
+    def test_match(self):
+        """测试按约束筛选。"""
+        result = Dispatcher().dispatch(rpc("match", specifier="<2,>=1.4", versions=["1.3", "1.5", "2.0"]))
+
+        assert result["result"] == {"matches": ["1.5"]}
+
+    def test_read_project_version(self, project_with_pyproject):
+        """测试读取项目版本号。"""
+        result = Dispatcher().dispatch(rpc("read-project-version", root=str(project_with_pyproject["path"])))
+
+        assert result["result"] == {"version": "1.0.0", "file": "pyproject.toml"}
+
+    @pytest.mark.parametrize(
+        ("request_object", "code"),
+        [
+            ({"jsonrpc": "2.0", "id": 1}, INVALID_REQUEST),
+            ([1, 2], INVALID_REQUEST),
+            (rpc("unknown"), METHOD_NOT_FOUND),
+            (rpc("validate"), INVALID_PARAMS),
+            (rpc("next", version="1.0.0", release_type="huge"), INVALID_PARAMS),
+        ],
+    )
+    def test_errors(self, request_object, code):
+        """测试错误码。"""
+        assert Dispatcher().dispatch(request_object)["error"]["code"] == code
+
+    def test_parse_error(self):
+        """测试无法解析的 JSON。"""
+        assert Dispatcher().handle_line("{oops")["error"]["code"] == PARSE_ERROR
+
+    def test_notification_has_no_response(self):
+        """测试没有 id 的通知不返回响应。"""
+        assert Dispatcher().dispatch({"jsonrpc": "2.0", "method": "ping"}) is None
+
+    def test_shutdown_only_when_enabled(self):
+        """测试只有服务端注册了回调才支持 shutdown。"""
+        assert Dispatcher().dispatch(rpc("shutdown"))["error"]["code"] == METHOD_NOT_FOUND
+
+
+class TestDaemonServer:
+    """测试套接字服务。"""
+
+    def test_call(self, server, socket_path):
+        """测试客户端请求。"""
+        assert ping(socket_path)
+        assert call(socket_path, "next", version="1.0.0", prerelease_type="rc") == {"version": "1.0.1rc0"}
+
+    def test_call_error(self, server, socket_path):
+        """测试服务返回错误时抛出 DaemonError。"""
+        with pytest.raises(DaemonError, match="无效的版本号格式"):
+            call(socket_path, "parse", version="bad")
+
+    def test_multiple_requests_per_connection(self, server, socket_path):
+        """测试同一连接上连续发送多个请求。"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            client.sendall(b"".join(json.dumps(rpc("ping")).encode() + b"\n" for _ in range(3)))
+            client.shutdown(socket.SHUT_WR)
+            with client.makefile("rb") as reader:
+                responses = [json.loads(line) for line in reader]
+
+        assert [response["result"] for response in responses] == ["pong"] * 3
+
+    def test_concurrent_clients(self, server, socket_path):
+        """测试多个客户端同时请求。"""
+        versions = [f"1.{i}.0" for i in range(40)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda v: call(socket_path, "next", version=v)["version"], versions))
+
+        assert results == [f"1.{i}.1" for i in range(40)]
+
+    def test_refuses_second_server(self, server, socket_path):
+        """测试已有服务在监听时无法再次启动。"""
+        with pytest.raises(OSError, match="已有服务在监听"):
+            DaemonServer(socket_path)
+
+    def test_removes_stale_socket(self, socket_path):
+        """测试启动时删除残留的套接字文件（没有服务在监听）。"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(str(socket_path))
+        daemon = DaemonServer(socket_path, idle_timeout=0)
+        daemon.server_close()
+        socket_path.unlink()
+
+    @pytest.mark.parametrize("kind", ["file", "symlink"])
+    def test_refuses_to_remove_other_files(self, socket_path, kind):
+        """测试路径是普通文件或符号链接时报错，不删除用户的文件。"""
+        target = socket_path.with_name("important.txt")
+        target.write_text("data")
+        if kind == "file":
+            socket_path.write_text("data")
+        else:
+            socket_path.symlink_to(target)
+
+        with pytest.raises(FileExistsError, match="不是套接字"):
+            DaemonServer(socket_path)
+
+        assert socket_path.read_text() == "data"
+        assert target.read_text() == "data"
+
+    def test_socket_permissions(self, socket_path):
+        """测试套接字文件创建时就只有所有者可以访问。"""
+        daemon = DaemonServer(socket_path, idle_timeout=0)
+        try:
+            assert stat.S_IMODE(os.lstat(socket_path).st_mode) == 0o600
+        finally:
+            daemon.server_close()
+
+    def test_accepted_connection_prevents_idle_exit(self, socket_path, monkeypatch):
+        """测试连接被接受后、处理线程开始运行之前，空闲检查也能看到这个连接。"""
+        started = threading.Event()
+        finish_request = DaemonServer.finish_request
+
+        def delayed(self, request, client_address):
+            started.wait(5)
+            finish_request(self, request, client_address)
+
+        monkeypatch.setattr(DaemonServer, "finish_request", delayed)
+        daemon = DaemonServer(socket_path, idle_timeout=0.01)
+        daemon.timeout = 1
+        time.sleep(0.05)
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(str(socket_path))
+                daemon.handle_request()
+
+                assert not daemon.should_stop()
+                started.set()
+        finally:
+            started.set()
+            daemon.server_close()
+
+    def test_idle_timeout(self, socket_path):
+        """测试空闲超时后退出并删除套接字文件。"""
+        daemon = DaemonServer(socket_path, idle_timeout=0.2)
+        start = time.monotonic()
+        daemon.run(poll_interval=0.05)
+
+        assert time.monotonic() - start < 5
+        assert not socket_path.exists()
+
+    def test_shutdown_request(self, socket_path):
+        """测试收到 shutdown 请求后退出。"""
+        daemon = DaemonServer(socket_path, idle_timeout=0)
+        thread = threading.Thread(target=daemon.run, kwargs={"poll_interval": 0.05})
+        thread.start()
+
+        assert call(socket_path, "shutdown") == "bye"
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+
+class TestTransparentClient:
+    """测试命令行在套接字存在时改由服务计算。"""
+
+    def run_cli(self, *args: str, socket_path: Path, cwd: Path | None = None):
+        """运行 bump 命令，指定套接字路径。"""
+        import os
+
+        env = {**os.environ, "BUMP_SOCKET": str(socket_path)}
+        env.pop("BUMP_NO_DAEMON", None)
+        return subprocess.run(
+            [sys.executable, "-m", "bump_version.cli", *args], capture_output=True, text=True, env=env, cwd=cwd
+        )
+
+    def test_cli_uses_daemon(self, server, socket_path):
+        """测试 validate 和 next 经过服务得到相同的输出。"""
+        served = []
+        original = server.dispatcher.dispatch
+        server.dispatcher.dispatch = lambda request: served.append(request["method"]) or original(request)
+
+        validate = self.run_cli("validate", "1.0.0", socket_path=socket_path)
+        next_version = self.run_cli("next", "1.0.0", "--type", "major", socket_path=socket_path)
+
+        assert validate.returncode == 0
+        assert "✅" in validate.stdout
+        assert next_version.stdout.strip() == "2.0.0"
+        assert served == ["validate", "next"]
+
+    def test_cli_reports_daemon_errors_locally(self, server, socket_path):
+        """测试服务返回错误时由本地计算报告同样的错误。"""
+        result = self.run_cli("next", "1.0.0a1", "--pre", "post", socket_path=socket_path)
+
+        assert result.returncode == 1
+        assert "不能从预发布版本直接升级到 post 版本" in result.stderr
+
+    def test_cli_falls_back_without_daemon(self, socket_path):
+        """测试套接字不可用时回退到本地计算。"""
+        socket_path.write_text("")
+
+        result = self.run_cli("next", "1.0.0", socket_path=socket_path)
+
+        assert result.stdout.strip() == "1.0.1"
@@ -0,0 +1,171 @@
+"""Git 仓库只读访问测试（结果与 git 命令对照）。"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from bump_version.errors import NotAGitRepositoryError
+from bump_version.gitrepo import GitRepository
+
+
+def git(cwd: Path, *args: str) -> str:
+    """执行 git 命令并返回输出。"""
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def git_tags(cwd: Path) -> dict[str, str]:
+    """git 命令列出的标签 {标签名: SHA}。"""
+    output = git(cwd, "for-each-ref", "--format=%(refname:short) %(objectname)", "refs/tags/")
+    return dict(line.split(" ") for line in output.splitlines())
+
+
+@pytest.fixture
+def repo(project_with_pyproject) -> Path:
+    """带有分支、轻量标签和附注标签的仓库。"""
+    path = project_with_pyproject["path"]
+    git(path, "tag", "v1.0.0")
+    git(path, "tag", "-a", "v1.0.1", "-m", "Release 1.0.1")
+    git(path, "branch", "feature/x")
+    return path
+
+
+class TestDiscover:
+    """测试仓库查找。"""
+
+    def test_discover_from_subdirectory(self, repo):
+        """测试从子目录向上查找仓库。"""
+        subdir = repo / "src" / "pkg"
+        subdir.mkdir(parents=True)
+
+        repository = GitRepository.discover(subdir)
+
+        assert repository.work_tree == repo.resolve()
+        assert repository.git_dir == repo.resolve() / ".git"
+
+    def test_not_a_repository(self, temp_dir):
+        """测试不在仓库中时抛出 NotAGitRepositoryError。"""
+        with pytest.raises(NotAGitRepositoryError):
+            GitRepository.discover(temp_dir)
+
+    def test_gitdir_file(self, temp_dir):
+        """测试 .git 文件（gitdir:）指向的独立 Git 目录。"""
+        work_tree, git_dir = temp_dir / "work", temp_dir / "store.git"
+        work_tree.mkdir()
+        git(work_tree, "init", "-q", "-b", "trunk", f"--separate-git-dir={git_dir}")
+
+        repository = GitRepository.discover(work_tree)
+
+        assert (work_tree / ".git").is_file()
+        assert repository.git_dir == git_dir.resolve()
+        assert repository.current_branch() == "trunk"
+        assert repository.head_commit() is None
+
+    def test_bare_repository(self, repo, temp_dir):
+        """测试裸仓库。"""
+        bare = temp_dir / "bare.git"
+        git(temp_dir, "clone", "-q", "--bare", str(repo), str(bare))
+
+        repository = GitRepository.discover(bare)
+
+        assert repository.work_tree is None
+        assert repository.current_branch() == "main"
+        assert repository.tags() == git_tags(bare)
+
+
+class TestRefs:
+    """测试引用解析。"""
+
+    def test_branch_and_head(self, repo):
+        """测试当前分支和 HEAD 提交。"""
+        repository = GitRepository.discover(repo)
+
+        assert repository.current_branch() == git(repo, "branch", "--show-current")
+        assert repository.head_commit() == git(repo, "rev-parse", "HEAD")
+        assert repository.symbolic_target() == "refs/heads/main"
+
+    def test_detached_head(self, repo):
+        """测试分离 HEAD 时当前分支为空字符串。"""
+        git(repo, "checkout", "-q", "--detach")
+        repository = GitRepository.discover(repo)
+
+        assert repository.current_branch() == ""
+        assert repository.head_commit() == git(repo, "rev-parse", "HEAD")
+
+    def test_loose_and_packed_refs(self, repo):
+        """测试松散引用与 packed-refs 一致，松散引用优先。"""
+        loose = GitRepository.discover(repo)
+        assert loose.tags() == git_tags(repo)
+        assert set(loose.branches()) == {"main", "feature/x"}
+
+        git(repo, "pack-refs", "--all")
+        assert not (repo / ".git" / "refs" / "tags" / "v1.0.0").exists()
+        git(repo, "commit", "-q", "--allow-empty", "-m", "next")
+        git(repo, "tag", "v1.0.2")
+
+        packed = GitRepository.discover(repo)
+        assert packed.tags() == git_tags(repo)
+        assert packed.branches()["main"] == git(repo, "rev-parse", "HEAD")
+        assert packed.resolve_ref("refs/heads/feature/x") == git(repo, "rev-parse", "feature/x")
+
+    def test_packed_refs_cache_invalidated(self, repo):
+        """测试 packed-refs 更新后重新读取。"""
+        repository = GitRepository.discover(repo)
+        git(repo, "pack-refs", "--all")
+        assert "v1.0.0" in repository.tags()
+
+        git(repo, "tag", "-d", "v1.0.0")
+
+        assert "v1.0.0" not in repository.tags()
+
+    def test_linked_worktree(self, repo, temp_dir):
+        """测试链接工作树：HEAD 属于工作树，分支和标签来自公共目录。"""
+        worktree = temp_dir / "wt"
+        git(repo, "worktree", "add", "-q", "-b", "hotfix", str(worktree))
+        git(repo, "tag", "v2.0.0")
+
+        repository = GitRepository.discover(worktree)
+
+        assert repository.current_branch() == "hotfix"
+        assert repository.head_commit() == git(worktree, "rev-parse", "HEAD")
+        assert repository.common_dir == (repo / ".git").resolve()
+        assert repository.tags() == git_tags(repo)
+        assert "hotfix" in repository.branches()
+
+    def test_missing_ref(self, repo):
+        """测试不存在的引用返回 None。"""
+        assert GitRepository.discover(repo).resolve_ref("refs/tags/nope") is None
+
+    @pytest.mark.parametrize("name", ["../config", "refs/../../etc/passwd", "/etc/passwd", ""])
+    def test_invalid_ref_name(self, repo, name):
+        """测试拒绝可能逃出 Git 目录的引用名。"""
+        with pytest.raises(ValueError):
+            GitRepository.discover(repo).read_ref(name)
+
+    def test_reftable_falls_back_to_git(self, repo, monkeypatch):
+        """测试无法直接读取的仓库格式回退到 git 命令。"""
+        repository = GitRepository.discover(repo)
+        monkeypatch.setattr(repository, "uses_git_binary", True)
+
+        assert repository.current_branch() == "main"
+        assert repository.head_commit() == git(repo, "rev-parse", "HEAD")
+        assert repository.tags() == git_tags(repo)
+        assert repository.resolve_ref("refs/tags/nope") is None
+
+
+class TestConfig:
+    """测试仓库配置读取。"""
+
+    def test_config(self, repo):
+        """测试读取节、子节和布尔键。"""
+        git(repo, "config", "core.untrackedCache", "true")
+        git(repo, "config", "remote.origin.url", "git@example.com:a/b.git")
+        with open(repo / ".git" / "config", "a") as f:
+            f.write("[Bumpster]\n\tflag\n\t; comment\n")
+
+        config = GitRepository.discover(repo).config()
+
+        assert config["core.untrackedcache"] == "true"
+        assert config["remote.origin.url"] == "git@example.com:a/b.git"
+        assert config["bumpster.flag"] == "true"
+        assert config["user.name"] == "Test User"
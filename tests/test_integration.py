@@ -1,5 +1,6 @@
 """集成测试 - 参考 JS 版本的测试用例。"""
 
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -383,3 +384,160 @@ class TestErrorHandling:
         # 不应该创建标签
         tags = get_git_tags(project_path)
         assert len(tags) == 0
+
+
+class TestNonInteractive:
+    """非交互式发布测试（--type / --pre / --yes）。"""
+
+    @pytest.fixture(autouse=True)
+    def no_prompts(self, monkeypatch):
+        """任何提示都视为失败。"""
+
+        def fail(message, *args, **kwargs):
+            raise AssertionError(f"不应该出现提示: {message}")
+
+        monkeypatch.setattr("bump_version.cli.list_input", fail)
+        monkeypatch.setattr("bump_version.cli.confirm", fail)
+        monkeypatch.setenv("BUMP_VERSION_SKIP_PUSH", "true")
+
+    def test_release_type_and_yes(self, project_with_pyproject, monkeypatch):
+        """测试指定递增类型并跳过确认。"""
+        project_path = project_with_pyproject["path"]
+        monkeypatch.chdir(project_path)
+
+        run_version_bump(release_type="minor", assume_yes=True)
+
+        assert get_version_from_pyproject(project_path) == "1.1.0"
+        assert "v1.1.0" in get_git_tags(project_path)
+        assert get_last_commit_message(project_path) == "chore: release 1.1.0"
+
+    def test_prerelease_defaults_to_patch(self, project_with_pyproject, monkeypatch):
+        """测试只指定预发布类型时按 patch 递增，已是同类预发布版本时递增序号。"""
+        project_path = project_with_pyproject["path"]
+        monkeypatch.chdir(project_path)
+
+        run_version_bump(prerelease_type="rc", assume_yes=True)
+        assert get_version_from_pyproject(project_path) == "1.0.1rc0"
+
+        run_version_bump(prerelease_type="rc", assume_yes=True)
+        assert get_version_from_pyproject(project_path) == "1.0.1rc1"
+
+        run_version_bump(release_type="patch", assume_yes=True)
+        assert get_version_from_pyproject(project_path) == "1.0.1"
+
+    def test_yes_skips_branch_confirmation(self, project_with_pyproject, monkeypatch):
+        """测试 --yes 跳过非主分支确认。"""
+        project_path = project_with_pyproject["path"]
+        subprocess.run(["git", "checkout", "-b", "feature"], cwd=project_path, check=True, capture_output=True)
+        monkeypatch.chdir(project_path)
+
+        run_version_bump(release_type="major", assume_yes=True)
+
+        assert get_version_from_pyproject(project_path) == "2.0.0"
+
+    def test_dry_run(self, project_with_pyproject, monkeypatch):
+        """测试与 --dry-run 组合时不修改任何内容。"""
+        project_path = project_with_pyproject["path"]
+        monkeypatch.chdir(project_path)
+
+        run_version_bump(dry_run=True, release_type="minor", prerelease_type="a")
+
+        assert get_version_from_pyproject(project_path) == "1.0.0"
+        assert get_git_tags(project_path) == []
+
+    def test_illegal_transition_exits_with_error(self, project_with_pyproject, monkeypatch):
+        """测试不允许的发布操作以错误码退出。"""
+        project_path = project_with_pyproject["path"]
+        monkeypatch.chdir(project_path)
+        run_version_bump(prerelease_type="b", assume_yes=True)
+
+        with pytest.raises(SystemExit) as exc_info:
+            run_version_bump(prerelease_type="post", assume_yes=True)
+
+        assert exc_info.value.code == 1
+        assert get_version_from_pyproject(project_path) == "1.0.1b0"
+
+    def test_auto(self, project_with_pyproject, monkeypatch):
+        """测试 --auto 根据上一个版本标签之后的提交选择递增类型，没有需要发布的提交时不发布。"""
+        project_path = project_with_pyproject["path"]
+        monkeypatch.chdir(project_path)
+        subprocess.run(["git", "tag", "v1.0.0"], cwd=project_path, check=True)
+        for message in ("fix: 修复", "feat: 新功能", "docs: 文档"):
+            subprocess.run(["git", "commit", "--allow-empty", "-m", message], cwd=project_path, check=True)
+
+        run_version_bump(auto=True, assume_yes=True)
+        assert get_version_from_pyproject(project_path) == "1.1.0"
+
+        with pytest.raises(SystemExit) as exc_info:
+            run_version_bump(auto=True, assume_yes=True)
+        assert exc_info.value.code == 0
+        assert get_version_from_pyproject(project_path) == "1.1.0"
+
+    def test_auto_conflicts_with_type(self, project_with_pyproject):
+        """测试 --auto 与 --type 同时使用时报告用法错误。"""
+        result = subprocess.run(
+            [sys.executable, "-m", "bump_version.cli", "--auto", "--type", "minor", "--yes"],
+            cwd=project_with_pyproject["path"],
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 2
+        assert "--auto" in result.stderr
+
+    def test_existing_tag(self, project_with_pyproject, monkeypatch):
+        """测试预发布标签已存在时确认后跳到下一个序号（--yes 时失败），正式版本标签已存在时以错误码退出。"""
+        project_path = project_with_pyproject["path"]
+        for tag in ("v1.0.1rc0", "v1.0.1"):
+            subprocess.run(["git", "tag", tag], cwd=project_path, check=True)
+        monkeypatch.chdir(project_path)
+
+        with pytest.raises(SystemExit) as exc_info:
+            run_version_bump(prerelease_type="rc", assume_yes=True)
+        assert exc_info.value.code == 1
+        assert get_version_from_pyproject(project_path) == "1.0.0"
+
+        questions = []
+
+        def accept(message, default=False):
+            questions.append(message)
+            return True
+
+        monkeypatch.setattr("bump_version.cli.confirm", accept)
+        run_version_bump(prerelease_type="rc")
+        assert questions[0] == "改为发布 1.0.1rc1？"
+        assert get_version_from_pyproject(project_path) == "1.0.1rc1"
+
+        with pytest.raises(SystemExit) as exc_info:
+            run_version_bump(release_type="patch", assume_yes=True)
+
+        assert exc_info.value.code == 1
+        assert get_version_from_pyproject(project_path) == "1.0.1rc1"
+
+    def test_dry_run_leaves_git_dir_untouched(self, project_with_pyproject, monkeypatch):
+        """测试干跑不在 Git 目录中创建标签索引。"""
+        project_path = project_with_pyproject["path"]
+        subprocess.run(["git", "tag", "v1.0.1rc0"], cwd=project_path, check=True)
+        monkeypatch.chdir(project_path)
+
+        run_version_bump(prerelease_type="rc", dry_run=True)
+
+        assert not (project_path / ".git" / "bumpster").exists()
+
+    def test_command_line_without_tty(self, project_with_pyproject):
+        """测试命令行一次调用完成发布，不需要终端。"""
+        project_path = project_with_pyproject["path"]
+
+        result = subprocess.run(
+            [sys.executable, "-m", "bump_version.cli", "--type", "minor", "--pre", "a", "--yes"],
+            cwd=project_path,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "BUMP_VERSION_SKIP_PUSH": "true", "BUMP_TRACE": "1"},
+        )
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "子进程: 4 (git: 4)" in result.stdout
+        assert get_version_from_pyproject(project_path) == "1.1.0a0"
+        assert "v1.1.0a0" in get_git_tags(project_path)
@@ -0,0 +1,253 @@
+"""发布日志（中断后继续 / 回滚）测试。"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from bump_version import api
+from bump_version.api import abort_release, release, resume_release
+from bump_version.commands import process_counts, reset_process_counts
+from bump_version.errors import CommandError, JournalError, ReleaseInProgressError
+from bump_version.gitrepo import GitRepository
+from bump_version.journal import JOURNAL_PATH, ReleaseJournal
+from tests.conftest import get_git_tags, get_version_from_pyproject
+
+
+def git(path: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=path, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def journal_of(path: Path) -> ReleaseJournal:
+    return ReleaseJournal.load(GitRepository.discover(path))
+
+
+def add_remote(path: Path) -> Path:
+    """添加一个裸仓库作为 origin，并设置当前分支的上游。"""
+    remote = path.parent / f"{path.name}-remote.git"
+    subprocess.run(["git", "init", "--bare", "-q", str(remote)], check=True)
+    git(path, "remote", "add", "origin", str(remote))
+    git(path, "push", "-q", "-u", "origin", "main")
+    return remote
+
+
+def interrupt_at(monkeypatch, subcommand: str) -> None:
+    """执行 git <subcommand> 时模拟 Ctrl-C（命令没有执行）。"""
+    run = api.commands.run
+
+    def interrupted(argv, *args, **kwargs):
+        if argv[:2] == ["git", subcommand]:
+            raise KeyboardInterrupt
+        return run(argv, *args, **kwargs)
+
+    monkeypatch.setattr(api.commands, "run", interrupted)
+
+
+@pytest.fixture
+def failed_push(project_with_pyproject) -> Path:
+    """推送失败（没有远程仓库）的发布：版本号、提交和标签都已完成。"""
+    path = project_with_pyproject["path"]
+    with pytest.raises(CommandError):
+        release(path, "minor", push=True)
+    return path
+
+
+class TestJournal:
+    """测试发布日志的记录。"""
+
+    def test_removed_after_release(self, project_with_pyproject):
+        """测试发布完成后删除日志。"""
+        path = project_with_pyproject["path"]
+
+        release(path, push=False)
+
+        assert not (path / ".git" / JOURNAL_PATH).exists()
+
+    def test_failed_push_is_recorded(self, failed_push):
+        """测试推送失败时已完成的步骤都记录在日志中。"""
+        journal = journal_of(failed_push)
+
+        assert (journal.old_version, journal.new_version, journal.tag) == ("1.0.0", "1.1.0", "v1.1.0")
+        assert journal.completed == ["write", "commit", "tag"]
+        assert journal.pending == ["push"]
+        assert journal.commit_sha == git(failed_push, "rev-parse", "HEAD")
+
+    def test_new_release_refused(self, failed_push):
+        """测试存在未完成的发布时不能开始新的发布（干跑不受影响）。"""
+        with pytest.raises(ReleaseInProgressError):
+            release(failed_push, push=False)
+
+        assert release(failed_push, dry_run=True).dry_run
+
+    def test_corrupt_journal(self, project_with_pyproject):
+        """测试没有日志或日志损坏时抛出 JournalError。"""
+        path = project_with_pyproject["path"]
+        with pytest.raises(JournalError, match="没有未完成的发布"):
+            resume_release(path)
+
+        (path / ".git" / "bumpster").mkdir()
+        (path / ".git" / JOURNAL_PATH).write_text(json.dumps({"schema": 1}))
+        with pytest.raises(JournalError, match="损坏"):
+            abort_release(path)
+
+
+class TestResume:
+    """测试从中断的步骤继续发布。"""
+
+    def test_resume_push(self, failed_push):
+        """测试只重试推送，不重新提交和打标签。"""
+        remote = add_remote(failed_push)
+        reset_process_counts()
+
+        result = resume_release(failed_push)
+
+        assert process_counts() == {"git": 1}
+        assert result.pushed and result.new_version == "1.1.0"
+        assert result.commit_sha == git(failed_push, "rev-parse", "HEAD")
+        assert git(remote, "tag") == "v1.1.0"
+        assert not (failed_push / ".git" / JOURNAL_PATH).exists()
+
+    def test_interrupted_before_commit(self, project_with_pyproject, monkeypatch):
+        """测试在提交时中断后继续：不重新写入版本号，提交和打标签。"""
+        path = project_with_pyproject["path"]
+        interrupt_at(monkeypatch, "commit")
+        with pytest.raises(KeyboardInterrupt):
+            release(path, push=False)
+        monkeypatch.undo()
+        assert journal_of(path).completed == ["write"]
+
+        reset_process_counts()
+        resume_release(path)
+
+        assert process_counts() == {"git": 3}  # add、commit、tag
+        assert get_version_from_pyproject(path) == "1.0.1"
+        assert git(path, "log", "-1", "--format=%s") == "chore: release 1.0.1"
+        assert "v1.0.1" in get_git_tags(path)
+
+    def test_commit_not_recorded(self, project_with_pyproject, monkeypatch):
+        """测试提交完成后、记录到日志之前中断：识别出已有的发布提交，不会再提交一次。"""
+        path = project_with_pyproject["path"]
+        complete = ReleaseJournal.complete
+
+        def crash(self, *steps, **kwargs):
+            if "commit" in steps:
+                raise KeyboardInterrupt
+            complete(self, *steps, **kwargs)
+
+        monkeypatch.setattr(ReleaseJournal, "complete", crash)
+        with pytest.raises(KeyboardInterrupt):
+            release(path, push=False)
+        monkeypatch.undo()
+
+        resume_release(path)
+
+        assert git(path, "rev-list", "--count", "HEAD") == "2"
+        assert git(path, "rev-parse", "v1.0.1^{commit}") == git(path, "rev-parse", "HEAD")
+
+    def test_head_moved(self, project_with_pyproject, monkeypatch):
+        """测试中断后 HEAD 被移动到其他提交时拒绝继续。"""
+        path = project_with_pyproject["path"]
+        interrupt_at(monkeypatch, "add")
+        with pytest.raises(KeyboardInterrupt):
+            release(path, push=False)
+        monkeypatch.undo()
+        git(path, "commit", "-q", "--allow-empty", "-m", "unrelated")
+
+        with pytest.raises(JournalError, match="HEAD"):
+            resume_release(path)
+
+
+class TestAbort:
+    """测试回滚中断的发布。"""
+
+    def test_abort_after_tag(self, failed_push):
+        """测试删除标签、退回提交并恢复版本号，工作区恢复干净。"""
+        initial = git(failed_push, "rev-parse", "HEAD~1")
+
+        journal = abort_release(failed_push)
+
+        assert journal.tag == "v1.1.0"
+        assert git(failed_push, "rev-parse", "HEAD") == initial
+        assert "v1.1.0" not in get_git_tags(failed_push)
+        assert get_version_from_pyproject(failed_push) == "1.0.0"
+        assert git(failed_push, "status", "--porcelain") == ""
+        assert release(failed_push, "minor", push=False).new_version == "1.1.0"
+
+    def test_abort_before_commit_removes_created_files(self, project_with_pyproject, monkeypatch):
+        """测试提交之前中断时恢复被修改的文件，删除本次发布新建的 CHANGELOG.md。"""
+        path = project_with_pyproject["path"]
+        interrupt_at(monkeypatch, "commit")
+        with pytest.raises(KeyboardInterrupt):
+            release(path, push=False, changelog=True)
+        monkeypatch.undo()
+        assert (path / "CHANGELOG.md").exists()
+
+        abort_release(path)
+
+        assert not (path / "CHANGELOG.md").exists()
+        assert git(path, "status", "--porcelain") == ""
+        assert git(path, "rev-list", "--count", "HEAD") == "1"
+
+    def test_head_moved_after_release_commit(self, failed_push):
+        """测试发布提交之后又有新的提交时拒绝回滚，不修改任何内容。"""
+        git(failed_push, "commit", "-q", "--allow-empty", "-m", "later")
+
+        with pytest.raises(JournalError, match="HEAD"):
+            abort_release(failed_push)
+
+        assert "v1.1.0" in get_git_tags(failed_push)
+        assert (failed_push / ".git" / JOURNAL_PATH).exists()
+
+
+class TestJournalCommand:
+    """测试 bump --resume / --abort。"""
+
+    def run(self, cwd: Path, *args: str) -> subprocess.CompletedProcess:
+        """运行 CLI（推送不跳过：没有远程仓库时推送失败）。"""
+        env = {key: value for key, value in os.environ.items() if key != "BUMP_VERSION_SKIP_PUSH"}
+        return subprocess.run(
+            [sys.executable, "-m", "bump_version.cli", *args], cwd=cwd, capture_output=True, text=True, env=env
+        )
+
+    def test_resume_and_abort(self, project_with_pyproject):
+        """测试推送失败后提示继续或回滚，新的发布被拒绝，--resume 完成推送，--abort 在没有发布时报错。"""
+        path = project_with_pyproject["path"]
+
+        result = self.run(path, "--type", "patch", "--yes")
+        assert result.returncode == 1
+        assert "bump --resume" in result.stdout
+        assert journal_of(path).pending == ["push"]
+
+        result = self.run(path, "--type", "patch", "--yes")
+        assert result.returncode == 1
+        assert "上一次发布没有完成" in result.stdout
+
+        remote = add_remote(path)
+        result = self.run(path, "--resume")
+        assert result.returncode == 0, result.stdout
+        assert git(remote, "tag") == "v1.0.1"
+
+        result = self.run(path, "--abort")
+        assert result.returncode == 1
+        assert "没有未完成的发布" in result.stdout
+
+    def test_abort(self, project_with_pyproject):
+        """测试 --abort 回滚 CLI 发布中断后留下的状态。"""
+        path = project_with_pyproject["path"]
+        assert self.run(path, "--type", "minor", "--yes").returncode == 1
+
+        result = self.run(path, "--abort")
+
+        assert result.returncode == 0, result.stdout
+        assert get_version_from_pyproject(path) == "1.0.0"
+        assert get_git_tags(path) == []
+        assert git(path, "status", "--porcelain") == ""
+
+    def test_resume_conflicts_with_abort(self, project_with_pyproject):
+        """测试 --resume 与 --abort 不能同时使用。"""
+        result = self.run(project_with_pyproject["path"], "--resume", "--abort")
+
+        assert result.returncode == 2
@@ -0,0 +1,80 @@
+"""锁文件版本号更新测试。"""
+
+from bump_version.lockfile import stamp_uv_lock
+
+UV_LOCK = """\
+version = 1
+revision = 2
+requires-python = ">=3.12"
+
+[[package]]
+name = "click"
+version = "8.1.8"
+source = { registry = "https://pypi.org/simple" }
+
+[[package]]
+name = "demo"
+version = "1.0.0"
+source = { editable = "." }
+dependencies = [
+    { name = "click" },
+]
+
+[package.metadata]
+requires-dist = [{ name = "click", specifier = ">=8.1.0" }]
+"""
+
+
+class TestStampUvLock:
+    """测试直接改写 uv.lock 中根项目的版本号。"""
+
+    def test_only_root_version_changes(self, temp_dir):
+        """测试只改写根项目的版本号，其余字节保持不变。"""
+        path = temp_dir / "uv.lock"
+        path.write_bytes(UV_LOCK.replace("\n", "\r\n").encode())
+
+        assert stamp_uv_lock(path, "1.1.0")
+
+        expected = UV_LOCK.replace('version = "1.0.0"', 'version = "1.1.0"').replace("\n", "\r\n")
+        assert path.read_bytes() == expected.encode()
+
+    def test_same_version_is_noop(self, temp_dir):
+        """测试版本号已经一致时不写入文件。"""
+        path = temp_dir / "uv.lock"
+        path.write_text(UV_LOCK)
+        mtime = path.stat().st_mtime_ns
+
+        assert stamp_uv_lock(path, "1.0.0")
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_unsupported_lock_version(self, temp_dir):
+        """测试不支持的锁文件格式版本返回 False，文件不变。"""
+        path = temp_dir / "uv.lock"
+        path.write_text(UV_LOCK.replace("version = 1\n", "version = 99\n", 1))
+
+        assert not stamp_uv_lock(path, "1.1.0")
+        assert 'version = "1.0.0"' in path.read_text()
+
+    def test_root_without_version(self, temp_dir):
+        """测试根项目没有版本号（虚拟项目或动态版本）时返回 False。"""
+        path = temp_dir / "uv.lock"
+        path.write_text(UV_LOCK.replace('version = "1.0.0"\nsource = { editable = "." }', 'source = { virtual = "." }'))
+
+        assert not stamp_uv_lock(path, "1.1.0")
+
+    def test_verification_failure(self, temp_dir):
+        """测试扫描定位到的不是根项目的版本号时校验失败，文件不变。"""
+        # 带引号的键不被扫描识别，扫描结果会指向子表中的 version
+        content = UV_LOCK.replace('version = "1.0.0"', '"version" = "1.0.0"') + '\n[package.extra]\nversion = "x"\n'
+        path = temp_dir / "uv.lock"
+        path.write_text(content)
+
+        assert not stamp_uv_lock(path, "1.1.0")
+        assert path.read_text() == content
+
+    def test_invalid_toml(self, temp_dir):
+        """测试无法解析的锁文件返回 False。"""
+        path = temp_dir / "uv.lock"
+        path.write_text("[[package]\n")
+
+        assert not stamp_uv_lock(path, "1.1.0")
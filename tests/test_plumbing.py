@@ -0,0 +1,241 @@
+"""底层命令提交测试（结果与 git 命令对照）。"""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from bump_version import commands
+from bump_version.api import release
+from bump_version.errors import CommandError, PlumbingNotAllowedError
+from bump_version.gitrepo import GitRepository
+from bump_version.plumbing import commit_files, parse_tree, skipped_features
+from tests.conftest import get_git_tags, get_last_commit_message, get_version_from_pyproject
+
+
+def git(cwd: Path, *args: str) -> str:
+    """执行 git 命令并返回输出。"""
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def assert_synced(path: Path) -> None:
+    """工作区、索引和 HEAD 完全一致。"""
+    assert git(path, "status", "--porcelain") == ""
+    subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=path, check=True)
+    subprocess.run(["git", "fsck", "--no-progress"], cwd=path, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(project_with_pyproject) -> Path:
+    """带有子目录和可执行文件的仓库。"""
+    path = project_with_pyproject["path"]
+    (path / "src" / "pkg").mkdir(parents=True)
+    (path / "src" / "pkg" / "__init__.py").write_text('__version__ = "1.0.0"\n')
+    (path / "run.sh").write_text("#!/bin/sh\n")
+    os.chmod(path / "run.sh", 0o755)
+    git(path, "add", ".")
+    git(path, "commit", "-q", "-m", "layout")
+    return path
+
+
+class TestParseTree:
+    """测试树对象解析。"""
+
+    def test_matches_ls_tree(self, repo):
+        """测试解析结果与 git ls-tree 一致。"""
+        content = subprocess.run(["git", "cat-file", "tree", "HEAD"], cwd=repo, check=True, capture_output=True).stdout
+
+        entries = parse_tree(content, 20)
+
+        expected = {}
+        for line in git(repo, "ls-tree", "HEAD").splitlines():
+            meta, name = line.split("\t")
+            mode, _, sha = meta.split(" ")
+            expected[name] = (mode.lstrip("0"), sha)
+        assert entries == expected
+
+
+class TestCommitFiles:
+    """测试不经过索引的提交。"""
+
+    def test_commit_and_tag(self, repo):
+        """测试沿改动路径重建树，创建提交和附注标签，并同步索引。"""
+        parent = git(repo, "rev-parse", "HEAD")
+        (repo / "pyproject.toml").write_text((repo / "pyproject.toml").read_text().replace("1.0.0", "1.0.1"))
+        (repo / "src" / "pkg" / "__init__.py").write_text('__version__ = "1.0.1"\n')
+        (repo / "src" / "pkg" / "_version.py").write_text('VERSION = "1.0.1"\n')
+
+        result = commit_files(
+            GitRepository.discover(repo),
+            ["pyproject.toml", "src/pkg/__init__.py", "src/pkg/_version.py"],
+            "chore: release 1.0.1",
+            tag="v1.0.1",
+            tag_message="Release 1.0.1",
+        )
+
+        assert git(repo, "rev-parse", "HEAD") == result.commit_sha
+        assert git(repo, "rev-parse", "HEAD^") == parent
+        assert get_last_commit_message(repo) == "chore: release 1.0.1"
+        assert git(repo, "rev-parse", "v1.0.1") == result.tag_sha
+        assert git(repo, "rev-parse", "v1.0.1^{commit}") == result.commit_sha
+        assert git(repo, "cat-file", "-t", "v1.0.1") == "tag"
+        assert git(repo, "diff", "--name-only", "HEAD^", "HEAD").splitlines() == [
+            "pyproject.toml",
+            "src/pkg/__init__.py",
+            "src/pkg/_version.py",
+        ]
+        assert git(repo, "ls-tree", "HEAD", "run.sh").startswith("100755")
+        assert git(repo, "reflog", "-1", "--format=%gs") == "commit: chore: release 1.0.1"
+        assert_synced(repo)
+
+    def test_process_count_is_independent_of_repository_size(self, repo):
+        """测试启动的进程数固定。"""
+        (repo / "pyproject.toml").write_text((repo / "pyproject.toml").read_text().replace("1.0.0", "1.0.1"))
+        commands.reset_process_counts()
+
+        commit_files(GitRepository.discover(repo), ["pyproject.toml"], "release", tag="v1.0.1")
+
+        # hash-object、cat-file、mktree、commit-tree、mktag、update-ref、update-index
+        assert commands.process_counts() == {"git": 7}
+
+    def test_existing_tag_is_atomic(self, repo):
+        """测试标签已存在时分支和标签都不更新。"""
+        git(repo, "tag", "v1.0.1")
+        head = git(repo, "rev-parse", "HEAD")
+        (repo / "pyproject.toml").write_text((repo / "pyproject.toml").read_text().replace("1.0.0", "1.0.1"))
+
+        with pytest.raises(CommandError):
+            commit_files(GitRepository.discover(repo), ["pyproject.toml"], "release", tag="v1.0.1")
+
+        assert git(repo, "rev-parse", "HEAD") == head
+        assert git(repo, "rev-parse", "v1.0.1") == head
+
+    def test_unborn_branch(self, git_repo):
+        """测试还没有任何提交的仓库。"""
+        (git_repo / "pyproject.toml").write_text('[project]\nversion = "0.1.0"\n')
+
+        result = commit_files(GitRepository.discover(git_repo), ["pyproject.toml"], "initial")
+
+        assert git(git_repo, "rev-parse", "main") == result.commit_sha
+        assert result.tag_sha is None
+        assert_synced(git_repo)
+
+    def test_project_in_subdirectory(self, repo):
+        """测试 monorepo 子目录中的项目，路径相对于项目目录。"""
+        project = repo / "src" / "pkg"
+        (project / "__init__.py").write_text('__version__ = "2.0.0"\n')
+
+        commit_files(GitRepository.discover(project), ["__init__.py"], "release", root=project)
+
+        assert git(repo, "show", "HEAD:src/pkg/__init__.py") == '__version__ = "2.0.0"'
+        assert_synced(repo)
+
+    def test_missing_file(self, repo):
+        """测试文件不存在时抛出 CommandError，不创建任何提交。"""
+        head = git(repo, "rev-parse", "HEAD")
+
+        with pytest.raises(CommandError):
+            commit_files(GitRepository.discover(repo), ["missing.txt"], "release")
+
+        assert git(repo, "rev-parse", "HEAD") == head
+
+    def test_symlinks_are_not_followed(self, repo, tmp_path):
+        """测试与 git add 相同，符号链接按链接本身提交（包括指向仓库外的链接）。"""
+        (tmp_path / "outside.txt").write_text("outside\n")
+        (repo / "latest").symlink_to(tmp_path / "outside.txt")
+        (repo / "src" / "run").symlink_to("../run.sh")
+        (repo / "pyproject.toml").write_text((repo / "pyproject.toml").read_text().replace("1.0.0", "1.0.1"))
+
+        commit_files(GitRepository.discover(repo), ["pyproject.toml", "latest", "src/../src/run"], "release")
+
+        assert git(repo, "ls-tree", "HEAD", "latest").startswith("120000")
+        assert git(repo, "cat-file", "-p", "HEAD:latest") == str(tmp_path / "outside.txt")
+        assert git(repo, "ls-tree", "HEAD", "src/run").startswith("120000")
+        assert git(repo, "cat-file", "-p", "HEAD:src/run") == "../run.sh"
+        assert git(repo, "diff", "--name-only", "HEAD^", "HEAD").splitlines() == ["latest", "pyproject.toml", "src/run"]
+        assert_synced(repo)
+
+
+class TestSkippedFeatures:
+    """测试检测底层命令会跳过的钩子和签名。"""
+
+    def test_default_repository(self, repo):
+        """测试 git init 生成的 .sample 钩子不算已安装。"""
+        assert skipped_features(GitRepository.discover(repo)) == []
+
+    def test_hooks_and_signing(self, repo):
+        """测试可执行的提交钩子、core.hooksPath 和签名配置。"""
+        hook = repo / ".git" / "hooks" / "pre-commit"
+        hook.write_text("#!/bin/sh\n")
+        hook.chmod(0o755)
+        git(repo, "config", "commit.gpgsign", "true")
+        git(repo, "config", "tag.gpgsign", "false")
+
+        assert skipped_features(GitRepository.discover(repo)) == ["commit.gpgsign", "pre-commit 钩子"]
+
+        (repo / "hooks").mkdir()
+        (repo / "hooks" / "commit-msg").write_text("#!/bin/sh\n")
+        (repo / "hooks" / "commit-msg").chmod(0o755)
+        (repo / "hooks" / "post-commit").write_text("#!/bin/sh\n")
+        git(repo, "config", "core.hooksPath", "hooks")
+
+        # 配置 hooksPath 后不再使用 .git/hooks；没有执行权限的钩子 git 也不会执行
+        assert skipped_features(GitRepository.discover(repo)) == ["commit.gpgsign", "commit-msg 钩子"]
+
+
+class TestReleaseWithPlumbing:
+    """测试发布流程使用底层命令。"""
+
+    def test_api_release(self, repo):
+        """测试库接口。"""
+        result = release(repo, "minor", push=False, plumbing=True)
+
+        assert result.commit_sha == git(repo, "rev-parse", "HEAD")
+        assert get_version_from_pyproject(repo) == "1.1.0"
+        assert "v1.1.0" in get_git_tags(repo)
+        assert_synced(repo)
+
+    def test_cli_release(self, repo, monkeypatch):
+        """测试命令行 --plumbing。"""
+        from bump_version.cli import run_version_bump
+
+        monkeypatch.setenv("BUMP_VERSION_SKIP_PUSH", "true")
+        monkeypatch.chdir(repo)
+
+        run_version_bump(release_type="major", assume_yes=True, plumbing=True)
+
+        assert get_version_from_pyproject(repo) == "2.0.0"
+        assert get_last_commit_message(repo) == "chore: release 2.0.0"
+        assert git(repo, "cat-file", "-t", "v2.0.0") == "tag"
+        assert_synced(repo)
+
+    def test_api_refuses_when_hooks_would_be_skipped(self, repo):
+        """测试仓库配置了签名时库接口拒绝执行，不修改任何文件。"""
+        head = git(repo, "rev-parse", "HEAD")
+        git(repo, "config", "tag.gpgsign", "true")
+
+        with pytest.raises(PlumbingNotAllowedError, match=r"tag\.gpgsign") as exc_info:
+            release(repo, "minor", push=False, plumbing=True)
+
+        assert exc_info.value.features == ["tag.gpgsign"]
+        assert git(repo, "rev-parse", "HEAD") == head
+        assert get_version_from_pyproject(repo) == "1.0.0"
+        assert not (repo / ".git" / "bumpster" / "release.json").exists()
+
+    def test_cli_refuses_when_hooks_would_be_skipped(self, repo, monkeypatch):
+        """测试安装了提交钩子时 --plumbing 失败退出，不修改任何文件。"""
+        from bump_version.cli import run_version_bump
+
+        hook = repo / ".git" / "hooks" / "commit-msg"
+        hook.write_text("#!/bin/sh\n")
+        hook.chmod(0o755)
+        monkeypatch.setenv("BUMP_VERSION_SKIP_PUSH", "true")
+        monkeypatch.chdir(repo)
+
+        with pytest.raises(SystemExit) as exc_info:
+            run_version_bump(release_type="major", assume_yes=True, plumbing=True)
+
+        assert exc_info.value.code == 1
+        assert get_version_from_pyproject(repo) == "1.0.0"
+        assert "v2.0.0" not in get_git_tags(repo)
@@ -0,0 +1,254 @@
+"""发布前检查测试。"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from bump_version import commands
+from bump_version import preflight as preflight_module
+from bump_version.errors import CommandError, DirtyWorktreeError, NotAGitRepositoryError, ProjectNotFoundError
+from bump_version.preflight import PreflightResult, preflight, run_checks, scan_worktree
+
+
+class TestPreflight:
+    """测试并发的发布前检查。"""
+
+    def test_clean_project(self, project_with_pyproject):
+        """测试干净的项目返回所有检查结果，并逐项回调。"""
+        path = project_with_pyproject["path"]
+        seen = []
+
+        result = preflight(path, on_result=lambda name, value: seen.append(name))
+
+        assert result == PreflightResult("1.0.0", "pyproject.toml", "main", False)
+        assert sorted(seen) == ["branch", "status", "uv_lock", "version"]
+
+    def test_uv_lock_detected(self, project_with_pyproject):
+        """测试探测 uv.lock。"""
+        path = project_with_pyproject["path"]
+        (path / ".gitignore").write_text("uv.lock\n.gitignore\n")
+        (path / "uv.lock").write_text("")
+
+        assert preflight(path).has_uv_lock
+
+    def test_dirty_worktree(self, project_with_pyproject):
+        """测试工作区不干净时抛出 DirtyWorktreeError。"""
+        path = project_with_pyproject["path"]
+        (path / "new.txt").write_text("x")
+
+        with pytest.raises(DirtyWorktreeError) as exc_info:
+            preflight(path)
+        assert "new.txt" in exc_info.value.status
+
+    def test_failure_order_is_deterministic(self, temp_dir):
+        """测试多个检查同时失败时，按声明顺序报告第一个失败（配置文件优先于 git）。"""
+        for _ in range(5):
+            with pytest.raises(ProjectNotFoundError):
+                preflight(temp_dir)
+
+    def test_not_a_git_repo(self, temp_dir):
+        """测试不在 Git 仓库中时抛出 NotAGitRepositoryError。"""
+        (temp_dir / "pyproject.toml").write_text('[project]\nname = "x"\nversion = "1.0.0"\n')
+
+        with pytest.raises(NotAGitRepositoryError):
+            preflight(temp_dir)
+
+
+class TestRunChecks:
+    """测试检查的调度与取消。"""
+
+    def test_failure_cancels_running_commands(self, temp_dir):
+        """测试一个检查失败时立即终止仍在运行的命令。"""
+
+        def fail(cancellation):
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        start = time.perf_counter()
+        with pytest.raises(ValueError, match="boom"):
+            run_checks(
+                {
+                    "slow": lambda cancellation: cancellation.run(
+                        [sys.executable, "-c", "import time; time.sleep(30)"], temp_dir
+                    ),
+                    "fail": fail,
+                }
+            )
+
+        assert time.perf_counter() - start < 10
+
+    def test_cancelled_status_leaves_no_index_lock(self, project_with_pyproject, monkeypatch):
+        """测试 git status 被取消时不会留下 index.lock（之后的 git add / commit 不受影响）。
+
+        用一个模拟的 git 代替真实的 git，使竞争窗口稳定出现：与 git status 刷新索引时一样持有 index.lock，
+        收到 SIGTERM 时清理锁文件，SIGKILL 则无法清理。
+        """
+        path = project_with_pyproject["path"]
+        shim = path.parent / f"{path.name}-bin"
+        shim.mkdir()
+        (shim / "git").write_text(
+            "#!/bin/sh\ntouch .git/index.lock\ntrap 'rm -f .git/index.lock; exit 143' TERM\nsleep 5 & wait $!\n"
+        )
+        (shim / "git").chmod(0o755)
+        monkeypatch.setenv("PATH", f"{shim}{os.pathsep}{os.environ['PATH']}")
+
+        def fail(cancellation):
+            time.sleep(0.2)
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            run_checks({"status": lambda cancellation: scan_worktree(path, cancellation=cancellation), "fail": fail})
+
+        assert not (path / ".git" / "index.lock").exists()
+
+    def test_checks_run_concurrently(self, temp_dir):
+        """测试检查并发执行。"""
+        sleep = [sys.executable, "-c", "import time; time.sleep(0.5)"]
+
+        start = time.perf_counter()
+        results = run_checks({f"check{i}": lambda cancellation: cancellation.run(sleep, temp_dir) for i in range(4)})
+
+        assert len(results) == 4
+        assert time.perf_counter() - start < 1.5
+
+
+class TestScanWorktree:
+    """测试流式工作区检查。"""
+
+    def test_matches_porcelain_v1(self, project_with_pyproject):
+        """测试输出与 git status --porcelain 一致。"""
+        path = project_with_pyproject["path"]
+        (path / "pyproject.toml").write_text("changed")
+        (path / "staged.txt").write_text("x")
+        subprocess.run(["git", "add", "staged.txt"], cwd=path, check=True)
+        (path / "build").mkdir()
+        (path / "build" / "out.bin").write_text("x")
+        (path / "name with space.txt").write_text("x")
+
+        status = scan_worktree(path)
+
+        expected = subprocess.run(
+            ["git", "-c", "core.quotePath=false", "status", "--porcelain", "--no-renames"],
+            cwd=path,
+            capture_output=True,
+            text=True,
+        ).stdout
+        expected_entries = [line.replace('"', "") for line in expected.splitlines()]
+        assert sorted(status.entries) == sorted(expected_entries)
+        assert not status.truncated
+
+    def test_stops_after_limit(self, project_with_pyproject):
+        """测试找到 limit 条更改后立即停止。"""
+        path = project_with_pyproject["path"]
+        for i in range(50):
+            (path / f"artefact-{i}.o").write_text("x")
+
+        status = scan_worktree(path, untracked="all", limit=3)
+
+        assert len(status.entries) == 3
+        assert status.truncated
+        assert not status.clean
+
+    def test_untracked_modes(self, project_with_pyproject):
+        """测试未跟踪文件模式。"""
+        path = project_with_pyproject["path"]
+        (path / "dist").mkdir()
+        (path / "dist" / "a.whl").write_text("x")
+        (path / "dist" / "b.whl").write_text("x")
+
+        assert scan_worktree(path).entries == ("?? dist/",)
+        assert sorted(scan_worktree(path, untracked="all").entries) == ["?? dist/a.whl", "?? dist/b.whl"]
+        assert scan_worktree(path, untracked="no").clean
+        assert preflight(path, untracked="no").version == "1.0.0"
+        with pytest.raises(ValueError):
+            scan_worktree(path, untracked="some")
+
+    def test_pathspec_scope(self, project_with_pyproject):
+        """测试只检查项目目录（monorepo 中其他目录的更改不影响发布）。"""
+        path = project_with_pyproject["path"]
+        package = path / "packages" / "core"
+        package.mkdir(parents=True)
+        (package / "pyproject.toml").write_text('[project]\nname = "core"\nversion = "0.1.0"\n')
+        subprocess.run(["git", "add", "."], cwd=path, check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "core"], cwd=path, check=True)
+        (path / "other.txt").write_text("x")
+
+        assert scan_worktree(package, pathspecs=(".",)).clean
+        assert not scan_worktree(package).clean
+        assert preflight(package, pathspecs=(".",)).version == "0.1.0"
+
+        (package / "dirty.py").write_text("x")
+        with pytest.raises(DirtyWorktreeError) as exc_info:
+            preflight(package, pathspecs=(".",))
+        assert exc_info.value.status == "?? packages/core/dirty.py"
+
+    def test_noisy_stderr(self, project_with_pyproject, monkeypatch):
+        """测试 git 在标准错误输出大量警告（超过管道缓冲区）时不会死锁，失败时带上错误输出。"""
+        path = project_with_pyproject["path"]
+        shim = path.parent / f"{path.name}-bin"
+        shim.mkdir()
+        (shim / "git").write_text("#!/bin/sh\nhead -c 500000 /dev/zero | tr '\\0' w >&2\nprintf '? a.txt\\0'\nexit 1\n")
+        (shim / "git").chmod(0o755)
+        monkeypatch.setenv("PATH", f"{shim}{os.pathsep}{os.environ['PATH']}")
+        outcome = []
+        thread = threading.Thread(target=lambda: outcome.append(self._scan_error(path)), daemon=True)
+
+        thread.start()
+        thread.join(10)
+
+        assert not thread.is_alive()
+        assert isinstance(outcome[0], CommandError)
+        assert outcome[0].stderr.startswith("www")
+
+    @staticmethod
+    def _scan_error(path) -> Exception | None:
+        try:
+            scan_worktree(path)
+        except Exception as e:
+            return e
+        return None
+
+    def test_process_cleaned_up_on_error(self, project_with_pyproject, monkeypatch):
+        """测试读取输出出错时终止并回收 git 进程，关闭管道。"""
+        path = project_with_pyproject["path"]
+        (path / "untracked.txt").write_text("x")
+        processes = []
+        popen = commands.popen
+
+        def recording_popen(*args, **kwargs):
+            processes.append(popen(*args, **kwargs))
+            return processes[-1]
+
+        monkeypatch.setattr(commands, "popen", recording_popen)
+
+        def broken(records):
+            next(records)
+            raise UnicodeDecodeError("utf-8", b"", 0, 1, "bad")
+
+        monkeypatch.setattr(preflight_module, "_status_entries", broken)
+
+        with pytest.raises(UnicodeDecodeError):
+            scan_worktree(path)
+
+        assert processes[0].returncode is not None
+        assert processes[0].stdout.closed
+
+    def test_untracked_cache_enabled_unless_configured(self, project_with_pyproject):
+        """测试仓库没有配置时检查会把未跟踪文件缓存写入索引（UNTR 扩展），显式关闭时不写入。"""
+        path = project_with_pyproject["path"]
+        (path / "build").mkdir()
+        (path / "build" / "out.bin").write_text("x")
+        index = path / ".git" / "index"
+
+        subprocess.run(["git", "config", "core.untrackedCache", "false"], cwd=path, check=True)
+        scan_worktree(path)
+        assert b"UNTR" not in index.read_bytes()
+
+        subprocess.run(["git", "config", "--unset", "core.untrackedCache"], cwd=path, check=True)
+        scan_worktree(path)
+        assert b"UNTR" in index.read_bytes()
+        assert not (path / ".git" / "index.lock").exists()
@@ -0,0 +1,188 @@
+"""项目配置文件读取测试。"""
+
+import os
+
+import pytest
+
+from bump_version import project
+from bump_version.project import ProjectDocument, ProjectNotFoundError, read_project_version, write_project_version
+
+
+class TestReadProjectVersion:
+    """测试读取项目版本号。"""
+
+    def test_pyproject(self, project_with_pyproject):
+        """测试读取 [project] 部分。"""
+        assert read_project_version(project_with_pyproject["path"]) == ("1.0.0", "pyproject.toml")
+
+    def test_poetry(self, temp_dir):
+        """测试读取 [tool.poetry] 部分。"""
+        (temp_dir / "pyproject.toml").write_text('[tool.poetry]\nname = "demo"\nversion = "2.1.0rc1"\n')
+
+        assert read_project_version(temp_dir) == ("2.1.0rc1", "pyproject.toml")
+
+    def test_setup_py(self, project_with_setup_py):
+        """测试读取 setup.py。"""
+        assert read_project_version(project_with_setup_py["path"]) == ("1.0.0", "setup.py")
+
+    def test_pyproject_without_version_falls_back_to_setup_py(self, project_with_setup_py):
+        """测试 pyproject.toml 中没有版本号时使用 setup.py。"""
+        path = project_with_setup_py["path"]
+        (path / "pyproject.toml").write_text('[build-system]\nrequires = ["setuptools"]\n')
+
+        assert read_project_version(path) == ("1.0.0", "setup.py")
+
+    def test_not_found(self, temp_dir):
+        """测试没有配置文件时抛出 ProjectNotFoundError。"""
+        with pytest.raises(ProjectNotFoundError):
+            read_project_version(temp_dir)
+
+
+class TestWriteProjectVersion:
+    """测试写入项目版本号。"""
+
+    def test_only_version_bytes_change(self, temp_dir):
+        """测试只替换版本号字符串，注释、空白和换行符保持不变。"""
+        content = (
+            b"# \xe9\xa1\xb9\xe7\x9b\xae\r\n"
+            b'[tool.other]\r\nversion = "9.9.9"\r\n\r\n'
+            b'[project]  # main\r\nname   =  "demo"\r\nversion\t= "1.0.0"   # current\r\n'
+        )
+        (temp_dir / "pyproject.toml").write_bytes(content)
+
+        write_project_version(temp_dir, "1.0.1", "pyproject.toml")
+
+        assert (temp_dir / "pyproject.toml").read_bytes() == content.replace(b'"1.0.0"', b'"1.0.1"')
+
+    def test_poetry(self, temp_dir):
+        """测试 [tool.poetry] 部分，保留单引号写法。"""
+        (temp_dir / "pyproject.toml").write_text("[tool . poetry]\nname = 'demo'\nversion = '2.1.0rc1'\n")
+
+        write_project_version(temp_dir, "2.1.0", "pyproject.toml")
+
+        assert (temp_dir / "pyproject.toml").read_text() == "[tool . poetry]\nname = 'demo'\nversion = '2.1.0'\n"
+
+    def test_project_takes_precedence_over_poetry(self, temp_dir):
+        """测试两个部分都有版本号时只更新 [project]（与读取时一致）。"""
+        (temp_dir / "pyproject.toml").write_text(
+            '[tool.poetry]\nversion = "1.0.0"\n\n[project]\nname = "demo"\nversion = "1.0.0"\n'
+        )
+
+        write_project_version(temp_dir, "1.1.0", "pyproject.toml")
+
+        text = (temp_dir / "pyproject.toml").read_text()
+        assert text == '[tool.poetry]\nversion = "1.0.0"\n\n[project]\nname = "demo"\nversion = "1.1.0"\n'
+
+    def test_inline_table_falls_back_to_tomlkit(self, temp_dir):
+        """测试无法直接定位的写法（内联表）回退到 tomlkit。"""
+        (temp_dir / "pyproject.toml").write_text('project = { name = "demo", version = "1.0.0" }\n')
+
+        write_project_version(temp_dir, "1.0.1", "pyproject.toml")
+
+        assert read_project_version(temp_dir) == ("1.0.1", "pyproject.toml")
+
+    def test_multiline_string_is_not_modified(self, temp_dir):
+        """测试多行字符串中形似表头的内容不会被误改。"""
+        notes = '[tool.notes]\ntext = """\n[project]\nversion = "1.0.0"\n"""\n\n'
+        (temp_dir / "pyproject.toml").write_text(notes + '[project]\nversion = "1.0.0"\n')
+
+        write_project_version(temp_dir, "2.0.0", "pyproject.toml")
+
+        assert (temp_dir / "pyproject.toml").read_text() == notes + '[project]\nversion = "2.0.0"\n'
+
+    def test_verification_falls_back_to_tomlkit(self, temp_dir):
+        """测试扫描定位到的位置与实际读取的位置不一致时，校验失败并回退到 tomlkit。"""
+        # 带引号的键不被扫描识别，扫描结果会指向 [tool.poetry]，而读取时以 [project] 为准
+        (temp_dir / "pyproject.toml").write_text('[project]\n"version" = "1.0.0"\n\n[tool.poetry]\nversion = "1.0.0"\n')
+
+        write_project_version(temp_dir, "1.0.1", "pyproject.toml")
+
+        text = (temp_dir / "pyproject.toml").read_text()
+        assert text == '[project]\n"version" = "1.0.1"\n\n[tool.poetry]\nversion = "1.0.0"\n'
+
+    def test_setup_py(self, project_with_setup_py):
+        """测试更新 setup.py。"""
+        path = project_with_setup_py["path"]
+
+        write_project_version(path, "1.0.1", "setup.py")
+
+        assert read_project_version(path) == ("1.0.1", "setup.py")
+
+    def test_atomic_write_keeps_mode(self, project_with_pyproject):
+        """测试写入后保留文件权限，并且不留下临时文件。"""
+        path = project_with_pyproject["path"]
+        os.chmod(path / "pyproject.toml", 0o640)
+
+        write_project_version(path, "1.0.1", "pyproject.toml")
+
+        assert os.stat(path / "pyproject.toml").st_mode & 0o777 == 0o640
+        assert not list(path.glob(".pyproject.toml.*"))
+
+    def test_failed_write_keeps_original(self, project_with_pyproject, monkeypatch):
+        """测试替换文件失败时原文件不变，临时文件被清理。"""
+        path = project_with_pyproject["path"]
+        original = (path / "pyproject.toml").read_bytes()
+
+        def fail(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(project.os, "replace", fail)
+        with pytest.raises(OSError, match="disk full"):
+            write_project_version(path, "1.0.1", "pyproject.toml")
+
+        assert (path / "pyproject.toml").read_bytes() == original
+        assert not list(path.glob(".pyproject.toml.*"))
+
+
+class TestProjectDocument:
+    """测试 ProjectDocument 的缓存和版本号读取。"""
+
+    def test_load_is_cached_until_file_changes(self, temp_dir):
+        """测试文件未变化时复用同一个文档，文件变化后重新读取。"""
+        path = temp_dir / "pyproject.toml"
+        path.write_text('[project]\nversion = "1.0.0"\n')
+
+        document = ProjectDocument.load(path)
+        assert ProjectDocument.load(path) is document
+
+        path.write_text('[project]\nversion = "1.0.10"\n')
+        assert ProjectDocument.load(path) is not document
+        assert ProjectDocument.load(path).version == "1.0.10"
+
+    def test_write_updates_cache(self, project_with_pyproject, monkeypatch):
+        """测试写入后缓存的就是新文档，随后的读取不再打开文件。"""
+        path = project_with_pyproject["path"]
+        write_project_version(path, "1.0.1", "pyproject.toml")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("不应重新读取文件")
+
+        monkeypatch.setattr(project, "open", fail, raising=False)
+        assert read_project_version(path) == ("1.0.1", "pyproject.toml")
+
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            ("[project]\nname = \"demo\"\nversion = '1.2.3'  # 注释\n", "1.2.3"),
+            ('[tool.poetry]\nversion = "2.0.0"\n', "2.0.0"),
+            ('[project]\n"version" = "3.0.0"\n', "3.0.0"),
+            ('[project]\nname = "demo"\ndynamic = ["version"]\n', None),
+            ('text = """\n[project]\nversion = "9.9.9"\n"""\n', None),
+        ],
+    )
+    def test_version_matches_full_parse(self, temp_dir, content, expected):
+        """测试扫描得到的版本号与完整解析一致。"""
+        document = ProjectDocument(temp_dir / "pyproject.toml", content.encode())
+
+        assert document.version == expected
+
+    def test_cache_size_is_bounded(self, temp_dir, monkeypatch):
+        """测试缓存的文档数有上限。"""
+        monkeypatch.setattr(project, "MAX_CACHED_DOCUMENTS", 2)
+        monkeypatch.setattr(project, "_documents", {})
+        for name in ("a", "b", "c"):
+            (temp_dir / name).mkdir()
+            (temp_dir / name / "pyproject.toml").write_text('[project]\nversion = "1.0.0"\n')
+            ProjectDocument.load(temp_dir / name / "pyproject.toml")
+
+        assert len(project._documents) == 2
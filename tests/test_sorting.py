@@ -0,0 +1,161 @@
+"""版本号流式排序测试。"""
+
+import random
+import subprocess
+import sys
+
+import pytest
+from packaging.version import Version
+
+from bump_version import sorting
+from bump_version.sorting import latest_version, parse_size, sort_versions
+
+
+@pytest.fixture
+def versions():
+    """带重复、预发布、post、dev 和本地版本的随机版本号。"""
+    rng = random.Random(440)
+    suffixes = ["", "a1", "rc1", ".post1", ".dev2", ".post1.dev0", "+local"]
+    result = [f"{rng.randint(0, 3)}.{rng.randint(0, 3)}{rng.choice(suffixes)}" for _ in range(3000)]
+    return [*result, "v1.0", "1.0.0", "1"]
+
+
+class TestParseSize:
+    """测试内存大小解析。"""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"), [("1024", 1024), ("64K", 65536), ("2m", 2 * 1024**2), ("1GB", 1024**3)]
+    )
+    def test_valid(self, text, expected):
+        """测试带单位的大小。"""
+        assert parse_size(text) == expected
+
+    @pytest.mark.parametrize("text", ["", "0", "abc", "1T", "-1M"])
+    def test_invalid(self, text):
+        """测试无效的大小。"""
+        with pytest.raises(ValueError):
+            parse_size(text)
+
+
+class TestSortVersions:
+    """测试排序。"""
+
+    def test_pep440_order(self):
+        """测试按 PEP 440 而不是字符串顺序排序。"""
+        versions = ["1.0.post1", "1.0", "1.0rc1", "1.0.dev0", "1.0a1", "0.10", "0.9"]
+
+        assert list(sort_versions(versions)) == ["0.9", "0.10", "1.0.dev0", "1.0a1", "1.0rc1", "1.0", "1.0.post1"]
+
+    def test_in_memory_matches_packaging(self, versions):
+        """测试内存内排序与 packaging 一致且稳定。"""
+        assert list(sort_versions(versions)) == sorted(versions, key=Version)
+
+    def test_external_merge_matches_packaging(self, versions, monkeypatch):
+        """测试超出内存预算时分段归并（含多层归并）的结果不变。"""
+        monkeypatch.setattr(sorting, "MAX_MERGE_FANIN", 4)
+
+        assert list(sort_versions(versions, memory_limit=8192)) == sorted(versions, key=Version)
+
+    def test_external_merge_reverse(self, versions):
+        """测试降序归并保持稳定。"""
+        expected = sorted(versions, key=Version, reverse=True)
+
+        assert list(sort_versions(versions, reverse=True, memory_limit=8192)) == expected
+
+    def test_temp_files_removed(self, versions, tmp_path):
+        """测试排序结束后删除临时文件。"""
+        list(sort_versions(versions, memory_limit=8192, temp_dir=tmp_path))
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unique(self, versions):
+        """测试去掉相等的版本号并保留第一个。"""
+        result = list(sort_versions(versions, unique=True, memory_limit=8192))
+
+        assert len(result) == len({Version(v) for v in versions})
+        assert [Version(v) for v in result] == sorted({Version(v) for v in versions})
+        assert list(sort_versions(["1.0.0", "v1.0", "1"], unique=True)) == ["1.0.0"]
+
+    def test_invalid_versions_skipped(self):
+        """测试跳过无效版本号并回调。"""
+        invalid = []
+
+        assert list(sort_versions(["2.0", "bad", "", "1.0\n"], on_invalid=invalid.append)) == ["1.0", "2.0"]
+        assert invalid == ["bad"]
+
+
+class TestLatestVersion:
+    """测试求最大版本号。"""
+
+    def test_latest(self):
+        """测试返回原始写法的最大版本号。"""
+        assert latest_version(["v1.0", "2.0rc1", "1.5"]) == "2.0rc1"
+
+    def test_stable(self):
+        """测试只考虑稳定版本，post 视为稳定版本。"""
+        assert latest_version(["1.0", "2.0rc1", "1.0.post1", "2.0.dev1"], stable=True) == "1.0.post1"
+
+    def test_ties_keep_first(self):
+        """测试相等的版本号返回第一个。"""
+        assert latest_version(["1.0", "v1.0.0"]) == "1.0"
+
+    def test_empty(self):
+        """测试没有有效版本号时返回 None。"""
+        invalid = []
+
+        assert latest_version(["bad"], on_invalid=invalid.append) is None
+        assert invalid == ["bad"]
+
+
+class TestSortCommandLine:
+    """测试 sort / latest 子命令。"""
+
+    def run(self, *args: str, stdin: str):
+        """运行 bump 子命令。"""
+        return subprocess.run(
+            [sys.executable, "-m", "bump_version.cli", *args],
+            input=stdin,
+            capture_output=True,
+            text=True,
+        )
+
+    def test_sort(self):
+        """测试从标准输入排序。"""
+        result = self.run("sort", stdin="v1.0\n1.0rc1\n1.0.post1\n0.9\n")
+
+        assert result.returncode == 0
+        assert result.stdout.splitlines() == ["0.9", "1.0rc1", "v1.0", "1.0.post1"]
+
+    def test_sort_reverse_unique_with_spill(self):
+        """测试降序去重，并通过很小的内存预算触发分段归并。"""
+        result = self.run("sort", "-r", "-u", "-S", "1K", stdin="1.0\n2.0\n1.0.0\n" * 50)
+
+        assert result.returncode == 0
+        assert result.stdout.splitlines() == ["2.0", "1.0"]
+
+    def test_sort_invalid(self):
+        """测试存在无效版本号时退出码为 1。"""
+        result = self.run("sort", stdin="1.0\nbad\n")
+
+        assert result.returncode == 1
+        assert result.stdout.splitlines() == ["1.0"]
+        assert "bad" in result.stderr
+
+    def test_sort_invalid_buffer_size(self):
+        """测试无效的内存预算。"""
+        result = self.run("sort", "-S", "lots", stdin="")
+
+        assert result.returncode == 2
+
+    def test_latest(self):
+        """测试输出最大版本号。"""
+        result = self.run("latest", "--stable", stdin="v1.0.0\nv2.0.0rc1\nv1.1.0\n")
+
+        assert result.returncode == 0
+        assert result.stdout.strip() == "v1.1.0"
+
+    def test_latest_no_versions(self):
+        """测试没有符合条件的版本号时退出码为 1。"""
+        result = self.run("latest", "--stable", stdin="1.0a1\n")
+
+        assert result.returncode == 1
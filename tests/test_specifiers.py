@@ -0,0 +1,162 @@
+"""版本约束编译测试。"""
+
+import subprocess
+import sys
+
+import pytest
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+
+from bump_version.specifiers import _compile_specifier, compile_specifier
+from bump_version.version_manager import VersionManager
+
+RELEASES = ("0", "1", "1.0", "1.2", "1.2.0", "1.2.3", "1.2.3.4", "1.3", "2", "1!1.0")
+SUFFIXES = ("", "a1", "b2", "rc1", ".dev0", ".dev3", ".post0", ".post1", ".post1.dev2", "a1.dev1", "rc1.post1")
+LOCALS = ("", "+abc", "+1.x", "+2")
+VERSIONS = tuple(r + s + local for r in RELEASES for s in SUFFIXES for local in LOCALS)
+
+SPECIFIERS = (
+    ">=1.2",
+    ">1.2",
+    "<1.2",
+    "<=1.2",
+    "==1.2",
+    "!=1.2",
+    "~=1.2",
+    "~=1.2.3",
+    "~=1.2.post1",
+    "==1.2.*",
+    "!=1.2.*",
+    "==1.2.3.*",
+    ">1.2.dev0",
+    ">1.2.post1",
+    ">1.2rc1",
+    "<1.2rc1",
+    "<1.2.post1",
+    "<1.0.dev0",
+    "<=1.2rc1",
+    ">=1.2a1",
+    "==1.2+abc",
+    "!=1.2+abc",
+    "<2,>=1.2",
+    "==1.*,!=1.2.*",
+    ">=1.2,<1.2",
+    ">1!0",
+)
+
+
+class TestCompiledSpecifier:
+    """测试编译后的约束与 packaging 的匹配结果一致。"""
+
+    @pytest.mark.parametrize("specifier", SPECIFIERS)
+    @pytest.mark.parametrize("prereleases", [True, False])
+    def test_matches_packaging(self, specifier, prereleases):
+        """测试每个运算符的区间语义。"""
+        manager = VersionManager()
+        compiled = compile_specifier(specifier)
+        expected = SpecifierSet(specifier)
+
+        for version in VERSIONS:
+            assert compiled.contains(manager.parse_version(version), prereleases=prereleases) == expected.contains(
+                version, prereleases=prereleases
+            ), version
+
+    @pytest.mark.parametrize("specifier", SPECIFIERS)
+    @pytest.mark.parametrize("prereleases", [True, False])
+    def test_specifier_set_prereleases(self, specifier, prereleases):
+        """测试 SpecifierSet 显式设置的 prereleases 作为默认值，与 SpecifierSet.contains 一致。"""
+        manager = VersionManager()
+        expected = SpecifierSet(specifier, prereleases=prereleases)
+        compiled = compile_specifier(expected)
+
+        assert compiled is not compile_specifier(SpecifierSet(specifier, prereleases=not prereleases))
+        for version in VERSIONS:
+            assert compiled.contains(manager.parse_version(version)) == expected.contains(version), version
+
+    def test_default_excludes_prereleases(self):
+        """测试默认不接受预发布版本。"""
+        manager = VersionManager()
+        compiled = compile_specifier(">=1.0")
+
+        assert compiled.contains(manager.parse_version("1.5.0"))
+        assert not compiled.contains(manager.parse_version("2.0.0rc1"))
+
+    def test_prerelease_in_specifier_implies_prereleases(self):
+        """测试约束中提到预发布版本时默认接受预发布版本。"""
+        manager = VersionManager()
+        compiled = compile_specifier(">=2.0b1")
+
+        assert compiled.implies_prereleases
+        assert compiled.contains(manager.parse_version("2.0.0rc1"))
+        assert not compile_specifier("!=2.0b1").implies_prereleases
+
+    def test_empty_intersection(self):
+        """测试互相矛盾的约束编译为空区间。"""
+        assert compile_specifier(">=2,<1").intervals == ()
+
+    def test_arbitrary_equality(self):
+        """测试 === 按原始字符串比较。"""
+        manager = VersionManager()
+        compiled = compile_specifier("===1.0")
+
+        assert compiled.contains(manager.parse_version("1.0"), raw="1.0")
+        assert not compiled.contains(manager.parse_version("1.0.0"), raw="1.0.0")
+
+    def test_compiled_specifiers_are_cached(self):
+        """测试相同的约束只编译一次。"""
+        _compile_specifier.cache_clear()
+
+        first = compile_specifier("<2,>=1.4")
+        assert compile_specifier("<2,>=1.4") is first
+        assert _compile_specifier.cache_info().hits == 1
+
+    def test_invalid_specifier(self):
+        """测试无效约束抛出 InvalidSpecifier。"""
+        with pytest.raises(InvalidSpecifier):
+            compile_specifier(">=banana")
+
+
+class TestMatchCommandLine:
+    """测试 match 子命令。"""
+
+    def run_match(self, *args: str, stdin: str):
+        """运行 bump match 命令。"""
+        return subprocess.run(
+            [sys.executable, "-m", "bump_version.cli", "match", *args],
+            input=stdin,
+            capture_output=True,
+            text=True,
+        )
+
+    def test_match(self):
+        """测试按输入顺序输出满足约束的版本号。"""
+        result = self.run_match("<2,>=1.4", stdin="v1.9.0\n1.3\n1.9.0rc1\n2.0\n1.4\n")
+
+        assert result.returncode == 0
+        assert result.stdout.splitlines() == ["v1.9.0", "1.4"]
+
+    def test_match_prereleases(self):
+        """测试 --pre 接受预发布版本。"""
+        result = self.run_match("<2,>=1.4", "--pre", stdin="1.9.0rc1\n")
+
+        assert result.stdout.splitlines() == ["1.9.0rc1"]
+
+    def test_match_invert(self):
+        """测试 --invert 输出不满足约束的有效版本号。"""
+        result = self.run_match(">=1.4", "-v", stdin="1.3\nbad\n1.5\n")
+
+        assert result.stdout.splitlines() == ["1.3"]
+        assert "bad" in result.stderr
+
+    def test_no_match(self):
+        """测试没有版本号满足约束时退出码为 1。"""
+        result = self.run_match(">=3", stdin="1.0\n")
+
+        assert result.returncode == 1
+        assert result.stdout == ""
+
+    def test_invalid_specifier(self):
+        """测试无效约束的退出码为 2。"""
+        result = self.run_match("banana", stdin="1.0\n")
+
+        assert result.returncode == 2
+        assert "无效的版本约束" in result.stderr
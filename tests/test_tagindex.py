@@ -0,0 +1,190 @@
+"""版本标签索引测试。"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from bump_version.commands import process_counts, reset_process_counts
+from bump_version.errors import TagExistsError
+from bump_version.gitrepo import GitRepository
+from bump_version.tagindex import TagIndex, encode_sort_key, next_free_version
+from bump_version.version_manager import VersionManager
+
+
+def git(cwd: Path, *args: str) -> str:
+    """执行 git 命令并返回输出。"""
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(project_with_pyproject) -> Path:
+    """带有正式版本、预发布版本和非版本标签的仓库。"""
+    path = project_with_pyproject["path"]
+    for tag in ("v1.0.0", "v1.1.0rc0", "v1.1.0rc1", "deploy-42"):
+        git(path, "tag", tag)
+    git(path, "tag", "-a", "v0.9.0", "-m", "Release 0.9.0")
+    return path
+
+
+def open_index(path: Path) -> TagIndex:
+    return TagIndex.open(GitRepository.discover(path))
+
+
+class TestEncodeSortKey:
+    """测试排序键的字节编码。"""
+
+    def test_byte_order_matches_version_order(self):
+        """测试字节串的字典序与 PEP 440 顺序一致。"""
+        versions = [
+            "1.0.dev0",
+            "1.0a0",
+            "1.0a1.dev0",
+            "1.0a1",
+            "1.0b2",
+            "1.0rc1",
+            "1.0",
+            "1.0.0.1",
+            "1.0+abc",
+            "1.0+abc.5",
+            "1.0+5",
+            "1.0.post0.dev1",
+            "1.0.post0",
+            "1.0.post1",
+            "1.1",
+            "1.10",
+            "2.0.0rc3",
+            "300.0",
+            "1!0.1",
+        ]
+        manager = VersionManager()
+        parts = [manager.parse_version(version) for version in versions]
+
+        by_key = sorted(parts, key=lambda p: p.sort_key)
+        by_bytes = sorted(parts, key=lambda p: encode_sort_key(p.sort_key))
+
+        assert by_bytes == by_key
+        assert encode_sort_key(manager.parse_version("1.0").sort_key) == encode_sort_key(
+            manager.parse_version("1.0.0").sort_key
+        )
+
+
+class TestTagIndex:
+    """测试索引查询和增量刷新。"""
+
+    def test_queries(self, repo):
+        """测试最高版本、下一个可用序号和标签是否存在。"""
+        with open_index(repo) as index:
+            assert index.highest() == "v1.1.0rc1"
+            assert index.highest(prereleases=False) == "v1.0.0"
+            assert index.next_prerelease_number("1.1.0", "rc") == 2
+            assert index.next_prerelease_number("1.1", "rc") == 2
+            assert index.next_prerelease_number("1.1.0", "b") == 0
+            assert index.exists("deploy-42")
+            assert not index.exists("v2.0.0")
+            assert index.sha("v1.0.0") == git(repo, "rev-parse", "v1.0.0")
+            assert index.tags_for("1.0") == ["v1.0.0"]
+
+    def test_index_is_stored_in_git_dir(self, repo):
+        """测试索引保存在 Git 目录中，再次打开时不需要重新解析。"""
+        open_index(repo).close()
+
+        assert (repo / ".git" / "bumpster" / "tags.sqlite3").is_file()
+        with open_index(repo) as index:
+            assert index.refresh() == 0
+
+    def test_incremental_refresh(self, repo):
+        """测试新增、删除标签和 pack-refs 后的增量刷新。"""
+        with open_index(repo) as index:
+            git(repo, "tag", "v2.0.0")
+            assert index.refresh() == 1
+            assert index.highest() == "v2.0.0"
+
+            git(repo, "tag", "-d", "v2.0.0")
+            assert index.refresh() == 1
+            assert not index.exists("v2.0.0")
+
+            git(repo, "pack-refs", "--all")
+            index.refresh()
+            assert index.highest() == "v1.1.0rc1"
+            assert index.refresh() == 0
+
+            # 删除已打包的标签会重写 packed-refs
+            git(repo, "tag", "-d", "v1.1.0rc1")
+            index.refresh()
+            assert index.next_prerelease_number("1.1.0", "rc") == 1
+
+    def test_corrupted_index_is_rebuilt(self, repo):
+        """测试索引文件损坏时删除重建。"""
+        path = repo / ".git" / "bumpster" / "tags.sqlite3"
+        path.parent.mkdir()
+        path.write_bytes(b"not a database" * 100)
+
+        with open_index(repo) as index:
+            assert index.highest() == "v1.1.0rc1"
+
+
+class TestLastReleaseTag:
+    """测试查找上一次发布的标签。"""
+
+    def test_current_version_tag(self, repo):
+        """测试优先使用当前版本的标签。"""
+        git(repo, "tag", "1.0.0")
+
+        with open_index(repo) as index:
+            assert index.last_release_tag("1.0.0") == "v1.0.0"
+            assert index.last_release_tag("1.1.0rc1") == "v1.1.0rc1"
+
+    def test_ignores_tags_on_other_branches(self, project_with_pyproject):
+        """测试当前版本没有标签时，跳过其他分支上的标签和版本号更高的标签。"""
+        path = project_with_pyproject["path"]
+        git(path, "tag", "v0.9.0")
+        git(path, "checkout", "-q", "-b", "side")
+        git(path, "commit", "-q", "--allow-empty", "-m", "side")
+        git(path, "tag", "v2.0.0")
+        for i in range(5, 10):
+            git(path, "tag", f"v0.9.{i}")
+        git(path, "checkout", "-q", "main")
+        git(path, "commit", "-q", "--allow-empty", "-m", "main")
+        git(path, "tag", "v1.5.0")
+
+        with open_index(path) as index:
+            reset_process_counts()
+            assert index.last_release_tag("1.0.0") == "v0.9.0"
+            assert process_counts() == {"git": 1}
+            assert index.last_release_tag("0.8.0") is None
+
+    def test_fallback_cached(self, project_with_pyproject):
+        """测试 HEAD 和标签都没有变化时不启动子进程，新增标签后重新计算。"""
+        path = project_with_pyproject["path"]
+        git(path, "tag", "v0.9.0")
+        with open_index(path) as index:
+            assert index.last_release_tag("1.0.0") == "v0.9.0"
+
+        reset_process_counts()
+        with open_index(path) as index:
+            assert index.last_release_tag("1.0.0") == "v0.9.0"
+        assert process_counts() == {}
+
+        git(path, "tag", "v0.9.1")
+        with open_index(path) as index:
+            assert index.last_release_tag("1.0.0") == "v0.9.1"
+
+
+class TestNextFreeVersion:
+    """测试根据已有标签选择可用的版本号。"""
+
+    def test_free_version_is_unchanged(self, repo):
+        """测试标签不存在时原样返回。"""
+        assert next_free_version(GitRepository.discover(repo), "1.0.1") == "1.0.1"
+
+    def test_prerelease_skips_to_next_free_number(self, repo):
+        """测试预发布标签已存在时跳到下一个可用序号。"""
+        assert next_free_version(GitRepository.discover(repo), "1.1.0rc0") == "1.1.0rc2"
+
+    def test_existing_final_release(self, repo):
+        """测试正式版本的标签已存在时抛出 TagExistsError。"""
+        with pytest.raises(TagExistsError) as exc_info:
+            next_free_version(GitRepository.discover(repo), "1.0.0")
+
+        assert exc_info.value.tag == "v1.0.0"
@@ -0,0 +1,175 @@
+"""额外版本号位置的同步更新测试。"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from bump_version.api import release
+from bump_version.commands import process_counts, reset_process_counts
+from bump_version.errors import VersionTargetError
+from bump_version.project import ProjectDocument
+from bump_version.targets import (
+    PARALLEL_THRESHOLD,
+    VersionTarget,
+    compile_patterns,
+    load_version_targets,
+    write_version_targets,
+)
+
+CONFIG = """
+[tool.bumpster]
+version-files = [
+    "pkg/__init__.py",
+    { path = "docs/conf.py", pattern = 'release = "{version}"' },
+    { path = "docs/conf.py", pattern = ['version = "{version}"', 'release = "{version}"'] },
+]
+"""
+
+
+def write_project(path: Path, config: str = CONFIG) -> None:
+    """在项目中加入 version-files 配置和对应的文件，并提交。"""
+    with open(path / "pyproject.toml", "a", encoding="utf-8") as f:
+        f.write(config)
+    (path / "pkg").mkdir()
+    (path / "pkg" / "__init__.py").write_text('"""包。"""\n\n__version__ = "0.9.0"\n')
+    (path / "docs").mkdir()
+    (path / "docs" / "conf.py").write_text('project = "demo"\nversion = "1.0.0"\nrelease = "1.0.0"\n')
+    subprocess.run(["git", "add", "."], cwd=path, check=True)
+    subprocess.run(["git", "commit", "-m", "add version files"], cwd=path, check=True, capture_output=True)
+
+
+class TestPatterns:
+    """测试模式编译和替换。"""
+
+    def test_whitespace_and_quotes(self):
+        """测试空白可以是任意数量，默认模式同时匹配单引号和双引号。"""
+        target = VersionTarget.create("a.py")
+        content = "__version__='1.0'\n__version__  =  \"1.0.post1+local.2\"\nmy_version = '1.0'\n"
+
+        assert (
+            target.rewrite(content, "2.0.0") == "__version__='2.0.0'\n__version__  =  \"2.0.0\"\nmy_version = '1.0'\n"
+        )
+
+    def test_multiple_patterns_in_one_pass(self):
+        """测试多个模式合并为一个正则表达式，一次替换全部匹配。"""
+        target = VersionTarget.create("README.md", ["pkg=={version}", "pkg@v{version}"])
+
+        assert target.matcher.groups == 2
+        assert (
+            target.rewrite("pip install pkg==1.0\nuses: pkg@v1.0\n", "1.1") == "pip install pkg==1.1\nuses: pkg@v1.1\n"
+        )
+
+    def test_trailing_punctuation(self):
+        """测试版本号后面紧跟的句点和连字符不属于版本号。"""
+        target = VersionTarget.create("README.md", ["pkg=={version}", "pkg@v{version}"])
+        content = "Install pkg==1.2.3.\nOr pin pkg@v1.0rc1+local.2-, pkg==1.\n"
+
+        assert target.rewrite(content, "2.0.0") == "Install pkg==2.0.0.\nOr pin pkg@v2.0.0-, pkg==2.0.0.\n"
+
+    def test_no_match(self):
+        """测试文件中没有匹配时抛出 VersionTargetError。"""
+        with pytest.raises(VersionTargetError, match=r"a\.py"):
+            VersionTarget.create("a.py").rewrite("VERSION = '1.0'\n", "2.0")
+
+    @pytest.mark.parametrize("pattern", ["version = 1.0", "{version}-{version}"])
+    def test_placeholder_required_once(self, pattern):
+        """测试模式中必须恰好有一个 {version}。"""
+        with pytest.raises(VersionTargetError):
+            compile_patterns([pattern])
+
+
+class TestLoadVersionTargets:
+    """测试读取 [tool.bumpster] 配置。"""
+
+    def test_config(self, project_with_pyproject):
+        """测试路径字符串使用默认模式，同一个文件的多项合并为一个目标。"""
+        path = project_with_pyproject["path"]
+        write_project(path)
+
+        targets = load_version_targets(path)
+
+        assert [target.path for target in targets] == ["pkg/__init__.py", "docs/conf.py"]
+        assert targets[1].patterns == ('release = "{version}"', 'version = "{version}"')
+
+    def test_without_config(self, project_with_pyproject):
+        """测试没有配置时返回空列表，不完整解析 pyproject.toml。"""
+        path = project_with_pyproject["path"]
+
+        assert load_version_targets(path) == []
+        assert ProjectDocument.load(path / "pyproject.toml")._data is None
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            '[tool.bumpster]\nversion-files = "a.py"\n',
+            "[tool.bumpster]\nversion-files = [1]\n",
+            '[tool.bumpster]\nversion-files = [{ path = "a.py", pattern = [] }]\n',
+        ],
+    )
+    def test_invalid_config(self, project_with_pyproject, config):
+        """测试格式错误的配置抛出 VersionTargetError。"""
+        path = project_with_pyproject["path"]
+        with open(path / "pyproject.toml", "a", encoding="utf-8") as f:
+            f.write(config)
+
+        with pytest.raises(VersionTargetError):
+            load_version_targets(path)
+
+
+class TestWriteVersionTargets:
+    """测试批量写入。"""
+
+    def test_all_or_nothing(self, temp_dir):
+        """测试任何一个文件缺失时不修改任何文件。"""
+        (temp_dir / "a.py").write_text('__version__ = "1.0"\n')
+        targets = [VersionTarget.create("a.py"), VersionTarget.create("missing.py")]
+
+        with pytest.raises(VersionTargetError, match=r"missing\.py"):
+            write_version_targets(temp_dir, targets, "2.0")
+
+        assert (temp_dir / "a.py").read_text() == '__version__ = "1.0"\n'
+
+    def test_many_files_in_thread_pool(self, temp_dir):
+        """测试文件较多时（线程池）结果相同，不是 UTF-8 的字节原样保留，内容不变的文件不写入。"""
+        count = PARALLEL_THRESHOLD * 2
+        for i in range(count):
+            (temp_dir / f"m{i}.py").write_bytes(b'# \xff\n__version__ = "1.0"\n')
+        (temp_dir / "same.py").write_text('__version__ = "2.0"\n')
+        targets = [VersionTarget.create(f"m{i}.py") for i in range(count)] + [VersionTarget.create("same.py")]
+
+        changed = write_version_targets(temp_dir, targets, "2.0")
+
+        assert changed == [f"m{i}.py" for i in range(count)]
+        assert all((temp_dir / f"m{i}.py").read_bytes() == b'# \xff\n__version__ = "2.0"\n' for i in range(count))
+
+
+class TestReleaseWithVersionTargets:
+    """测试发布流程同步更新额外的版本号位置。"""
+
+    def test_files_committed_together(self, project_with_pyproject):
+        """测试所有文件在同一个提交中，只需要一次 git add。"""
+        path = project_with_pyproject["path"]
+        write_project(path)
+        reset_process_counts()
+
+        release(path, "minor", push=False)
+
+        assert process_counts() == {"git": 4}
+        assert (path / "pkg" / "__init__.py").read_text() == '"""包。"""\n\n__version__ = "1.1.0"\n'
+        assert (path / "docs" / "conf.py").read_text() == 'project = "demo"\nversion = "1.1.0"\nrelease = "1.1.0"\n'
+        changed = subprocess.run(
+            ["git", "show", "--name-only", "--format=", "HEAD"], cwd=path, capture_output=True, text=True
+        ).stdout.split()
+        assert sorted(changed) == ["docs/conf.py", "pkg/__init__.py", "pyproject.toml"]
+
+    def test_missing_file_changes_nothing(self, project_with_pyproject):
+        """测试配置的文件不存在时在修改任何文件之前失败。"""
+        path = project_with_pyproject["path"]
+        write_project(path, '\n[tool.bumpster]\nversion-files = ["pkg/__init__.py", "missing.py"]\n')
+
+        with pytest.raises(VersionTargetError):
+            release(path, push=False)
+
+        assert 'version = "1.0.0"' in (path / "pyproject.toml").read_text()
+        assert '"0.9.0"' in (path / "pkg" / "__init__.py").read_text()
@@ -0,0 +1,136 @@
+"""列式版本号数组测试。"""
+
+import random
+
+import pytest
+from packaging.specifiers import SpecifierSet
+from packaging.version import Version
+
+np = pytest.importorskip("numpy")
+
+from bump_version.version_array import VersionArray  # noqa: E402
+
+from .test_specifiers import SPECIFIERS, VERSIONS  # noqa: E402
+
+
+@pytest.fixture
+def shuffled():
+    """打乱顺序的版本号。"""
+    versions = list(VERSIONS)
+    random.Random(440).shuffle(versions)
+    return versions
+
+
+class TestConstruction:
+    """测试数组构造。"""
+
+    def test_from_strings(self):
+        """测试批量解析并保留输入顺序。"""
+        array = VersionArray.from_strings(["v1.2", "2.0.0rc1", "1.0.0+cu121", "1!0.1.dev3"])
+
+        assert len(array) == 4
+        assert array.to_strings() == ["1.2.0", "2.0.0rc1", "1.0.0+cu121", "1!0.1.0.dev3"]
+
+    def test_duplicates_share_parsing(self):
+        """测试重复的版本号展开为相同的行。"""
+        array = VersionArray.from_strings(["1.0", "2.0", "1.0"])
+
+        assert array.to_strings() == ["1.0.0", "2.0.0", "1.0.0"]
+
+    def test_invalid_raises(self):
+        """测试遇到无效版本号时报错。"""
+        with pytest.raises(ValueError, match="无效的版本号"):
+            VersionArray.from_strings(["1.0", "not-a-version"])
+
+    def test_skip_invalid(self):
+        """测试跳过无效版本号。"""
+        array = VersionArray.from_strings(["1.0", "bad", "2.0", "bad"], skip_invalid=True)
+
+        assert array.to_strings() == ["1.0.0", "2.0.0"]
+
+    def test_compact_columns(self):
+        """测试小数值的列压缩为 int32。"""
+        array = VersionArray.from_strings(["1.0", "2.0.dev1"])
+
+        assert array.release.dtype == np.int32
+        assert array.dev.dtype == np.int32
+
+    def test_large_segments_keep_int64(self):
+        """测试超出 int32 的版本段保持 int64 且顺序正确。"""
+        array = VersionArray.from_strings(["20240101123000.0", "1.0"])
+
+        assert array.release.dtype == np.int64
+        assert str(array.max()) == "20240101123000.0.0"
+
+    def test_empty(self):
+        """测试空数组。"""
+        array = VersionArray.from_strings([])
+
+        assert len(array) == 0
+        assert list(array.argsort()) == []
+        with pytest.raises(ValueError):
+            array.argmax()
+
+
+class TestOrdering:
+    """测试排序与最大值。"""
+
+    def test_argsort_matches_packaging(self, shuffled):
+        """测试排序结果与 packaging.Version 一致。"""
+        array = VersionArray.from_strings(shuffled)
+        ordered = [Version(shuffled[i]) for i in array.argsort()]
+
+        assert ordered == sorted(Version(v) for v in shuffled)
+
+    def test_lexsort_fallback(self):
+        """测试列取值范围过大无法打包时退回 lexsort。"""
+        versions = ["99999999999.0", "1.0.dev99999999999", "1.0.post99999999999", "1.0", "0.1"]
+        array = VersionArray.from_strings(versions)
+
+        assert array._packed_key() is None
+        assert [versions[i] for i in array.argsort()] == sorted(versions, key=Version)
+
+    def test_argsort_is_stable(self):
+        """测试相等的版本号保持输入顺序。"""
+        array = VersionArray.from_strings(["1.0", "2.0", "1.0.0", "1"])
+
+        assert list(array.argsort()) == [0, 2, 3, 1]
+
+    def test_sorted(self):
+        """测试返回排序后的新数组。"""
+        array = VersionArray.from_strings(["2.0", "1.0rc1", "1.0"])
+
+        assert array.sorted().to_strings() == ["1.0.0rc1", "1.0.0", "2.0.0"]
+
+    def test_max(self, shuffled):
+        """测试最大值与 packaging 一致。"""
+        array = VersionArray.from_strings(shuffled)
+
+        assert Version(str(array.max())) == max(Version(v) for v in shuffled)
+
+
+class TestFilter:
+    """测试按约束过滤。"""
+
+    @pytest.mark.parametrize("specifier", SPECIFIERS)
+    def test_mask_matches_packaging(self, shuffled, specifier):
+        """测试掩码与 packaging 的匹配结果一致。"""
+        array = VersionArray.from_strings(shuffled)
+        expected = SpecifierSet(specifier)
+
+        for prereleases in (True, False):
+            mask = array.mask(specifier, prereleases=prereleases)
+            assert list(mask) == [expected.contains(v, prereleases=prereleases) for v in shuffled]
+
+    def test_filter_default_excludes_prereleases(self):
+        """测试默认排除预发布版本。"""
+        array = VersionArray.from_strings(["1.4.0", "1.9.0rc1", "1.9.0", "2.0.0"])
+
+        assert array.filter("<2,>=1.4").to_strings() == ["1.4.0", "1.9.0"]
+
+    def test_arbitrary_equality_unsupported(self):
+        """测试不支持 === 约束。"""
+        array = VersionArray.from_strings(["1.0"])
+
+        with pytest.raises(ValueError, match="==="):
+            array.filter("===1.0")
@@ -3,7 +3,98 @@
 import pytest
 from packaging.version import InvalidVersion, Version
 
-from bump_version.version_manager import VersionManager
+from bump_version.version_manager import (
+    RELEASE_TYPES,
+    TRANSITION_TABLE,
+    VERSION_STATES,
+    VersionManager,
+    VersionParts,
+)
+
+
+def legacy_next_version(
+    version_parts: VersionParts, release_type: str, is_prerelease: bool, prerelease_type: str | None
+) -> str:
+    """迁移表引入之前的 get_next_version 实现，作为迁移表的对照基准。"""
+    major = version_parts.major
+    minor = version_parts.minor
+    patch = version_parts.patch
+
+    # 如果当前是预发布版本
+    if version_parts.prerelease_type:
+        if is_prerelease and prerelease_type:
+            if prerelease_type == version_parts.prerelease_type:
+                # 相同类型：递增版本号
+                new_num = (version_parts.prerelease_num or 0) + 1
+                if prerelease_type in ["dev", "post"]:
+                    return f"{major}.{minor}.{patch}.{prerelease_type}{new_num}"
+                else:
+                    return f"{major}.{minor}.{patch}{prerelease_type}{new_num}"
+            else:
+                # 不同类型：检查升级路径
+                # PEP 440 顺序: dev < a < b < rc < 正式版 < post
+                prerelease_order = ["dev", "a", "b", "rc"]
+
+                # 处理 post 版本的特殊情况
+                if version_parts.prerelease_type == "post":
+                    # 从 post 版本只能继续 post 或者升级到新的主/次/修订版本
+                    if prerelease_type == "post":
+                        new_num = (version_parts.prerelease_num or 0) + 1
+                        return f"{major}.{minor}.{patch}.post{new_num}"
+                    else:
+                        # 不允许从 post 回到其他预发布版本
+                        raise ValueError(f"不能从 post 版本回到 {prerelease_type} 版本")
+                elif prerelease_type == "post":
+                    # 不能从预发布版本直接到 post 版本
+                    raise ValueError("不能从预发布版本直接升级到 post 版本，请先发布正式版本")
+
+                current_idx = (
+                    prerelease_order.index(version_parts.prerelease_type)
+                    if version_parts.prerelease_type in prerelease_order
+                    else -1
+                )
+                new_idx = prerelease_order.index(prerelease_type) if prerelease_type in prerelease_order else -1
+
+                if new_idx > current_idx:
+                    # 升级预发布类型
+                    if prerelease_type in ["dev", "post"]:
+                        return f"{major}.{minor}.{patch}.{prerelease_type}0"
+                    else:
+                        return f"{major}.{minor}.{patch}{prerelease_type}0"
+                else:
+                    # 降级警告，但仍然允许
+                    if prerelease_type in ["dev", "post"]:
+                        return f"{major}.{minor}.{patch}.{prerelease_type}0"
+                    else:
+                        return f"{major}.{minor}.{patch}{prerelease_type}0"
+        else:
+            # 预发布 -> 正式版：去掉预发布后缀
+            return f"{major}.{minor}.{patch}"
+    else:
+        # 当前是正式版本
+        if is_prerelease and prerelease_type == "post":
+            # 正式版本可以直接升级到 post 版本
+            return f"{major}.{minor}.{patch}.post0"
+
+        if release_type == "major":
+            major += 1
+            minor = 0
+            patch = 0
+        elif release_type == "minor":
+            minor += 1
+            patch = 0
+        elif release_type == "patch":
+            patch += 1
+
+        new_version = f"{major}.{minor}.{patch}"
+
+        if is_prerelease and prerelease_type and prerelease_type != "post":
+            if prerelease_type == "dev":
+                new_version += f".{prerelease_type}0"
+            else:
+                new_version += f"{prerelease_type}0"
+
+        return new_version
 
 
 class TestVersionParsing:
@@ -325,3 +416,264 @@ class TestPEP440Compliance:
                     Version(reconstructed)
                 except InvalidVersion:
                     pytest.fail(f"重构的版本号 {reconstructed} 不符合 PEP 440 规范")
+
+
+class TestFastParser:
+    """测试快速解析路径与解析缓存。"""
+
+    def test_fast_path_matches_packaging(self):
+        """测试快速解析结果与 packaging 完全一致。"""
+        from bump_version.version_manager import _parse_fast, _parse_with_packaging
+
+        releases = ["0", "1", "1.2", "1.2.3", "01.002.0003", "2024.10.1"]
+        suffixes = ["", "a0", "b1", "rc12", ".post3", "post3", ".dev0", "dev7", "a1.post2", "rc1.dev3", ".post1.dev2"]
+        locals_ = ["", "+abc", "+cu118.1", "+abc.05", "+0.x1"]
+
+        for release in releases:
+            for suffix in suffixes:
+                for local in locals_:
+                    version = f"{release}{suffix}{local}"
+                    fast = _parse_fast(version)
+                    if fast is not None:
+                        # 比较 repr 以确保逐字段一致，而不仅是 PEP 440 意义上相等
+                        assert repr(fast) == repr(_parse_with_packaging(version)), version
+
+    def test_exotic_versions_fall_back_to_packaging(self):
+        """测试非规范写法由 packaging 处理。"""
+        from bump_version.version_manager import _parse_fast
+
+        manager = VersionManager()
+        for version in ["1!2.0.0", "1.0.0-alpha.1", "1.0.0.0.1", "1.0.0RC1", "1.0+ABC"]:
+            assert _parse_fast(version) is None
+            assert manager.parse_version(version) is not None
+
+        parts = manager.parse_version("1.0.0-alpha.1")
+        assert parts is not None
+        assert parts.prerelease_type == "a"
+        assert parts.prerelease_num == 1
+
+    def test_parse_cache_counters(self):
+        """测试解析缓存的命中和未命中计数。"""
+        manager = VersionManager()
+        manager.clear_parse_cache()
+
+        manager.parse_version("3.2.1")
+        manager.parse_version("v3.2.1")
+        manager.parse_version("3.2.2")
+
+        info = manager.parse_cache_info()
+        assert info["misses"] == 2
+        assert info["hits"] == 1
+        assert info["currsize"] == 2
+
+    def test_cached_results_are_immutable(self):
+        """测试缓存命中时返回同一个不可变实例。"""
+        from dataclasses import FrozenInstanceError
+
+        manager = VersionManager()
+        first = manager.parse_version("4.0.0")
+        assert first is not None
+        with pytest.raises(FrozenInstanceError):
+            first.major = 99  # type: ignore[misc]
+
+        assert manager.parse_version("4.0.0") is first
+
+
+class TestVersionPartsValueType:
+    """测试 VersionParts 作为不可变值类型的行为。"""
+
+    ORDERED = (
+        "1.0.dev0",
+        "1.0a0",
+        "1.0a1.dev0",
+        "1.0a1",
+        "1.0a1.post1.dev2",
+        "1.0a1.post1",
+        "1.0b0",
+        "1.0rc1",
+        "1.0",
+        "1.0+abc",
+        "1.0+abc.2",
+        "1.0+1",
+        "1.0.post0.dev1",
+        "1.0.post0",
+        "1.0.post1",
+        "1.0.1",
+        "1.0.1.1",
+        "2.0",
+        "1!0.1",
+    )
+
+    def test_sorting_matches_packaging(self):
+        """测试排序结果与 packaging.Version 一致。"""
+        import random
+
+        manager = VersionManager()
+        shuffled = list(self.ORDERED)
+        random.Random(0).shuffle(shuffled)
+
+        by_parts = sorted(shuffled, key=manager.parse_version)  # type: ignore[arg-type]
+        assert by_parts == sorted(shuffled, key=Version) == list(self.ORDERED)
+
+    def test_equality_and_hash_follow_pep440(self):
+        """测试补零后相等的版本号相等且哈希一致，可用于去重。"""
+        manager = VersionManager()
+        versions = {manager.parse_version(v) for v in ["1.0", "1.0.0", "v1.0.0", "1.0.0.0", "1.0.1"]}
+        assert len(versions) == 2
+
+    def test_str_renders_canonical_form(self):
+        """测试 __str__ 输出规范形式。"""
+        manager = VersionManager()
+        cases = {
+            "v1.0": "1.0.0",
+            "1.0.0-alpha.1": "1.0.0a1",
+            "2.1.0.beta1": "2.1.0b1",
+            "1.0.0dev3": "1.0.0.dev3",
+            "1!1.2.3.4rc1.post2.dev3+Ubuntu-1": "1!1.2.3.4rc1.post2.dev3+ubuntu.1",
+        }
+        for raw, expected in cases.items():
+            assert str(manager.parse_version(raw)) == expected
+
+    def test_is_frozen_and_slotted(self):
+        """测试不可变且没有实例 __dict__。"""
+        from dataclasses import FrozenInstanceError
+
+        parts = VersionParts(1, 2, 3)
+        assert not hasattr(parts, "__dict__")
+        with pytest.raises(FrozenInstanceError):
+            parts.patch = 4  # type: ignore[misc]
+
+    def test_manual_construction_fills_suffix_fields(self):
+        """测试只指定 prerelease_type 构造时补全对应字段。"""
+        assert VersionParts(1, 0, 0, "rc", 2).pre == ("rc", 2)
+        assert VersionParts(1, 0, 0, "dev", 1).dev == 1
+        assert VersionParts(1, 0, 0, "post", 3).post == 3
+        assert VersionParts(1, 0, 0, "a", 1) < VersionParts(1, 0, 0)
+
+    def test_get_next_version_accepts_parts(self):
+        """测试 get_next_version 直接接受已解析的 VersionParts。"""
+        manager = VersionManager()
+        parts = manager.parse_version("1.0.0a3")
+        assert parts is not None
+        assert manager.get_next_version(parts, "patch", True, "b") == "1.0.0b0"
+        assert manager.get_next_version(VersionParts(1, 2, 3), "minor", False, None) == "1.3.0"
+
+
+class TestTransitionTable:
+    """测试预先计算的版本迁移表。"""
+
+    SAMPLES = ("0.0.0", "1.2.3", "2.0", "1.2.3.dev4", "1.2.3a4", "1.2.3b0", "1.2.3rc4", "1.2.3.post4", "1.2.3a1.dev2")
+
+    def test_table_covers_every_state_and_action(self):
+        """测试迁移表覆盖全部 (状态, 操作) 组合。"""
+        assert len(TRANSITION_TABLE) == len(VERSION_STATES) * len(RELEASE_TYPES) * len(VERSION_STATES)
+        for current in VERSION_STATES:
+            for release_type in RELEASE_TYPES:
+                for target in VERSION_STATES:
+                    assert (current, release_type, target) in TRANSITION_TABLE
+
+    def test_table_matches_legacy_behaviour(self):
+        """测试迁移表与原有分支实现的结果（包括错误）完全一致。"""
+        manager = VersionManager()
+        for version in self.SAMPLES:
+            parts = manager.parse_version(version)
+            assert parts is not None
+            for release_type in RELEASE_TYPES:
+                for is_prerelease in (True, False):
+                    for prerelease_type in VERSION_STATES:
+                        try:
+                            expected = legacy_next_version(parts, release_type, is_prerelease, prerelease_type)
+                        except ValueError as e:
+                            with pytest.raises(ValueError, match=str(e)):
+                                manager.get_next_version(parts, release_type, is_prerelease, prerelease_type)
+                            continue
+                        actual = manager.get_next_version(parts, release_type, is_prerelease, prerelease_type)
+                        assert actual == expected, (version, release_type, is_prerelease, prerelease_type)
+
+    def test_table_is_read_only(self):
+        """测试迁移表不可修改。"""
+        with pytest.raises(TypeError):
+            TRANSITION_TABLE[(None, "patch", None)] = TRANSITION_TABLE[(None, "major", None)]  # type: ignore[index]
+
+    def test_unsupported_action_raises(self):
+        """测试迁移表之外的操作报错。"""
+        manager = VersionManager()
+        with pytest.raises(ValueError, match="不支持的发布操作"):
+            manager.get_next_version("1.0.0", "huge", False, None)  # type: ignore[arg-type]
+
+    def test_batch_next_versions(self):
+        """测试批量计算下一个版本号。"""
+        manager = VersionManager()
+        parts = manager.parse_version("3.1.4")
+        assert parts is not None
+
+        result = manager.get_next_versions(["1.0.0", "1.0.0a1", "v2.5.9", parts], "minor", True, "a")
+        assert result == ["1.1.0a0", "1.0.0a2", "2.6.0a0", "3.2.0a0"]
+
+    def test_batch_raises_on_illegal_transition(self):
+        """测试批量计算遇到不允许的迁移时报错。"""
+        manager = VersionManager()
+        with pytest.raises(ValueError, match="不能从预发布版本直接升级到 post 版本"):
+            manager.get_next_versions(["1.0.0", "1.0.0rc1"], "patch", True, "post")
+
+
+class TestCandidates:
+    """测试候选版本矩阵。"""
+
+    def test_candidates_match_get_next_version(self):
+        """测试每个候选版本与 get_next_version 的结果一致。"""
+        manager = VersionManager()
+        for version in ("1.2.3", "1.2.3.dev1", "1.2.3b2", "1.2.3.post1"):
+            for candidate in manager.get_candidates(version):
+                release_type = candidate.release_type or "patch"
+                is_prerelease = candidate.prerelease_type is not None
+                if candidate.error:
+                    with pytest.raises(ValueError, match=candidate.error):
+                        manager.get_next_version(version, release_type, is_prerelease, candidate.prerelease_type)
+                else:
+                    assert candidate.version == manager.get_next_version(
+                        version, release_type, is_prerelease, candidate.prerelease_type
+                    )
+
+    def test_candidates_offered_flags(self):
+        """测试 offered 标记与交互式流程提供的选项一致。"""
+        manager = VersionManager()
+        offered = {c.prerelease_type for c in manager.get_candidates("1.0.0b1") if c.offered}
+        assert offered == {None, "b", "rc"}
+
+    def test_prerelease_candidates_are_not_repeated_per_release_type(self):
+        """测试与递增类型无关的操作只列出一次。"""
+        manager = VersionManager()
+        candidates = manager.get_candidates("1.0.0rc1")
+        assert len(candidates) == len(VERSION_STATES)
+        assert all(c.release_type is None for c in candidates)
+
+
+class TestFilterBySpecifier:
+    """测试按约束筛选版本号。"""
+
+    def test_filter_preserves_input(self):
+        """测试按输入顺序原样产出满足约束的版本号。"""
+        manager = VersionManager()
+        versions = ["v1.9.0", "1.3", "2.0", "1.4.0", "not-a-version", "1.5.0rc1"]
+
+        assert list(manager.filter_by_specifier(versions, "<2,>=1.4")) == ["v1.9.0", "1.4.0"]
+
+    def test_filter_prereleases(self):
+        """测试显式接受预发布版本。"""
+        manager = VersionManager()
+
+        assert list(manager.filter_by_specifier(["1.5.0rc1", "1.5.0"], ">=1.4", prereleases=True)) == [
+            "1.5.0rc1",
+            "1.5.0",
+        ]
+
+    def test_filter_is_lazy(self):
+        """测试流式筛选，不会一次读完输入。"""
+        manager = VersionManager()
+
+        def versions():
+            yield "1.5"
+            raise AssertionError("不应读取更多输入")
+
+        assert next(manager.filter_by_specifier(versions(), ">=1.4")) == "1.5"